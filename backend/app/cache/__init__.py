@@ -0,0 +1,60 @@
+# backend/app/cache/__init__.py
+
+# Response cache used by the read endpoints
+#
+# from app.cache import cache, trip_tag
+# stops = cache.get_or_load(f"stops:{trip_id}", load, tags=[trip_tag(trip_id)], session=db)
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..utils.trip_changes import on_trip_change
+from .base import CacheBackend, NullCache, SingleFlight, MISSING, trip_tag
+from .memory import MemoryCache
+from .redis_cache import RedisCache
+
+
+def create_cache(backend: str) -> CacheBackend:
+    """Build the cache backend named in settings (memory, redis or none)"""
+    if backend == "memory":
+        return MemoryCache(
+            max_entries=settings.CACHE_MAX_ENTRIES,
+            default_ttl=settings.CACHE_DEFAULT_TTL
+        )
+    if backend == "redis":
+        return RedisCache(
+            url=settings.CACHE_REDIS_URL,
+            default_ttl=settings.CACHE_DEFAULT_TTL
+        )
+    if backend == "none":
+        return NullCache(default_ttl=settings.CACHE_DEFAULT_TTL)
+
+    raise ValueError(f"Unknown CACHE_BACKEND: {backend}")
+
+
+cache = create_cache(settings.CACHE_BACKEND)
+
+
+@on_trip_change
+def _invalidate_changed_trips(trip_ids):
+    cache.invalidate_tags(trip_tag(trip_id) for trip_id in trip_ids)
+
+
+# A session's reads are as old as its transaction: get_or_load(session=db)
+# compares against the generation from when it began
+@event.listens_for(Session, "after_begin")
+def _remember_cache_generation(session, transaction, connection):
+    cache.remember_generation(session)
+
+
+__all__ = [
+    "cache",
+    "create_cache",
+    "trip_tag",
+    "CacheBackend",
+    "MemoryCache",
+    "RedisCache",
+    "NullCache",
+    "SingleFlight",
+    "MISSING",
+]
@@ -0,0 +1,218 @@
+# backend/app/cache/base.py
+
+import threading
+from typing import Any, Callable, Iterable, Optional, Union
+
+# Returned by get() when a key isn't cached
+# (None is a valid cached value, so we can't use it)
+MISSING = object()
+
+TagsArg = Union[Iterable[str], Callable[[Any], Iterable[str]]]
+
+
+def trip_tag(trip_id: int) -> str:
+    """Tag for everything derived from one trip's subtree"""
+    return f"trip:{trip_id}"
+
+
+class _Call:
+    """One in-flight load that other callers can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Collapse concurrent loads of the same key into one
+
+    The first caller runs the loader, everyone else
+    waits for it and gets the same result (or exception)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn()
+            return call.value
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class CacheBackend:
+    """
+    Base class for response caches
+
+    Values must be JSON-serialisable (lists/dicts of plain values),
+    so every backend can store them.
+
+    Backends implement get / set / delete / invalidate_tags / clear.
+    get_or_load adds read-through with stampede protection on top.
+    """
+
+    def __init__(self, default_ttl: int):
+        self.default_ttl = default_ttl
+        self._flight = SingleFlight()
+        self._generation = 0  # Bumped on every tag invalidation
+        self._session_key = f"cache_generation:{id(self)}"
+        self.hits = 0
+        self.misses = 0
+
+    # ---- backend interface ----
+
+    def get(self, key: str) -> Any:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None, tags: Iterable[str] = ()) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def _invalidate_tags(self, tags: Iterable[str]) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    # ---- shared behaviour ----
+
+    def _current_generation(self) -> Any:
+        """Changes on every tag invalidation (see get_or_load)"""
+        return self._generation
+
+    def _bump_generation(self) -> None:
+        self._generation += 1
+
+    def _set_if_generation(self, key: str, value: Any, ttl: Optional[int],
+                           tags: Iterable[str], generation: Any) -> None:
+        """
+        set() unless an invalidation happened since `generation` was read
+
+        Backends make the check and the write atomic against invalidate_tags
+        """
+        if generation == self._current_generation():
+            self.set(key, value, ttl, tags)
+
+    def invalidate_tags(self, tags: Iterable[str]) -> None:
+        """Drop every key stored with any of these tags"""
+        self._bump_generation()
+        self._invalidate_tags(list(tags))
+
+    def remember_generation(self, session) -> None:
+        """
+        Record the generation when a session's transaction begins
+
+        Its reads see the database as of (roughly) that moment, so a value
+        loaded in that transaction is only as fresh as this generation
+        """
+        session.info[self._session_key] = self._current_generation()
+
+    def _generation_for(self, session) -> Any:
+        """Generation a value loaded now, in this session, is as fresh as"""
+        if session is not None and session.in_transaction() and self._session_key in session.info:
+            return session.info[self._session_key]
+        # No transaction yet: the loader's first read starts it after this
+        return self._current_generation()
+
+    def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        ttl: Optional[int] = None,
+        tags: TagsArg = (),
+        session=None
+    ) -> Any:
+        """
+        Return the cached value, or call loader() and cache the result
+
+        - Concurrent misses on the same key run loader() only once
+        - tags may be a callable taking the loaded value
+        - None results are returned but not cached
+        - session: the Session loader() reads with. If its transaction
+          began before an invalidation, the value isn't stored
+          (its snapshot may predate the write)
+        """
+        value = self.get(key)
+        if value is not MISSING:
+            self.hits += 1
+            return value
+
+        def load():
+            # Another thread may have filled it while we waited
+            value = self.get(key)
+            if value is not MISSING:
+                self.hits += 1
+                return value
+
+            self.misses += 1
+            generation = self._generation_for(session)
+
+            def store(value):
+                # Skip storing if an invalidation happened mid-load
+                # (the value may already be stale)
+                if value is not None:
+                    resolved_tags = tags(value) if callable(tags) else tags
+                    self._set_if_generation(key, value, ttl, resolved_tags, generation)
+
+            return self._load(key, loader, store)
+
+        return self._flight.do(key, load)
+
+    def _load(self, key: str, loader: Callable[[], Any], store: Callable[[Any], None]) -> Any:
+        """
+        Hook for backends that need cross-process stampede protection
+
+        Calls loader(), passes the result to store() and returns it
+        """
+        value = loader()
+        store(value)
+        return value
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self).__name__,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+class NullCache(CacheBackend):
+    """Cache that never stores anything (CACHE_BACKEND=none)"""
+
+    def get(self, key):
+        return MISSING
+
+    def set(self, key, value, ttl=None, tags=()):
+        pass
+
+    def delete(self, key):
+        pass
+
+    def _invalidate_tags(self, tags):
+        pass
+
+    def clear(self):
+        pass
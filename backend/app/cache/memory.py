@@ -0,0 +1,106 @@
+# backend/app/cache/memory.py
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Iterable, Optional
+from .base import CacheBackend, MISSING
+
+
+class MemoryCache(CacheBackend):
+    """
+    Bounded in-process LRU cache with per-key TTLs and tags
+
+    Each worker process has its own copy, so tag invalidation
+    only reaches this process (use RedisCache to share a cache)
+    """
+
+    def __init__(self, max_entries: int, default_ttl: int):
+        super().__init__(default_ttl)
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key → (expires_at, value, tags)
+        self._keys_by_tag = {}         # tag → {key, ...}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+
+            expires_at, value, _ = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                return MISSING
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None, tags: Iterable[str] = ()) -> None:
+        with self._lock:
+            self._put(key, value, ttl, tuple(tags))
+
+    def _set_if_generation(self, key, value, ttl, tags, generation) -> None:
+        # Under the same lock as invalidate_tags: no invalidation can
+        # land between the check and the write
+        with self._lock:
+            if generation == self._generation:
+                self._put(key, value, ttl, tuple(tags))
+
+    def invalidate_tags(self, tags) -> None:
+        with self._lock:
+            self._generation += 1
+            self._drop_tags(tags)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def _invalidate_tags(self, tags) -> None:
+        with self._lock:
+            self._drop_tags(tags)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_tag.clear()
+
+    def _put(self, key: str, value: Any, ttl: Optional[int], tags: tuple) -> None:
+        """Store a key (caller holds the lock)"""
+        expires_at = time.monotonic() + (ttl or self.default_ttl)
+
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = (expires_at, value, tags)
+        for tag in tags:
+            self._keys_by_tag.setdefault(tag, set()).add(key)
+
+        # Evict least recently used
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+
+    def _drop_tags(self, tags) -> None:
+        """Remove every key stored with these tags (caller holds the lock)"""
+        for tag in tags:
+            for key in self._keys_by_tag.pop(tag, ()):
+                self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        """Remove a key and its tag links (caller holds the lock)"""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+
+        for tag in entry[2]:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        stats["entries"] = len(self._entries)
+        return stats
@@ -0,0 +1,208 @@
+# backend/app/cache/redis_cache.py
+
+import json
+import secrets
+import time
+from datetime import date, datetime, time as dtime
+from typing import Any, Callable, Iterable, Optional
+from .base import CacheBackend, MISSING
+
+
+def _json_default(value):
+    """Dates/times as ISO strings (same as the JSON responses)"""
+    if isinstance(value, (date, datetime, dtime)):
+        return value.isoformat()
+    return str(value)
+
+
+class RedisCache(CacheBackend):
+    """
+    Cache stored in Redis (or anything speaking the Redis protocol:
+    KeyDB, Dragonfly, fakeredis in tests...)
+
+    Shared by all workers, so tag invalidation reaches every process.
+
+    Layout (all keys prefixed):
+    - <key>          JSON value with EX ttl
+    - tag:<tag>      set of keys stored with that tag
+    - lock:<key>     short-lived loader lock (cross-process single-flight)
+    - generation     counter bumped by every tag invalidation, so a load
+                     that overlapped an invalidation in any process
+                     isn't stored
+
+    If Redis is unreachable, reads fall through to the database.
+    """
+
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379/0",
+        default_ttl: int = 300,
+        prefix: str = "globetrotter:",
+        lock_timeout: float = 10.0,
+        client=None
+    ):
+        super().__init__(default_ttl)
+
+        if client is None:
+            try:
+                import redis
+            except ImportError:
+                raise RuntimeError(
+                    "CACHE_BACKEND=redis needs the 'redis' package (pip install redis)"
+                )
+            client = redis.Redis.from_url(url)
+
+        self._client = client
+        self.prefix = prefix
+        self.lock_timeout = lock_timeout
+        self._tag_ttl = default_ttl
+
+    def _key(self, key: str) -> str:
+        return self.prefix + key
+
+    def _tag_key(self, tag: str) -> str:
+        return self.prefix + "tag:" + tag
+
+    def get(self, key: str) -> Any:
+        try:
+            raw = self._client.get(self._key(key))
+        except Exception as e:
+            print(f"❌ Redis cache get failed: {str(e)}")
+            return MISSING
+
+        if raw is None:
+            return MISSING
+
+        return json.loads(raw)
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None, tags: Iterable[str] = ()) -> None:
+        try:
+            pipe = self._client.pipeline()
+            self._queue_set(pipe, key, value, ttl, tags)
+            pipe.execute()
+        except Exception as e:
+            print(f"❌ Redis cache set failed: {str(e)}")
+
+    def _queue_set(self, pipe, key: str, value: Any, ttl: Optional[int], tags: Iterable[str]) -> None:
+        ttl = ttl or self.default_ttl
+
+        # Tag sets must outlive every key they point to
+        self._tag_ttl = max(self._tag_ttl, ttl)
+
+        pipe.set(self._key(key), json.dumps(value, default=_json_default), ex=ttl)
+        for tag in tags:
+            pipe.sadd(self._tag_key(tag), key)
+            pipe.expire(self._tag_key(tag), self._tag_ttl)
+
+    def _set_if_generation(self, key, value, ttl, tags, generation) -> None:
+        """
+        WATCH the generation key, so the write is dropped if any process
+        bumps it between the check and EXEC. An invalidation that bumps
+        it after EXEC finds the key in its tag set and deletes it.
+        """
+        from redis.exceptions import WatchError
+
+        generation_key = self.prefix + "generation"
+        try:
+            with self._client.pipeline() as pipe:
+                pipe.watch(generation_key)
+                if pipe.get(generation_key) != generation:
+                    return
+                pipe.multi()
+                self._queue_set(pipe, key, value, ttl, tags)
+                pipe.execute()
+        except WatchError:
+            pass
+        except Exception as e:
+            print(f"❌ Redis cache set failed: {str(e)}")
+
+    def delete(self, key: str) -> None:
+        try:
+            self._client.delete(self._key(key))
+        except Exception as e:
+            print(f"❌ Redis cache delete failed: {str(e)}")
+
+    def _invalidate_tags(self, tags) -> None:
+        try:
+            for tag in tags:
+                tag_key = self._tag_key(tag)
+                keys = [self._key(k.decode() if isinstance(k, bytes) else k)
+                        for k in self._client.smembers(tag_key)]
+                self._client.delete(tag_key, *keys)
+        except Exception as e:
+            print(f"❌ Redis cache invalidation failed: {str(e)}")
+
+    def clear(self) -> None:
+        try:
+            for key in self._client.scan_iter(match=self.prefix + "*"):
+                self._client.delete(key)
+        except Exception as e:
+            print(f"❌ Redis cache clear failed: {str(e)}")
+
+    def _current_generation(self) -> Any:
+        try:
+            return self._client.get(self.prefix + "generation")
+        except Exception:
+            return secrets.token_hex(8)  # Never equal: don't store what we can't check
+
+    def _bump_generation(self) -> None:
+        try:
+            self._client.incr(self.prefix + "generation")
+        except Exception as e:
+            print(f"❌ Redis cache generation bump failed: {str(e)}")
+
+    def _load(self, key: str, loader: Callable[[], Any], store: Callable[[Any], None]) -> Any:
+        """
+        Take a Redis lock before loading, so only one worker
+        (across all processes) hits the database for this key
+
+        Workers that don't get the lock poll for the value,
+        and load it themselves if the holder takes too long.
+        The holder stores the value before letting the lock go.
+        """
+        lock_key = self.prefix + "lock:" + key
+        token = secrets.token_hex(8)
+
+        def load_and_store():
+            value = loader()
+            store(value)
+            return value
+
+        try:
+            acquired = self._client.set(
+                lock_key, token, nx=True, px=int(self.lock_timeout * 1000)
+            )
+        except Exception:
+            return load_and_store()
+
+        if acquired:
+            try:
+                # The previous holder may have stored it just before we got the lock
+                value = self.get(key)
+                if value is not MISSING:
+                    return value
+                return load_and_store()
+            finally:
+                try:
+                    if self._client.get(lock_key) in (token, token.encode()):
+                        self._client.delete(lock_key)
+                except Exception:
+                    pass
+
+        deadline = time.monotonic() + self.lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            value = self.get(key)
+            if value is not MISSING:
+                return value
+            try:
+                if not self._client.exists(lock_key):
+                    # Released: the holder stored the value first
+                    value = self.get(key)
+                    if value is not MISSING:
+                        return value
+                    break
+            except Exception:
+                break
+
+        return load_and_store()
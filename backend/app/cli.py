@@ -0,0 +1,61 @@
+# backend/app/cli.py
+
+# Command line tools
+#
+# Run from backend/:
+# python -m app.cli import-trips dump.ndjson --user-id 1
+# python -m app.cli import-trips old-planner.csv --user-id 1 --partial
+
+import argparse
+import sys
+
+
+def import_trips(args) -> int:
+    """Import an NDJSON/CSV trip dump straight into the database"""
+    from .database import WriteSessionLocal
+    from .services.import_service import ImportService
+
+    format = args.format or ("csv" if args.path.lower().endswith(".csv") else "ndjson")
+
+    db = WriteSessionLocal()
+    try:
+        with open(args.path, encoding="utf-8", newline="") as lines:
+            result = ImportService.run(
+                db, args.user_id, lines, format=format, partial=args.partial,
+                allow_conflicts=args.allow_conflicts
+            )
+    finally:
+        db.close()
+
+    for error in result.errors:
+        print(f"❌ line {error['line']}: {error['error']}")
+    if result.error_count > len(result.errors):
+        print(f"... and {result.error_count - len(result.errors)} more errors")
+
+    if result.committed:
+        print(f"✅ Imported {result.created}")
+        return 0
+
+    print(f"❌ Nothing imported ({result.error_count} errors)")
+    return 1
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    importer = commands.add_parser("import-trips", help="Import an NDJSON/CSV trip dump")
+    importer.add_argument("path")
+    importer.add_argument("--user-id", type=int, required=True, help="Owner of the imported trips")
+    importer.add_argument("--format", choices=("ndjson", "csv"), help="Default: from the file extension")
+    importer.add_argument("--partial", action="store_true", help="Keep valid records even if some fail")
+    importer.add_argument("--allow-conflicts", action="store_true",
+                          help="Import activities that overlap others at their stop")
+    importer.set_defaults(handler=import_trips)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
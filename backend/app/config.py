@@ -7,11 +7,91 @@ class Settings(BaseSettings):
     # DATABASE CONNECTION
     DATABASE_URL: str = "sqlite:///./globetrotter.db"  # Default for development
     
+    # SQLITE - production profile applied on connect (see utils/sqlite_tuning.py)
+    SQLITE_TUNING: bool = True             # False = driver defaults (no WAL, no writer queue)
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000     # Wait for another process's write lock
+    SQLITE_MMAP_SIZE: int = 268435456      # 256MB of the file memory-mapped
+    SQLITE_CACHE_SIZE_KB: int = 16384      # Page cache per connection
+    SQLITE_FOREIGN_KEYS: bool = True       # Enforce foreign keys / ondelete
+    SQLITE_WRITER_QUEUE: bool = True       # Write transactions take turns (FIFO) within a process
+    SQLITE_WRITER_TIMEOUT: float = 30      # Seconds a write waits for its turn
+    
     # SECURITY
     SECRET_KEY: str = "your-secret-key-change-this-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
+    # PUBLIC SHARE SNAPSHOTS
+    SHARE_SNAPSHOT_MAX_ENTRIES: int = 1024  # Shared trips kept in memory (0 = off)
+    
+    # ACTIVITY SCHEDULES - per-stop interval indexes for conflict checks
+    SCHEDULE_INDEX_MAX_ENTRIES: int = 4096  # Stops kept in memory (0 = off)
+    
+    # DESTINATION AUTOCOMPLETE - in-memory index of the destinations table
+    DESTINATION_REFRESH_SECONDS: int = 30   # Pick up destinations added by other processes
+    DESTINATION_RELOAD_SECONDS: int = 600   # Full reload (recounts stops per destination)
+    
+    # BUDGET FORECAST - spend rates rebuilt from all trips' budget records
+    FORECAST_MODEL_TTL: int = 3600  # Seconds
+    
+    # BUDGET ALERTS - % of budget_limit that trigger an alert when crossed
+    BUDGET_ALERT_THRESHOLDS: List[int] = [50, 80, 100]
+    BUDGET_ALERT_HISTORY: int = 1000  # Recent alerts kept for polling/replay
+    
+    # LIVE TRIP FEED - trip_events outbox fanned out to SSE/WebSocket subscribers
+    TRIP_EVENTS_POLL_SECONDS: float = 1.0  # Picks up writes from other worker processes
+    TRIP_EVENTS_REPLAY_LIMIT: int = 1000   # Missed events replayed on reconnect (more → "reset")
+    TRIP_EVENTS_QUEUE_SIZE: int = 256      # Per subscriber; a slow one re-reads from the table
+    TRIP_EVENTS_RETENTION_HOURS: int = 72
+    
+    # BACKGROUND JOBS - jobs table, run by threads in each app process
+    JOB_WORKERS: int = 2               # Jobs run at once per process (0 = don't run jobs here)
+    JOB_POLL_SECONDS: float = 1.0      # Picks up jobs enqueued by other processes
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_BASE_SECONDS: int = 5    # Doubles per attempt
+    JOB_RETRY_MAX_SECONDS: int = 600
+    JOB_HEARTBEAT_SECONDS: float = 60  # A running job's locked_at is refreshed this often
+    JOB_LOCK_TIMEOUT: int = 600        # No heartbeat for this long = runner died, queue again
+    JOB_RETENTION_HOURS: int = 168     # Finished jobs kept for the admin view
+    
+    # ARCHIVAL - soft-deleted trips moved out of the hot tables
+    ARCHIVE_RETENTION_DAYS: int = 30     # Deleted trips stay restorable in place this long
+    ARCHIVE_BATCH_TRIPS: int = 50        # Trips archived per job run
+    ARCHIVE_CHUNK_ROWS: int = 1000       # Rows read/deleted per transaction
+    ARCHIVE_INTERVAL_SECONDS: int = 3600 # Between archive runs
+    
+    # WARM-UP - loaded on a background thread at startup, reported by GET /api/ready
+    WARMUP_ON_STARTUP: bool = True
+    WARMUP_DB_CONNECTIONS: int = 5   # Pool connections opened ahead of traffic
+    WARMUP_BLOCKING: bool = False    # Finish warming before accepting connections
+    WARMUP_FORECAST_MODEL: bool = True  # Build the forecast model (reads every trip) while warming
+    
+    # PRE-FORK SERVER - python -m app.server (flags override these)
+    SERVER_WORKERS: int = 1              # >1: workers follow each other's commits (see app/server.py)
+    WORKER_SYNC_SECONDS: float = 0.5     # How often; in-memory caches may lag other workers this long
+    SERVER_MAX_REQUESTS: int = 0         # Recycle a worker after this many requests (0 = never)
+    SERVER_MAX_REQUESTS_JITTER: int = 0  # + random 0..jitter, so workers don't recycle together
+    SERVER_DRAIN_SECONDS: int = 30       # In-flight requests get this long on SIGTERM
+    
+    # PROFILER - on-demand stack sampling via POST /api/admin/profile
+    ADMIN_TOKEN: str = ""            # Sent as X-Admin-Token; empty = profiler disabled
+    PROFILER_MAX_SECONDS: int = 60
+    PROFILER_DEFAULT_HZ: int = 100
+    
+    # RESPONSE CACHE
+    CACHE_BACKEND: str = "memory"  # 'memory', 'redis' or 'none'
+    CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    CACHE_MAX_ENTRIES: int = 10000  # Only used by the memory backend
+    CACHE_DEFAULT_TTL: int = 300    # Seconds
+    
+    # FAST JSON - orjson responses built straight from row tuples
+    FAST_JSON: bool = False
+    
+    # IDEMPOTENCY-KEY - replayed responses for retried POSTs
+    IDEMPOTENCY_TTL: int = 86400  # Seconds
+    IDEMPOTENCY_PENDING_TIMEOUT: int = 300  # A claim this old (its worker died) is taken over
+    IDEMPOTENCY_WAIT: float = 5.0  # Seconds a retry waits for the request in flight, then 409
+    
     # CORS - IMPORTANT!
     CORS_ORIGINS: List[str] = [
         "http://localhost:5173",
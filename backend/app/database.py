@@ -3,7 +3,9 @@
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from starlette.requests import HTTPConnection
 from .config import settings
+from .utils.sqlite_tuning import WRITER_OPTION, install_sqlite_tuning
 
 # Create database connection
 # Engine is like a "connection pool" that manages database connections
@@ -12,6 +14,10 @@ engine = create_engine(
     connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
 )
 
+# SQLite: WAL + pragmas on connect, BEGIN IMMEDIATE for write sessions
+if engine.dialect.name == "sqlite" and settings.SQLITE_TUNING:
+    install_sqlite_tuning(engine)
+
 # Session maker - creates new database sessions
 SessionLocal = sessionmaker(
     autocommit=False,  # Don't auto-commit changes
@@ -19,18 +25,44 @@ SessionLocal = sessionmaker(
     bind=engine        # Use the engine we created above
 )
 
+# Connections that will write: on SQLite they take the write lock when
+# their transaction begins (elsewhere the option does nothing).
+# Schema changes at startup use write_engine.begin()
+write_engine = engine.execution_options(**{WRITER_OPTION: True})
+
+# Sessions that will write
+WriteSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=write_engine
+)
+
+# Methods whose requests get a read session
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
 # Base class for all models
 # All database models will inherit from this
 Base = declarative_base()
 
 # Dependency injection function for FastAPI routes
-def get_db():
+def get_db(connection: HTTPConnection):
     """
     Creates a new database session for each request
     Automatically closes when request is done
+    
+    POST/PUT/PATCH/DELETE requests get a write session
     """
-    db = SessionLocal()
+    method = connection.scope.get("method", "GET")
+    db = SessionLocal() if method in READ_METHODS else WriteSessionLocal()
     try:
         yield db  # Give the session to the route
     finally:
-        db.close()  # Always close the session
\ No newline at end of file
+        db.close()  # Always close the session
+
+def get_read_db():
+    """A read session whatever the method (e.g. POST /api/auth/login)"""
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
\ No newline at end of file
@@ -2,8 +2,14 @@
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from .utils.serializers import default_response_class
+from .utils.idempotency import IdempotencyMiddleware, install_idempotency_on_startup
 
-app = FastAPI()
+app = FastAPI(default_response_class=default_response_class())
+
+# Replay retried POSTs (Idempotency-Key header)
+# Added first so CORS stays the outermost middleware
+app.add_middleware(IdempotencyMiddleware)
 
 # ADD CORS BEFORE ANYTHING ELSE
 app.add_middleware(
@@ -14,9 +20,108 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Idempotency-Key responses live in the database (shared by all workers)
+@app.on_event("startup")
+def install_idempotency():
+    install_idempotency_on_startup()
+
+# Track writes to trip subtrees (cache invalidation hooks)
+from .utils import trip_changes
+from .database import write_engine
+
+@app.on_event("startup")
+def install_trip_versions():
+    try:
+        with write_engine.begin() as connection:
+            trip_changes.install_trip_versions(connection)
+    except Exception as e:
+        print(f"⚠️ Trip versions not installed: {str(e)}")
+
+# Trip event outbox (live trip feeds), written with every trip subtree write
+from .utils import trip_events
+from .services.trip_event_service import install_trip_events_on_startup
+
+@app.on_event("startup")
+def install_trip_events():
+    install_trip_events_on_startup()
+
+# Running spend totals + budget threshold alerts
+from .utils.budget_watch import install_budget_alerts_on_startup, install_spend_totals
+
+@app.on_event("startup")
+def install_budget_totals():
+    try:
+        with write_engine.begin() as connection:
+            install_spend_totals(connection)
+    except Exception as e:
+        print(f"⚠️ Budget running totals not installed: {str(e)}")
+
+@app.on_event("startup")
+def install_budget_alerts():
+    install_budget_alerts_on_startup()
+
+# Background jobs (enqueued by request handlers, run on threads here)
+# The runner starts after every hook that changes the schema, so its
+# threads never hold the database while a table is being altered
+from .utils.jobs import job_runner, install_jobs_on_startup, start_job_runner_on_startup
+
+@app.on_event("startup")
+def install_jobs():
+    install_jobs_on_startup()
+
+@app.on_event("shutdown")
+def stop_job_runner():
+    job_runner.stop()
+
+# Soft-deleted trips move to the archive after the retention window
+from .services.archive_service import schedule_archival_on_startup
+
+@app.on_event("startup")
+def schedule_archival():
+    schedule_archival_on_startup()
+
+# Full-text search index (created with the tables, or on startup)
+from .services.search_service import install_search_index_on_startup
+
+@app.on_event("startup")
+def install_search_index():
+    install_search_index_on_startup()
+
+# Destination dictionary (canonical cities) + autocomplete index
+from .services.destination_service import load_destinations_on_startup
+
+@app.on_event("startup")
+def load_destinations():
+    load_destinations_on_startup()
+
+# Schema is up to date: start running jobs
+@app.on_event("startup")
+def start_job_runner():
+    start_job_runner_on_startup()
+
+# Several worker processes: follow each other's commits (caches, budget alerts)
+from .services.worker_sync_service import worker_sync, start_worker_sync_on_startup
+
+@app.on_event("startup")
+def start_worker_sync():
+    start_worker_sync_on_startup()
+
+@app.on_event("shutdown")
+def stop_worker_sync():
+    worker_sync.stop()
+
+# Warm-up (bcrypt, jose, numpy, pool connections) after the other
+# startup work, on a background thread; GET /api/ready reports it
+from .utils.warmup import start_warmup_on_startup
+
+@app.on_event("startup")
+def start_warmup():
+    start_warmup_on_startup()
+
 # Then include routers...
-from .routes import trips, stops, activities, parking, budget, sharing, admin, auth
+from .routes import health, trips, stops, activities, parking, budget, sharing, admin, auth, batch, search, destinations, trip_events as trip_event_routes
 
+app.include_router(health.router)
 app.include_router(auth.router)
 app.include_router(trips.router)
 app.include_router(stops.router)
@@ -24,4 +129,8 @@ app.include_router(activities.router)
 app.include_router(parking.router)
 app.include_router(budget.router)
 app.include_router(sharing.router)
-app.include_router(admin.router)
\ No newline at end of file
+app.include_router(admin.router)
+app.include_router(batch.router)
+app.include_router(search.router)
+app.include_router(destinations.router)
+app.include_router(trip_event_routes.router)
\ No newline at end of file
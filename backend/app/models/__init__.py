@@ -9,6 +9,12 @@ from .stop import Stop
 from .activity import Activity
 from .parking import ParkingSlot, ParkingBooking
 from .budget import BudgetRecord
+from .destination import Destination
+from .trip_event import TripEvent
+from .job import Job
+from .archived_trip import ArchivedTrip
+from .idempotency_key import IdempotencyKey
+from .budget_alert import BudgetAlertEvent
 
 __all__ = [
     "User",
@@ -18,4 +24,10 @@ __all__ = [
     "ParkingSlot",
     "ParkingBooking",
     "BudgetRecord",
+    "Destination",
+    "TripEvent",
+    "Job",
+    "ArchivedTrip",
+    "IdempotencyKey",
+    "BudgetAlertEvent",
 ]
\ No newline at end of file
@@ -34,7 +34,7 @@ class Activity(Base):
     id = Column(Integer, primary_key=True)
     
     # FOREIGN KEY - Links to Stop
-    stop_id = Column(Integer, ForeignKey("stops.id", ondelete="CASCADE"), nullable=False)
+    stop_id = Column(Integer, ForeignKey("stops.id", ondelete="CASCADE"), nullable=False, index=True)
     
     # REQUIRED FIELDS
     name = Column(String(255), nullable=False)
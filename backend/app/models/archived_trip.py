@@ -0,0 +1,50 @@
+# backend/app/models/archived_trip.py
+
+from sqlalchemy import Column, Integer, String, DateTime, LargeBinary, JSON
+from datetime import datetime
+from ..database import Base
+
+class ArchivedTrip(Base):
+    """
+    ArchivedTrip model - cold copy of a soft-deleted trip's subtree
+    
+    Once a deleted trip is past ARCHIVE_RETENTION_DAYS, the trip and its
+    stops, activities, parking slots, budget records, bookings and share
+    links are written here as gzipped NDJSON and removed from the hot
+    tables (services/archive_service.py). Restoring puts them back.
+    
+    Fields:
+    - id: Unique archive identifier
+    - trip_id / user_id / name: The trip as it was (for listing and restore)
+    - status: purging (rows still being deleted) or purged
+    - row_counts: Rows per record type, e.g. {"stop": 4, "activity": 31}
+    - raw_bytes: NDJSON size before compression
+    - data: gzip(NDJSON), one {"type": ..., "data": {...}} line per row
+    """
+    
+    __tablename__ = "archived_trips"
+    
+    # PRIMARY KEY
+    id = Column(Integer, primary_key=True)
+    
+    # THE TRIP (no foreign keys - the rows are gone)
+    trip_id = Column(Integer, nullable=False, index=True)
+    user_id = Column(Integer, nullable=False, index=True)
+    name = Column(String(255), nullable=False)
+    
+    # STATE
+    status = Column(String(20), nullable=False, default="purging")
+    # Values: 'purging', 'purged'
+    
+    # CONTENTS
+    row_counts = Column(JSON, nullable=False)
+    raw_bytes = Column(Integer, nullable=False)
+    data = Column(LargeBinary, nullable=False)
+    
+    # TIMESTAMPS
+    deleted_at = Column(DateTime, nullable=True)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+    purged_at = Column(DateTime, nullable=True)
+    
+    def __repr__(self):
+        return f"<ArchivedTrip(trip_id={self.trip_id}, status={self.status})>"
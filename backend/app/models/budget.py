@@ -31,7 +31,7 @@ class BudgetRecord(Base):
     id = Column(Integer, primary_key=True)
     
     # FOREIGN KEY - Which trip?
-    trip_id = Column(Integer, ForeignKey("trips.id", ondelete="CASCADE"), nullable=False)
+    trip_id = Column(Integer, ForeignKey("trips.id", ondelete="CASCADE"), nullable=False, index=True)
     
     # REQUIRED FIELDS
     category = Column(String(50), nullable=False)
@@ -0,0 +1,43 @@
+# backend/app/models/budget_alert.py
+
+from sqlalchemy import Column, Integer, String, Float, DateTime
+from datetime import datetime
+from ..database import Base
+
+class BudgetAlertEvent(Base):
+    """
+    BudgetAlertEvent model - a budget threshold crossed by a trip
+    
+    Inserted in the same transaction as the write that crossed it, so
+    every worker process can pick up alerts committed by the others
+    (GET /api/budget/alerts and its stream).
+    
+    Fields:
+    - id: Alert id (increasing; clients pass it back as ?since= / Last-Event-ID)
+    - trip_id, user_id: Whose trip (not foreign keys - alerts outlive deleted trips)
+    - threshold: % of budget_limit crossed (BUDGET_ALERT_THRESHOLDS)
+    - direction: up or down
+    - spent, budget_limit, percent: The trip's spend right after the write
+    """
+    
+    __tablename__ = "budget_alerts"
+    
+    # PRIMARY KEY
+    id = Column(Integer, primary_key=True)
+    
+    # WHOSE TRIP?
+    trip_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, nullable=True)
+    
+    # WHAT WAS CROSSED
+    threshold = Column(Integer, nullable=False)
+    direction = Column(String(4), nullable=False)
+    spent = Column(Float, nullable=False)
+    budget_limit = Column(Float, nullable=False)
+    percent = Column(Float, nullable=False)
+    
+    # TIMESTAMP
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<BudgetAlertEvent(id={self.id}, trip_id={self.trip_id}, {self.direction} {self.threshold}%)>"
@@ -0,0 +1,38 @@
+# backend/app/models/destination.py
+
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+from ..database import Base
+
+class Destination(Base):
+    """
+    Destination model - one canonical city, shared by every stop there
+    
+    Stops keep the city/country the user typed; destination_id points
+    them at the canonical entry, so "Paris, France", "paris , FRANCE"
+    and "Páris, France" all count as the same destination.
+    
+    Fields:
+    - id: Unique destination identifier
+    - key: Normalised "city|country" (e.g., "paris|france")
+    - city_name: Display name (e.g., "Paris")
+    - country: Display country (e.g., "France")
+    """
+    
+    __tablename__ = "destinations"
+    
+    # PRIMARY KEY
+    id = Column(Integer, primary_key=True)
+    
+    # NORMALISED NAME - one row per key
+    key = Column(String(255), nullable=False, unique=True, index=True)
+    
+    # DISPLAY NAMES (most common spelling when seeded from stops)
+    city_name = Column(String(100), nullable=False)
+    country = Column(String(100), nullable=False)
+    
+    # TIMESTAMP
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<Destination(id={self.id}, key={self.key})>"
@@ -0,0 +1,58 @@
+# backend/app/models/idempotency_key.py
+
+from sqlalchemy import Column, Integer, String, DateTime, JSON, LargeBinary, UniqueConstraint
+from datetime import datetime
+from ..database import Base
+
+class IdempotencyKey(Base):
+    """
+    IdempotencyKey model - responses kept for retried POSTs
+
+    One row per (principal, Idempotency-Key). Inserting it is the claim:
+    the unique constraint lets exactly one request run per key, whichever
+    worker process the retries land on (utils/idempotency.py).
+
+    Example Keys:
+    1. user:4 / 6f1c... pending (first request still running)
+    2. user:4 / 9a2e... done, 200, {"id": 7, ...}
+
+    Fields:
+    - id: Row id
+    - principal: Who sent it (user:<id> or anonymous)
+    - key: The Idempotency-Key header
+    - status: pending (in flight) or done (response stored)
+    - fingerprint: Method, path, query and body of the original request
+    - response_status / response_headers / response_body: What to replay
+    - created_at: When the key was claimed (stale pending claims are taken over)
+    - expires_at: Replays stop after this (IDEMPOTENCY_TTL)
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    # PRIMARY KEY
+    id = Column(Integer, primary_key=True)
+
+    # WHOSE KEY?
+    principal = Column(String(50), nullable=False)
+    key = Column(String(255), nullable=False)
+
+    # STATE
+    status = Column(String(10), nullable=False, default="pending")
+    # Values: 'pending', 'done'
+    fingerprint = Column(String(64), nullable=True)
+
+    # STORED RESPONSE
+    response_status = Column(Integer, nullable=True)
+    response_headers = Column(JSON, nullable=True)
+    response_body = Column(LargeBinary, nullable=True)
+
+    # TIMESTAMPS
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+    __table_args__ = (
+        UniqueConstraint("principal", "key", name="uq_idempotency_keys_principal_key"),
+    )
+
+    def __repr__(self):
+        return f"<IdempotencyKey(principal={self.principal}, key={self.key}, status={self.status})>"
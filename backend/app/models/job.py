@@ -0,0 +1,64 @@
+# backend/app/models/job.py
+
+from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, Index
+from datetime import datetime
+from ..database import Base
+
+class Job(Base):
+    """
+    Job model - background work queued by request handlers
+    
+    Enqueued in the same transaction as the write that needs it,
+    then claimed and run by the in-process job runner (utils/jobs.py).
+    
+    Example Jobs:
+    1. link_destinations - link imported stops to canonical destinations
+    2. recompute_spend_totals - repair trips' running spend totals
+    
+    Fields:
+    - id: Unique job identifier
+    - kind: Which handler runs it
+    - payload: Handler arguments (JSON)
+    - dedupe_key: At most one queued job per key
+    - status: queued, running, done or failed
+    - attempts / max_attempts: Retries with backoff until max_attempts
+    - run_at: Not claimed before this time (backoff, delayed jobs)
+    - locked_by / locked_at: Runner that claimed it, and when
+    - last_error: Error from the latest failed attempt
+    """
+    
+    __tablename__ = "jobs"
+    
+    # PRIMARY KEY
+    id = Column(Integer, primary_key=True)
+    
+    # WHAT TO RUN
+    kind = Column(String(50), nullable=False)
+    payload = Column(JSON, nullable=True)
+    dedupe_key = Column(String(255), nullable=True, index=True)
+    
+    # STATE
+    status = Column(String(20), nullable=False, default="queued")
+    # Values: 'queued', 'running', 'done', 'failed'
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    run_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    
+    # CLAIM
+    locked_by = Column(String(100), nullable=True)
+    locked_at = Column(DateTime, nullable=True)
+    
+    # RESULT
+    last_error = Column(Text, nullable=True)
+    
+    # TIMESTAMPS
+    created_at = Column(DateTime, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+    
+    # The runner's claim query: next due job by status and time
+    __table_args__ = (
+        Index("ix_jobs_status_run_at", "status", "run_at"),
+    )
+    
+    def __repr__(self):
+        return f"<Job(id={self.id}, kind={self.kind}, status={self.status})>"
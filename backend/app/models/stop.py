@@ -25,6 +25,7 @@ class Stop(Base):
     - sequence_order: Order in trip (1st stop, 2nd stop, etc.)
     - cost_index: How expensive is this city? (1-10 scale)
     - description: Notes about this stop
+    - destination_id: Canonical destination for city_name/country
     """
     
     __tablename__ = "stops"
@@ -33,7 +34,7 @@ class Stop(Base):
     id = Column(Integer, primary_key=True)
     
     # FOREIGN KEY - Links to Trip
-    trip_id = Column(Integer, ForeignKey("trips.id", ondelete="CASCADE"), nullable=False)
+    trip_id = Column(Integer, ForeignKey("trips.id", ondelete="CASCADE"), nullable=False, index=True)
     
     # REQUIRED FIELDS
     city_name = Column(String(100), nullable=False)
@@ -46,6 +47,12 @@ class Stop(Base):
     cost_index = Column(Numeric(5, 2), nullable=True)  # 1.00 to 99.99
     description = Column(Text, nullable=True)
     
+    # CANONICAL DESTINATION - set from city_name/country when the stop is saved
+    # (see services/destination_service.py)
+    destination_id = Column(
+        Integer, ForeignKey("destinations.id", ondelete="SET NULL"), nullable=True, index=True
+    )
+    
     # TIMESTAMP
     created_at = Column(DateTime, default=datetime.utcnow)
     
@@ -62,5 +69,8 @@ class Stop(Base):
     # Reference back to Trip
     trip = relationship("Trip", back_populates="stops")
     
+    # Canonical destination
+    destination = relationship("Destination")
+    
     def __repr__(self):
         return f"<Stop(id={self.id}, city={self.city_name})>"
\ No newline at end of file
@@ -27,6 +27,9 @@ class Trip(Base):
     - created_at: When trip was created
     - updated_at: Last modification time
     - is_deleted: Soft delete flag
+    - deleted_at: When it was soft deleted (archived after ARCHIVE_RETENTION_DAYS)
+    - version: Change counter for the trip and its subtree
+    - spent_total: Running total of budget records, parking and activity costs
     """
     
     __tablename__ = "trips"
@@ -55,6 +58,15 @@ class Trip(Base):
     
     # SOFT DELETE
     is_deleted = Column(Boolean, default=False)
+    deleted_at = Column(DateTime, nullable=True)
+    
+    # VERSION - bumped on every write to this trip or anything under it
+    # (stops, activities, budget records, bookings). Used for ETags.
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    
+    # SPENT SO FAR - budget records + parking bookings + activity costs,
+    # kept up to date on every write (see utils/budget_watch.py)
+    spent_total = Column(Numeric(12, 2), nullable=False, default=0, server_default="0")
     
     # ============================================
     # RELATIONSHIPS (How models connect)
@@ -0,0 +1,48 @@
+# backend/app/models/trip_event.py
+
+from sqlalchemy import Column, Integer, String, DateTime, JSON
+from datetime import datetime
+from ..database import Base
+
+class TripEvent(Base):
+    """
+    TripEvent model - outbox of changes to a trip's subtree
+    
+    One row per trip/stop/activity/budget record/parking booking written,
+    inserted in the same transaction as the write itself. Live feeds
+    read them in id order, so a client that reconnects with the last id
+    it saw gets exactly what it missed.
+    
+    Example Events for "Europe Trip":
+    1. stop 12 created
+    2. activity 40 updated (cost, start_time)
+    3. budget_record 7 deleted
+    
+    Fields:
+    - id: Event id (increasing; the resume point for clients)
+    - trip_id: Which trip? (not a foreign key - events outlive deleted rows)
+    - entity: What was written (trip, stop, activity, budget_record, parking_booking)
+    - entity_id: Its id
+    - action: created, updated or deleted
+    - fields: Columns changed (updates only)
+    """
+    
+    __tablename__ = "trip_events"
+    
+    # PRIMARY KEY
+    id = Column(Integer, primary_key=True)
+    
+    # WHICH TRIP?
+    trip_id = Column(Integer, nullable=False, index=True)
+    
+    # WHAT CHANGED
+    entity = Column(String(30), nullable=False)
+    entity_id = Column(Integer, nullable=True)
+    action = Column(String(10), nullable=False)
+    fields = Column(JSON, nullable=True)
+    
+    # TIMESTAMP (retention purge)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    
+    def __repr__(self):
+        return f"<TripEvent(id={self.id}, trip_id={self.trip_id}, {self.entity} {self.action})>"
@@ -19,6 +19,7 @@ class User(Base):
     - created_at: When user account was created
     - updated_at: When user info was last updated
     - is_deleted: Soft delete flag (mark as deleted, don't actually delete)
+    - trips_version: Bumped whenever one of the user's trips is written (trip list ETag)
     """
     
     __tablename__ = "users"  # Database table name
@@ -43,6 +44,9 @@ class User(Base):
     # SOFT DELETE
     is_deleted = Column(Boolean, default=False)
     
+    # TRIP LIST VERSION - bumped with the version of any of the user's trips
+    trips_version = Column(Integer, nullable=False, default=1, server_default="1")
+    
     def __repr__(self):
         """String representation for debugging"""
         return f"<User(id={self.id}, email={self.email})>"
\ No newline at end of file
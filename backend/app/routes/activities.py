@@ -1,23 +1,73 @@
 # backend/app/routes/activities.py
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Header, Response
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
+from pydantic import ValidationError
+from typing import Optional
+from ..cache import cache, trip_tag
 from ..database import get_db
 from ..models.activity import Activity
 from ..models.stop import Stop
-from ..schemas.activity import ActivityCreate, ActivityResponse
+from ..schemas.activity import (
+    ActivityCreate,
+    ActivityResponse,
+    ActivityBulkCreate,
+    ActivityBulkResponse,
+    ActivityBulkError
+)
+from ..services.trip_service import TripService
+from ..services.schedule_service import ScheduleService, PendingSchedules, mark_stops_changed
+from ..utils.etag import weak_etag, etag_matches, not_modified
+from ..utils.serializers import RowSerializer, list_response
+from ..utils.trip_changes import mark_trips_changed
+from ..utils.budget_watch import record_spend
+from ..utils.trip_events import record_trip_events, trip_event
 
 router = APIRouter(
     prefix="/api/activities",
     tags=["activities"]
 )
 
+activity_rows = RowSerializer(Activity, ActivityResponse)
+
+def check_schedule_conflicts(db: Session, activity: ActivityCreate, activity_id: Optional[int] = None):
+    """
+    Reject an activity that overlaps another one at the same stop
+    
+    Raises 409 with the overlapping activities
+    """
+    conflicts = ScheduleService.find_conflicts(
+        db,
+        activity.stop_id,
+        activity.date_scheduled,
+        activity.time_start,
+        activity.duration_hours,
+        name=activity.name,
+        activity_id=activity_id
+    )
+    
+    if conflicts:
+        print(f"❌ Schedule conflict for {activity.name}: {len(conflicts)} overlapping activities")
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "message": "Activity overlaps other activities at this stop. "
+                           "Send allow_conflicts=true to save it anyway.",
+                "conflicts": [conflict.model_dump(mode="json") for conflict in conflicts]
+            }
+        )
+
 # ============================================
 # CREATE ACTIVITY (POST /api/activities)
 # ============================================
 @router.post("/", response_model=ActivityResponse)
-def create_activity(activity: ActivityCreate, db: Session = Depends(get_db)):
+def create_activity(
+    activity: ActivityCreate,
+    allow_conflicts: bool = False,
+    db: Session = Depends(get_db)
+):
     """
     Create new activity for a stop
     
@@ -30,6 +80,9 @@ def create_activity(activity: ActivityCreate, db: Session = Depends(get_db)):
         "duration_hours": 2.0,
         "date_scheduled": "2024-06-01"
     }
+    
+    Returns 409 if it overlaps another activity at the stop
+    (unless ?allow_conflicts=true)
     """
     try:
         # Debug logging
@@ -53,6 +106,9 @@ def create_activity(activity: ActivityCreate, db: Session = Depends(get_db)):
         
         print(f"✅ Stop found: {stop.city_name}")
         
+        if not allow_conflicts:
+            check_schedule_conflicts(db, activity)
+        
         # Create activity
         db_activity = Activity(
             stop_id=activity.stop_id,
@@ -95,28 +151,179 @@ def create_activity(activity: ActivityCreate, db: Session = Depends(get_db)):
             detail=f"An error occurred: {str(e)}"
         )
 
+# ============================================
+# BULK IMPORT (POST /api/activities/bulk)
+# ============================================
+@router.post("/bulk", response_model=ActivityBulkResponse)
+def bulk_create_activities(
+    payload: ActivityBulkCreate,
+    allow_conflicts: bool = False,
+    db: Session = Depends(get_db)
+):
+    """
+    Create hundreds of activities in one request
+    
+    Frontend sends: POST /api/activities/bulk
+    {
+        "stop_id": 1,
+        "activities": [
+            {"name": "Louvre", "date_scheduled": "2024-06-02", "cost": 15.0},
+            {"stop_id": 2, "name": "Colosseum", "date_scheduled": "2024-06-07"}
+        ]
+    }
+    
+    - All referenced stops are checked with one IN query
+    - Valid rows go in with one multi-row INSERT ... RETURNING id
+    - One commit
+    - Invalid rows are skipped and listed in "errors", including rows
+      that overlap another activity at their stop (saved, or earlier in
+      the import) unless ?allow_conflicts=true
+    """
+    errors = []
+    valid = []  # (index, ActivityCreate)
+    
+    # Validate each item on its own
+    for index, item in enumerate(payload.activities):
+        data = dict(item)
+        if data.get("stop_id") is None:
+            data["stop_id"] = payload.stop_id
+        
+        try:
+            valid.append((index, ActivityCreate.model_validate(data)))
+        except ValidationError as e:
+            message = "; ".join(
+                f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}"
+                for err in e.errors()
+            )
+            errors.append(ActivityBulkError(index=index, error=message))
+    
+    # Check every stop with one query
+    stop_ids = {activity.stop_id for _, activity in valid}
+    stop_query = db.query(Stop.id, Stop.trip_id).filter(Stop.id.in_(stop_ids))
+    if payload.trip_id is not None:
+        stop_query = stop_query.filter(Stop.trip_id == payload.trip_id)
+    stop_trips = dict(stop_query.all()) if stop_ids else {}
+    
+    schedules = None if allow_conflicts else PendingSchedules(db)
+    
+    rows = []
+    for index, activity in valid:
+        if activity.stop_id not in stop_trips:
+            where = f" in trip {payload.trip_id}" if payload.trip_id is not None else ""
+            errors.append(ActivityBulkError(
+                index=index, error=f"Stop {activity.stop_id} not found{where}"
+            ))
+            continue
+        
+        if schedules is not None:
+            conflict = schedules.add(
+                activity.stop_id, activity.date_scheduled, activity.time_start,
+                activity.duration_hours, activity.name
+            )
+            if conflict:
+                errors.append(ActivityBulkError(index=index, error=conflict))
+                continue
+        
+        rows.append(activity.model_dump())
+    
+    ids = []
+    if rows:
+        try:
+            result = db.execute(
+                insert(Activity).returning(Activity.id, sort_by_parameter_order=True),
+                rows
+            )
+            ids = [row[0] for row in result]
+            
+            # Core insert skips the ORM flush hooks
+            mark_trips_changed(db, {stop_trips[row["stop_id"]] for row in rows})
+            mark_stops_changed(db, {row["stop_id"]: stop_trips[row["stop_id"]] for row in rows})
+            record_trip_events(db, (
+                trip_event(stop_trips[row["stop_id"]], "activity", activity_id, "created")
+                for activity_id, row in zip(ids, rows)
+            ))
+            
+            spend = {}
+            for row in rows:
+                if row.get("cost"):
+                    trip_id = stop_trips[row["stop_id"]]
+                    spend[trip_id] = spend.get(trip_id, 0.0) + float(row["cost"])
+            record_spend(db, spend)
+            db.commit()
+            
+        except SQLAlchemyError as e:
+            print(f"❌ Bulk import database error: {str(e)}")
+            db.rollback()
+            raise HTTPException(
+                status_code=500,
+                detail=f"Database error: {str(e)}"
+            )
+    
+    errors.sort(key=lambda error: error.index)
+    
+    print(f"✅ Bulk import: {len(ids)} activities created, {len(errors)} skipped")
+    
+    return ActivityBulkResponse(created=len(ids), ids=ids, errors=errors)
+
 # ============================================
 # LIST ACTIVITIES FOR A STOP (GET /api/activities?stop_id=1)
 # ============================================
 @router.get("/", response_model=list[ActivityResponse])
-def list_activities(stop_id: int = None, db: Session = Depends(get_db)):
+def list_activities(
+    response: Response,
+    stop_id: int = None,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db),
+    if_none_match: Optional[str] = Header(None)
+):
     """
     Get all activities for a stop
     
     Frontend calls: GET /api/activities?stop_id=1
     Backend returns: List of activities at that stop
+    (304 if If-None-Match still matches the trip version)
+    
+    Optional ?fields=id,name,cost returns only those columns
+    (skips Text descriptions / image URLs in the query)
     """
+    columns = activity_rows.parse_fields(fields)
+    trip_version = TripService.get_stop_trip_version(db, stop_id) if stop_id else None
+    
+    if trip_version is not None:
+        etag = weak_etag("activities", stop_id, *trip_version, fields=columns)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "private, no-cache"
+    
     try:
-        if stop_id:
-            activities = db.query(Activity).filter(
-                Activity.stop_id == stop_id
-            ).order_by(Activity.date_scheduled, Activity.time_start).all()
+        if trip_version is not None:
+            def load():
+                return activity_rows.fetch(
+                    db, Activity.stop_id == stop_id,
+                    order_by=[Activity.date_scheduled, Activity.time_start],
+                    fields=columns
+                )
+            
+            activities = cache.get_or_load(
+                activity_rows.cache_key(f"activities:{stop_id}", columns), load,
+                tags=[trip_tag(trip_version[0])],
+                session=db
+            )
+        elif stop_id:
+            # Unknown stop
+            activities = []
         else:
-            activities = db.query(Activity).order_by(
-                Activity.date_scheduled, Activity.time_start
-            ).all()
+            activities = activity_rows.fetch(
+                db, order_by=[Activity.date_scheduled, Activity.time_start],
+                fields=columns
+            )
+        
+        return list_response(activities, response, partial=bool(columns))
         
-        return activities
+    except HTTPException:
+        raise
         
     except Exception as e:
         print(f"❌ Error listing activities: {str(e)}")
@@ -132,15 +339,28 @@ def list_activities(stop_id: int = None, db: Session = Depends(get_db)):
 def update_activity(
     activity_id: int, 
     activity_data: ActivityCreate, 
+    allow_conflicts: bool = False,
     db: Session = Depends(get_db)
 ):
-    """Update an existing activity"""
+    """
+    Update an existing activity
+    
+    Returns 409 if the new time overlaps another activity at the stop
+    (unless ?allow_conflicts=true)
+    """
     try:
         activity = db.query(Activity).filter(Activity.id == activity_id).first()
         
         if not activity:
             raise HTTPException(status_code=404, detail="Activity not found")
         
+        if not allow_conflicts:
+            check_schedule_conflicts(
+                db,
+                activity_data.model_copy(update={"stop_id": activity.stop_id}),
+                activity_id=activity_id
+            )
+        
         # Update fields
         activity.name = activity_data.name
         activity.category = activity_data.category
@@ -1,19 +1,55 @@
 # backend/app/routes/admin.py
 
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+import secrets
+from datetime import datetime
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from ..database import get_db
+from sqlalchemy import func, cast, Float
+from typing import Literal, Optional
+from ..cache import cache
+from ..config import settings
+from ..database import engine, get_db
 from ..models.user import User
 from ..models.trip import Trip
 from ..models.stop import Stop
 from ..models.activity import Activity
+from ..models.job import Job
+from ..schemas.job import JobCreate, JobResponse, JobsOverview
+from ..schemas.archive import ArchivedTripResponse, TripRestoreResponse
+from ..services.archive_service import ArchiveService, schedule_archive_run
+from ..services.export_service import export_response
+from ..services.destination_service import DestinationService
+from ..utils.jobs import enqueue_job, job_kinds, job_runner
+from ..utils.profiler import StackSampler, finish_profile, route_codes, try_start_profile
+from ..utils import worker_metrics
+from ..utils.sqlite_tuning import database_status
 
 router = APIRouter(
     prefix="/api/admin",
     tags=["admin"]
 )
 
+# Seconds to keep platform stats cached
+ADMIN_STATS_TTL = 60
+
+# ============================================
+# ADMIN TOKEN (X-Admin-Token header)
+# ============================================
+def require_admin_token(x_admin_token: Optional[str] = Header(None)):
+    """
+    Guard for admin endpoints that affect the running process
+    or read everyone's data
+    
+    Disabled (403) until ADMIN_TOKEN is set
+    """
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="ADMIN_TOKEN is not configured")
+    
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, settings.ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
 # ============================================
 # ADMIN STATS (GET /api/admin/stats)
 # ============================================
@@ -31,7 +67,19 @@ def get_admin_stats(db: Session = Depends(get_db)):
         "avg_trip_duration": 7.5,
         "avg_budget": 3500.0
     }
+    
+    Cached for ADMIN_STATS_TTL seconds (platform-wide totals
+    don't need to be exact to the second)
     """
+    return cache.get_or_load(
+        "admin:stats",
+        lambda: _calculate_admin_stats(db),
+        ttl=ADMIN_STATS_TTL,
+        session=db
+    )
+
+def _calculate_admin_stats(db: Session) -> dict:
+    """Run the platform-wide count/average queries"""
     # Count users
     total_users = db.query(func.count(User.id)).filter(
         User.is_deleted == False
@@ -51,9 +99,9 @@ def get_admin_stats(db: Session = Depends(get_db)):
     # Average trip duration
     avg_duration_result = db.query(
         func.avg(
-            func.cast(
+            cast(
                 func.julianday(Trip.end_date) - func.julianday(Trip.start_date),
-                type_=float
+                Float
             )
         )
     ).filter(Trip.is_deleted == False).scalar()
@@ -76,6 +124,23 @@ def get_admin_stats(db: Session = Depends(get_db)):
         "avg_budget": round(avg_budget, 2)
     }
 
+# ============================================
+# EXPORT EVERYTHING (GET /api/admin/export?format=ndjson)
+# ============================================
+@router.get("/export", dependencies=[Depends(require_admin_token)])
+def export_all(format: Literal["ndjson", "csv", "ics"] = "ndjson"):
+    """
+    Stream every trip (with stops, activities and budget records)
+    
+    Rows are read in batches and sent as they are encoded,
+    so the download starts at once and memory stays flat
+    however many rows there are. Every table is read in one
+    transaction, so the export is a consistent snapshot.
+    
+    Needs the X-Admin-Token header (it's everyone's data)
+    """
+    return export_response(format, "globetrotter-export")
+
 # ============================================
 # POPULAR DESTINATIONS (GET /api/admin/popular-destinations)
 # ============================================
@@ -86,22 +151,15 @@ def get_popular_destinations(db: Session = Depends(get_db)):
     
     Backend returns:
     [
-        {"city": "Paris", "count": 45},
-        {"city": "Rome", "count": 38},
-        {"city": "Barcelona", "count": 35}
+        {"destination_id": 1, "city": "Paris", "country": "France", "count": 45},
+        {"destination_id": 2, "city": "Rome", "country": "Italy", "count": 38},
+        {"destination_id": 3, "city": "Barcelona", "country": "Spain", "count": 35}
     ]
-    """
-    destinations = db.query(
-        Stop.city_name,
-        func.count(Stop.id).label("count")
-    ).group_by(Stop.city_name).order_by(
-        func.count(Stop.id).desc()
-    ).limit(10).all()
     
-    return [
-        {"city": dest[0], "count": dest[1]}
-        for dest in destinations
-    ]
+    Stops are grouped by canonical destination, so "Paris",
+    "paris " and "PARIS" count as one city
+    """
+    return DestinationService.popular_destinations(db)
 
 # ============================================
 # TOP USERS (GET /api/admin/top-users)
@@ -156,4 +214,241 @@ def get_activity_analytics(db: Session = Depends(get_db)):
     return [
         {"category": act[0], "count": act[1]}
         for act in activities
-    ]
\ No newline at end of file
+    ]
+
+# ============================================
+# BACKGROUND JOBS (GET /api/admin/jobs)
+# ============================================
+@router.get("/jobs", response_model=JobsOverview)
+def get_jobs(
+    status: Optional[Literal["queued", "running", "done", "failed"]] = None,
+    kind: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db)
+):
+    """
+    Job counts by status, this process's runner, and the latest jobs
+    
+    Filter with ?status=failed and/or ?kind=link_destinations
+    """
+    counts = dict(db.query(Job.status, func.count(Job.id)).group_by(Job.status).all())
+    
+    query = db.query(Job)
+    if status:
+        query = query.filter(Job.status == status)
+    if kind:
+        query = query.filter(Job.kind == kind)
+    
+    return {
+        "counts": {name: counts.get(name, 0) for name in ("queued", "running", "done", "failed")},
+        "runner": {"name": job_runner.name, "workers": job_runner.workers, **job_runner.stats},
+        "kinds": job_kinds(),
+        "jobs": query.order_by(Job.id.desc()).limit(limit).all()
+    }
+
+# ============================================
+# QUEUE A JOB (POST /api/admin/jobs)
+# ============================================
+@router.post("/jobs", response_model=JobResponse, dependencies=[Depends(require_admin_token)])
+def create_job(job: JobCreate, db: Session = Depends(get_db)):
+    """
+    Queue a job by hand, e.g. repair running spend totals:
+    {"kind": "recompute_spend_totals", "payload": {"trip_ids": [12]}}
+    """
+    if job.kind not in job_kinds():
+        raise HTTPException(status_code=400, detail=f"Unknown job kind: {job.kind}")
+    
+    job_id = enqueue_job(db, job.kind, job.payload)
+    db.commit()
+    
+    return db.query(Job).filter(Job.id == job_id).first()
+
+# ============================================
+# RETRY A FAILED JOB (POST /api/admin/jobs/{job_id}/retry)
+# ============================================
+@router.post("/jobs/{job_id}/retry", response_model=JobResponse, dependencies=[Depends(require_admin_token)])
+def retry_job(job_id: int, db: Session = Depends(get_db)):
+    """Queue a failed job again, with a fresh set of attempts"""
+    job = db.query(Job).filter(Job.id == job_id).first()
+    
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    if job.status != "failed":
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}, not failed")
+    
+    job.status = "queued"
+    job.attempts = 0
+    job.run_at = datetime.utcnow()
+    job.finished_at = None
+    db.commit()
+    db.refresh(job)
+    job_runner.notify()
+    
+    return job
+
+# ============================================
+# TRIP ARCHIVE (GET /api/admin/archive)
+# ============================================
+@router.get("/archive")
+def get_archive_status(db: Session = Depends(get_db)):
+    """
+    Soft-deleted trips waiting out the retention window, trips due for
+    archiving, and what the archive holds (raw vs gzipped bytes)
+    """
+    return ArchiveService.status(db)
+
+# ============================================
+# ARCHIVED TRIPS (GET /api/admin/archive/trips)
+# ============================================
+@router.get("/archive/trips", response_model=list[ArchivedTripResponse])
+def get_archived_trips(
+    user_id: Optional[int] = None,
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db)
+):
+    """Latest archived trips, optionally for one user"""
+    archives = ArchiveService.list_archived(db, user_id, limit)
+    
+    return [
+        {
+            "id": archive.id,
+            "trip_id": archive.trip_id,
+            "user_id": archive.user_id,
+            "name": archive.name,
+            "status": archive.status,
+            "row_counts": archive.row_counts or {},
+            "raw_bytes": archive.raw_bytes,
+            "stored_bytes": len(archive.data or b""),
+            "deleted_at": archive.deleted_at,
+            "archived_at": archive.archived_at,
+            "purged_at": archive.purged_at
+        }
+        for archive in archives
+    ]
+
+# ============================================
+# RUN ARCHIVAL NOW (POST /api/admin/archive/run)
+# ============================================
+@router.post("/archive/run", dependencies=[Depends(require_admin_token)])
+def run_archive(db: Session = Depends(get_db)):
+    """Queue an archive run now instead of at the next interval"""
+    schedule_archive_run(db)
+    db.commit()
+    job_runner.notify()
+    
+    return {"message": "Archive run queued"}
+
+# ============================================
+# RESTORE ANY TRIP (POST /api/admin/archive/trips/{trip_id}/restore)
+# ============================================
+@router.post("/archive/trips/{trip_id}/restore", response_model=TripRestoreResponse, dependencies=[Depends(require_admin_token)])
+def restore_archived_trip(trip_id: int, db: Session = Depends(get_db)):
+    """Undelete a trip, or bring it back from the archive under a new id"""
+    try:
+        restored = ArchiveService.restore(db, trip_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    if restored is None:
+        raise HTTPException(status_code=404, detail="No deleted or archived trip with this id")
+    
+    return {"trip_id": restored, "restored_from": trip_id}
+
+
+# ============================================
+# SERVER WORKERS (GET /api/admin/workers)
+# ============================================
+@router.get("/workers")
+def get_workers():
+    """
+    Request counters of every worker under the pre-fork server
+    (python -m app.server), whichever worker answers
+    
+    Backend returns:
+    {
+        "master_pid": 4100,
+        "this_worker": 1,
+        "workers": [{"index": 0, "pid": 4101, "restarts": 2, "requests": 180, "in_flight": 1, "rss_mb": 92.4, ...}],
+        "totals": {"requests": 5210, "errors": 0, "in_flight": 3, "restarts": 4, "mean_ms": 11.8, "rss_mb": 370.1}
+    }
+    
+    requests counts the current process in each slot; totals include
+    the workers it replaced
+    """
+    if worker_metrics.worker_metrics is None:
+        raise HTTPException(status_code=404, detail="Not running under the pre-fork server (python -m app.server)")
+    
+    return worker_metrics.worker_metrics.snapshot()
+
+# ============================================
+# DATABASE TUNING (GET /api/admin/database)
+# ============================================
+@router.get("/database")
+def get_database_status():
+    """
+    SQLite pragmas in effect and this process's writer queue
+    
+    Backend returns:
+    {
+        "tuning": true,
+        "pragmas": {"journal_mode": "wal", "synchronous": 1, "busy_timeout": 5000, "foreign_keys": 1, ...},
+        "writer_queue": {"enabled": true, "waiting": 0, "acquired": 5210, "timeouts": 0, "mean_wait_ms": 0.8, "max_wait_ms": 41.2}
+    }
+    """
+    status = database_status(engine)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Not a SQLite database")
+    
+    return status
+
+# ============================================
+# SAMPLING PROFILER (POST /api/admin/profile)
+# ============================================
+@router.post("/profile", dependencies=[Depends(require_admin_token)])
+async def profile_worker(
+    request: Request,
+    seconds: float = Query(10, gt=0),
+    hz: int = Query(None, ge=1, le=1000),
+    format: Literal["speedscope", "collapsed"] = "speedscope",
+    idle: bool = False
+):
+    """
+    Sample every thread's stack on THIS worker process for `seconds`
+    
+    Stacks are tagged with the route they were serving
+    ("GET /api/trips/{trip_id}"); other threads show up as
+    "thread:<name>". Waiting threads are left out unless ?idle=true.
+    
+    - format=speedscope: JSON for https://www.speedscope.app (one profile per route)
+    - format=collapsed: "route;frame;frame count" lines for flamegraph.pl
+    
+    Nothing runs on the request path unless a profile is being taken
+    """
+    if seconds > settings.PROFILER_MAX_SECONDS:
+        raise HTTPException(status_code=400, detail=f"seconds must be at most {settings.PROFILER_MAX_SECONDS}")
+    
+    sampler = StackSampler(
+        hz=hz or settings.PROFILER_DEFAULT_HZ,
+        routes=route_codes(request.app.routes),
+        idle=idle
+    )
+    
+    if not try_start_profile(sampler):
+        raise HTTPException(status_code=409, detail="A profile is already running on this worker")
+    
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        finish_profile(sampler)
+    
+    summary = sampler.summary()
+    print(f"✅ Profiled pid {summary['pid']}: {summary['samples']} samples in {summary['seconds']}s")
+    
+    if format == "collapsed":
+        return PlainTextResponse(
+            sampler.collapsed(),
+            headers={"X-Profile-Pid": str(summary["pid"]), "X-Profile-Samples": str(summary["samples"])}
+        )
+    
+    return {**sampler.speedscope(), "summary": summary}
@@ -3,7 +3,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from datetime import timedelta
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..schemas.user import UserCreate, UserLogin, UserResponse, AuthResponse
 from ..services.auth_service import AuthService
 from ..utils.security import create_access_token
@@ -54,7 +54,7 @@ def signup(user_data: UserCreate, db: Session = Depends(get_db)):
 # LOGIN (POST /api/auth/login)
 # ============================================
 @router.post("/login", response_model=AuthResponse)
-def login(credentials: UserLogin, db: Session = Depends(get_db)):
+def login(credentials: UserLogin, db: Session = Depends(get_read_db)):
     """
     Login user
     
@@ -0,0 +1,80 @@
+# backend/app/routes/batch.py
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from ..database import get_db
+from ..schemas.batch import BatchRequest, BatchResponse, BatchOperationResult
+from ..services.batch_service import BatchService, BatchError
+
+router = APIRouter(
+    prefix="/api/batch",
+    tags=["batch"]
+)
+
+# Status reported for operations that weren't applied
+# because another one in the batch failed
+NOT_APPLIED = 424
+
+# ============================================
+# APPLY BATCH (POST /api/batch)
+# ============================================
+@router.post("/", response_model=BatchResponse)
+def apply_batch(
+    batch: BatchRequest,
+    allow_conflicts: bool = False,
+    db: Session = Depends(get_db)
+):
+    """
+    Apply many itinerary edits in one request / one transaction
+    
+    Frontend sends: POST /api/batch
+    {
+        "operations": [
+            {"op": "create", "resource": "stop", "temp_id": "rome",
+             "data": {"trip_id": 1, "city_name": "Rome", "country": "Italy",
+                      "arrival_date": "2024-06-06", "departure_date": "2024-06-10",
+                      "sequence_order": 2}},
+            {"op": "create", "resource": "activity",
+             "data": {"stop_id": "$rome", "name": "Colosseum",
+                      "date_scheduled": "2024-06-07"}},
+            {"op": "update", "resource": "stop", "id": 3, "data": {"sequence_order": 3}},
+            {"op": "delete", "resource": "activity", "id": 12}
+        ]
+    }
+    
+    All or nothing: if any operation fails, nothing is saved and the
+    response (400/404/422...) says which one failed. An activity left
+    overlapping another one at its stop fails with 409
+    (unless ?allow_conflicts=true), and so does deleting a stop that an
+    earlier operation added or moved an activity to.
+    """
+    try:
+        results = BatchService.apply(db, batch.operations, allow_conflicts=allow_conflicts)
+        return BatchResponse(committed=True, results=results)
+    
+    except BatchError as e:
+        results = [
+            BatchOperationResult(
+                index=index,
+                op=operation.op,
+                resource=operation.resource,
+                temp_id=operation.temp_id,
+                status=e.status if index == e.index else NOT_APPLIED,
+                error=e.message if index == e.index else "Not applied (batch rolled back)"
+            )
+            for index, operation in enumerate(batch.operations)
+        ]
+        return JSONResponse(
+            status_code=e.status,
+            content=BatchResponse(committed=False, results=results).model_dump(mode="json")
+        )
+    
+    except SQLAlchemyError as e:
+        print(f"❌ Batch database error: {str(e)}")
+        db.rollback()
+        return JSONResponse(
+            status_code=409,
+            content={"detail": f"Database error: {str(e)}"}
+        )
@@ -1,22 +1,36 @@
 # backend/app/routes/budget.py
 
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+import json
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import func
+from typing import Optional
+from ..cache import cache, trip_tag
 from ..database import get_db
 from ..models.budget import BudgetRecord
 from ..models.trip import Trip
 from ..schemas.budget import (
     BudgetRecordCreate,
     BudgetRecordResponse,
-    BudgetSummaryResponse
+    BudgetSummaryResponse,
+    BudgetAlertsResponse
 )
+from ..utils.budget_watch import budget_alerts
+from ..utils.serializers import RowSerializer, list_response
+from .trips import get_current_user_id
 
 router = APIRouter(
     prefix="/api/budget",
     tags=["budget"]
 )
 
+budget_rows = RowSerializer(BudgetRecord, BudgetRecordResponse)
+
+# Seconds between keep-alive comments on an idle alert stream
+ALERT_STREAM_KEEPALIVE = 15
+
 # ============================================
 # ADD BUDGET RECORD (POST /api/budget)
 # ============================================
@@ -71,6 +85,15 @@ def get_budget_summary(trip_id: int, db: Session = Depends(get_db)):
         "total_cost": 1450.0
     }
     """
+    return cache.get_or_load(
+        f"budget-summary:{trip_id}",
+        lambda: _calculate_budget_summary(db, trip_id),
+        tags=[trip_tag(trip_id)],
+        session=db
+    )
+
+def _calculate_budget_summary(db: Session, trip_id: int) -> dict:
+    """Sum a trip's budget records by category"""
     # Query all records for this trip
     records = db.query(BudgetRecord).filter(BudgetRecord.trip_id == trip_id).all()
     
@@ -106,17 +129,33 @@ def get_budget_summary(trip_id: int, db: Session = Depends(get_db)):
 # LIST BUDGET RECORDS (GET /api/budget?trip_id=1)
 # ============================================
 @router.get("/", response_model=list[BudgetRecordResponse])
-def list_budget_records(trip_id: int, db: Session = Depends(get_db)):
+def list_budget_records(
+    trip_id: int,
+    response: Response,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
     """
     Get all expense records for a trip
     
     Frontend calls: GET /api/budget?trip_id=1
+    Optional ?fields=category,amount returns only those columns
     """
-    records = db.query(BudgetRecord).filter(
-        BudgetRecord.trip_id == trip_id
-    ).order_by(BudgetRecord.date.desc()).all()
+    columns = budget_rows.parse_fields(fields)
+    
+    def load():
+        return budget_rows.fetch(
+            db, BudgetRecord.trip_id == trip_id,
+            order_by=[BudgetRecord.date.desc()], fields=columns
+        )
+    
+    records = cache.get_or_load(
+        budget_rows.cache_key(f"budget:{trip_id}", columns), load,
+        tags=[trip_tag(trip_id)],
+        session=db
+    )
     
-    return records
+    return list_response(records, response, partial=bool(columns))
 
 # ============================================
 # DELETE BUDGET RECORD (DELETE /api/budget/{record_id})
@@ -132,4 +171,84 @@ def delete_budget_record(record_id: int, db: Session = Depends(get_db)):
     db.delete(record)
     db.commit()
     
-    return {"message": "Record deleted"}
\ No newline at end of file
+    return {"message": "Record deleted"}
+
+# ============================================
+# BUDGET ALERTS (GET /api/budget/alerts?since=0)
+# ============================================
+@router.get("/alerts", response_model=BudgetAlertsResponse)
+def list_budget_alerts(
+    since: int = Query(0, ge=0),
+    trip_id: Optional[int] = None,
+    authorization: Optional[str] = Header(None)
+):
+    """
+    Budget thresholds (50/80/100% by default) crossed by the current
+    user's trips, for polling
+    
+    Frontend calls: GET /api/budget/alerts?since=12
+    and passes the returned last_id as ?since= next time
+    """
+    user_id = get_current_user_id(authorization)
+    
+    alerts = budget_alerts.recent(since, user_id=user_id, trip_id=trip_id)
+    
+    return {
+        "last_id": alerts[-1]["id"] if alerts else max(since, 0),
+        "alerts": alerts
+    }
+
+# ============================================
+# BUDGET ALERT STREAM (GET /api/budget/alerts/stream)
+# ============================================
+@router.get("/alerts/stream")
+async def stream_budget_alerts(
+    request: Request,
+    trip_id: Optional[int] = None,
+    authorization: Optional[str] = Header(None),
+    last_event_id: Optional[str] = Header(None)
+):
+    """
+    Server-Sent Events: one "budget-alert" event per threshold crossed
+    
+    Frontend: new EventSource("/api/budget/alerts/stream")
+    On reconnect the browser sends Last-Event-ID, and alerts missed
+    in between are replayed first
+    """
+    user_id = get_current_user_id(authorization)
+    since = int(last_event_id) if last_event_id and last_event_id.isdigit() else budget_alerts.last_id
+    
+    def wanted(alert) -> bool:
+        return alert["user_id"] == user_id and (trip_id is None or alert["trip_id"] == trip_id)
+    
+    def encode(alert) -> str:
+        data = {key: value for key, value in alert.items() if key != "user_id"}
+        return f"id: {alert['id']}\nevent: budget-alert\ndata: {json.dumps(data)}\n\n"
+    
+    async def events():
+        # Subscribe before replaying, so nothing falls in between
+        queue = budget_alerts.open_queue()
+        try:
+            sent = since
+            for alert in budget_alerts.recent(since, user_id=user_id, trip_id=trip_id):
+                sent = alert["id"]
+                yield encode(alert)
+            
+            while not await request.is_disconnected():
+                try:
+                    alert = await asyncio.wait_for(queue.get(), timeout=ALERT_STREAM_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                
+                if alert["id"] > sent and wanted(alert):
+                    sent = alert["id"]
+                    yield encode(alert)
+        finally:
+            budget_alerts.close_queue(queue)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,32 @@
+# backend/app/routes/destinations.py
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from ..database import get_db
+from ..schemas.destination import DestinationSuggestion
+from ..services.destination_service import DestinationService
+
+router = APIRouter(
+    prefix="/api/destinations",
+    tags=["destinations"]
+)
+
+# ============================================
+# AUTOCOMPLETE (GET /api/destinations/suggest?prefix=par)
+# ============================================
+@router.get("/suggest", response_model=list[DestinationSuggestion])
+def suggest_destinations(
+    prefix: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db)
+):
+    """
+    City suggestions for the stop form
+    
+    Frontend calls: GET /api/destinations/suggest?prefix=sao
+    Backend returns: [{"id": 4, "city_name": "São Paulo", "country": "Brazil", "stop_count": 37}, ...]
+    
+    Case and accents are ignored; most used destinations first.
+    Served from memory (no query unless the index is due a refresh).
+    """
+    return DestinationService.suggest(db, prefix, limit=limit)
@@ -0,0 +1,37 @@
+# backend/app/routes/health.py
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from ..utils.warmup import readiness
+
+router = APIRouter(
+    prefix="/api",
+    tags=["health"]
+)
+
+# ============================================
+# LIVENESS (GET /api/health)
+# ============================================
+@router.get("/health")
+def health():
+    """The process is up and serving (warm or not)"""
+    return {"status": "ok"}
+
+# ============================================
+# READINESS (GET /api/ready)
+# ============================================
+@router.get("/ready")
+def ready():
+    """
+    200 once this worker has warmed up, 503 until then
+    
+    Backend returns:
+    {
+        "ready": true,
+        "steps": {"preload": {"ok": true, "ms": 180.2}, "database": {"ok": true, "ms": 3.1}},
+        "seconds_since_start": 12.5,
+        "ready_after_seconds": 1.42
+    }
+    """
+    status = readiness.status()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
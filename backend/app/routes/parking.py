@@ -2,6 +2,7 @@
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
+from typing import Optional
 from ..database import get_db
 from ..models.parking import ParkingSlot, ParkingBooking
 from ..schemas.parking import (
@@ -9,29 +10,38 @@ from ..schemas.parking import (
     ParkingBookingCreate,
     ParkingBookingResponse
 )
+from ..utils.serializers import RowSerializer, list_response
 
 router = APIRouter(
     prefix="/api/parking",
     tags=["parking"]
 )
 
+slot_rows = RowSerializer(ParkingSlot, ParkingSlotResponse)
+booking_rows = RowSerializer(ParkingBooking, ParkingBookingResponse)
+
 # ============================================
 # LIST PARKING SLOTS (GET /api/parking/slots?stop_id=1)
 # ============================================
 @router.get("/slots", response_model=list[ParkingSlotResponse])
-def list_parking_slots(stop_id: int, db: Session = Depends(get_db)):
+def list_parking_slots(stop_id: int, fields: Optional[str] = None, db: Session = Depends(get_db)):
     """
     Get available parking slots at a stop
     
     Frontend calls: GET /api/parking/slots?stop_id=1
     Backend returns: List of slots at that location
+    Optional ?fields=id,slot_number returns only those columns
     """
-    slots = db.query(ParkingSlot).filter(
+    columns = slot_rows.parse_fields(fields)
+    
+    slots = slot_rows.fetch(
+        db,
         ParkingSlot.stop_id == stop_id,
-        ParkingSlot.availability_status == "available"
-    ).all()
+        ParkingSlot.availability_status == "available",
+        fields=columns
+    )
     
-    return slots
+    return list_response(slots, partial=bool(columns))
 
 # ============================================
 # BOOK PARKING (POST /api/parking/bookings)
@@ -84,10 +94,14 @@ def create_parking_booking(booking: ParkingBookingCreate, db: Session = Depends(
 # LIST BOOKINGS (GET /api/parking/bookings?trip_id=1)
 # ============================================
 @router.get("/bookings", response_model=list[ParkingBookingResponse])
-def list_parking_bookings(trip_id: int, db: Session = Depends(get_db)):
+def list_parking_bookings(trip_id: int, fields: Optional[str] = None, db: Session = Depends(get_db)):
     """
     Get all parking bookings for a trip
+    
+    Optional ?fields=id,start_date,end_date returns only those columns
     """
-    bookings = db.query(ParkingBooking).filter(ParkingBooking.trip_id == trip_id).all()
+    columns = booking_rows.parse_fields(fields)
+    
+    bookings = booking_rows.fetch(db, ParkingBooking.trip_id == trip_id, fields=columns)
     
-    return bookings
\ No newline at end of file
+    return list_response(bookings, partial=bool(columns))
\ No newline at end of file
@@ -0,0 +1,42 @@
+# backend/app/routes/search.py
+
+from fastapi import APIRouter, Depends, HTTPException, Header, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+from ..database import get_db
+from ..schemas.search import SearchResponse
+from ..services.search_service import SearchService
+from .trips import get_current_user_id
+
+router = APIRouter(
+    prefix="/api/search",
+    tags=["search"]
+)
+
+# ============================================
+# SEARCH (GET /api/search?q=louvre)
+# ============================================
+@router.get("/", response_model=SearchResponse)
+def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    authorization: Optional[str] = Header(None)
+):
+    """
+    Search the current user's trips, stops and activities
+    
+    Frontend calls: GET /api/search?q=paris mus&page=1
+    Matches trip names/descriptions, stop cities/countries and
+    activity names/categories/descriptions. Every word must match
+    (as a prefix), best matches first.
+    """
+    user_id = get_current_user_id(authorization)
+    
+    result = SearchService.search(db, user_id, q, page=page, page_size=page_size)
+    
+    if result is None:
+        raise HTTPException(status_code=400, detail="Search query has no words")
+    
+    return result
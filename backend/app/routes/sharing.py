@@ -1,12 +1,14 @@
 # backend/app/routes/sharing.py
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 import secrets
 from ..database import get_db
 from ..models.trip import Trip
 from ..models.shared_trip import SharedTrip
 from ..schemas.trip import TripDetailResponse
+from ..services.share_service import ShareService
+from ..utils.etag import etag_matches
 
 router = APIRouter(
     prefix="/api/sharing",
@@ -64,27 +66,34 @@ def create_share_link(trip_id: int, db: Session = Depends(get_db)):
 # GET PUBLIC TRIP (GET /api/sharing/public/{share_token})
 # ============================================
 @router.get("/public/{share_token}", response_model=TripDetailResponse)
-def get_public_trip(share_token: str, db: Session = Depends(get_db)):
+def get_public_trip(share_token: str, request: Request, db: Session = Depends(get_db)):
     """
     Get a shared trip (public view, no authentication needed)
     
     Frontend calls: GET /api/sharing/public/abc123xyz789
+    
+    Served from an in-memory snapshot (trip + stops + activities).
+    Repeat views with If-None-Match get 304 without touching the database.
     """
-    # Find share record
-    share = db.query(SharedTrip).filter(
-        SharedTrip.public_share_token == share_token
-    ).first()
+    snapshot = ShareService.get_snapshot(db, share_token)
     
-    if not share:
+    if not snapshot:
         raise HTTPException(status_code=404, detail="Shared trip not found")
     
-    # Get trip
-    trip = db.query(Trip).filter(Trip.id == share.trip_id).first()
+    headers = {
+        "ETag": snapshot.etag,
+        # Always revalidate, so edits show up on the next view
+        "Cache-Control": "public, no-cache"
+    }
     
-    if not trip:
-        raise HTTPException(status_code=404, detail="Trip not found")
+    if etag_matches(request.headers.get("if-none-match"), snapshot.etag):
+        return Response(status_code=304, headers=headers)
     
-    return trip
+    return Response(
+        content=snapshot.body,
+        media_type="application/json",
+        headers=headers
+    )
 
 # ============================================
 # COPY SHARED TRIP (POST /api/sharing/copy/{share_token})
@@ -1,17 +1,26 @@
 # backend/app/routes/stops.py
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Header, Response
 from sqlalchemy.orm import Session
+from typing import Optional
+from ..cache import cache, trip_tag
 from ..database import get_db
 from ..models.stop import Stop
 from ..models.trip import Trip
 from ..schemas.stop import StopCreate, StopResponse
+from ..schemas.activity import ActivityConflict
+from ..services.trip_service import TripService
+from ..services.schedule_service import ScheduleService
+from ..utils.etag import weak_etag, etag_matches, not_modified
+from ..utils.serializers import RowSerializer, list_response
 
 router = APIRouter(
     prefix="/api/stops",
     tags=["stops"]
 )
 
+stop_rows = RowSerializer(Stop, StopResponse)
+
 # ============================================
 # CREATE STOP (POST /api/stops)
 # ============================================
@@ -58,18 +67,61 @@ def create_stop(trip_id: int, stop: StopCreate, db: Session = Depends(get_db)):
 # LIST STOPS FOR TRIP (GET /api/stops?trip_id=1)
 # ============================================
 @router.get("/", response_model=list[StopResponse])
-def list_stops(trip_id: int, db: Session = Depends(get_db)):
+def list_stops(
+    trip_id: int,
+    response: Response,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db),
+    if_none_match: Optional[str] = Header(None)
+):
     """
     Get all stops in a trip ordered by sequence
     
     Frontend calls: GET /api/stops?trip_id=1
     Backend returns: List of cities in trip order
+    (304 if If-None-Match still matches the trip version)
+    
+    Optional ?fields=id,city_name returns only those columns
     """
-    stops = db.query(Stop).filter(
-        Stop.trip_id == trip_id
-    ).order_by(Stop.sequence_order).all()
+    columns = stop_rows.parse_fields(fields)
+    
+    version = TripService.get_trip_version(db, trip_id)
+    if version is not None:
+        etag = weak_etag("stops", trip_id, version, fields=columns)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "private, no-cache"
+    
+    def load():
+        return stop_rows.fetch(
+            db, Stop.trip_id == trip_id,
+            order_by=[Stop.sequence_order], fields=columns
+        )
+    
+    stops = cache.get_or_load(
+        stop_rows.cache_key(f"stops:{trip_id}", columns), load,
+        tags=[trip_tag(trip_id)],
+        session=db
+    )
+    
+    return list_response(stops, response, partial=bool(columns))
+
+# ============================================
+# SCHEDULE CONFLICTS (GET /api/stops/{stop_id}/conflicts)
+# ============================================
+@router.get("/{stop_id}/conflicts", response_model=list[ActivityConflict])
+def get_stop_conflicts(stop_id: int, db: Session = Depends(get_db)):
+    """
+    Activities at this stop whose times overlap, in start order
+    """
+    conflicts = ScheduleService.get_stop_conflicts(db, stop_id)
+    
+    if conflicts is None:
+        raise HTTPException(status_code=404, detail="Stop not found")
     
-    return stops
+    return conflicts
 
 # ============================================
 # UPDATE STOP (PUT /api/stops/{stop_id})
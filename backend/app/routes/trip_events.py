@@ -0,0 +1,112 @@
+# backend/app/routes/trip_events.py
+
+import asyncio
+import json
+from fastapi import APIRouter, Header, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from typing import Optional
+from ..services.trip_event_service import can_watch_trip, trip_event_stream
+from .trips import get_current_user_id
+
+router = APIRouter(
+    prefix="/api/trips",
+    tags=["live updates"]
+)
+
+# Seconds between keep-alives on an idle feed
+# (under the usual 60s proxy read timeout; each one is a write per subscriber)
+TRIP_FEED_KEEPALIVE = 30
+
+
+def _resume_point(since: Optional[int], last_event_id: Optional[str]) -> Optional[int]:
+    """?since= wins; otherwise the Last-Event-ID an EventSource sends on reconnect"""
+    if since is not None:
+        return since
+    if last_event_id and last_event_id.isdigit():
+        return int(last_event_id)
+    return None
+
+# ============================================
+# TRIP CHANGE FEED - SSE (GET /api/trips/{id}/events)
+# ============================================
+@router.get("/{trip_id}/events")
+async def stream_trip_events(
+    trip_id: int,
+    since: Optional[int] = Query(None, ge=0),
+    share_token: Optional[str] = None,
+    authorization: Optional[str] = Header(None),
+    last_event_id: Optional[str] = Header(None)
+):
+    """
+    Server-Sent Events: one "change" event per trip/stop/activity/
+    budget record/parking booking written in this trip
+
+    Frontend: new EventSource(`/api/trips/${id}/events`)
+    Each event: {"id": 42, "entity": "activity", "entity_id": 9,
+                 "action": "updated", "fields": ["cost"], ...}
+
+    On reconnect the browser sends Last-Event-ID and missed events are
+    replayed first. A "reset" event means they couldn't be (too many,
+    or purged): reload the trip.
+
+    Viewers of a shared trip pass ?share_token= instead of a login.
+    """
+    user_id = get_current_user_id(authorization)
+    if not await run_in_threadpool(can_watch_trip, trip_id, user_id, share_token):
+        raise HTTPException(status_code=404, detail="Trip not found")
+
+    resume = _resume_point(since, last_event_id)
+
+    async def events():
+        async for event in trip_event_stream(trip_id, resume, keepalive=TRIP_FEED_KEEPALIVE):
+            if event is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# ============================================
+# TRIP CHANGE FEED - WEBSOCKET (WS /api/trips/{id}/events/ws)
+# ============================================
+@router.websocket("/{trip_id}/events/ws")
+async def trip_events_socket(
+    websocket: WebSocket,
+    trip_id: int,
+    since: Optional[int] = Query(None, ge=0),
+    token: Optional[str] = None,
+    share_token: Optional[str] = None
+):
+    """
+    Same feed as GET /api/trips/{id}/events, one JSON message per event
+
+    Browsers can't set headers on a WebSocket, so the login token
+    comes as ?token=; reconnect with ?since=<last id received>
+    """
+    user_id = get_current_user_id(f"Bearer {token}" if token else None)
+    if not await run_in_threadpool(can_watch_trip, trip_id, user_id, share_token):
+        await websocket.close(code=4404)
+        return
+
+    await websocket.accept()
+
+    async def send_events():
+        async for event in trip_event_stream(trip_id, since, keepalive=TRIP_FEED_KEEPALIVE):
+            await websocket.send_json(event if event is not None else {"type": "keep-alive"})
+
+    sender = asyncio.create_task(send_events())
+    try:
+        # Nothing is expected from the client; this returns when it goes away
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
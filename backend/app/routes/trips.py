@@ -1,18 +1,34 @@
 # backend/app/routes/trips.py
 
-from fastapi import APIRouter, Depends, HTTPException, Header
+import io
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Header, Response, UploadFile, File
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Literal, Optional
+from ..cache import cache, trip_tag
 from ..database import get_db
 from ..models.trip import Trip
-from ..schemas.trip import TripCreate, TripResponse
+from ..models.user import User
+from ..schemas.trip import TripCreate, TripResponse, TripCalendarResponse, TripForecastResponse
+from ..schemas.activity import ActivityConflict
+from ..schemas.archive import TripRestoreResponse
+from ..services.trip_service import TripService
+from ..services.schedule_service import ScheduleService
+from ..services.export_service import export_response
+from ..services.import_service import ImportService
+from ..services.forecast_service import ForecastService
+from ..services.archive_service import ArchiveService
+from ..utils.etag import weak_etag, etag_matches, not_modified
 from ..utils.security import decode_access_token
+from ..utils.serializers import RowSerializer, list_response
 
 router = APIRouter(
     prefix="/api/trips",
     tags=["trips"]
 )
 
+trip_rows = RowSerializer(Trip, TripResponse)
+
 # ============================================
 # HELPER FUNCTION TO GET CURRENT USER ID
 # ============================================
@@ -37,6 +53,15 @@ def get_current_user_id(authorization: Optional[str] = Header(None)) -> int:
     except:
         return 1
 
+def require_user(db: Session, user_id: int) -> None:
+    """
+    401 unless the user exists - a trip owned by a missing user
+    (the development fallback on an empty database) fails the
+    foreign key on commit
+    """
+    if not db.query(User.id).filter(User.id == user_id).first():
+        raise HTTPException(status_code=401, detail="Not authenticated")
+
 # ============================================
 # CREATE TRIP (POST /api/trips)
 # ============================================
@@ -51,6 +76,7 @@ def create_trip(
     """
     # Get current user ID from token
     user_id = get_current_user_id(authorization)
+    require_user(db, user_id)
     
     print("=" * 60)
     print(f"📝 Creating trip for user_id: {user_id}")
@@ -76,33 +102,100 @@ def create_trip(
     
     return db_trip
 
+# ============================================
+# IMPORT (POST /api/trips/import)
+# ============================================
+@router.post("/import")
+def import_trips(
+    file: UploadFile = File(...),
+    format: Optional[Literal["ndjson", "csv"]] = None,
+    partial: bool = False,
+    allow_conflicts: bool = False,
+    db: Session = Depends(get_db),
+    authorization: Optional[str] = Header(None)
+):
+    """
+    Import trips with their stops, activities and budget records
+    from an NDJSON export (or the same records as CSV)
+    
+    The file is read line by line and written in batches,
+    all in one transaction. Any invalid record rolls back the
+    whole import unless ?partial=true. Activities overlapping an
+    earlier one at their stop are invalid (unless ?allow_conflicts=true).
+    
+    Backend returns:
+    {
+        "committed": true,
+        "created": {"trip": 12, "stop": 40, "activity": 900, "budget_record": 300},
+        "error_count": 0,
+        "errors": []   # [{"line": 7, "error": "..."}]
+    }
+    """
+    user_id = get_current_user_id(authorization)
+    require_user(db, user_id)
+    
+    if format is None:
+        format = "csv" if (file.filename or "").lower().endswith(".csv") else "ndjson"
+    
+    lines = io.TextIOWrapper(file.file, encoding="utf-8", newline="")
+    result = ImportService.run(
+        db, user_id, lines, format=format, partial=partial, allow_conflicts=allow_conflicts
+    )
+    
+    print(f"✅ Import for user {user_id}: {result.created}, {result.error_count} errors")
+    
+    return result.as_dict()
+
 # ============================================
 # LIST TRIPS (GET /api/trips)
 # ============================================
 @router.get("/", response_model=list[TripResponse])
 def list_trips(
+    response: Response,
+    fields: Optional[str] = None,
     db: Session = Depends(get_db),
-    authorization: Optional[str] = Header(None)
+    authorization: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None)
 ):
     """
     Get all trips for the CURRENT USER ONLY
+    
+    Supports conditional GET: send back the ETag in If-None-Match
+    and get 304 if nothing changed since
+    
+    Optional ?fields=id,name returns only those columns
     """
     # Get current user ID from token
     user_id = get_current_user_id(authorization)
+    columns = trip_rows.parse_fields(fields)
+    
+    # Cheap version check before loading the list
+    etag = weak_etag(
+        "trips", user_id, TripService.get_user_trips_version(db, user_id),
+        fields=columns
+    )
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
     
     print("=" * 60)
     print(f"📋 Fetching trips for user_id: {user_id}")
     print("=" * 60)
     
     # Query trips ONLY for this user
-    trips = db.query(Trip).filter(
+    trips = trip_rows.fetch(
+        db,
         Trip.user_id == user_id,  # Filter by user ID
-        Trip.is_deleted == False
-    ).order_by(Trip.created_at.desc()).all()
+        Trip.is_deleted == False,
+        order_by=[Trip.created_at.desc()],
+        fields=columns
+    )
     
     print(f"✅ Found {len(trips)} trips for user {user_id}")
     
-    return trips
+    return list_response(trips, response, partial=bool(columns))
 
 # ============================================
 # GET SINGLE TRIP (GET /api/trips/{trip_id})
@@ -110,14 +203,25 @@ def list_trips(
 @router.get("/{trip_id}", response_model=TripResponse)
 def get_trip(
     trip_id: int, 
+    response: Response,
     db: Session = Depends(get_db),
-    authorization: Optional[str] = Header(None)
+    authorization: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None)
 ):
     """
     Get details of a single trip (only if it belongs to current user)
     """
     user_id = get_current_user_id(authorization)
     
+    version = TripService.get_trip_version(db, trip_id, user_id)
+    if version is not None:
+        etag = weak_etag("trip", trip_id, version)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "private, no-cache"
+    
     trip = db.query(Trip).filter(
         Trip.id == trip_id,
         Trip.user_id == user_id,  # Ensure trip belongs to this user
@@ -132,6 +236,148 @@ def get_trip(
     
     return trip
 
+# ============================================
+# CALENDAR (GET /api/trips/{trip_id}/calendar)
+# ============================================
+@router.get("/{trip_id}/calendar", response_model=TripCalendarResponse)
+def get_trip_calendar(
+    trip_id: int,
+    response: Response,
+    db: Session = Depends(get_db),
+    authorization: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    Every day of the trip with the stop(s) and activities for that day,
+    plus daily cost and duration totals
+    """
+    user_id = get_current_user_id(authorization)
+    
+    version = TripService.get_trip_version(db, trip_id, user_id)
+    if version is None:
+        raise HTTPException(
+            status_code=404, 
+            detail="Trip not found or you don't have permission to view it"
+        )
+    
+    etag = weak_etag("calendar", trip_id, version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    
+    return cache.get_or_load(
+        f"calendar:{trip_id}",
+        lambda: TripService.get_trip_calendar(db, trip_id),
+        tags=[trip_tag(trip_id)],
+        session=db
+    )
+
+# ============================================
+# FORECAST (GET /api/trips/{trip_id}/forecast)
+# ============================================
+@router.get("/{trip_id}/forecast", response_model=TripForecastResponse)
+def get_trip_forecast(
+    trip_id: int,
+    response: Response,
+    db: Session = Depends(get_db),
+    authorization: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    Projected spend for the trip, per category and per stop
+    
+    Based on the stops' cost index and length of stay, the activities
+    already scheduled, and what similar trips actually spent
+    """
+    user_id = get_current_user_id(authorization)
+    
+    version = TripService.get_trip_version(db, trip_id, user_id)
+    if version is None:
+        raise HTTPException(
+            status_code=404, 
+            detail="Trip not found or you don't have permission to view it"
+        )
+    
+    # Changes with the trip and with every rebuild of the spend model
+    generation = ForecastService.get_model(db).generation
+    
+    etag = weak_etag("forecast", trip_id, version, generation)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    
+    return cache.get_or_load(
+        f"forecast:{trip_id}:{generation}",
+        lambda: ForecastService.get_trip_forecast(db, trip_id),
+        tags=[trip_tag(trip_id)],
+        session=db
+    )
+
+# ============================================
+# EXPORT (GET /api/trips/{trip_id}/export?format=ndjson)
+# ============================================
+@router.get("/{trip_id}/export")
+def export_trip(
+    trip_id: int,
+    format: Literal["ndjson", "csv", "ics"] = "ndjson",
+    db: Session = Depends(get_db),
+    authorization: Optional[str] = Header(None)
+):
+    """
+    Download a trip as a file, streamed as it is read
+    
+    - ndjson: trip, stops, activities and budget records (one per line)
+    - csv: budget ledger with a running total
+    - ics: calendar of stops and activities
+    """
+    user_id = get_current_user_id(authorization)
+    
+    trip = db.query(Trip.id).filter(
+        Trip.id == trip_id,
+        Trip.user_id == user_id,
+        Trip.is_deleted == False
+    ).first()
+    
+    if not trip:
+        raise HTTPException(
+            status_code=404, 
+            detail="Trip not found or you don't have permission to view it"
+        )
+    
+    return export_response(format, f"trip-{trip_id}", Trip.id == trip_id)
+
+# ============================================
+# SCHEDULE CONFLICTS (GET /api/trips/{trip_id}/conflicts)
+# ============================================
+@router.get("/{trip_id}/conflicts", response_model=list[ActivityConflict])
+def get_trip_conflicts(
+    trip_id: int,
+    db: Session = Depends(get_db),
+    authorization: Optional[str] = Header(None)
+):
+    """
+    Overlapping activities in every stop of the trip
+    """
+    user_id = get_current_user_id(authorization)
+    
+    trip = db.query(Trip.id).filter(
+        Trip.id == trip_id,
+        Trip.user_id == user_id,
+        Trip.is_deleted == False
+    ).first()
+    
+    if not trip:
+        raise HTTPException(
+            status_code=404, 
+            detail="Trip not found or you don't have permission to view it"
+        )
+    
+    return ScheduleService.get_trip_conflicts(db, trip_id)
+
 # ============================================
 # UPDATE TRIP (PUT /api/trips/{trip_id})
 # ============================================
@@ -205,9 +451,38 @@ def delete_trip(
         )
     
     # Soft delete: mark as deleted instead of actually deleting
+    # (moved to the archive after ARCHIVE_RETENTION_DAYS)
     trip.is_deleted = True
+    trip.deleted_at = datetime.utcnow()
     db.commit()
     
     print(f"✅ Trip {trip_id} deleted for user {user_id}")
     
-    return {"message": "Trip deleted successfully"}
\ No newline at end of file
+    return {"message": "Trip deleted successfully"}
+
+# ============================================
+# RESTORE TRIP (POST /api/trips/{trip_id}/restore)
+# ============================================
+@router.post("/{trip_id}/restore", response_model=TripRestoreResponse)
+def restore_trip(
+    trip_id: int,
+    db: Session = Depends(get_db),
+    authorization: Optional[str] = Header(None)
+):
+    """
+    Undo a delete
+    
+    Within ARCHIVE_RETENTION_DAYS the trip comes back as it was; after
+    that it's restored from the archive and gets a new id
+    """
+    user_id = get_current_user_id(authorization)
+    
+    try:
+        restored = ArchiveService.restore(db, trip_id, user_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    if restored is None:
+        raise HTTPException(status_code=404, detail="No deleted trip to restore")
+    
+    return {"trip_id": restored, "restored_from": trip_id}
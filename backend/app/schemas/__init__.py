@@ -1,23 +1,38 @@
 # backend/app/schemas/__init__.py
 
 from .user import UserCreate, UserResponse, UserLogin
-from .trip import TripCreate, TripResponse
+from .trip import TripCreate, TripResponse, TripCalendarResponse, TripForecastResponse
 from .stop import StopCreate, StopResponse
-from .activity import ActivityCreate, ActivityResponse
+from .activity import ActivityCreate, ActivityResponse, ActivityBulkCreate, ActivityBulkResponse, ActivityConflict
 from .parking import ParkingSlotResponse, ParkingBookingCreate, ParkingBookingResponse
-from .budget import BudgetRecordCreate, BudgetRecordResponse
+from .budget import BudgetRecordCreate, BudgetRecordResponse, BudgetAlert, BudgetAlertsResponse
+from .batch import BatchOperation, BatchRequest, BatchResponse
+from .search import SearchResult, SearchResponse
+from .destination import DestinationSuggestion
+from .job import JobCreate, JobResponse, JobsOverview
+from .archive import ArchivedTripResponse, TripRestoreResponse
 
 __all__ = [
     # User schemas
     "UserCreate", "UserResponse", "UserLogin",
     # Trip schemas
-    "TripCreate", "TripResponse",
+    "TripCreate", "TripResponse", "TripCalendarResponse", "TripForecastResponse",
     # Stop schemas
     "StopCreate", "StopResponse",
     # Activity schemas
-    "ActivityCreate", "ActivityResponse",
+    "ActivityCreate", "ActivityResponse", "ActivityBulkCreate", "ActivityBulkResponse", "ActivityConflict",
     # Parking schemas
     "ParkingSlotResponse", "ParkingBookingCreate", "ParkingBookingResponse",
     # Budget schemas
-    "BudgetRecordCreate", "BudgetRecordResponse",
+    "BudgetRecordCreate", "BudgetRecordResponse", "BudgetAlert", "BudgetAlertsResponse",
+    # Batch schemas
+    "BatchOperation", "BatchRequest", "BatchResponse",
+    # Search schemas
+    "SearchResult", "SearchResponse",
+    # Destination schemas
+    "DestinationSuggestion",
+    # Job schemas
+    "JobCreate", "JobResponse", "JobsOverview",
+    # Archive schemas
+    "ArchivedTripResponse", "TripRestoreResponse",
 ]
\ No newline at end of file
@@ -1,7 +1,7 @@
 # backend/app/schemas/activity.py
 
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List, Any
 from datetime import date, time, datetime
 
 class ActivityCreate(BaseModel):
@@ -45,4 +45,64 @@ class ActivityResponse(BaseModel):
     created_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class ActivityBulkCreate(BaseModel):
+    """
+    Import many activities at once:
+    {
+        "stop_id": 1,       # Default for items without stop_id
+        "trip_id": null,    # If set, every stop must belong to this trip
+        "activities": [
+            {"name": "Louvre", "date_scheduled": "2024-06-02"},
+            {"stop_id": 2, "name": "Colosseum", "date_scheduled": "2024-06-07"}
+        ]
+    }
+    
+    Items are validated one by one, so bad rows
+    are reported without rejecting the whole import
+    """
+    stop_id: Optional[int] = None
+    trip_id: Optional[int] = None
+    activities: List[dict[str, Any]]
+
+class ActivityBulkError(BaseModel):
+    """
+    Why one item of a bulk import was skipped
+    """
+    index: int
+    error: str
+
+class ActivityBulkResponse(BaseModel):
+    """
+    Bulk import result:
+    {
+        "created": 1998,
+        "ids": [101, 102, ...],   # Same order as the valid items
+        "errors": [{"index": 7, "error": "Stop 99 not found"}]
+    }
+    """
+    created: int
+    ids: List[int]
+    errors: List[ActivityBulkError]
+
+class ActivityConflict(BaseModel):
+    """
+    Two activities of the same stop that overlap in time:
+    {
+        "stop_id": 1,
+        "activity_id": 4,            # Starts first
+        "activity_name": "Louvre",
+        "other_activity_id": 9,
+        "other_activity_name": "Seine cruise",
+        "overlap_start": "2024-06-02T11:00:00",
+        "overlap_end": "2024-06-02T12:30:00"
+    }
+    """
+    stop_id: int
+    activity_id: Optional[int]       # None for an activity not saved yet
+    activity_name: str
+    other_activity_id: Optional[int]
+    other_activity_name: str
+    overlap_start: datetime
+    overlap_end: datetime
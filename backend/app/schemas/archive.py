@@ -0,0 +1,39 @@
+# backend/app/schemas/archive.py
+
+from pydantic import BaseModel
+from typing import Dict, Optional
+from datetime import datetime
+
+class ArchivedTripResponse(BaseModel):
+    """
+    Return archived trip (without its data):
+    {
+        "trip_id": 12,
+        "user_id": 3,
+        "name": "Europe Trip",
+        "status": "purged",
+        "row_counts": {"trip": 1, "stop": 4, "activity": 31},
+        "raw_bytes": 48210,
+        "stored_bytes": 6120,
+        ...
+    }
+    """
+    id: int
+    trip_id: int
+    user_id: int
+    name: str
+    status: str
+    row_counts: Dict[str, int]
+    raw_bytes: int
+    stored_bytes: int
+    deleted_at: Optional[datetime]
+    archived_at: datetime
+    purged_at: Optional[datetime]
+
+class TripRestoreResponse(BaseModel):
+    """
+    Restored trip:
+    {"trip_id": 57, "restored_from": 12}   # New id when it came back from the archive
+    """
+    trip_id: int
+    restored_from: int
@@ -0,0 +1,61 @@
+# backend/app/schemas/batch.py
+
+from pydantic import BaseModel
+from typing import Optional, List, Literal, Union, Any
+
+class BatchOperation(BaseModel):
+    """
+    One operation in a batch:
+    {
+        "op": "create",
+        "resource": "stop",
+        "temp_id": "paris",
+        "data": {"trip_id": 1, "city_name": "Paris", ...}
+    }
+    {
+        "op": "create",
+        "resource": "activity",
+        "data": {"stop_id": "$paris", "name": "Louvre", ...}
+    }
+    {
+        "op": "update",
+        "resource": "activity",
+        "id": 12,
+        "data": {"cost": 25.0}
+    }
+    {"op": "delete", "resource": "budget_record", "id": 7}
+
+    "$<temp_id>" can be used in place of an id anywhere
+    to point at something created earlier in the same batch
+    """
+    op: Literal["create", "update", "delete"]
+    resource: Literal["stop", "activity", "budget_record"]
+    id: Optional[Union[int, str]] = None  # Target of update/delete
+    temp_id: Optional[str] = None         # Client-side id for creates
+    data: dict = {}
+
+class BatchRequest(BaseModel):
+    """
+    Ordered list of operations, applied in one transaction
+    """
+    operations: List[BatchOperation]
+
+class BatchOperationResult(BaseModel):
+    """
+    Result of one operation (same order as the request)
+    """
+    index: int
+    op: str
+    resource: str
+    status: int                       # 200/201/204 or the error status
+    id: Optional[int] = None          # Real id (after create)
+    temp_id: Optional[str] = None
+    data: Optional[dict[str, Any]] = None
+    error: Optional[str] = None
+
+class BatchResponse(BaseModel):
+    """
+    Batch outcome - nothing is saved unless committed is true
+    """
+    committed: bool
+    results: List[BatchOperationResult]
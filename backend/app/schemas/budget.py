@@ -1,7 +1,7 @@
 # backend/app/schemas/budget.py
 
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Literal, Optional
 from datetime import datetime
 
 class BudgetRecordCreate(BaseModel):
@@ -49,4 +49,34 @@ class BudgetSummaryResponse(BaseModel):
     total_activities: float = 0.0
     total_meals: float = 0.0
     total_parking: float = 0.0
-    total_cost: float = 0.0
\ No newline at end of file
+    total_cost: float = 0.0
+
+class BudgetAlert(BaseModel):
+    """
+    A budget threshold was crossed:
+    {
+        "id": 12,                 # Increasing; pass as ?since= / Last-Event-ID
+        "trip_id": 1,
+        "threshold": 80,          # % of budget_limit
+        "direction": "up",        # "down" when spend or the limit changes back
+        "spent": 1650.0,          # Records + parking + activity costs
+        "budget_limit": 2000.0,
+        "percent": 82.5,
+        "created_at": "2024-06-03T10:15:00"
+    }
+    """
+    id: int
+    trip_id: int
+    threshold: int
+    direction: Literal["up", "down"]
+    spent: float
+    budget_limit: float
+    percent: float
+    created_at: datetime
+
+class BudgetAlertsResponse(BaseModel):
+    """
+    Alerts after ?since=, oldest first
+    """
+    last_id: int
+    alerts: List[BudgetAlert]
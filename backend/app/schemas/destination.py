@@ -0,0 +1,18 @@
+# backend/app/schemas/destination.py
+
+from pydantic import BaseModel
+
+class DestinationSuggestion(BaseModel):
+    """
+    Autocomplete entry:
+    {
+        "id": 4,
+        "city_name": "São Paulo",
+        "country": "Brazil",
+        "stop_count": 37        # Stops at this destination (all users)
+    }
+    """
+    id: int
+    city_name: str
+    country: str
+    stop_count: int
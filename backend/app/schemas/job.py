@@ -0,0 +1,50 @@
+# backend/app/schemas/job.py
+
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+from datetime import datetime
+
+class JobCreate(BaseModel):
+    """
+    Queue a job (admin):
+    {
+        "kind": "recompute_spend_totals",
+        "payload": {"trip_ids": [1, 2]}
+    }
+    """
+    kind: str
+    payload: Optional[dict] = None
+
+class JobResponse(BaseModel):
+    """
+    Return job
+    """
+    id: int
+    kind: str
+    payload: Optional[dict]
+    status: str
+    attempts: int
+    max_attempts: int
+    run_at: datetime
+    locked_by: Optional[str]
+    last_error: Optional[str]
+    created_at: datetime
+    finished_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
+
+class JobsOverview(BaseModel):
+    """
+    Admin job view:
+    {
+        "counts": {"queued": 3, "running": 1, "done": 120, "failed": 2},
+        "runner": {"name": "web-1:4211", "workers": 2, "done": 57, "retried": 1, "failed": 0},
+        "kinds": ["link_destinations", "recompute_spend_totals"],
+        "jobs": [...]           # Newest first
+    }
+    """
+    counts: Dict[str, int]
+    runner: dict
+    kinds: List[str]
+    jobs: List[JobResponse]
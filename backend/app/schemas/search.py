@@ -0,0 +1,33 @@
+# backend/app/schemas/search.py
+
+from pydantic import BaseModel
+from typing import List, Literal
+
+class SearchResult(BaseModel):
+    """
+    One match:
+    {
+        "type": "activity",
+        "id": 12,
+        "trip_id": 3,
+        "title": "Louvre Museum",
+        "snippet": "sightseeing Skip the [queue] at the pyramid…",
+        "score": 7.42          # Higher is better
+    }
+    """
+    type: Literal["trip", "stop", "activity"]
+    id: int
+    trip_id: int
+    title: str
+    snippet: str
+    score: float
+
+class SearchResponse(BaseModel):
+    """
+    A page of matches, best first
+    """
+    query: str
+    page: int
+    page_size: int
+    has_more: bool
+    results: List[SearchResult]
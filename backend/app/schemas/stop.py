@@ -1,8 +1,9 @@
 # backend/app/schemas/stop.py
 
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
 from datetime import date, datetime
+from .activity import ActivityResponse
 
 class StopCreate(BaseModel):
     """
@@ -41,4 +42,10 @@ class StopResponse(BaseModel):
     created_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class StopDetailResponse(StopResponse):
+    """
+    Stop with its activities (used in shared trip view)
+    """
+    activities: List[ActivityResponse] = []
@@ -1,8 +1,10 @@
 # backend/app/schemas/trip.py
 
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import date, datetime
+from .stop import StopDetailResponse
+from .activity import ActivityResponse
 
 # ============================================
 # REQUEST MODELS (What frontend sends)
@@ -67,4 +69,95 @@ class TripDetailResponse(TripResponse):
     """
     Full trip with all related data
     """
-    pass  # Remove the stops field for now
\ No newline at end of file
+    stops: List[StopDetailResponse] = []
+
+# ============================================
+# CALENDAR (day-by-day itinerary)
+# ============================================
+
+class CalendarStop(BaseModel):
+    """
+    A stop the traveller is at on a given day
+    """
+    id: int
+    city_name: str
+    country: str
+    sequence_order: int
+
+class CalendarDay(BaseModel):
+    """
+    One day of the trip:
+    {
+        "date": "2024-06-02",
+        "stops": [{"id": 1, "city_name": "Paris", ...}],  # 2 on travel days
+        "activities": [...],                              # In time order
+        "total_cost": 35.0,
+        "total_duration_hours": 6.0
+    }
+    """
+    date: date
+    stops: List[CalendarStop]
+    activities: List[ActivityResponse]
+    total_cost: float
+    total_duration_hours: float
+
+class TripCalendarResponse(BaseModel):
+    """
+    Every day from start_date to end_date
+    """
+    trip_id: int
+    start_date: date
+    end_date: date
+    days: List[CalendarDay]
+
+# ============================================
+# FORECAST (projected spend)
+# ============================================
+
+class ForecastStop(BaseModel):
+    """
+    Projected spend at one stop:
+    {
+        "id": 1,
+        "city_name": "Paris",
+        "days": 5,
+        "cost_index": 7.5,
+        "projected": 1240.0
+    }
+    """
+    id: int
+    city_name: str
+    days: int
+    cost_index: Optional[float]
+    projected: float
+
+class TripForecastResponse(BaseModel):
+    """
+    Projected total and per-category spend for a trip:
+    {
+        "trip_id": 1,
+        "days": 10,
+        "categories": {"stay": 900.0, "meals": 410.0, "activities": 180.0, ...},
+        "projected_total": 2310.0,
+        "low_total": 1650.0,           # From the 10th percentile of similar trips
+        "high_total": 3120.0,          # From the 90th percentile
+        "scheduled_activities": 180.0, # Sum of activity costs already planned
+        "spent_to_date": 640.0,        # Budget records so far
+        "budget_limit": 2000.0,
+        "over_budget": true,           # projected_total > budget_limit
+        "history_trips": 412,          # Trips the daily rates are based on
+        "stops": [...]
+    }
+    """
+    trip_id: int
+    days: int
+    categories: Dict[str, float]
+    projected_total: float
+    low_total: float
+    high_total: float
+    scheduled_activities: float
+    spent_to_date: float
+    budget_limit: Optional[float]
+    over_budget: bool
+    history_trips: int
+    stops: List[ForecastStop]
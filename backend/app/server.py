@@ -0,0 +1,291 @@
+# backend/app/server.py
+
+"""
+Pre-fork production server
+
+  python -m app.server --workers 4 --port 8000
+
+- The master binds the socket, imports the app and the lazily loaded
+  dependencies once, then forks the workers: they share those pages
+  copy-on-write instead of each importing everything again.
+- Each worker warms up (pool connections, forecast model) before it
+  starts accepting connections from the shared socket.
+- SIGTERM/SIGINT: workers stop accepting, finish in-flight requests
+  (up to --drain seconds), then exit; the master waits for them.
+- --max-requests N: a worker exits gracefully after ~N requests and
+  the master forks a fresh one (bounds slow memory growth).
+- Request counters per worker live in shared memory;
+  GET /api/admin/workers shows them all from any worker.
+- With more than one worker, each one follows the others' commits
+  (services/worker_sync_service.py): the trip_events outbox drops
+  their trips from its in-memory caches, and budget alerts are read
+  back from the budget_alerts table. Caches can lag another worker's
+  write by WORKER_SYNC_SECONDS; CACHE_BACKEND=redis shares the
+  response cache instead.
+
+Unix only (fork). For development, `uvicorn app.main:app --reload`
+is still the way to run it.
+"""
+
+import argparse
+import gc
+import os
+import random
+import signal
+import socket
+import sys
+import time
+import traceback
+from typing import Dict
+
+# Extra time the master gives workers on top of --drain before killing them
+KILL_GRACE_SECONDS = 5
+
+# A worker dying this soon after it was forked is crashing, not recycling
+CRASH_WINDOW_SECONDS = 5
+CRASH_BACKOFF_SECONDS = 1
+
+# The first worker's startup runs alone, for at most this long
+FIRST_WORKER_TIMEOUT = 120
+
+
+def share_process_state(workers: int) -> None:
+    """
+    Settings for running more than one worker
+
+    In-memory caches are invalidated only by writes in their own process,
+    so each worker follows the others' commits (WORKER_SYNC_SECONDS)
+    """
+    from .config import settings
+
+    settings.SERVER_WORKERS = workers
+    if workers < 2:
+        return
+
+    cached = "share snapshots, stop schedules"
+    if settings.CACHE_BACKEND == "memory":
+        cached += ", response cache"
+    print(f"✅ {workers} workers: {cached} and budget alerts follow other workers' commits "
+          f"(every {settings.WORKER_SYNC_SECONDS}s)")
+
+
+def bind_socket(host: str, port: int, backlog: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class Master:
+    """Forks, watches and replaces the workers"""
+
+    def __init__(self, args, sock: socket.socket):
+        self.args = args
+        self.sock = sock
+        self.workers: Dict[int, int] = {}      # pid → slot index
+        self.spawned_at: Dict[int, float] = {}  # slot index → time
+        self.stopping = False
+
+    # ============================================
+    # MASTER
+    # ============================================
+
+    def preload(self):
+        """Import everything once, before forking"""
+        from .config import settings
+        from .main import app
+        from .utils.warmup import preload
+        from .utils.worker_metrics import WorkerMetricsMiddleware, install_worker_metrics
+
+        # Workers finish warming up before they accept connections
+        settings.WARMUP_BLOCKING = True
+
+        preload()
+        self.app = app
+        self.metrics = install_worker_metrics(self.args.workers)
+        app.add_middleware(WorkerMetricsMiddleware, metrics=self.metrics)
+
+        # Objects imported so far are never collected; keeps the GC from
+        # touching (and so copying) the shared pages in every worker
+        gc.collect()
+        gc.freeze()
+
+    def run(self) -> int:
+        self.preload()
+        signal.signal(signal.SIGTERM, self.handle_stop)
+        signal.signal(signal.SIGINT, self.handle_stop)
+
+        # The first worker runs the startup hooks (tables created on
+        # older databases, etc.) alone, so workers don't race on them
+        self.spawn(0)
+        self.wait_ready(0)
+        for index in range(1, self.args.workers):
+            self.spawn(index)
+        print(f"✅ Master {os.getpid()} serving on {self.args.host}:{self.args.port} with {self.args.workers} workers")
+
+        while not self.stopping:
+            self.reap()
+            time.sleep(0.1)
+
+        return self.shutdown()
+
+    def wait_ready(self, index: int):
+        deadline = time.time() + FIRST_WORKER_TIMEOUT
+        while not self.metrics.is_ready(index) and not self.stopping and time.time() < deadline:
+            pid = next(pid for pid, slot in self.workers.items() if slot == index)
+            exited, status = os.waitpid(pid, os.WNOHANG)
+            if exited:
+                del self.workers[pid]
+                print(f"❌ Worker {pid} exited during startup ({os.waitstatus_to_exitcode(status)}), retrying")
+                self.spawn(index)
+            time.sleep(0.05)
+
+    def handle_stop(self, signum, frame):
+        self.stopping = True
+
+    def spawn(self, index: int):
+        started = self.spawned_at.get(index)
+        if started is not None and time.time() - started < CRASH_WINDOW_SECONDS:
+            time.sleep(CRASH_BACKOFF_SECONDS)
+
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                self.run_worker(index)
+            except SystemExit as e:  # uvicorn exits with 3 when startup fails
+                code = e.code if isinstance(e.code, int) else 1
+            except BaseException:
+                traceback.print_exc()
+                code = 1
+            finally:
+                sys.stdout.flush()
+                os._exit(code)
+
+        self.metrics.assign(index, pid)
+        self.workers[pid] = index
+        self.spawned_at[index] = time.time()
+
+    def reap(self):
+        """Replace workers that exited (recycled after --max-requests, or crashed)"""
+        while self.workers:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+
+            index = self.workers.pop(pid, None)
+            if index is None:
+                continue
+
+            code = os.waitstatus_to_exitcode(status)
+            if code == 0:
+                print(f"✅ Worker {pid} recycled")
+            else:
+                print(f"⚠️ Worker {pid} exited with {code}, replacing it")
+            if not self.stopping:
+                self.spawn(index)
+
+    def shutdown(self) -> int:
+        """Drain: workers stop accepting and finish what they're serving"""
+        print(f"⚠️ Draining {len(self.workers)} workers (up to {self.args.drain}s)")
+        self.sock.close()
+        for pid in self.workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+        deadline = time.time() + self.args.drain + KILL_GRACE_SECONDS
+        while self.workers and time.time() < deadline:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid:
+                self.workers.pop(pid, None)
+            else:
+                time.sleep(0.05)
+
+        for pid in self.workers:
+            print(f"❌ Worker {pid} still busy after the drain, killing it")
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        for pid in list(self.workers):
+            os.waitpid(pid, 0)
+
+        print("✅ All workers stopped")
+        return 0
+
+    # ============================================
+    # WORKER
+    # ============================================
+
+    def run_worker(self, index: int):
+        import uvicorn
+        from .database import engine
+        from .utils import warmup
+
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        random.seed()
+
+        # Nothing connected in the master, but never share a pooled connection
+        engine.dispose(close=False)
+        warmup.PROCESS_STARTED = time.time()
+        self.metrics.attach(index)
+
+        max_requests = None
+        if self.args.max_requests:
+            max_requests = self.args.max_requests + random.randint(0, self.args.max_requests_jitter)
+
+        config = uvicorn.Config(
+            self.app,
+            lifespan="on",
+            limit_max_requests=max_requests,
+            timeout_graceful_shutdown=self.args.drain,
+            log_level=self.args.log_level,
+            access_log=self.args.access_log,
+        )
+        uvicorn.Server(config).run(sockets=[self.sock])
+
+
+def main(argv=None) -> int:
+    from .config import settings
+
+    parser = argparse.ArgumentParser(prog="python -m app.server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=settings.SERVER_WORKERS)
+    parser.add_argument("--max-requests", type=int, default=settings.SERVER_MAX_REQUESTS,
+                        help="Recycle a worker after this many requests (0 = never)")
+    parser.add_argument("--max-requests-jitter", type=int, default=settings.SERVER_MAX_REQUESTS_JITTER)
+    parser.add_argument("--drain", type=int, default=settings.SERVER_DRAIN_SECONDS,
+                        help="Seconds in-flight requests get on SIGTERM")
+    parser.add_argument("--backlog", type=int, default=2048)
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument("--access-log", action="store_true")
+    args = parser.parse_args(argv)
+
+    if not hasattr(os, "fork"):
+        print("❌ The pre-fork server needs fork(); use uvicorn directly on this platform")
+        return 1
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    # Before the app (and its caches) is imported
+    share_process_state(args.workers)
+
+    sock = bind_socket(args.host, args.port, args.backlog)
+    return Master(args, sock).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
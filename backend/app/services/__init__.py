@@ -3,5 +3,10 @@
 from .trip_service import TripService
 from .budget_service import BudgetService
 from .auth_service import AuthService
+from .share_service import ShareService
+from .schedule_service import ScheduleService
+from .search_service import SearchService
+from .destination_service import DestinationService
+from .forecast_service import ForecastService
 
-__all__ = ["TripService", "BudgetService", "AuthService"]
\ No newline at end of file
+__all__ = ["TripService", "BudgetService", "AuthService", "ShareService", "ScheduleService", "SearchService", "DestinationService", "ForecastService"]
\ No newline at end of file
@@ -0,0 +1,469 @@
+# backend/app/services/archive_service.py
+
+import gzip
+import io
+import json
+import time as clock
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional, Tuple
+from sqlalchemy import Date, DateTime, Numeric, Table, Time, delete, func, insert, inspect, select, text, update
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..database import WriteSessionLocal, write_engine
+from ..models.trip import Trip
+from ..models.stop import Stop
+from ..models.activity import Activity
+from ..models.budget import BudgetRecord
+from ..models.parking import ParkingSlot, ParkingBooking
+from ..models.shared_trip import SharedTrip
+from ..models.archived_trip import ArchivedTrip
+from ..models.job import Job
+from ..utils.jobs import enqueue_job, job_handler
+from ..utils.trip_changes import mark_trips_changed
+from ..utils.trip_events import record_trip_events, trip_event
+
+# ============================================
+# SOFT-DELETE ARCHIVAL
+# ============================================
+# Trips deleted more than ARCHIVE_RETENTION_DAYS ago leave the hot tables:
+#
+#   1. snapshot: the trip and every row under it, one NDJSON line each,
+#      gzipped into archived_trips.data (status 'purging')
+#   2. purge: rows deleted ARCHIVE_CHUNK_ROWS at a time, children first,
+#      one short transaction per chunk
+#   3. the trip row itself, in the transaction that marks the archive 'purged'
+#
+# Reads are chunked the same way, so no step holds a lock for longer
+# than one chunk. A run that stops halfway resumes from its 'purging'
+# archives. restore() puts a subtree back (under new ids).
+#
+# Runs as the archive_deleted_trips job, which queues its next run itself.
+
+ARCHIVE_JOB = "archive_deleted_trips"
+
+
+def _stops_of(trip_id: int):
+    return select(Stop.id).where(Stop.trip_id == trip_id).scalar_subquery()
+
+
+@dataclass(frozen=True)
+class _ArchiveTable:
+    name: str
+    table: Table
+    parents: Dict[str, str]            # Foreign key column → parent record type
+    rows_of: Callable[[int], object]   # trip_id → WHERE clause
+
+
+# Parents first (restore order); purged in reverse
+ARCHIVE_TABLES = (
+    _ArchiveTable("trip", Trip.__table__, {}, lambda trip_id: Trip.id == trip_id),
+    _ArchiveTable("stop", Stop.__table__, {"trip_id": "trip"}, lambda trip_id: Stop.trip_id == trip_id),
+    _ArchiveTable(
+        "activity", Activity.__table__, {"stop_id": "stop"},
+        lambda trip_id: Activity.stop_id.in_(_stops_of(trip_id))
+    ),
+    _ArchiveTable(
+        "parking_slot", ParkingSlot.__table__, {"stop_id": "stop"},
+        lambda trip_id: ParkingSlot.stop_id.in_(_stops_of(trip_id))
+    ),
+    _ArchiveTable(
+        "budget_record", BudgetRecord.__table__, {"trip_id": "trip"},
+        lambda trip_id: BudgetRecord.trip_id == trip_id
+    ),
+    _ArchiveTable(
+        "parking_booking", ParkingBooking.__table__, {"trip_id": "trip", "parking_slot_id": "parking_slot"},
+        lambda trip_id: ParkingBooking.trip_id == trip_id
+    ),
+    _ArchiveTable(
+        "shared_trip", SharedTrip.__table__, {"trip_id": "trip"},
+        lambda trip_id: SharedTrip.trip_id == trip_id
+    ),
+)
+
+# Totals in this process (the admin view adds the database's own counts)
+archive_progress = Counter()
+last_run: Dict[str, object] = {}
+
+
+def _json_default(value):
+    """Dates/times as ISO strings, decimals as exact strings"""
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    return str(value)
+
+
+def _decode(table: Table, data: dict) -> dict:
+    """An archived row back to column values (columns dropped since are skipped)"""
+    row = {}
+    for key, value in data.items():
+        column = table.c.get(key)
+        if column is None:
+            continue
+        if value is not None:
+            if isinstance(column.type, DateTime):
+                value = datetime.fromisoformat(value)
+            elif isinstance(column.type, Date):
+                value = date.fromisoformat(value)
+            elif isinstance(column.type, Time):
+                value = time.fromisoformat(value)
+            elif isinstance(column.type, Numeric):
+                value = Decimal(value)
+        row[key] = value
+    return row
+
+
+def _deleted_before(cutoff: datetime):
+    """Soft-deleted trips deleted before cutoff (updated_at for trips deleted before deleted_at existed)"""
+    return (Trip.is_deleted == True) & (func.coalesce(Trip.deleted_at, Trip.updated_at) < cutoff)
+
+
+def _being_purged():
+    """Trips with a snapshot whose rows are still being deleted"""
+    return select(ArchivedTrip.trip_id).where(ArchivedTrip.status == "purging").scalar_subquery()
+
+
+def _snapshot(db: Session, trip_id: int) -> Tuple[bytes, Dict[str, int], int]:
+    """gzip(NDJSON) of the trip's subtree, read in keyset chunks"""
+    chunk = settings.ARCHIVE_CHUNK_ROWS
+    buffer = io.BytesIO()
+    counts = {}
+    raw_bytes = 0
+
+    with gzip.GzipFile(fileobj=buffer, mode="wb", compresslevel=6, mtime=0) as archive:
+        for spec in ARCHIVE_TABLES:
+            id_column = spec.table.c.id
+            last_id = 0
+            while True:
+                rows = db.execute(
+                    select(spec.table)
+                    .where(spec.rows_of(trip_id), id_column > last_id)
+                    .order_by(id_column)
+                    .limit(chunk)
+                ).mappings().all()
+                db.commit()  # Don't hold a read transaction across chunks
+
+                for row in rows:
+                    line = json.dumps({"type": spec.name, "data": dict(row)}, default=_json_default)
+                    encoded = line.encode() + b"\n"
+                    archive.write(encoded)
+                    raw_bytes += len(encoded)
+
+                if rows:
+                    counts[spec.name] = counts.get(spec.name, 0) + len(rows)
+                    last_id = rows[-1]["id"]
+                if len(rows) < chunk:
+                    break
+
+    return buffer.getvalue(), counts, raw_bytes
+
+
+def _still_deleted(db: Session, trip_id: int) -> bool:
+    return db.query(Trip.id).filter(Trip.id == trip_id, Trip.is_deleted == True).first() is not None
+
+
+def _purge(db: Session, archive: ArchivedTrip) -> Optional[int]:
+    """
+    Delete the archived trip's rows, children first, in chunks
+
+    Each chunk checks, in its own transaction, that the trip is still
+    deleted. If it was restored meanwhile the snapshot is dropped and
+    nothing more is deleted (returns None).
+    """
+    chunk = settings.ARCHIVE_CHUNK_ROWS
+    deleted = 0
+
+    for spec in reversed(ARCHIVE_TABLES[1:]):
+        id_column = spec.table.c.id
+        while True:
+            if not _still_deleted(db, archive.trip_id):
+                return _abandon(db, archive)
+            ids = db.execute(select(id_column).where(spec.rows_of(archive.trip_id)).limit(chunk)).scalars().all()
+            if not ids:
+                db.commit()
+                break
+            deleted += db.execute(delete(spec.table).where(id_column.in_(ids))).rowcount
+            db.commit()
+
+    trips = db.execute(
+        delete(Trip.__table__).where(Trip.id == archive.trip_id, Trip.is_deleted == True)
+    ).rowcount
+    if not trips:
+        return _abandon(db, archive)
+
+    archive.status = "purged"
+    archive.purged_at = datetime.utcnow()
+    db.commit()
+    return deleted + trips
+
+
+def _abandon(db: Session, archive: ArchivedTrip) -> None:
+    """The trip came back while it was being archived: drop the snapshot"""
+    db.delete(archive)
+    db.commit()
+    print(f"⚠️ Trip {archive.trip_id} was restored while being archived, archive dropped")
+    return None
+
+
+class ArchiveService:
+    """Move soft-deleted trips to the archive, and back"""
+
+    @staticmethod
+    def due_trips(db: Session, limit: int) -> List[int]:
+        """Deleted trips past the retention window, not archived yet"""
+        cutoff = datetime.utcnow() - timedelta(days=settings.ARCHIVE_RETENTION_DAYS)
+        rows = db.query(Trip.id).filter(
+            _deleted_before(cutoff),
+            Trip.id.not_in(_being_purged())
+        ).order_by(Trip.id).limit(limit)
+        return [trip_id for (trip_id,) in rows]
+
+    @staticmethod
+    def archive_trip(db: Session, trip_id: int) -> Optional[ArchivedTrip]:
+        """Snapshot one deleted trip (status 'purging'); None if it's not deleted"""
+        trip = db.query(Trip.user_id, Trip.name, Trip.deleted_at, Trip.updated_at).filter(
+            Trip.id == trip_id,
+            Trip.is_deleted == True
+        ).first()
+        if not trip:
+            return None
+
+        data, counts, raw_bytes = _snapshot(db, trip_id)
+
+        # The snapshot commits per chunk: the trip may have been restored
+        # meanwhile. Checked in the transaction that marks it 'purging',
+        # after which restore() refuses until the purge is done.
+        if not _still_deleted(db, trip_id):
+            db.rollback()
+            return None
+
+        archive = ArchivedTrip(
+            trip_id=trip_id,
+            user_id=trip.user_id,
+            name=trip.name,
+            status="purging",
+            row_counts=counts,
+            raw_bytes=raw_bytes,
+            data=data,
+            deleted_at=trip.deleted_at or trip.updated_at
+        )
+        db.add(archive)
+        db.commit()
+        return archive
+
+    @staticmethod
+    def run(db: Session, limit: Optional[int] = None) -> dict:
+        """
+        Archive and purge up to `limit` trips (ARCHIVE_BATCH_TRIPS),
+        finishing interrupted purges first
+
+        Returns this run's progress, including how many trips are still due
+        """
+        limit = limit or settings.ARCHIVE_BATCH_TRIPS
+        started = clock.monotonic()
+        progress = Counter()
+
+        archives = db.query(ArchivedTrip).filter(ArchivedTrip.status == "purging").limit(limit).all()
+        progress["resumed"] = len(archives)
+
+        for trip_id in ArchiveService.due_trips(db, limit - len(archives)):
+            archive = ArchiveService.archive_trip(db, trip_id)
+            if archive is not None:
+                archives.append(archive)
+                progress["raw_bytes"] += archive.raw_bytes
+                progress["stored_bytes"] += len(archive.data)
+
+        for archive in archives:
+            deleted = _purge(db, archive)
+            if deleted is None:
+                progress["restored_meanwhile"] += 1
+                continue
+            progress["rows_deleted"] += deleted
+            progress["trips_archived"] += 1
+
+        cutoff = datetime.utcnow() - timedelta(days=settings.ARCHIVE_RETENTION_DAYS)
+        remaining = db.query(func.count(Trip.id)).filter(
+            _deleted_before(cutoff),
+            Trip.id.not_in(_being_purged())
+        ).scalar()
+        remaining += db.query(func.count(ArchivedTrip.id)).filter(ArchivedTrip.status == "purging").scalar()
+
+        archive_progress.update(progress)
+        archive_progress["runs"] += 1
+        result = {**progress, "remaining": remaining, "seconds": round(clock.monotonic() - started, 2)}
+        last_run.clear()
+        last_run.update(result, finished_at=datetime.utcnow().isoformat())
+
+        if progress["trips_archived"]:
+            print(f"✅ Archived {progress['trips_archived']} deleted trips "
+                  f"({progress['rows_deleted']} rows), {remaining} still due")
+        return result
+
+    @staticmethod
+    def restore(db: Session, trip_id: int, user_id: Optional[int] = None) -> Optional[int]:
+        """
+        Bring a deleted trip back; returns its id (None if there's
+        nothing to restore, or it isn't the user's)
+
+        - Still in place (within the retention window): just undeleted
+        - Archived: rows inserted again from the snapshot, under new ids
+          (old ids may have been reused since); share links keep their tokens
+
+        Raises ValueError while the trip is halfway through being purged
+        """
+        trip = db.query(Trip).filter(Trip.id == trip_id, Trip.is_deleted == True).first()
+        if trip is not None:
+            if user_id is not None and trip.user_id != user_id:
+                return None
+            if db.query(ArchivedTrip.id).filter(
+                ArchivedTrip.trip_id == trip_id, ArchivedTrip.status == "purging"
+            ).first():
+                raise ValueError("Trip is being archived, try again shortly")
+            trip.is_deleted = False
+            trip.deleted_at = None
+            db.commit()
+            return trip.id
+
+        # SQLite can hand a purged trip's id to a new trip, so the
+        # same trip_id may have been archived more than once
+        archive = db.query(ArchivedTrip).filter(
+            ArchivedTrip.trip_id == trip_id,
+            ArchivedTrip.status == "purged"
+        ).order_by(ArchivedTrip.id.desc()).first()
+        if archive is None or (user_id is not None and archive.user_id != user_id):
+            return None
+
+        records = defaultdict(list)
+        for line in gzip.decompress(archive.data).splitlines():
+            record = json.loads(line)
+            records[record["type"]].append(record["data"])
+
+        id_maps: Dict[str, Dict[int, int]] = {}
+        for spec in ARCHIVE_TABLES:
+            rows, old_ids = [], []
+            for data in records.get(spec.name, ()):
+                row = _decode(spec.table, data)
+                old_ids.append(row.pop("id"))
+                for column, parent in spec.parents.items():
+                    if row.get(column) is not None:
+                        # Parents outside the trip (another trip's slot) keep their id
+                        row[column] = id_maps.get(parent, {}).get(row[column], row[column])
+                rows.append(row)
+
+            if not rows:
+                continue
+            if spec.name == "trip":
+                rows[0].update(is_deleted=False, deleted_at=None)
+
+            new_ids = db.execute(
+                insert(spec.table).returning(spec.table.c.id, sort_by_parameter_order=True),
+                rows
+            ).scalars().all()
+            id_maps[spec.name] = dict(zip(old_ids, new_ids))
+
+        new_trip_id = id_maps["trip"][trip_id]
+
+        # Core inserts skip the ORM flush hooks
+        mark_trips_changed(db, [new_trip_id])
+        record_trip_events(db, [trip_event(new_trip_id, "trip", new_trip_id, "created")])
+
+        db.delete(archive)
+        db.commit()
+        archive_progress["restored"] += 1
+
+        print(f"✅ Trip {trip_id} restored from the archive as trip {new_trip_id}")
+        return new_trip_id
+
+    @staticmethod
+    def status(db: Session) -> dict:
+        """Progress numbers for the admin view"""
+        cutoff = datetime.utcnow() - timedelta(days=settings.ARCHIVE_RETENTION_DAYS)
+        waiting = db.query(func.count(Trip.id)).filter(
+            Trip.is_deleted == True,
+            func.coalesce(Trip.deleted_at, Trip.updated_at) >= cutoff
+        ).scalar()
+        due = db.query(func.count(Trip.id)).filter(
+            _deleted_before(cutoff),
+            Trip.id.not_in(_being_purged())
+        ).scalar()
+
+        stored = {
+            status: {"trips": trips, "raw_bytes": int(raw or 0), "stored_bytes": int(stored_bytes or 0)}
+            for status, trips, raw, stored_bytes in db.query(
+                ArchivedTrip.status,
+                func.count(ArchivedTrip.id),
+                func.sum(ArchivedTrip.raw_bytes),
+                func.sum(func.length(ArchivedTrip.data))
+            ).group_by(ArchivedTrip.status)
+        }
+
+        return {
+            "retention_days": settings.ARCHIVE_RETENTION_DAYS,
+            "deleted_in_retention": waiting,
+            "due": due,
+            "purging": stored.get("purging", {}).get("trips", 0),
+            "archived": stored.get("purged", {"trips": 0, "raw_bytes": 0, "stored_bytes": 0}),
+            "this_process": dict(archive_progress),
+            "last_run": dict(last_run) or None
+        }
+
+    @staticmethod
+    def list_archived(db: Session, user_id: Optional[int] = None, limit: int = 50) -> List[ArchivedTrip]:
+        query = db.query(ArchivedTrip)
+        if user_id is not None:
+            query = query.filter(ArchivedTrip.user_id == user_id)
+        return query.order_by(ArchivedTrip.id.desc()).limit(limit).all()
+
+
+# ============================================
+# SCHEDULING
+# ============================================
+
+def schedule_archive_run(db: Session, delay: float = 0) -> None:
+    """
+    Make sure an archive run is queued within `delay` seconds
+    (moves a later queued run forward). The caller commits.
+    """
+    run_at = datetime.utcnow() + timedelta(seconds=delay)
+    db.execute(
+        update(Job)
+        .where(Job.dedupe_key == ARCHIVE_JOB, Job.status == "queued", Job.run_at > run_at)
+        .values(run_at=run_at)
+    )
+    enqueue_job(db, ARCHIVE_JOB, dedupe_key=ARCHIVE_JOB, delay=delay)
+
+
+@job_handler(ARCHIVE_JOB)
+def _archive_deleted_trips_job(db: Session, payload: dict) -> None:
+    progress = ArchiveService.run(db)
+    schedule_archive_run(db, delay=0 if progress["remaining"] else settings.ARCHIVE_INTERVAL_SECONDS)
+
+
+# ============================================
+# STARTUP
+# ============================================
+
+def install_archive(connection) -> None:
+    """Create archived_trips and trips.deleted_at on databases created before they existed"""
+    ArchivedTrip.__table__.create(connection, checkfirst=True)
+
+    columns = {column["name"] for column in inspect(connection).get_columns("trips")}
+    if "deleted_at" not in columns:
+        connection.execute(text("ALTER TABLE trips ADD COLUMN deleted_at TIMESTAMP"))
+
+
+def schedule_archival_on_startup() -> None:
+    try:
+        with write_engine.begin() as connection:
+            install_archive(connection)
+
+        db = WriteSessionLocal()
+        try:
+            schedule_archive_run(db, delay=settings.ARCHIVE_INTERVAL_SECONDS)
+            db.commit()
+        finally:
+            db.close()
+    except Exception as e:
+        print(f"⚠️ Trip archival not scheduled: {str(e)}")
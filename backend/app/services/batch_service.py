@@ -0,0 +1,308 @@
+# backend/app/services/batch_service.py
+
+from typing import List, Optional
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.orm import Session
+from ..models.trip import Trip
+from ..models.stop import Stop
+from ..models.activity import Activity
+from ..models.budget import BudgetRecord
+from ..schemas.stop import StopCreate, StopResponse
+from ..schemas.activity import ActivityCreate, ActivityResponse
+from ..schemas.budget import BudgetRecordCreate, BudgetRecordResponse
+from ..schemas.batch import BatchOperation, BatchOperationResult
+from .schedule_service import ScheduleService, describe_conflicts
+
+
+class BatchError(Exception):
+    """An operation in the batch failed - the whole batch is rolled back"""
+
+    def __init__(self, index: int, status: int, message: str):
+        super().__init__(message)
+        self.index = index
+        self.status = status
+        self.message = message
+
+
+class _Resource:
+    """How to create/update/delete one kind of row in a batch"""
+
+    def __init__(self, model, create_schema, response_schema,
+                 parent_field: str, parent_model, parent_relationship: Optional[str] = None):
+        self.model = model
+        self.create_schema = create_schema
+        self.response_schema = response_schema
+        self.parent_field = parent_field
+        self.parent_model = parent_model
+        # Relationship used when the parent is created in the same batch
+        self.parent_relationship = parent_relationship
+
+
+RESOURCES = {
+    "stop": _Resource(Stop, StopCreate, StopResponse, "trip_id", Trip),
+    "activity": _Resource(Activity, ActivityCreate, ActivityResponse, "stop_id", Stop, "stop"),
+    "budget_record": _Resource(BudgetRecord, BudgetRecordCreate, BudgetRecordResponse, "trip_id", Trip),
+}
+
+# Which resource a temp id may stand in for, by parent model
+_PARENT_RESOURCE = {Stop: "stop"}
+
+_STATUS = {"create": 201, "update": 200, "delete": 204}
+
+
+def _is_ref(value) -> bool:
+    """"$paris" → reference to temp id "paris\""""
+    return isinstance(value, str) and value.startswith("$")
+
+
+def _validation_message(e: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}"
+        for err in e.errors()
+    )
+
+
+class BatchService:
+    """Apply itinerary edits as one transaction"""
+
+    @staticmethod
+    def apply(db: Session, operations: List[BatchOperation],
+              allow_conflicts: bool = False) -> List[BatchOperationResult]:
+        """
+        Apply operations in order, flush once and commit
+
+        1. Load every referenced row / parent with one IN query per table
+        2. Apply creates, updates and deletes to the session
+           (temp ids resolve to the in-session objects)
+        3. Flush once, check the written activities don't overlap others
+           at their stops (unless allow_conflicts), collect results, commit
+
+        Raises BatchError (after rolling back) if any operation fails
+        """
+        try:
+            targets, parent_ids = BatchService._preload(db, operations)
+
+            temps = {}     # temp_id → (resource name, object)
+            deleted = set()
+            touched = []   # (operation, object) in request order
+
+            for index, operation in enumerate(operations):
+                resource = RESOURCES[operation.resource]
+
+                if operation.op == "create":
+                    obj = BatchService._create(db, index, operation, resource, temps, parent_ids)
+                else:
+                    obj = BatchService._resolve_target(index, operation, targets, temps, deleted)
+
+                    if operation.op == "update":
+                        BatchService._update(index, operation, resource, obj, temps, parent_ids)
+                    else:
+                        BatchService._delete(db, index, operation, resource, obj, temps, deleted, touched)
+
+                touched.append((operation, obj))
+
+            db.flush()
+
+            if not allow_conflicts:
+                BatchService._check_conflicts(db, touched, deleted)
+
+            results = []
+            for index, (operation, obj) in enumerate(touched):
+                resource = RESOURCES[operation.resource]
+                result = BatchOperationResult(
+                    index=index,
+                    op=operation.op,
+                    resource=operation.resource,
+                    status=_STATUS[operation.op],
+                    id=obj.id,
+                    temp_id=operation.temp_id
+                )
+                if operation.op != "delete" and id(obj) not in deleted:
+                    result.data = resource.response_schema.model_validate(obj).model_dump(mode="json")
+                results.append(result)
+
+            db.commit()
+            return results
+
+        except BatchError:
+            db.rollback()
+            raise
+
+    # ============================================
+    # HELPERS
+    # ============================================
+
+    @staticmethod
+    def _preload(db: Session, operations: List[BatchOperation]):
+        """Fetch update/delete targets and check parents exist, one query per table"""
+        target_ids = {name: set() for name in RESOURCES}
+        wanted_parents = {}
+
+        for operation in operations:
+            resource = RESOURCES[operation.resource]
+
+            if operation.op != "create" and isinstance(operation.id, int):
+                target_ids[operation.resource].add(operation.id)
+
+            parent = operation.data.get(resource.parent_field)
+            if isinstance(parent, int):
+                wanted_parents.setdefault(resource.parent_model, set()).add(parent)
+
+        targets = {}
+        for name, ids in target_ids.items():
+            model = RESOURCES[name].model
+            rows = db.query(model).filter(model.id.in_(ids)).all() if ids else []
+            targets[name] = {row.id: row for row in rows}
+
+        parent_ids = {}
+        for model, ids in wanted_parents.items():
+            rows = db.query(model.id).filter(model.id.in_(ids)).all()
+            parent_ids[model] = {row[0] for row in rows}
+
+        return targets, parent_ids
+
+    @staticmethod
+    def _check_conflicts(db: Session, touched, deleted) -> None:
+        """Fail the operation that left an activity overlapping another one (409)"""
+        written = {}  # activity id → index of the last operation that wrote it
+        for index, (operation, obj) in enumerate(touched):
+            if operation.resource == "activity" and operation.op != "delete" and id(obj) not in deleted:
+                written[obj.id] = (index, obj)
+
+        conflicts = ScheduleService.conflicts_involving(db, [obj for _, obj in written.values()])
+        if not conflicts:
+            return
+
+        first = conflicts[0]
+        activity_id = first.other_activity_id if first.other_activity_id in written else first.activity_id
+        raise BatchError(written[activity_id][0], 409, describe_conflicts(
+            [conflict for conflict in conflicts if activity_id in (conflict.activity_id, conflict.other_activity_id)],
+            activity_id
+        ))
+
+    @staticmethod
+    def _resolve_target(index, operation, targets, temps, deleted):
+        if operation.id is None:
+            raise BatchError(index, 422, f"'{operation.op}' needs an id")
+
+        if _is_ref(operation.id):
+            name, obj = temps.get(operation.id[1:], (None, None))
+            if obj is None or name != operation.resource:
+                raise BatchError(index, 404, f"Unknown temp id {operation.id}")
+        else:
+            obj = targets[operation.resource].get(operation.id)
+            if obj is None:
+                raise BatchError(index, 404, f"{operation.resource} {operation.id} not found")
+
+        if id(obj) in deleted:
+            raise BatchError(index, 404, f"{operation.resource} {operation.id} was deleted earlier in this batch")
+
+        return obj
+
+    @staticmethod
+    def _validate(index, resource: _Resource, data: dict) -> BaseModel:
+        payload = dict(data)
+        payload.pop(resource.parent_field, None)
+
+        # Parent is checked separately (it may be a temp id)
+        if resource.parent_field in resource.create_schema.model_fields:
+            payload[resource.parent_field] = 0
+
+        try:
+            return resource.create_schema.model_validate(payload)
+        except ValidationError as e:
+            raise BatchError(index, 422, _validation_message(e))
+
+    @staticmethod
+    def _set_parent(index, resource: _Resource, obj, value, temps, parent_ids):
+        if _is_ref(value):
+            name, parent = temps.get(value[1:], (None, None))
+            if parent is None or name != _PARENT_RESOURCE.get(resource.parent_model):
+                raise BatchError(index, 404, f"Unknown temp id {value}")
+            setattr(obj, resource.parent_relationship, parent)
+            return
+
+        if not isinstance(value, int) or value not in parent_ids.get(resource.parent_model, ()):
+            raise BatchError(
+                index, 404,
+                f"{resource.parent_model.__name__} {value} not found"
+            )
+        setattr(obj, resource.parent_field, value)
+
+    @staticmethod
+    def _create(db, index, operation, resource: _Resource, temps, parent_ids):
+        if resource.parent_field not in operation.data:
+            raise BatchError(index, 422, f"{resource.parent_field} is required")
+
+        validated = BatchService._validate(index, resource, operation.data)
+        obj = resource.model(**validated.model_dump(exclude={resource.parent_field}))
+        BatchService._set_parent(index, resource, obj, operation.data[resource.parent_field], temps, parent_ids)
+
+        if operation.temp_id:
+            if operation.temp_id in temps:
+                raise BatchError(index, 409, f"Duplicate temp id {operation.temp_id}")
+            temps[operation.temp_id] = (operation.resource, obj)
+
+        db.add(obj)
+        return obj
+
+    @staticmethod
+    def _update(index, operation, resource: _Resource, obj, temps, parent_ids):
+        # Validate the merged result, then apply only the fields sent
+        current = {
+            field: getattr(obj, field)
+            for field in resource.create_schema.model_fields
+            if field != resource.parent_field
+        }
+        validated = BatchService._validate(index, resource, {**current, **operation.data})
+
+        for field in operation.data:
+            if field == resource.parent_field:
+                BatchService._set_parent(index, resource, obj, operation.data[field], temps, parent_ids)
+            elif field in resource.create_schema.model_fields:
+                setattr(obj, field, getattr(validated, field))
+            else:
+                raise BatchError(index, 422, f"Unknown field {field}")
+
+    @staticmethod
+    def _check_no_new_children(index, operation, obj, deleted, touched):
+        """
+        Refuse to delete a row that an earlier operation in the batch put
+        a child under (409) - the child would be left without a parent
+        """
+        for child_index, (child_operation, child) in enumerate(touched):
+            child_resource = RESOURCES[child_operation.resource]
+            if (
+                child_resource.parent_relationship is None
+                or not isinstance(obj, child_resource.parent_model)
+                or id(child) in deleted
+                or (child_operation.op != "create" and child_resource.parent_field not in child_operation.data)
+            ):
+                continue
+
+            parent = getattr(child, child_resource.parent_relationship)
+            parent_id = getattr(child, child_resource.parent_field)
+            if parent is obj or (obj.id is not None and parent_id == obj.id):
+                raise BatchError(
+                    index, 409,
+                    f"{operation.resource} {operation.id} still has the {child_operation.resource} "
+                    f"from operation {child_index} - delete or move that first"
+                )
+
+    @staticmethod
+    def _delete(db, index, operation, resource: _Resource, obj, temps, deleted, touched):
+        BatchService._check_no_new_children(index, operation, obj, deleted, touched)
+
+        if obj in db.new:
+            # Created earlier in this batch - just drop it
+            if resource.parent_relationship:
+                setattr(obj, resource.parent_relationship, None)
+            # delete-orphan cascades may already have expunged it
+            if obj in db:
+                db.expunge(obj)
+            for temp_id, (_, temp_obj) in list(temps.items()):
+                if temp_obj is obj:
+                    del temps[temp_id]
+        else:
+            db.delete(obj)
+        deleted.add(id(obj))
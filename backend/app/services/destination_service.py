@@ -0,0 +1,482 @@
+# backend/app/services/destination_service.py
+
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter
+from heapq import nsmallest
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import event, func, inspect, select, text, update, bindparam
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..database import WriteSessionLocal, write_engine
+from ..models.stop import Stop
+from ..models.destination import Destination
+from ..utils.constants import COUNTRY_ALIASES, CITY_WORD_ALIASES
+from ..utils.jobs import job_handler
+
+# Stops updated per statement when linking existing stops
+LINK_BATCH_SIZE = 5000
+
+# ============================================
+# NORMALISATION
+# ============================================
+# "  São Paulo ", "sao paulo" and "SAO-PAULO" → "sao paulo"
+# "St. Petersburg" and "Saint Petersburg"    → "saint petersburg"
+# "USA", "U.S.A." and "United States"        → "united states"
+
+
+def normalize_name(value: Optional[str]) -> str:
+    """Lowercase, no accents, punctuation → spaces, single spaces"""
+    decomposed = unicodedata.normalize("NFKD", (value or "").lower())
+    folded = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(re.findall(r"[^\W_]+", folded))
+
+
+def normalize_city(city: Optional[str]) -> str:
+    return " ".join(CITY_WORD_ALIASES.get(word, word) for word in normalize_name(city).split())
+
+
+def normalize_country(country: Optional[str]) -> str:
+    name = normalize_name(country)
+    return COUNTRY_ALIASES.get(name, name)
+
+
+def destination_key(city: Optional[str], country: Optional[str]) -> Optional[str]:
+    """Canonical "city|country" key (None if the city has no letters/digits)"""
+    city = normalize_city(city)
+    if not city:
+        return None
+    return f"{city}|{normalize_country(country)}"
+
+
+def _prefixes(prefix: str) -> List[str]:
+    """
+    Normalised forms of what the user has typed so far
+
+    The last word may be unfinished, so it's looked up both as typed
+    and expanded ("st" → stockholm..., saint petersburg...)
+    """
+    words = normalize_name(prefix).split()
+    if not words:
+        return []
+
+    head = [CITY_WORD_ALIASES.get(word, word) for word in words[:-1]]
+    last = words[-1]
+    complete = not prefix[-1].isalnum()
+
+    forms = {" ".join(head + [CITY_WORD_ALIASES.get(last, last)])}
+    if not complete:
+        forms.add(" ".join(head + [last]))
+    return sorted(forms)
+
+
+# ============================================
+# IN-MEMORY INDEX
+# ============================================
+
+# (normalised city, id, city_name, country)
+Entry = Tuple[str, int, str, str]
+
+
+class DestinationIndex:
+    """
+    Every destination in memory, sorted by normalised city name
+
+    A prefix lookup is one bisect to the first name >= prefix and a walk
+    while names still start with it (what a trie would do, in one flat
+    sorted list). Matches are ranked by how many stops use them.
+
+    - Loaded from the destinations table on startup
+    - refresh() only reads destinations with id > last_id, so new cities
+      (from this process or any other) show up without a reload
+    - Stop counts are recounted by a full reload every
+      DESTINATION_RELOAD_SECONDS, and bumped in between as stops are added
+    """
+
+    def __init__(self):
+        self._entries: List[Entry] = []
+        self._ids: Dict[str, int] = {}       # key → id
+        self._counts: Counter = Counter()    # id → stops
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self.last_id = 0
+        self.loaded_at = 0.0                 # Last full load
+        self.refreshed_at = 0.0              # Last load or incremental refresh
+        self.stale = True                    # New destinations were committed
+
+    def __len__(self):
+        return len(self._entries)
+
+    def lookup(self, key: str) -> Optional[int]:
+        return self._ids.get(key)
+
+    def suggest(self, prefixes: Iterable[str], limit: int) -> List[dict]:
+        """Destinations whose normalised city starts with any prefix, most used first"""
+        with self._lock:
+            found = {}
+            for prefix in prefixes:
+                i = bisect_left(self._entries, (prefix,))
+                while i < len(self._entries) and self._entries[i][0].startswith(prefix):
+                    entry = self._entries[i]
+                    found[entry[1]] = entry
+                    i += 1
+
+            best = nsmallest(limit, found.values(), key=lambda entry: (-self._counts[entry[1]], entry))
+
+            return [
+                {
+                    "id": destination_id,
+                    "city_name": city_name,
+                    "country": country,
+                    "stop_count": self._counts[destination_id]
+                }
+                for _, destination_id, city_name, country in best
+            ]
+
+    def stops_added(self, destination_ids: Counter, created: bool) -> None:
+        """Called after a commit that assigned destinations to new stops"""
+        with self._lock:
+            self._counts.update(destination_ids)
+            if created:
+                self.stale = True
+
+    def load(self, db: Session) -> None:
+        """Replace everything with the current table contents"""
+        loaded_at = time.monotonic()
+        rows = db.execute(
+            select(Destination.id, Destination.key, Destination.city_name, Destination.country)
+        ).all()
+        counts = Counter(dict(db.execute(
+            select(Stop.destination_id, func.count(Stop.id))
+            .where(Stop.destination_id.isnot(None))
+            .group_by(Stop.destination_id)
+        ).all()))
+
+        entries = sorted(
+            (key.split("|", 1)[0], destination_id, city_name, country)
+            for destination_id, key, city_name, country in rows
+        )
+        ids = {key: destination_id for destination_id, key, _, _ in rows}
+
+        with self._lock:
+            self._entries = entries
+            self._ids = ids
+            self._counts = counts
+            self.last_id = max(ids.values(), default=0)
+            self.loaded_at = self.refreshed_at = loaded_at
+            self.stale = False
+
+    def refresh(self, db: Session) -> int:
+        """Merge in destinations created since the last load; returns how many"""
+        refreshed_at = time.monotonic()
+        rows = db.execute(
+            select(Destination.id, Destination.key, Destination.city_name, Destination.country)
+            .where(Destination.id > self.last_id)
+            .order_by(Destination.id)
+        ).all()
+        counts = db.execute(
+            select(Stop.destination_id, func.count(Stop.id))
+            .where(Stop.destination_id > self.last_id)
+            .group_by(Stop.destination_id)
+        ).all() if rows else []
+
+        with self._lock:
+            for destination_id, key, city_name, country in rows:
+                if key in self._ids:
+                    continue
+                insort(self._entries, (key.split("|", 1)[0], destination_id, city_name, country))
+                self._ids[key] = destination_id
+                self.last_id = max(self.last_id, destination_id)
+            for destination_id, count in counts:
+                self._counts[destination_id] = count
+            self.refreshed_at = refreshed_at
+            self.stale = False
+
+        return len(rows)
+
+    def ensure_fresh(self, db: Session) -> None:
+        """Full reload or incremental refresh, whichever is due"""
+        now = time.monotonic()
+        reload_due = now - self.loaded_at > settings.DESTINATION_RELOAD_SECONDS
+        refresh_due = self.stale or now - self.refreshed_at > settings.DESTINATION_REFRESH_SECONDS
+        if not (reload_due or refresh_due):
+            return
+
+        # One request refreshes; the others keep using the current index
+        if not self._refresh_lock.acquire(blocking=not self._entries):
+            return
+        try:
+            if reload_due:
+                self.load(db)
+            else:
+                self.refresh(db)
+        finally:
+            self._refresh_lock.release()
+
+
+destination_index = DestinationIndex()
+
+
+# ============================================
+# ASSIGNING STOPS TO DESTINATIONS
+# ============================================
+
+_SESSION_KEY = "assigned_destinations"
+
+
+def _insert_missing(connection, names: Dict[str, Tuple[str, str]]) -> bool:
+    """
+    Create destinations for keys that don't exist yet
+
+    INSERT ... ON CONFLICT DO NOTHING, so two requests adding the same
+    new city at once both end up with the one row
+    Returns True if anything was created
+    """
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    result = connection.execute(
+        insert(Destination).on_conflict_do_nothing(index_elements=["key"]),
+        [
+            {"key": key, "city_name": city_name.strip(), "country": country.strip()}
+            for key, (city_name, country) in names.items()
+        ]
+    )
+    return bool(result.rowcount)
+
+
+def resolve_destinations(connection, names: Dict[str, Tuple[str, str]]) -> Tuple[Dict[str, int], bool]:
+    """
+    key → destination id for every key in names (key → display names),
+    creating the missing ones in the connection's transaction
+
+    Returns (ids, created)
+    """
+    ids = {}
+    missing = {}
+    for key, display in names.items():
+        destination_id = destination_index.lookup(key)
+        if destination_id is None:
+            missing[key] = display
+        else:
+            ids[key] = destination_id
+
+    if not missing:
+        return ids, False
+
+    found = dict(connection.execute(
+        select(Destination.key, Destination.id).where(Destination.key.in_(missing))
+    ).all())
+
+    created = False
+    new = {key: display for key, display in missing.items() if key not in found}
+    if new:
+        created = _insert_missing(connection, new)
+        found.update(connection.execute(
+            select(Destination.key, Destination.id).where(Destination.key.in_(new))
+        ).all())
+
+    ids.update(found)
+    return ids, created
+
+
+def _names_changed(stop: Stop) -> bool:
+    state = inspect(stop)
+    return (
+        state.attrs.city_name.history.has_changes()
+        or state.attrs.country.history.has_changes()
+    )
+
+
+@event.listens_for(Session, "before_flush")
+def _assign_destinations(session, flush_context, instances):
+    """Point new stops (and stops whose city/country changed) at their destination"""
+    stops = {}
+    for obj in chain(session.new, session.dirty):
+        if isinstance(obj, Stop) and (obj in session.new or _names_changed(obj)):
+            stops[obj] = destination_key(obj.city_name, obj.country)
+
+    if not stops:
+        return
+
+    names = {key: (stop.city_name, stop.country) for stop, key in stops.items() if key}
+    ids, created = resolve_destinations(session.connection(), names) if names else ({}, False)
+
+    assigned = session.info.setdefault(_SESSION_KEY, [Counter(), False])
+    for stop, key in stops.items():
+        stop.destination_id = ids.get(key)
+        if stop in session.new and stop.destination_id is not None:
+            assigned[0][stop.destination_id] += 1
+    assigned[1] = assigned[1] or created
+
+
+@event.listens_for(Session, "after_commit")
+def _index_assigned_destinations(session):
+    assigned = session.info.pop(_SESSION_KEY, None)
+    if assigned:
+        destination_index.stops_added(*assigned)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_assigned_destinations(session):
+    session.info.pop(_SESSION_KEY, None)
+
+
+class DestinationService:
+    """Canonical destinations for free-text stop cities"""
+
+    @staticmethod
+    def suggest(db: Session, prefix: str, limit: int = 10) -> List[dict]:
+        """
+        Autocomplete: destinations whose city starts with prefix
+        (accent/case-insensitive), most used first
+        """
+        prefixes = _prefixes(prefix)
+        if not prefixes:
+            return []
+
+        destination_index.ensure_fresh(db)
+        return destination_index.suggest(prefixes, limit)
+
+    @staticmethod
+    def link_unassigned_stops(db: Session) -> int:
+        """
+        Give stops without a destination_id one (stops from before the
+        dictionary existed, or written with Core inserts like the bulk
+        import). The caller commits.
+
+        Each destination is named after its most common spelling
+        Returns how many stops were linked
+        """
+        connection = db.connection()
+
+        spellings = connection.execute(
+            select(Stop.city_name, Stop.country, func.count(Stop.id))
+            .where(Stop.destination_id.is_(None))
+            .group_by(Stop.city_name, Stop.country)
+        ).all()
+        if not spellings:
+            return 0
+
+        names = {}
+        best = {}
+        for city_name, country, count in spellings:
+            key = destination_key(city_name, country)
+            if key and count > best.get(key, 0):
+                best[key] = count
+                names[key] = (city_name, country)
+
+        ids, created = resolve_destinations(connection, names) if names else ({}, False)
+
+        link = update(Stop.__table__).where(
+            Stop.__table__.c.id == bindparam("stop_id")
+        ).values(destination_id=bindparam("new_destination_id"))
+
+        linked = 0
+        counts = Counter()
+        last_id = 0
+        while True:
+            batch = connection.execute(
+                select(Stop.id, Stop.city_name, Stop.country)
+                .where(Stop.destination_id.is_(None), Stop.id > last_id)
+                .order_by(Stop.id)
+                .limit(LINK_BATCH_SIZE)
+            ).all()
+            if not batch:
+                break
+            last_id = batch[-1][0]
+
+            params = []
+            for stop_id, city_name, country in batch:
+                destination_id = ids.get(destination_key(city_name, country))
+                if destination_id is not None:
+                    params.append({"stop_id": stop_id, "new_destination_id": destination_id})
+                    counts[destination_id] += 1
+
+            if params:
+                connection.execute(link, params)
+                linked += len(params)
+
+        if linked or created:
+            assigned = db.info.setdefault(_SESSION_KEY, [Counter(), False])
+            assigned[0].update(counts)
+            assigned[1] = assigned[1] or created
+
+        return linked
+
+    @staticmethod
+    def popular_destinations(db: Session, limit: int = 10) -> List[dict]:
+        """
+        Most visited destinations, grouped by canonical destination
+
+        Read only: stops are linked when they're written (before_flush),
+        by the link_destinations job after Core inserts, and at startup
+        """
+        rows = db.query(
+            Destination.id,
+            Destination.city_name,
+            Destination.country,
+            func.count(Stop.id).label("count")
+        ).join(Stop, Stop.destination_id == Destination.id).group_by(
+            Destination.id, Destination.city_name, Destination.country
+        ).order_by(
+            func.count(Stop.id).desc()
+        ).limit(limit).all()
+
+        return [
+            {"destination_id": destination_id, "city": city_name, "country": country, "count": count}
+            for destination_id, city_name, country, count in rows
+        ]
+
+
+@job_handler("link_destinations")
+def _link_destinations_job(db: Session, payload: dict) -> None:
+    """Queued after Core inserts of stops (bulk import)"""
+    DestinationService.link_unassigned_stops(db)
+
+
+# ============================================
+# STARTUP
+# ============================================
+
+def install_destinations(connection) -> None:
+    """
+    Create the destinations table and stops.destination_id on databases
+    created before they existed (idempotent)
+    """
+    Destination.__table__.create(connection, checkfirst=True)
+
+    columns = {column["name"] for column in inspect(connection).get_columns("stops")}
+    if "destination_id" not in columns:
+        connection.execute(text(
+            "ALTER TABLE stops ADD COLUMN destination_id INTEGER REFERENCES destinations(id)"
+        ))
+        connection.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_stops_destination_id ON stops (destination_id)"
+        ))
+
+
+def load_destinations_on_startup() -> None:
+    """Seed the dictionary from existing stops and load the index"""
+    try:
+        with write_engine.begin() as connection:
+            install_destinations(connection)
+
+        db = WriteSessionLocal()
+        try:
+            linked = DestinationService.link_unassigned_stops(db)
+            db.commit()
+            destination_index.load(db)
+        finally:
+            db.close()
+
+        print(f"✅ Destination index loaded: {len(destination_index)} destinations ({linked} stops linked)")
+    except Exception as e:
+        print(f"⚠️ Destination index not loaded: {str(e)}")
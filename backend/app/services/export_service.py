@@ -0,0 +1,299 @@
+# backend/app/services/export_service.py
+
+import csv
+import io
+import json
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta
+from typing import Iterator
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from ..database import SessionLocal
+from ..models.trip import Trip
+from ..models.stop import Stop
+from ..models.activity import Activity
+from ..models.budget import BudgetRecord
+from ..schemas.trip import TripResponse
+from ..schemas.stop import StopResponse
+from ..schemas.activity import ActivityResponse
+from ..schemas.budget import BudgetRecordResponse
+from ..utils.serializers import RowSerializer
+
+# Rows fetched per round trip (server-side cursor on Postgres)
+EXPORT_BATCH_SIZE = 1000
+
+# NDJSON record types, parents first so an importer can remap ids as it reads
+EXPORT_TABLES = (
+    ("trip", RowSerializer(Trip, TripResponse)),
+    ("stop", RowSerializer(Stop, StopResponse)),
+    ("activity", RowSerializer(Activity, ActivityResponse)),
+    ("budget_record", RowSerializer(BudgetRecord, BudgetRecordResponse)),
+)
+
+LEDGER_COLUMNS = ("trip_id", "record_id", "date", "category", "amount", "notes", "running_total")
+
+
+def _json_default(value):
+    """Dates/times as ISO strings (same as the JSON responses)"""
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    return str(value)
+
+
+@contextmanager
+def _export_session() -> Iterator[Session]:
+    """
+    One session for a whole export, independent of the request's session
+
+    All of its queries run in one read transaction, so every table is
+    read from the same snapshot (no stop whose trip wasn't exported,
+    no activity missing because it moved mid-export). It lives as long
+    as the response is being sent.
+    """
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _stream(db: Session, query, *criteria) -> Iterator[list]:
+    """Run a query and yield batches of rows"""
+    result = db.execute(
+        query.where(*criteria).execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    for rows in result.partitions():
+        yield rows
+
+
+def _trip_ids(*trip_criteria):
+    """Ids of the exported trips, as a subquery for the child tables"""
+    return select(Trip.id).where(*trip_criteria).scalar_subquery()
+
+
+# ============================================
+# iCalendar helpers
+# ============================================
+
+def _ics_text(value) -> str:
+    """Escape a TEXT value (RFC 5545 3.3.11)"""
+    return (
+        str(value or "")
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _ics_line(line: str) -> str:
+    """Fold a content line to 75 octets (RFC 5545 3.1)"""
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line + "\r\n"
+
+    parts = []
+    limit = 75
+    while encoded:
+        cut = min(limit, len(encoded))
+        # Don't split a UTF-8 sequence
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode())
+        encoded = encoded[cut:]
+        limit = 74  # Continuation lines start with a space
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _ics_event(uid: str, stamp: str, start: str, end: str, summary: str,
+               description=None, location=None) -> str:
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{uid}",
+        f"DTSTAMP:{stamp}",
+        start,
+        end,
+        f"SUMMARY:{_ics_text(summary)}",
+    ]
+    if description:
+        lines.append(f"DESCRIPTION:{_ics_text(description)}")
+    if location:
+        lines.append(f"LOCATION:{_ics_text(location)}")
+    lines.append("END:VEVENT")
+    return "".join(_ics_line(line) for line in lines)
+
+
+class ExportService:
+    """
+    Streaming exports of trips and everything under them
+
+    Each exporter is a generator of bytes chunks (one per batch of rows),
+    meant for a StreamingResponse. Rows are read with yield_per,
+    so memory use doesn't grow with the size of the export.
+
+    trip_criteria select the trips, e.g. (Trip.id == 5,) for one trip
+    or () for everything (admin export)
+    """
+
+    @staticmethod
+    def ndjson(*trip_criteria) -> Iterator[bytes]:
+        """
+        One JSON object per line, parents before children:
+        {"type": "trip", "data": {"id": 1, "name": "Europe", ...}}
+        {"type": "stop", "data": {"id": 3, "trip_id": 1, ...}}
+        {"type": "activity", "data": {"id": 9, "stop_id": 3, ...}}
+        {"type": "budget_record", "data": {"id": 4, "trip_id": 1, ...}}
+        """
+        trip_ids = _trip_ids(*trip_criteria)
+        criteria = {
+            "trip": trip_criteria,
+            "stop": (Stop.trip_id.in_(trip_ids),),
+            "activity": (Activity.stop_id.in_(
+                select(Stop.id).where(Stop.trip_id.in_(trip_ids)).scalar_subquery()
+            ),),
+            "budget_record": (BudgetRecord.trip_id.in_(trip_ids),),
+        }
+
+        with _export_session() as db:
+            for record_type, rows in EXPORT_TABLES:
+                query = select(*rows.columns).order_by(rows.model.id)
+                prefix = f'{{"type":"{record_type}","data":'
+
+                for batch in _stream(db, query, *criteria[record_type]):
+                    yield "".join(
+                        prefix + json.dumps(
+                            dict(zip(rows.fields, row)),
+                            default=_json_default,
+                            separators=(",", ":")
+                        ) + "}\n"
+                        for row in batch
+                    ).encode()
+
+    @staticmethod
+    def budget_csv(*trip_criteria) -> Iterator[bytes]:
+        """
+        Budget ledger: every expense in date order with a running total per trip
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(LEDGER_COLUMNS)
+        yield buffer.getvalue().encode()
+
+        query = select(
+            BudgetRecord.trip_id,
+            BudgetRecord.id,
+            BudgetRecord.date,
+            BudgetRecord.category,
+            BudgetRecord.amount,
+            BudgetRecord.notes
+        ).order_by(BudgetRecord.trip_id, BudgetRecord.date, BudgetRecord.id)
+
+        current_trip = None
+        running_total = 0.0
+
+        with _export_session() as db:
+            for batch in _stream(db, query, BudgetRecord.trip_id.in_(_trip_ids(*trip_criteria))):
+                buffer.seek(0)
+                buffer.truncate()
+
+                for trip_id, record_id, spent_at, category, amount, notes in batch:
+                    if trip_id != current_trip:
+                        current_trip = trip_id
+                        running_total = 0.0
+
+                    amount = float(amount)
+                    running_total += amount
+                    writer.writerow((
+                        trip_id,
+                        record_id,
+                        spent_at.isoformat() if spent_at else "",
+                        category,
+                        f"{amount:.2f}",
+                        notes or "",
+                        f"{running_total:.2f}"
+                    ))
+
+                yield buffer.getvalue().encode()
+
+    @staticmethod
+    def ics(*trip_criteria) -> Iterator[bytes]:
+        """
+        iCalendar file: one all-day event per stop (arrival → departure)
+        and one event per activity (timed when it has a start time)
+        """
+        stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+        yield "".join(_ics_line(line) for line in (
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            "PRODID:-//GlobeTrotter//Trip Export//EN",
+            "CALSCALE:GREGORIAN",
+        )).encode()
+
+        with _export_session() as db:
+            trip_ids = _trip_ids(*trip_criteria)
+
+            stops = select(
+                Stop.id, Stop.city_name, Stop.country,
+                Stop.arrival_date, Stop.departure_date, Stop.description
+            ).order_by(Stop.trip_id, Stop.arrival_date)
+
+            for batch in _stream(db, stops, Stop.trip_id.in_(trip_ids)):
+                yield "".join(
+                    _ics_event(
+                        f"stop-{stop_id}@globetrotter",
+                        stamp,
+                        f"DTSTART;VALUE=DATE:{arrival:%Y%m%d}",
+                        f"DTEND;VALUE=DATE:{departure + timedelta(days=1):%Y%m%d}",
+                        f"{city}, {country}",
+                        description
+                    )
+                    for stop_id, city, country, arrival, departure, description in batch
+                ).encode()
+
+            activities = select(
+                Activity.id, Activity.name, Activity.description,
+                Activity.date_scheduled, Activity.time_start, Activity.duration_hours,
+                Stop.city_name, Stop.country
+            ).join(Stop, Stop.id == Activity.stop_id).order_by(
+                Activity.date_scheduled, Activity.time_start, Activity.id
+            )
+
+            for batch in _stream(db, activities, Stop.trip_id.in_(trip_ids)):
+                events = []
+                for activity_id, name, description, day, start, duration, city, country in batch:
+                    if start is not None:
+                        begins = datetime.combine(day, start)
+                        ends = begins + timedelta(hours=float(duration or 1))
+                        dtstart = f"DTSTART:{begins:%Y%m%dT%H%M%S}"
+                        dtend = f"DTEND:{ends:%Y%m%dT%H%M%S}"
+                    else:
+                        dtstart = f"DTSTART;VALUE=DATE:{day:%Y%m%d}"
+                        dtend = f"DTEND;VALUE=DATE:{day + timedelta(days=1):%Y%m%d}"
+
+                    events.append(_ics_event(
+                        f"activity-{activity_id}@globetrotter",
+                        stamp, dtstart, dtend, name, description, f"{city}, {country}"
+                    ))
+                yield "".join(events).encode()
+
+        yield _ics_line("END:VCALENDAR").encode()
+
+
+# format → (exporter, media type, file extension)
+EXPORT_FORMATS = {
+    "ndjson": (ExportService.ndjson, "application/x-ndjson", "ndjson"),
+    "csv": (ExportService.budget_csv, "text/csv", "csv"),
+    "ics": (ExportService.ics, "text/calendar", "ics"),
+}
+
+
+def export_response(format: str, filename: str, *trip_criteria) -> StreamingResponse:
+    """StreamingResponse for an export, sent as a file download"""
+    exporter, media_type, extension = EXPORT_FORMATS[format]
+    return StreamingResponse(
+        exporter(*trip_criteria),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{extension}"'}
+    )
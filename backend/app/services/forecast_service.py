@@ -0,0 +1,342 @@
+# backend/app/services/forecast_service.py
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
+from sqlalchemy import Float, String, func, select, type_coerce
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..models.trip import Trip
+from ..models.stop import Stop
+from ..models.activity import Activity
+from ..models.budget import BudgetRecord
+from ..utils.constants import BUDGET_CATEGORIES
+
+# numpy is imported where it's used: it's only needed once a forecast
+# is asked for, not to start a worker
+if TYPE_CHECKING:
+    import numpy as np
+
+# ============================================
+# SPEND MODEL
+# ============================================
+# Built from every trip's budget records:
+#
+#   daily spend per category = category total / trip length (days)
+#
+# grouped by the trip's cost index (its stops' cost_index, weighted by
+# nights) into whole-number buckets 1..10. Bucket 0 holds all trips
+# and is used for stops without a cost index.
+#
+# A forecast is then: nights at each stop × that stop's bucket rates.
+
+COST_INDEX_BUCKETS = 10
+
+# Trips at the overall average mixed into every bucket,
+# so a bucket with a couple of trips doesn't swing the forecast
+PRIOR_TRIPS = 5
+
+# Spread of the daily total among similar trips (low/high forecast)
+LOW_PERCENTILE = 10
+HIGH_PERCENTILE = 90
+
+_CATEGORY_INDEX = {name: i for i, name in enumerate(BUDGET_CATEGORIES)}
+_OTHER = _CATEGORY_INDEX["other"]
+_ACTIVITIES = _CATEGORY_INDEX["activities"]
+
+
+def cost_index_bucket(cost_index) -> "np.ndarray":
+    """Bucket per cost index: 1..10 by whole number, 0 when missing"""
+    import numpy as np
+    values = np.asarray(cost_index, dtype=float)
+    buckets = np.clip(np.floor(np.nan_to_num(values, nan=0.0)), 1, COST_INDEX_BUCKETS)
+    return np.where(np.isnan(values), 0, buckets).astype(np.intp)
+
+
+def _nights(arrivals: "np.ndarray", departures: "np.ndarray") -> "np.ndarray":
+    """Nights at each stop (at least 1, so day trips count)"""
+    import numpy as np
+    return np.maximum((departures - arrivals).astype(np.int64), 1).astype(float)
+
+
+def _as_float(column):
+    return type_coerce(column, Float)
+
+
+def _as_text(column):
+    return type_coerce(column, String)
+
+
+@dataclass
+class ForecastModel:
+    """Daily spend rates per cost index bucket (row 0 = all trips)"""
+    rates: "np.ndarray"     # (buckets + 1, categories) mean daily spend
+    low: "np.ndarray"       # (buckets + 1,) low daily total
+    high: "np.ndarray"      # (buckets + 1,) high daily total
+    trips: int              # Trips with budget records
+    generation: int         # Bumped on every rebuild
+    built_at: float
+
+
+def build_forecast_model(db: Session, generation: int = 0) -> ForecastModel:
+    """
+    Read the spend history once and reduce it to per-bucket rates
+
+    Three queries (spend per trip/category, trip lengths, stop stays);
+    everything after that is array arithmetic
+    """
+    import numpy as np
+
+    buckets = COST_INDEX_BUCKETS + 1
+    categories = len(BUDGET_CATEGORIES)
+
+    # Plain Core rows, no Decimal/date objects per value: dates come back
+    # as stored (ISO text on SQLite) and numpy parses them in bulk
+    connection = db.connection()
+
+    spend_rows = connection.execute(
+        select(BudgetRecord.trip_id, BudgetRecord.category, _as_float(func.sum(BudgetRecord.amount)))
+        .join(Trip, Trip.id == BudgetRecord.trip_id)
+        .where(Trip.is_deleted == False)
+        .group_by(BudgetRecord.trip_id, BudgetRecord.category)
+    ).all()
+
+    trip_ids = np.unique(np.fromiter((row[0] for row in spend_rows), dtype=np.int64, count=len(spend_rows)))
+    count = len(trip_ids)
+    if not count:
+        return ForecastModel(
+            rates=np.zeros((buckets, categories)),
+            low=np.zeros(buckets),
+            high=np.zeros(buckets),
+            trips=0,
+            generation=generation,
+            built_at=time.monotonic()
+        )
+
+    # Spend matrix: one row per trip, one column per category
+    spend = np.zeros((count, categories))
+    np.add.at(
+        spend,
+        (
+            np.searchsorted(trip_ids, [row[0] for row in spend_rows]),
+            [_CATEGORY_INDEX.get(row[1], _OTHER) for row in spend_rows]
+        ),
+        np.array([row[2] or 0.0 for row in spend_rows])
+    )
+
+    # The same trips as spend_rows (deleted trips left out), so every
+    # id below has a row in trip_ids
+    history = (
+        select(BudgetRecord.trip_id)
+        .join(Trip, Trip.id == BudgetRecord.trip_id)
+        .where(Trip.is_deleted == False)
+        .distinct()
+        .correlate(None)
+        .scalar_subquery()
+    )
+
+    trips = connection.execute(
+        select(Trip.id, _as_text(Trip.start_date), _as_text(Trip.end_date)).where(Trip.id.in_(history))
+    ).all()
+    days = np.ones(count)
+    if trips:
+        ids, starts, ends = zip(*trips)
+        positions = np.searchsorted(trip_ids, ids)
+        starts = np.array(starts, dtype="datetime64[D]")
+        ends = np.array(ends, dtype="datetime64[D]")
+        days[positions] = np.maximum((ends - starts).astype(np.int64) + 1, 1)
+
+    # Trip cost index = stops' cost_index weighted by nights
+    stays = connection.execute(
+        select(Stop.trip_id, _as_text(Stop.arrival_date), _as_text(Stop.departure_date), _as_float(Stop.cost_index))
+        .where(Stop.trip_id.in_(history), Stop.cost_index.isnot(None))
+    ).all()
+    cost_index = np.full(count, np.nan)
+    if stays:
+        ids, arrivals, departures, stop_cost_index = zip(*stays)
+        positions = np.searchsorted(trip_ids, ids)
+        nights = _nights(
+            np.array(arrivals, dtype="datetime64[D]"),
+            np.array(departures, dtype="datetime64[D]")
+        )
+        weighted = np.bincount(positions, weights=nights * np.array(stop_cost_index), minlength=count)
+        total_nights = np.bincount(positions, weights=nights, minlength=count)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cost_index = np.where(total_nights > 0, weighted / total_nights, np.nan)
+
+    daily = spend / days[:, None]
+    daily_total = daily.sum(axis=1)
+    trip_buckets = cost_index_bucket(cost_index)
+
+    overall = daily.mean(axis=0)
+    overall_low, overall_high = np.percentile(daily_total, [LOW_PERCENTILE, HIGH_PERCENTILE])
+
+    # Per-bucket sums in one pass, then shrink toward the overall mean
+    sums = np.zeros((buckets, categories))
+    np.add.at(sums, trip_buckets, daily)
+    sizes = np.bincount(trip_buckets, minlength=buckets).astype(float)
+
+    rates = (sums + PRIOR_TRIPS * overall) / (sizes + PRIOR_TRIPS)[:, None]
+    rates[0] = overall
+
+    low = np.full(buckets, overall_low)
+    high = np.full(buckets, overall_high)
+    for bucket in range(1, buckets):
+        if sizes[bucket] >= PRIOR_TRIPS:
+            low[bucket], high[bucket] = np.percentile(
+                daily_total[trip_buckets == bucket], [LOW_PERCENTILE, HIGH_PERCENTILE]
+            )
+
+    return ForecastModel(
+        rates=rates,
+        low=low,
+        high=high,
+        trips=count,
+        generation=generation,
+        built_at=time.monotonic()
+    )
+
+
+class ForecastModelCache:
+    """
+    The current ForecastModel, rebuilt every FORECAST_MODEL_TTL seconds
+
+    History across all trips moves slowly, so requests never scan it;
+    while one request rebuilds, the others keep using the old model
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._model: Optional[ForecastModel] = None
+        self._lock = threading.Lock()
+
+    def get(self, db: Session) -> ForecastModel:
+        model = self._model
+        if model is not None and time.monotonic() - model.built_at < self.ttl:
+            return model
+
+        # Only the first build makes requests wait
+        if not self._lock.acquire(blocking=model is None):
+            return model
+        try:
+            if self._model is model:
+                generation = model.generation + 1 if model else 1
+                self._model = build_forecast_model(db, generation)
+            return self._model
+        finally:
+            self._lock.release()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._model = None
+
+
+forecast_models = ForecastModelCache(settings.FORECAST_MODEL_TTL)
+
+
+class ForecastService:
+    """Projected spend for a trip"""
+
+    @staticmethod
+    def get_model(db: Session) -> ForecastModel:
+        return forecast_models.get(db)
+
+    @staticmethod
+    def get_trip_forecast(db: Session, trip_id: int, user_id: Optional[int] = None) -> Optional[dict]:
+        """
+        Projected total and per-category spend
+
+        - Each stop: nights × daily rates of its cost index bucket
+        - Trip days not covered by stops: the all-trips rates
+        - Every category: at least what's already been spent on it
+        - Activities: at least what's already scheduled (activity costs)
+
+        Returns None if the trip doesn't exist (or isn't the user's)
+        """
+        import numpy as np
+
+        trip_query = db.query(Trip.start_date, Trip.end_date, Trip.budget_limit).filter(
+            Trip.id == trip_id,
+            Trip.is_deleted == False
+        )
+        if user_id is not None:
+            trip_query = trip_query.filter(Trip.user_id == user_id)
+
+        trip = trip_query.first()
+        if not trip:
+            return None
+
+        stops = db.query(
+            Stop.id, Stop.city_name, Stop.arrival_date, Stop.departure_date, Stop.cost_index
+        ).filter(Stop.trip_id == trip_id).order_by(Stop.sequence_order).all()
+
+        scheduled = db.query(func.coalesce(func.sum(Activity.cost), 0)).join(
+            Stop, Stop.id == Activity.stop_id
+        ).filter(Stop.trip_id == trip_id).scalar()
+
+        spent_rows = db.query(BudgetRecord.category, func.sum(BudgetRecord.amount)).filter(
+            BudgetRecord.trip_id == trip_id
+        ).group_by(BudgetRecord.category).all()
+
+        model = forecast_models.get(db)
+
+        nights = _nights(
+            np.array([stop.arrival_date for stop in stops], dtype="datetime64[D]"),
+            np.array([stop.departure_date for stop in stops], dtype="datetime64[D]")
+        )
+        buckets = cost_index_bucket([
+            float(stop.cost_index) if stop.cost_index is not None else np.nan for stop in stops
+        ])
+
+        days = max((trip.end_date - trip.start_date).days + 1, 1)
+        unplaced = max(days - nights.sum(), 0.0)
+
+        per_stop = model.rates[buckets] * nights[:, None]
+        categories = per_stop.sum(axis=0) + unplaced * model.rates[0]
+        low_total = float(nights @ model.low[buckets] + unplaced * model.low[0])
+        high_total = float(nights @ model.high[buckets] + unplaced * model.high[0])
+
+        # Recorded spend and planned activities are spend we already know
+        # about: no category is projected below them
+        known = np.zeros(len(_CATEGORY_INDEX))
+        for category, amount in spent_rows:
+            known[_CATEGORY_INDEX.get(category, _OTHER)] += float(amount or 0)
+        spent = float(known.sum())
+
+        scheduled = float(scheduled)
+        known[_ACTIVITIES] = max(known[_ACTIVITIES], scheduled)
+
+        floored = np.maximum(categories, known)
+        extra = float(floored.sum() - categories.sum())
+        categories = floored
+
+        projected_total = float(categories.sum())
+        known_total = float(known.sum())
+        budget_limit = float(trip.budget_limit) if trip.budget_limit is not None else None
+
+        return {
+            "trip_id": trip_id,
+            "days": days,
+            "categories": {
+                name: round(float(categories[i]), 2) for name, i in _CATEGORY_INDEX.items()
+            },
+            "projected_total": round(projected_total, 2),
+            "low_total": round(max(low_total + extra, known_total), 2),
+            "high_total": round(max(high_total + extra, known_total), 2),
+            "scheduled_activities": round(scheduled, 2),
+            "spent_to_date": round(spent, 2),
+            "budget_limit": budget_limit,
+            "over_budget": budget_limit is not None and projected_total > budget_limit,
+            "history_trips": model.trips,
+            "stops": [
+                {
+                    "id": stop.id,
+                    "city_name": stop.city_name,
+                    "days": int(nights[i]),
+                    "cost_index": float(stop.cost_index) if stop.cost_index is not None else None,
+                    "projected": round(float(per_stop[i].sum()), 2)
+                }
+                for i, stop in enumerate(stops)
+            ]
+        }
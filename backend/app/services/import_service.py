@@ -0,0 +1,320 @@
+# backend/app/services/import_service.py
+
+import csv
+import json
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from ..models.trip import Trip
+from ..models.stop import Stop
+from ..models.activity import Activity
+from ..models.budget import BudgetRecord
+from ..schemas.trip import TripCreate
+from ..schemas.stop import StopCreate
+from ..schemas.activity import ActivityCreate
+from ..schemas.budget import BudgetRecordCreate
+from ..utils.trip_changes import mark_trips_changed
+from ..utils.budget_watch import record_spend
+from ..utils.trip_events import record_trip_events, trip_event
+from ..utils.jobs import enqueue_job
+from ..utils.validators import TripValidator, ActivityValidator
+from .schedule_service import PendingSchedules
+
+# Rows per multi-row INSERT
+IMPORT_BATCH_SIZE = 1000
+
+# Errors kept in the report (the import still counts all of them)
+MAX_REPORTED_ERRORS = 100
+
+
+def _check_trip(trip: TripCreate) -> None:
+    TripValidator.validate_dates(trip.start_date, trip.end_date)
+    if trip.budget_limit is not None:
+        TripValidator.validate_budget(trip.budget_limit)
+
+
+def _check_activity(activity: ActivityCreate) -> None:
+    if activity.cost is not None:
+        ActivityValidator.validate_cost(activity.cost)
+    if activity.duration_hours is not None:
+        ActivityValidator.validate_duration(activity.duration_hours)
+
+
+@dataclass
+class _RecordType:
+    """How one record type of the dump is validated and inserted"""
+    model: type
+    schema: type
+    parent: Optional[str]        # Record type the parent id points at
+    parent_field: Optional[str]  # Field holding the parent id
+    check: Optional[Callable[[BaseModel], None]] = None
+    amount_field: Optional[str] = None  # Counted in the trip's spent_total
+
+
+RECORD_TYPES = {
+    "trip": _RecordType(Trip, TripCreate, None, None, _check_trip),
+    "stop": _RecordType(Stop, StopCreate, "trip", "trip_id"),
+    "activity": _RecordType(Activity, ActivityCreate, "stop", "stop_id", _check_activity, "cost"),
+    "budget_record": _RecordType(BudgetRecord, BudgetRecordCreate, "trip", "trip_id", amount_field="amount"),
+}
+
+# Parents are always written before their children
+_FLUSH_ORDER = ("trip", "stop", "activity", "budget_record")
+
+
+@dataclass
+class ImportResult:
+    """What an import did (or would have done)"""
+    committed: bool = False
+    created: Dict[str, int] = field(default_factory=lambda: {name: 0 for name in RECORD_TYPES})
+    error_count: int = 0
+    errors: List[dict] = field(default_factory=list)
+
+    def add_error(self, line: int, message: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": message})
+
+    def as_dict(self) -> dict:
+        return {
+            "committed": self.committed,
+            "created": self.created,
+            "error_count": self.error_count,
+            "errors": sorted(self.errors, key=lambda error: error["line"])
+        }
+
+
+# ============================================
+# PARSERS (line number, record type, data)
+# ============================================
+
+def parse_ndjson(lines: Iterable[str]) -> Iterator[Tuple[int, Optional[str], dict]]:
+    """
+    Records in the export format:
+    {"type": "trip", "data": {"id": 1, "name": "Europe", ...}}
+    """
+    for number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield number, None, {"_error": f"Invalid JSON: {str(e)}"}
+            continue
+
+        if not isinstance(record, dict) or not isinstance(record.get("data"), dict):
+            yield number, None, {"_error": "Expected {\"type\": ..., \"data\": {...}}"}
+            continue
+
+        yield number, record.get("type"), record["data"]
+
+
+def parse_csv(lines: Iterable[str]) -> Iterator[Tuple[int, Optional[str], dict]]:
+    """
+    One row per record, with a "type" column and one column per field
+    (empty cells are left out):
+
+    type,id,trip_id,stop_id,name,start_date,end_date,city_name,...
+    trip,1,,,Europe,2024-06-01,2024-06-10,,...
+    stop,3,1,,,,,Paris,...
+    """
+    reader = csv.DictReader(lines)
+    for row in reader:
+        record_type = row.pop("type", None)
+        data = {key: value for key, value in row.items() if key and value not in (None, "")}
+        yield reader.line_num, record_type, data
+
+
+PARSERS = {"ndjson": parse_ndjson, "csv": parse_csv}
+
+
+class ImportService:
+    """
+    Import trip dumps (the NDJSON export, or the same records as CSV)
+
+    Pipeline, one record at a time:
+    1. parse the line
+    2. validate with the create schemas and TripValidator/ActivityValidator
+    3. buffer it; full buffers go in as one multi-row INSERT ... RETURNING id
+    4. old ids → new ids, so children point at the rows just created
+
+    Everything runs in one transaction. If any record fails, nothing is
+    committed (unless partial=True, which keeps the valid records).
+    An activity overlapping an earlier one of its stop is a failed record
+    (unless allow_conflicts=True).
+    Memory holds the current batches, the trip/stop id maps and the
+    timed activities per imported stop only.
+    """
+
+    def __init__(self, db: Session, user_id: int, allow_conflicts: bool = False):
+        self.db = db
+        self.user_id = user_id
+        self.result = ImportResult()
+        self.id_maps = {"trip": {}, "stop": {}}         # old id → new id
+        self.stop_trips = {}                             # new stop id → new trip id
+        self.buffers = {name: [] for name in RECORD_TYPES}  # (line, old id, row)
+        # Activities only go into stops created by this import
+        self.schedules = None if allow_conflicts else PendingSchedules(db, saved=False)
+
+    @classmethod
+    def run(cls, db: Session, user_id: int, lines: Iterable[str],
+            format: str = "ndjson", partial: bool = False,
+            allow_conflicts: bool = False) -> ImportResult:
+        """Import every record from lines and commit (or roll back)"""
+        importer = cls(db, user_id, allow_conflicts=allow_conflicts)
+        try:
+            for number, record_type, data in PARSERS[format](lines):
+                importer.add(number, record_type, data)
+            importer.flush_all()
+
+            # Core inserts skip the ORM hook that sets stops' destination_id;
+            # linking them can wait for the job runner
+            if importer.result.created["stop"]:
+                enqueue_job(db, "link_destinations", dedupe_key="link_destinations")
+
+            if importer.result.error_count and not partial:
+                db.rollback()
+            else:
+                db.commit()
+                importer.result.committed = True
+
+        except Exception:
+            db.rollback()
+            raise
+
+        return importer.result
+
+    def add(self, number: int, record_type: Optional[str], data: dict) -> None:
+        """Validate one record and buffer it"""
+        if "_error" in data:
+            self.result.add_error(number, data["_error"])
+            return
+
+        spec = RECORD_TYPES.get(record_type)
+        if spec is None:
+            self.result.add_error(number, f"Unknown record type: {record_type}")
+            return
+
+        payload = dict(data)
+        old_id = payload.pop("id", None)
+        parent_id = payload.get(spec.parent_field) if spec.parent_field else None
+
+        # Parent ids are remapped when the batch is written
+        if spec.parent_field in spec.schema.model_fields:
+            payload[spec.parent_field] = 0
+
+        try:
+            validated = spec.schema.model_validate(payload)
+            if spec.check:
+                spec.check(validated)
+        except ValidationError as e:
+            self.result.add_error(number, "; ".join(
+                f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}"
+                for err in e.errors()
+            ))
+            return
+        except ValueError as e:
+            self.result.add_error(number, str(e))
+            return
+
+        if spec.parent and parent_id is None:
+            self.result.add_error(number, f"{spec.parent_field} is required")
+            return
+
+        row = validated.model_dump()
+        if spec.parent_field:
+            row[spec.parent_field] = parent_id
+        if record_type == "trip":
+            row["user_id"] = self.user_id
+
+        self.buffers[record_type].append((number, old_id, row))
+        if len(self.buffers[record_type]) >= IMPORT_BATCH_SIZE:
+            self.flush(record_type)
+
+    def flush_all(self) -> None:
+        for record_type in _FLUSH_ORDER:
+            self.flush(record_type)
+
+    def flush(self, record_type: str) -> None:
+        """Write one buffered batch (parents' batches first)"""
+        spec = RECORD_TYPES[record_type]
+        if spec.parent:
+            self.flush(spec.parent)
+
+        batch = self.buffers[record_type]
+        if not batch:
+            return
+        self.buffers[record_type] = []
+
+        rows, old_ids = [], []
+        for number, old_id, row in batch:
+            if spec.parent:
+                new_parent = self.id_maps[spec.parent].get(_as_int(row[spec.parent_field]))
+                if new_parent is None:
+                    self.result.add_error(
+                        number, f"{spec.parent} {row[spec.parent_field]} is not in this import"
+                    )
+                    continue
+                row[spec.parent_field] = new_parent
+
+            if record_type == "activity" and self.schedules is not None:
+                conflict = self.schedules.add(
+                    row["stop_id"], row["date_scheduled"], row["time_start"],
+                    row["duration_hours"], row["name"]
+                )
+                if conflict:
+                    self.result.add_error(number, conflict)
+                    continue
+
+            rows.append(row)
+            old_ids.append(old_id)
+
+        if not rows:
+            return
+
+        new_ids = [
+            new_id for (new_id,) in self.db.execute(
+                insert(spec.model).returning(spec.model.id, sort_by_parameter_order=True),
+                rows
+            )
+        ]
+
+        if record_type in self.id_maps:
+            id_map = self.id_maps[record_type]
+            for old_id, new_id in zip(old_ids, new_ids):
+                if old_id is not None:
+                    id_map[_as_int(old_id)] = new_id
+
+        if record_type == "stop":
+            self.stop_trips.update(zip(new_ids, (row["trip_id"] for row in rows)))
+
+        # Core inserts skip the ORM flush hooks
+        if record_type == "trip":
+            mark_trips_changed(self.db, new_ids)
+            # One event per new trip, not per row: nobody can be
+            # watching a trip before it exists
+            record_trip_events(self.db, (
+                trip_event(trip_id, "trip", trip_id, "created") for trip_id in new_ids
+            ))
+
+        if spec.amount_field:
+            spend = {}
+            for row in rows:
+                if row.get(spec.amount_field):
+                    trip_id = row["trip_id"] if spec.parent == "trip" else self.stop_trips[row["stop_id"]]
+                    spend[trip_id] = spend.get(trip_id, 0.0) + float(row[spec.amount_field])
+            record_spend(self.db, spend)
+
+        self.result.created[record_type] += len(new_ids)
+
+
+def _as_int(value):
+    """Ids come in as ints (NDJSON) or strings (CSV)"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return value
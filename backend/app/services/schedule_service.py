@@ -0,0 +1,536 @@
+# backend/app/services/schedule_service.py
+
+import heapq
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta
+from itertools import chain
+from typing import Dict, List, Optional, Set, Tuple
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..models.trip import Trip
+from ..models.stop import Stop
+from ..models.activity import Activity
+from ..schemas.activity import ActivityConflict
+from ..utils.trip_changes import stop_trip_map
+
+# (start, end, activity_id, name)
+Interval = Tuple[datetime, datetime, int, str]
+
+
+def activity_interval(date_scheduled: date, time_start: Optional[time],
+                      duration_hours) -> Optional[Tuple[datetime, datetime]]:
+    """
+    When an activity takes place
+
+    Activities without a start time or a duration can't overlap anything
+    """
+    if time_start is None or not duration_hours or float(duration_hours) <= 0:
+        return None
+
+    start = datetime.combine(date_scheduled, time_start)
+    return start, start + timedelta(hours=float(duration_hours))
+
+
+def _conflict(stop_id: int, first: Interval, second: Interval) -> ActivityConflict:
+    """Describe the overlap of two intervals (first starts no later than second)"""
+    return ActivityConflict(
+        stop_id=stop_id,
+        activity_id=first[2],
+        activity_name=first[3],
+        other_activity_id=second[2],
+        other_activity_name=second[3],
+        overlap_start=max(first[0], second[0]),
+        overlap_end=min(first[1], second[1])
+    )
+
+
+def _describe(stop_id: int, overlaps) -> str:
+    """overlaps: (other activity id or None, its name, overlap start, overlap end)"""
+    described = []
+    for other_id, other_name, start, end in overlaps:
+        label = f"{other_name} (activity {other_id})" if other_id is not None else other_name
+        described.append(f"{label} {start:%Y-%m-%d %H:%M} - {end:%Y-%m-%d %H:%M}")
+    return f"Overlaps activities at stop {stop_id}: " + ", ".join(described)
+
+
+def describe_conflicts(conflicts: List[ActivityConflict], activity_id: int) -> str:
+    """One-line error for a saved activity rejected by its conflicts"""
+    return _describe(conflicts[0].stop_id, [
+        (conflict.other_activity_id, conflict.other_activity_name, conflict.overlap_start, conflict.overlap_end)
+        if conflict.activity_id == activity_id else
+        (conflict.activity_id, conflict.activity_name, conflict.overlap_start, conflict.overlap_end)
+        for conflict in conflicts
+    ])
+
+
+class StopSchedule:
+    """
+    Timed activities of one stop, sorted by start
+
+    A segment tree over the sorted positions holds the latest end in
+    each range, so "what overlaps [start, end)?" only descends into
+    ranges that start before `end` and reach past `start`:
+    O(log n) per interval found, O(log n) when nothing overlaps
+    """
+
+    def __init__(self, stop_id: int, trip_id: Optional[int], intervals: List[Interval]):
+        self.stop_id = stop_id
+        self.trip_id = trip_id
+        self.intervals = sorted(intervals, key=lambda interval: (interval[0], interval[1]))
+        self.starts = [interval[0] for interval in self.intervals]
+
+        # Leaves at [size, size + n); node i covers its children 2i, 2i + 1
+        self.size = 1
+        while self.size < len(self.intervals):
+            self.size *= 2
+        self.max_end = [datetime.min] * (2 * self.size)
+        for position, interval in enumerate(self.intervals):
+            self.max_end[self.size + position] = interval[1]
+        for node in range(self.size - 1, 0, -1):
+            self.max_end[node] = max(self.max_end[2 * node], self.max_end[2 * node + 1])
+
+    def overlapping(self, start: datetime, end: datetime,
+                    ignore_id: Optional[int] = None) -> List[Interval]:
+        """Intervals overlapping [start, end), in start order"""
+        found = []
+
+        # Only intervals starting before `end` can overlap
+        last = bisect_left(self.starts, end) - 1
+        if last >= 0:
+            self._collect(1, 0, self.size, last, start, ignore_id, found)
+        return found
+
+    def _collect(self, node: int, low: int, high: int, last: int, start: datetime,
+                 ignore_id: Optional[int], found: List[Interval]) -> None:
+        """Intervals at positions [low, high) ∩ [0, last] ending after `start`"""
+        if low > last or self.max_end[node] <= start:
+            return
+
+        if high - low == 1:
+            interval = self.intervals[low]
+            if interval[2] != ignore_id:
+                found.append(interval)
+            return
+
+        middle = (low + high) // 2
+        self._collect(2 * node, low, middle, last, start, ignore_id, found)
+        self._collect(2 * node + 1, middle, high, last, start, ignore_id, found)
+
+    def conflicts(self) -> List[ActivityConflict]:
+        """
+        Every overlapping pair - sweep over the sorted intervals
+        with a heap of the ones still running: O(n log n + k)
+        """
+        found = []
+        running = []  # heap of (end, position)
+
+        for position, interval in enumerate(self.intervals):
+            while running and running[0][0] <= interval[0]:
+                heapq.heappop(running)
+
+            for _, other in sorted(running, key=lambda item: item[1]):
+                found.append(_conflict(self.stop_id, self.intervals[other], interval))
+
+            heapq.heappush(running, (interval[1], position))
+
+        return found
+
+    def replaced(self, activity_ids: Set[int], added: List[Interval]) -> "StopSchedule":
+        """
+        Copy with these activities' intervals swapped for `added`
+        (the kept intervals are already sorted, so re-sorting is ~linear)
+        """
+        kept = [interval for interval in self.intervals if interval[2] not in activity_ids]
+        return StopSchedule(self.stop_id, self.trip_id, kept + added)
+
+
+class ScheduleChanges:
+    """
+    What a transaction wrote that cached schedules care about
+
+    - activities: activity_id → (stops it left, stop it's at now or None
+      if deleted, its Interval or None if it isn't timed)
+    - dropped_stops: stops deleted or moved to another trip
+    - dropped_trips: trips deleted (their stops go with them)
+    - trip_ids: every trip involved (for StopScheduleCache.put)
+    """
+
+    def __init__(self):
+        self.activities: Dict[int, Tuple[Set[int], Optional[int], Optional[Interval]]] = {}
+        self.dropped_stops: Set[int] = set()
+        self.dropped_trips: Set[int] = set()
+        self.trip_ids: Set[int] = set()
+
+
+class StopScheduleCache:
+    """
+    StopSchedule per stop, kept between requests
+
+    - Bounded LRU
+    - Committed activity writes are applied to the cached schedule of their
+      stop (apply()), instead of dropping every schedule of the trip
+    - A load is only stored if no write to its trip was committed since
+      the loading transaction began (generation is a clock, and each trip
+      remembers when it last changed)
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._schedules = OrderedDict()  # stop_id → StopSchedule
+        self._stops_by_trip = {}         # trip_id → {stop_id, ...}
+        self._changed_at = OrderedDict()  # trip_id → generation of its last write
+        self._forgotten = 0              # Latest generation dropped from _changed_at
+        self._lock = threading.Lock()
+        self.generation = 0              # Bumped on every write committed
+
+    def get(self, stop_id: int) -> Optional[StopSchedule]:
+        with self._lock:
+            schedule = self._schedules.get(stop_id)
+            if schedule is not None:
+                self._schedules.move_to_end(stop_id)
+            return schedule
+
+    def put(self, schedule: StopSchedule, generation: int) -> None:
+        """Store a schedule, unless a write to its trip was committed while it was loaded"""
+        with self._lock:
+            if not self.max_entries:
+                return
+            if self._changed_at.get(schedule.trip_id, self._forgotten) > generation:
+                return
+
+            self._store(schedule)
+
+            while len(self._schedules) > self.max_entries:
+                self._discard(next(iter(self._schedules)))
+
+    def apply(self, changes: ScheduleChanges) -> None:
+        """Bring cached schedules up to date with a committed transaction"""
+        added = {}    # stop_id → [Interval, ...]
+        removed = {}  # stop_id → {activity_id, ...}
+        for activity_id, (left, stop_id, interval) in changes.activities.items():
+            for old_stop_id in left | {stop_id}:
+                removed.setdefault(old_stop_id, set()).add(activity_id)
+            if stop_id is not None and interval is not None:
+                added.setdefault(stop_id, []).append(interval)
+
+        with self._lock:
+            self.generation += 1
+            for trip_id in changes.trip_ids | changes.dropped_trips:
+                self._changed_at[trip_id] = self.generation
+                self._changed_at.move_to_end(trip_id)
+            while len(self._changed_at) > max(self.max_entries, 1):
+                _, self._forgotten = self._changed_at.popitem(last=False)
+
+            for trip_id in changes.dropped_trips:
+                for stop_id in list(self._stops_by_trip.get(trip_id, ())):
+                    self._discard(stop_id)
+            for stop_id in changes.dropped_stops:
+                self._discard(stop_id)
+
+            for stop_id, activity_ids in removed.items():
+                schedule = self._schedules.get(stop_id)
+                if schedule is not None:
+                    self._schedules[stop_id] = schedule.replaced(activity_ids, added.get(stop_id, []))
+
+    def invalidate_trips(self, trip_ids) -> None:
+        """Drop every schedule of these trips (writes we don't have the details of)"""
+        changes = ScheduleChanges()
+        changes.dropped_trips.update(trip_ids)
+        self.apply(changes)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._forgotten = self.generation
+            self._schedules.clear()
+            self._stops_by_trip.clear()
+            self._changed_at.clear()
+
+    def _store(self, schedule: StopSchedule) -> None:
+        """Add or replace a schedule (caller holds the lock)"""
+        self._discard(schedule.stop_id)
+        self._schedules[schedule.stop_id] = schedule
+        self._stops_by_trip.setdefault(schedule.trip_id, set()).add(schedule.stop_id)
+
+    def _discard(self, stop_id: int) -> None:
+        """Remove a schedule and its trip link (caller holds the lock)"""
+        old = self._schedules.pop(stop_id, None)
+        if old is None:
+            return
+
+        stops = self._stops_by_trip.get(old.trip_id)
+        if stops:
+            stops.discard(stop_id)
+            if not stops:
+                del self._stops_by_trip[old.trip_id]
+
+
+stop_schedules = StopScheduleCache(settings.SCHEDULE_INDEX_MAX_ENTRIES)
+
+
+# ============================================
+# KEEPING CACHED SCHEDULES CURRENT
+# ============================================
+# after_begin: remember the generation the transaction's reads start from
+# after_flush: record the activity / stop / trip writes (ScheduleChanges)
+# after_commit: apply them to the cached schedules
+
+_SESSION_KEY = "schedule_changes"
+_GENERATION_KEY = "schedule_generation"
+
+
+def _previous(obj, attribute: str) -> Set:
+    """Values the attribute had before this flush"""
+    return set(inspect(obj).attrs[attribute].history.deleted) - {None}
+
+
+def mark_stops_changed(session: Session, stop_trips: Dict[int, int]) -> None:
+    """
+    Record stops whose activities were written (stop_id → trip_id):
+    their cached schedules are dropped after commit
+
+    Use this for Core-level writes (insert()/update()/delete())
+    which don't go through the ORM flush
+    """
+    changes = session.info.setdefault(_SESSION_KEY, ScheduleChanges())
+    changes.dropped_stops.update(stop_trips)
+    changes.trip_ids.update(trip_id for trip_id in stop_trips.values() if trip_id is not None)
+
+
+@event.listens_for(Session, "after_begin")
+def _remember_schedule_generation(session, transaction, connection):
+    session.info[_GENERATION_KEY] = stop_schedules.generation
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_schedule_changes(session, flush_context):
+    activities = []
+    stop_ids = set()
+    dropped_stops = {}  # stop_id → trips it was / is in
+    dropped_trips = set()
+
+    dirty = (obj for obj in session.dirty if session.is_modified(obj))
+
+    for obj in chain(session.new, dirty, session.deleted):
+        if isinstance(obj, Activity):
+            activities.append(obj)
+            stop_ids |= {obj.stop_id} | _previous(obj, "stop_id")
+        elif isinstance(obj, Stop):
+            moved_from = _previous(obj, "trip_id")
+            if obj in session.deleted or moved_from:
+                dropped_stops[obj.id] = moved_from | {obj.trip_id}
+        elif isinstance(obj, Trip) and obj in session.deleted:
+            dropped_trips.add(obj.id)
+
+    if not (activities or dropped_stops or dropped_trips):
+        return
+
+    changes = session.info.setdefault(_SESSION_KEY, ScheduleChanges())
+    changes.dropped_trips |= dropped_trips
+    for stop_id, trip_ids in dropped_stops.items():
+        changes.dropped_stops.add(stop_id)
+        changes.trip_ids |= trip_ids - {None}
+
+    stop_ids.discard(None)
+    if stop_ids:
+        stop_trips = stop_trip_map(session, stop_ids)
+        changes.trip_ids.update(trip_id for trip_id in stop_trips.values() if trip_id is not None)
+
+    for obj in activities:
+        left = _previous(obj, "stop_id")
+        if obj.id in changes.activities:
+            left |= changes.activities[obj.id][0]
+
+        if obj in session.deleted:
+            changes.activities[obj.id] = (left | {obj.stop_id}, None, None)
+            continue
+
+        interval = activity_interval(obj.date_scheduled, obj.time_start, obj.duration_hours)
+        if interval is not None:
+            interval = (*interval, obj.id, obj.name)
+        changes.activities[obj.id] = (left, obj.stop_id, interval)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_schedule_changes(session):
+    changes = session.info.pop(_SESSION_KEY, None)
+    if changes is not None:
+        stop_schedules.apply(changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_schedule_changes(session):
+    session.info.pop(_SESSION_KEY, None)
+
+
+class PendingSchedules:
+    """
+    Conflict checks for activities about to be inserted together
+    (bulk imports, trip imports)
+
+    Each candidate is checked against its stop's saved activities and
+    the candidates accepted before it. Accepted candidates never overlap
+    each other, so only the neighbours of the insertion point need a look.
+    """
+
+    def __init__(self, db: Session, saved: bool = True):
+        self.db = db
+        self.saved = saved      # False: the stops are new, nothing saved to check
+        self._starts = {}       # stop_id → sorted starts of accepted candidates
+        self._accepted = {}     # stop_id → accepted Intervals, same order
+
+    def add(self, stop_id: int, date_scheduled: date, time_start: Optional[time],
+            duration_hours, name: str = "") -> Optional[str]:
+        """
+        Accept the candidate, or say what it overlaps (it isn't accepted then)
+        """
+        interval = activity_interval(date_scheduled, time_start, duration_hours)
+        if interval is None:
+            return None
+
+        start, end = interval
+        found = []
+
+        if self.saved:
+            schedule = ScheduleService.get_stop_schedule(self.db, stop_id)
+            if schedule is not None:
+                found.extend(schedule.overlapping(start, end))
+
+        starts = self._starts.setdefault(stop_id, [])
+        accepted = self._accepted.setdefault(stop_id, [])
+        position = bisect_left(starts, start)
+        if position > 0 and accepted[position - 1][1] > start:
+            found.append(accepted[position - 1])
+        if position < len(accepted) and accepted[position][0] < end:
+            found.append(accepted[position])
+
+        if found:
+            return _describe(stop_id, [
+                (other[2], other[3], max(start, other[0]), min(end, other[1])) for other in found
+            ])
+
+        starts.insert(position, start)
+        accepted.insert(position, (start, end, None, name))
+        return None
+
+
+class ScheduleService:
+    """Find overlapping activities"""
+
+    @staticmethod
+    def _load_intervals(db: Session, *criteria) -> dict:
+        """Timed activities matching criteria → {stop_id: [Interval, ...]}"""
+        query = select(
+            Activity.stop_id,
+            Activity.id,
+            Activity.name,
+            Activity.date_scheduled,
+            Activity.time_start,
+            Activity.duration_hours
+        ).where(
+            Activity.time_start.isnot(None),
+            Activity.duration_hours > 0,
+            *criteria
+        )
+
+        intervals = {}
+        for stop_id, activity_id, name, day, start, duration in db.execute(query):
+            interval = activity_interval(day, start, duration)
+            if interval:
+                intervals.setdefault(stop_id, []).append((*interval, activity_id, name))
+        return intervals
+
+    @staticmethod
+    def get_stop_schedule(db: Session, stop_id: int) -> Optional[StopSchedule]:
+        """
+        Cached schedule for a stop, loaded on a miss
+
+        Returns None if the stop doesn't exist
+        """
+        schedule = stop_schedules.get(stop_id)
+        if schedule is not None:
+            return schedule
+
+        # Reads in an open transaction are as old as its beginning
+        if db.in_transaction() and _GENERATION_KEY in db.info:
+            generation = db.info[_GENERATION_KEY]
+        else:
+            generation = stop_schedules.generation
+
+        trip_id = db.query(Stop.trip_id).filter(Stop.id == stop_id).scalar()
+        if trip_id is None:
+            return None
+
+        intervals = ScheduleService._load_intervals(db, Activity.stop_id == stop_id)
+        schedule = StopSchedule(stop_id, trip_id, intervals.get(stop_id, []))
+
+        # Not if it includes this transaction's own uncommitted writes
+        if _SESSION_KEY not in db.info:
+            stop_schedules.put(schedule, generation)
+        return schedule
+
+    @staticmethod
+    def find_conflicts(db: Session, stop_id: int, date_scheduled: date,
+                       time_start: Optional[time], duration_hours,
+                       name: str = "", activity_id: Optional[int] = None) -> List[ActivityConflict]:
+        """
+        Activities of the stop that would overlap this one
+
+        Pass activity_id when updating, so it isn't compared with itself
+        """
+        interval = activity_interval(date_scheduled, time_start, duration_hours)
+        if interval is None:
+            return []
+
+        schedule = ScheduleService.get_stop_schedule(db, stop_id)
+        if schedule is None:
+            return []
+
+        candidate = (*interval, activity_id, name)
+        return [
+            _conflict(stop_id, *sorted((other, candidate), key=lambda i: i[0]))
+            for other in schedule.overlapping(*interval, ignore_id=activity_id)
+        ]
+
+    @staticmethod
+    def conflicts_involving(db: Session, activities) -> List[ActivityConflict]:
+        """
+        Overlaps involving any of these flushed activities, as the current
+        transaction sees their stops (writes that change many at once)
+        """
+        activity_ids = {activity.id for activity in activities}
+        stop_ids = {activity.stop_id for activity in activities}
+        if not activity_ids:
+            return []
+
+        intervals = ScheduleService._load_intervals(db, Activity.stop_id.in_(stop_ids))
+
+        conflicts = []
+        for stop_id in sorted(intervals):
+            conflicts.extend(
+                conflict for conflict in StopSchedule(stop_id, None, intervals[stop_id]).conflicts()
+                if conflict.activity_id in activity_ids or conflict.other_activity_id in activity_ids
+            )
+        return conflicts
+
+    @staticmethod
+    def get_stop_conflicts(db: Session, stop_id: int) -> Optional[List[ActivityConflict]]:
+        """Overlapping pairs in one stop (None if the stop doesn't exist)"""
+        schedule = ScheduleService.get_stop_schedule(db, stop_id)
+        if schedule is None:
+            return None
+        return schedule.conflicts()
+
+    @staticmethod
+    def get_trip_conflicts(db: Session, trip_id: int) -> List[ActivityConflict]:
+        """Overlapping pairs in every stop of a trip - one query, one sweep per stop"""
+        stop_ids = select(Stop.id).where(Stop.trip_id == trip_id).scalar_subquery()
+        intervals = ScheduleService._load_intervals(db, Activity.stop_id.in_(stop_ids))
+
+        conflicts = []
+        for stop_id in sorted(intervals):
+            conflicts.extend(StopSchedule(stop_id, trip_id, intervals[stop_id]).conflicts())
+        return conflicts
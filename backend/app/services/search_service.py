@@ -0,0 +1,361 @@
+# backend/app/services/search_service.py
+
+import re
+import unicodedata
+from typing import List, Optional
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+from ..database import Base, write_engine
+
+# ============================================
+# FULL-TEXT INDEX
+# ============================================
+# SQLite:   one FTS5 table (search_index) kept in sync by triggers
+#           rowid = id * 4 + kind, so updates/deletes hit one row
+#           "owner" holds u<user_id>, so scoping is part of the match
+#
+# Postgres: a generated tsvector column + GIN index on each table
+#
+# Either way the database keeps the index in sync on every write,
+# including Core inserts (bulk import) and cascaded deletes.
+
+_KIND_TRIP, _KIND_STOP, _KIND_ACTIVITY = 1, 2, 3
+
+_SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+        kind UNINDEXED, ref_id UNINDEXED, trip_id UNINDEXED,
+        owner, title, body,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    # Trips
+    f"""
+    CREATE TRIGGER IF NOT EXISTS search_trips_ai AFTER INSERT ON trips BEGIN
+        INSERT INTO search_index(rowid, kind, ref_id, trip_id, owner, title, body)
+        VALUES (new.id * 4 + {_KIND_TRIP}, 'trip', new.id, new.id, 'u' || new.user_id,
+                new.name, coalesce(new.description, ''));
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS search_trips_au AFTER UPDATE OF name, description, user_id ON trips BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + {_KIND_TRIP};
+        INSERT INTO search_index(rowid, kind, ref_id, trip_id, owner, title, body)
+        VALUES (new.id * 4 + {_KIND_TRIP}, 'trip', new.id, new.id, 'u' || new.user_id,
+                new.name, coalesce(new.description, ''));
+    END
+    """,
+    # A trip given to another user: its stops and activities change owner
+    f"""
+    CREATE TRIGGER IF NOT EXISTS search_trips_owner_au AFTER UPDATE OF user_id ON trips
+    WHEN old.user_id IS NOT new.user_id BEGIN
+        DELETE FROM search_index WHERE rowid IN (
+            SELECT id * 4 + {_KIND_STOP} FROM stops WHERE trip_id = new.id
+            UNION ALL
+            SELECT activities.id * 4 + {_KIND_ACTIVITY} FROM activities
+            JOIN stops ON stops.id = activities.stop_id WHERE stops.trip_id = new.id
+        );
+        INSERT INTO search_index(rowid, kind, ref_id, trip_id, owner, title, body)
+        SELECT id * 4 + {_KIND_STOP}, 'stop', id, trip_id, 'u' || new.user_id,
+               city_name, country || ' ' || coalesce(description, '')
+        FROM stops WHERE trip_id = new.id;
+        INSERT INTO search_index(rowid, kind, ref_id, trip_id, owner, title, body)
+        SELECT activities.id * 4 + {_KIND_ACTIVITY}, 'activity', activities.id, new.id, 'u' || new.user_id,
+               activities.name, coalesce(activities.category, '') || ' ' || coalesce(activities.description, '')
+        FROM activities JOIN stops ON stops.id = activities.stop_id WHERE stops.trip_id = new.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS search_trips_ad AFTER DELETE ON trips BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + {_KIND_TRIP};
+    END
+    """,
+    # Stops
+    f"""
+    CREATE TRIGGER IF NOT EXISTS search_stops_ai AFTER INSERT ON stops BEGIN
+        INSERT INTO search_index(rowid, kind, ref_id, trip_id, owner, title, body)
+        SELECT new.id * 4 + {_KIND_STOP}, 'stop', new.id, new.trip_id, 'u' || trips.user_id,
+               new.city_name, new.country || ' ' || coalesce(new.description, '')
+        FROM trips WHERE trips.id = new.trip_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS search_stops_au AFTER UPDATE OF city_name, country, description, trip_id ON stops BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + {_KIND_STOP};
+        INSERT INTO search_index(rowid, kind, ref_id, trip_id, owner, title, body)
+        SELECT new.id * 4 + {_KIND_STOP}, 'stop', new.id, new.trip_id, 'u' || trips.user_id,
+               new.city_name, new.country || ' ' || coalesce(new.description, '')
+        FROM trips WHERE trips.id = new.trip_id;
+    END
+    """,
+    # A stop moved to another trip takes its activities along
+    f"""
+    CREATE TRIGGER IF NOT EXISTS search_stops_moved_au AFTER UPDATE OF trip_id ON stops
+    WHEN old.trip_id IS NOT new.trip_id BEGIN
+        DELETE FROM search_index WHERE rowid IN (
+            SELECT id * 4 + {_KIND_ACTIVITY} FROM activities WHERE stop_id = new.id
+        );
+        INSERT INTO search_index(rowid, kind, ref_id, trip_id, owner, title, body)
+        SELECT activities.id * 4 + {_KIND_ACTIVITY}, 'activity', activities.id, new.trip_id, 'u' || trips.user_id,
+               activities.name, coalesce(activities.category, '') || ' ' || coalesce(activities.description, '')
+        FROM activities JOIN trips ON trips.id = new.trip_id WHERE activities.stop_id = new.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS search_stops_ad AFTER DELETE ON stops BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + {_KIND_STOP};
+    END
+    """,
+    # Activities
+    f"""
+    CREATE TRIGGER IF NOT EXISTS search_activities_ai AFTER INSERT ON activities BEGIN
+        INSERT INTO search_index(rowid, kind, ref_id, trip_id, owner, title, body)
+        SELECT new.id * 4 + {_KIND_ACTIVITY}, 'activity', new.id, stops.trip_id, 'u' || trips.user_id,
+               new.name, coalesce(new.category, '') || ' ' || coalesce(new.description, '')
+        FROM stops JOIN trips ON trips.id = stops.trip_id WHERE stops.id = new.stop_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS search_activities_au AFTER UPDATE OF name, category, description, stop_id ON activities BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + {_KIND_ACTIVITY};
+        INSERT INTO search_index(rowid, kind, ref_id, trip_id, owner, title, body)
+        SELECT new.id * 4 + {_KIND_ACTIVITY}, 'activity', new.id, stops.trip_id, 'u' || trips.user_id,
+               new.name, coalesce(new.category, '') || ' ' || coalesce(new.description, '')
+        FROM stops JOIN trips ON trips.id = stops.trip_id WHERE stops.id = new.stop_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS search_activities_ad AFTER DELETE ON activities BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + {_KIND_ACTIVITY};
+    END
+    """,
+]
+
+# Fills the index from existing rows (first install only)
+_SQLITE_BACKFILL = [
+    f"""
+    INSERT INTO search_index(rowid, kind, ref_id, trip_id, owner, title, body)
+    SELECT id * 4 + {_KIND_TRIP}, 'trip', id, id, 'u' || user_id, name, coalesce(description, '')
+    FROM trips
+    """,
+    f"""
+    INSERT INTO search_index(rowid, kind, ref_id, trip_id, owner, title, body)
+    SELECT stops.id * 4 + {_KIND_STOP}, 'stop', stops.id, stops.trip_id, 'u' || trips.user_id,
+           stops.city_name, stops.country || ' ' || coalesce(stops.description, '')
+    FROM stops JOIN trips ON trips.id = stops.trip_id
+    """,
+    f"""
+    INSERT INTO search_index(rowid, kind, ref_id, trip_id, owner, title, body)
+    SELECT activities.id * 4 + {_KIND_ACTIVITY}, 'activity', activities.id, stops.trip_id, 'u' || trips.user_id,
+           activities.name, coalesce(activities.category, '') || ' ' || coalesce(activities.description, '')
+    FROM activities JOIN stops ON stops.id = activities.stop_id JOIN trips ON trips.id = stops.trip_id
+    """,
+]
+
+_POSTGRES_DDL = [
+    """
+    ALTER TABLE trips ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_trips_search_vector ON trips USING GIN (search_vector)",
+    """
+    ALTER TABLE stops ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(city_name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(country, '') || ' ' || coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_stops_search_vector ON stops USING GIN (search_vector)",
+    """
+    ALTER TABLE activities ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(category, '') || ' ' || coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_activities_search_vector ON activities USING GIN (search_vector)",
+]
+
+
+def install_search_index(connection) -> None:
+    """
+    Create the full-text index for the connection's dialect (idempotent)
+
+    Runs after Base.metadata.create_all() and at app startup
+    """
+    dialect = connection.dialect.name
+
+    if dialect == "sqlite":
+        existed = connection.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE name = 'search_index'"
+        )).first()
+
+        for statement in _SQLITE_DDL:
+            connection.execute(text(statement))
+
+        if not existed:
+            for statement in _SQLITE_BACKFILL:
+                connection.execute(text(statement))
+
+    elif dialect == "postgresql":
+        for statement in _POSTGRES_DDL:
+            connection.execute(text(statement))
+
+    else:
+        print(f"⚠️ Full-text search is not supported on {dialect}")
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _install_after_create(target, connection, **kw):
+    install_search_index(connection)
+
+
+def install_search_index_on_startup() -> None:
+    """Install the index on an existing database (skipped if tables are missing)"""
+    try:
+        with write_engine.begin() as connection:
+            install_search_index(connection)
+    except Exception as e:
+        print(f"⚠️ Full-text search index not installed: {str(e)}")
+
+
+# ============================================
+# QUERIES
+# ============================================
+
+# SQLite ranks and pages in the query: bm25() with the title weighted 10x
+# the body (kind/ref_id/trip_id/owner weigh 0), so IDF comes from the whole
+# index and only one page of rows leaves SQLite. Snippets are built in
+# Python for that page only (_snippet), since snippet() re-runs the MATCH
+_SQLITE_SEARCH = """
+    SELECT search_index.kind, search_index.ref_id, search_index.trip_id,
+           search_index.title, search_index.body,
+           -bm25(search_index, 0, 0, 0, 0, 10.0, 1.0) AS score
+    FROM search_index
+    JOIN trips ON trips.id = search_index.trip_id
+    WHERE search_index MATCH :match AND trips.is_deleted = 0
+    ORDER BY bm25(search_index, 0, 0, 0, 0, 10.0, 1.0), search_index.rowid
+    LIMIT :limit OFFSET :offset
+"""
+
+_POSTGRES_SEARCH = """
+    WITH q AS (SELECT to_tsquery('simple', :match) AS query)
+    SELECT kind, ref_id, trip_id, title, snippet, rank FROM (
+        SELECT 'trip' AS kind, t.id AS ref_id, t.id AS trip_id, t.name AS title,
+               coalesce(t.description, '') AS snippet,
+               ts_rank(t.search_vector, q.query) AS rank
+        FROM trips t, q
+        WHERE t.search_vector @@ q.query AND t.user_id = :user_id AND t.is_deleted = false
+        UNION ALL
+        SELECT 'stop', s.id, s.trip_id, s.city_name,
+               s.country || ' ' || coalesce(s.description, ''),
+               ts_rank(s.search_vector, q.query)
+        FROM stops s JOIN trips t ON t.id = s.trip_id, q
+        WHERE s.search_vector @@ q.query AND t.user_id = :user_id AND t.is_deleted = false
+        UNION ALL
+        SELECT 'activity', a.id, s.trip_id, a.name,
+               coalesce(a.category, '') || ' ' || coalesce(a.description, ''),
+               ts_rank(a.search_vector, q.query)
+        FROM activities a JOIN stops s ON s.id = a.stop_id JOIN trips t ON t.id = s.trip_id, q
+        WHERE a.search_vector @@ q.query AND t.user_id = :user_id AND t.is_deleted = false
+    ) hits
+    ORDER BY rank DESC
+    LIMIT :limit OFFSET :offset
+"""
+
+# Snippets longer than this are cut
+_SNIPPET_LENGTH = 120
+
+
+def _fold(value: str) -> str:
+    """Lowercase without accents (same as the FTS5 tokenizer)"""
+    decomposed = unicodedata.normalize("NFKD", value.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def search_terms(q: str) -> List[str]:
+    """Words of the query (punctuation and operators are dropped)"""
+    return re.findall(r"\w+", _fold(q))[:16]
+
+
+def _snippet(terms: List[str], body: str, size: int = 12) -> str:
+    """Up to `size` words of body around the first hit, hits in [brackets]"""
+    words = body.split()
+    hits = [
+        any(_fold(word).strip(".,;:!?()\"'").startswith(term) for term in terms)
+        for word in words
+    ]
+
+    first = hits.index(True) if True in hits else 0
+    start = max(0, min(first - 2, len(words) - size))
+    shown = [
+        f"[{word}]" if hit else word
+        for word, hit in zip(words[start:start + size], hits[start:start + size])
+    ]
+
+    return ("…" if start > 0 else "") + " ".join(shown) + ("…" if start + size < len(words) else "")
+
+
+class SearchService:
+    """Full-text search over a user's trips, stops and activities"""
+
+    @staticmethod
+    def search(db: Session, user_id: int, q: str, page: int = 1, page_size: int = 20) -> Optional[dict]:
+        """
+        Ranked, paginated matches - every word must match (prefix match)
+
+        Returns None if the query has no words
+        """
+        terms = search_terms(q)
+        if not terms:
+            return None
+
+        offset = (page - 1) * page_size
+
+        if db.get_bind().dialect.name == "sqlite":
+            rows = SearchService._search_sqlite(db, user_id, terms, offset, page_size + 1)
+        else:
+            rows = db.execute(text(_POSTGRES_SEARCH), {
+                "match": " & ".join(f"{term}:*" for term in terms),
+                "user_id": user_id,
+                "limit": page_size + 1,
+                "offset": offset
+            }).all()
+
+        results = [
+            {
+                "type": kind,
+                "id": ref_id,
+                "trip_id": trip_id,
+                "title": title,
+                "snippet": snippet[:_SNIPPET_LENGTH].strip(),
+                "score": round(float(score), 4)
+            }
+            for kind, ref_id, trip_id, title, snippet, score in rows[:page_size]
+        ]
+
+        return {
+            "query": q,
+            "page": page,
+            "page_size": page_size,
+            "has_more": len(rows) > page_size,
+            "results": results
+        }
+
+    @staticmethod
+    def _search_sqlite(db: Session, user_id: int, terms: List[str], offset: int, limit: int) -> list:
+        """(kind, id, trip_id, title, snippet, score) rows for one page"""
+        words = " ".join(f'"{term}"*' for term in terms)
+        match = f'owner:"u{user_id}" AND {{title body}}: ({words})'
+
+        rows = db.execute(
+            text(_SQLITE_SEARCH), {"match": match, "limit": limit, "offset": offset}
+        ).all()
+
+        return [
+            (row.kind, row.ref_id, row.trip_id, row.title, _snippet(terms, row.body), row.score)
+            for row in rows
+        ]
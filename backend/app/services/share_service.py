@@ -0,0 +1,142 @@
+# backend/app/services/share_service.py
+
+import threading
+from datetime import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+from sqlalchemy.orm import Session, selectinload
+from ..config import settings
+from ..models.trip import Trip
+from ..models.stop import Stop
+from ..models.shared_trip import SharedTrip
+from ..schemas.trip import TripDetailResponse
+from ..utils.etag import strong_etag
+from ..utils.trip_changes import on_trip_change
+
+
+@dataclass(frozen=True)
+class ShareSnapshot:
+    """Pre-serialised public view of a shared trip"""
+    trip_id: int
+    body: bytes
+    etag: str
+
+
+class ShareSnapshotCache:
+    """
+    In-memory snapshots of shared trips, keyed by share token
+
+    - Bounded LRU (oldest snapshots are dropped first)
+    - Invalidated when anything in the trip's subtree is written
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._snapshots = OrderedDict()  # share_token → ShareSnapshot
+        self._tokens_by_trip = {}        # trip_id → {share_token, ...}
+        self._lock = threading.Lock()
+        self.generation = 0              # Bumped on every invalidation
+
+    def get(self, share_token: str) -> Optional[ShareSnapshot]:
+        with self._lock:
+            snapshot = self._snapshots.get(share_token)
+            if snapshot is not None:
+                self._snapshots.move_to_end(share_token)
+            return snapshot
+
+    def put(self, share_token: str, snapshot: ShareSnapshot, generation: int) -> None:
+        """
+        Store a snapshot built while the cache was at `generation`
+
+        If a write was committed while it was being built,
+        it may already be stale, so it is not stored
+        """
+        with self._lock:
+            if generation != self.generation or not self.max_entries:
+                return
+
+            self._snapshots[share_token] = snapshot
+            self._snapshots.move_to_end(share_token)
+            self._tokens_by_trip.setdefault(snapshot.trip_id, set()).add(share_token)
+
+            while len(self._snapshots) > self.max_entries:
+                token, old = self._snapshots.popitem(last=False)
+                self._forget_token(old.trip_id, token)
+
+    def invalidate_trips(self, trip_ids) -> None:
+        with self._lock:
+            self.generation += 1
+            for trip_id in trip_ids:
+                for token in self._tokens_by_trip.pop(trip_id, ()):
+                    self._snapshots.pop(token, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._snapshots.clear()
+            self._tokens_by_trip.clear()
+
+    def _forget_token(self, trip_id: int, share_token: str) -> None:
+        tokens = self._tokens_by_trip.get(trip_id)
+        if tokens:
+            tokens.discard(share_token)
+            if not tokens:
+                del self._tokens_by_trip[trip_id]
+
+
+share_snapshots = ShareSnapshotCache(settings.SHARE_SNAPSHOT_MAX_ENTRIES)
+
+# Drop snapshots as soon as their trip changes
+on_trip_change(share_snapshots.invalidate_trips)
+
+
+class ShareService:
+    """Handle public trip sharing"""
+
+    @staticmethod
+    def build_snapshot(db: Session, share_token: str) -> Optional[ShareSnapshot]:
+        """
+        Serialise a shared trip with its stops and activities
+
+        Returns None if the token or trip doesn't exist
+        """
+        share = db.query(SharedTrip).filter(
+            SharedTrip.public_share_token == share_token
+        ).first()
+
+        if not share:
+            return None
+
+        trip = db.query(Trip).options(
+            selectinload(Trip.stops).selectinload(Stop.activities)
+        ).filter(Trip.id == share.trip_id).first()
+
+        if not trip:
+            return None
+
+        detail = TripDetailResponse.model_validate(trip)
+
+        # Stops in trip order, activities in time order
+        detail.stops.sort(key=lambda s: s.sequence_order)
+        for stop in detail.stops:
+            stop.activities.sort(
+                key=lambda a: (a.date_scheduled, a.time_start or time.min)
+            )
+
+        body = detail.model_dump_json().encode()
+
+        return ShareSnapshot(trip_id=trip.id, body=body, etag=strong_etag(body))
+
+    @staticmethod
+    def get_snapshot(db: Session, share_token: str) -> Optional[ShareSnapshot]:
+        """Return the cached snapshot, building it on a miss"""
+        snapshot = share_snapshots.get(share_token)
+
+        if snapshot is None:
+            generation = share_snapshots.generation
+            snapshot = ShareService.build_snapshot(db, share_token)
+            if snapshot is not None:
+                share_snapshots.put(share_token, snapshot, generation)
+
+        return snapshot
@@ -0,0 +1,332 @@
+# backend/app/services/trip_event_service.py
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, List, Optional, Set
+from sqlalchemy import delete, func, select
+from starlette.concurrency import run_in_threadpool
+from ..config import settings
+from ..database import SessionLocal, WriteSessionLocal, write_engine
+from ..models.trip_event import TripEvent
+from ..models.shared_trip import SharedTrip
+from ..models.trip import Trip
+from ..utils.trip_changes import on_trip_change
+from .trip_service import TripService
+
+# ============================================
+# LIVE TRIP FEED
+# ============================================
+# Writes land in trip_events in the same transaction as the write itself
+# (utils/trip_events.py).
+# One dispatcher task per process reads new rows in id order and hands
+# each one to the subscribers of its trip:
+#
+#   commit → wake dispatcher → SELECT ... WHERE id > last → subscriber queues
+#
+# Commits in other worker processes are picked up by polling every
+# TRIP_EVENTS_POLL_SECONDS - one indexed query, and only while
+# somebody is subscribed. An idle subscriber is just a small queue.
+
+# Seconds to wait for a missing id (a transaction that took its id
+# but hasn't committed yet) before dispatching past it
+GAP_WAIT_SECONDS = 5
+
+# Seconds between retention purges
+PURGE_INTERVAL = 3600
+
+_COLUMNS = (
+    TripEvent.id, TripEvent.trip_id, TripEvent.entity, TripEvent.entity_id,
+    TripEvent.action, TripEvent.fields, TripEvent.created_at
+)
+
+
+def _event_dict(row) -> dict:
+    return {
+        "type": "change",
+        "id": row.id,
+        "trip_id": row.trip_id,
+        "entity": row.entity,
+        "entity_id": row.entity_id,
+        "action": row.action,
+        "fields": row.fields,
+        "created_at": row.created_at.isoformat() if row.created_at else None,
+    }
+
+
+def latest_event_id() -> int:
+    db = SessionLocal()
+    try:
+        return db.query(func.coalesce(func.max(TripEvent.id), 0)).scalar()
+    finally:
+        db.close()
+
+
+def fetch_events(after_id: int, limit: int, trip_id: Optional[int] = None,
+                 until_id: Optional[int] = None) -> List[dict]:
+    """Events with id > after_id (and <= until_id), oldest first"""
+    db = SessionLocal()
+    try:
+        query = select(*_COLUMNS).where(TripEvent.id > after_id)
+        if trip_id is not None:
+            query = query.where(TripEvent.trip_id == trip_id)
+        if until_id is not None:
+            query = query.where(TripEvent.id <= until_id)
+        rows = db.execute(query.order_by(TripEvent.id).limit(limit)).all()
+        return [_event_dict(row) for row in rows]
+    finally:
+        db.close()
+
+
+def replay_events(trip_id: int, since: int, until_id: int) -> Optional[List[dict]]:
+    """
+    A trip's events in (since, until_id] for a reconnecting client
+
+    None if they can't all be replayed (purged, or more than
+    TRIP_EVENTS_REPLAY_LIMIT) - the client should reload the trip
+    """
+    db = SessionLocal()
+    try:
+        oldest = db.query(func.min(TripEvent.id)).scalar()
+    finally:
+        db.close()
+
+    if oldest is not None and since < oldest - 1:
+        return None
+
+    limit = settings.TRIP_EVENTS_REPLAY_LIMIT
+    events = fetch_events(since, limit + 1, trip_id=trip_id, until_id=until_id)
+    return events if len(events) <= limit else None
+
+
+def purge_trip_events(hours: Optional[int] = None) -> int:
+    """Delete events older than the retention period"""
+    hours = settings.TRIP_EVENTS_RETENTION_HOURS if hours is None else hours
+    db = WriteSessionLocal()
+    try:
+        cutoff = datetime.utcnow() - timedelta(hours=hours)
+        deleted = db.execute(delete(TripEvent).where(TripEvent.created_at < cutoff)).rowcount
+        db.commit()
+        return deleted
+    finally:
+        db.close()
+
+
+def can_watch_trip(trip_id: int, user_id: int, share_token: Optional[str] = None) -> bool:
+    """The trip's owner, or anyone with its public share token (while it isn't deleted)"""
+    db = SessionLocal()
+    try:
+        if share_token:
+            return db.query(SharedTrip.id).join(
+                Trip, Trip.id == SharedTrip.trip_id
+            ).filter(
+                SharedTrip.trip_id == trip_id,
+                SharedTrip.public_share_token == share_token,
+                Trip.is_deleted == False
+            ).first() is not None
+        return TripService.get_trip_version(db, trip_id, user_id) is not None
+    finally:
+        db.close()
+
+
+class TripSubscription:
+    """One client's queue of events for one trip"""
+
+    __slots__ = ("trip_id", "queue", "start_id", "overflowed")
+
+    def __init__(self, trip_id: int, start_id: int):
+        self.trip_id = trip_id
+        self.queue = asyncio.Queue(maxsize=settings.TRIP_EVENTS_QUEUE_SIZE)
+        self.start_id = start_id   # Events after this one are delivered live
+        self.overflowed = False
+
+    def offer(self, event: dict) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Slow reader; it re-reads what it missed from the table
+            self.overflowed = True
+
+
+class TripEventBroadcaster:
+    """
+    Fans trip_events rows out to per-trip subscriber queues
+
+    - subscribe(trip_id) / unsubscribe(subscription): from async code
+    - notify(): wake the dispatcher now; safe from any thread
+    """
+
+    def __init__(self, poll_seconds: float, batch_size: int = 500):
+        self.poll_seconds = poll_seconds
+        self.batch_size = batch_size
+        self.last_id: Optional[int] = None  # Last event dispatched
+        self._subscriptions: Dict[int, Set[TripSubscription]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._starting: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+        self._gap_since: Optional[float] = None
+        self._purged_at = 0.0
+
+    def __len__(self) -> int:
+        return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+    async def subscribe(self, trip_id: int) -> TripSubscription:
+        self._start()
+
+        # Position first, so whatever commits from here on is dispatched
+        if self.last_id is None:
+            async with self._starting:
+                if self.last_id is None:
+                    self.last_id = await run_in_threadpool(latest_event_id)
+
+        subscription = TripSubscription(trip_id, self.last_id)
+        self._subscriptions.setdefault(trip_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: TripSubscription) -> None:
+        subscriptions = self._subscriptions.get(subscription.trip_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.trip_id]
+
+    def notify(self) -> None:
+        loop, wakeup = self._loop, self._wakeup
+        if loop is None or not self._subscriptions:
+            return
+        try:
+            loop.call_soon_threadsafe(wakeup.set)
+        except RuntimeError:
+            pass  # Loop already closed
+
+    def _start(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._task is not None and not self._task.done():
+            return
+
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        self._starting = asyncio.Lock()
+        self.last_id = None
+        self._task = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            try:
+                await self._dispatch()
+                if time.monotonic() - self._purged_at > PURGE_INTERVAL:
+                    self._purged_at = time.monotonic()
+                    await run_in_threadpool(purge_trip_events)
+            except Exception as e:
+                print(f"❌ Trip event dispatch failed: {str(e)}")
+
+    async def _dispatch(self) -> None:
+        if not self._subscriptions:
+            # Nobody listening: stop reading, start from "now" next time
+            self.last_id = None
+            return
+        if self.last_id is None:
+            return  # A subscribe() is fetching the position
+
+        events = await run_in_threadpool(fetch_events, self.last_id, self.batch_size)
+        for event in events:
+            if event["id"] != self.last_id + 1 and not self._gap_expired():
+                return  # Retried on the next wake-up or poll
+            self._gap_since = None
+            self.last_id = event["id"]
+
+            for subscription in tuple(self._subscriptions.get(event["trip_id"], ())):
+                subscription.offer(event)
+
+        if len(events) == self.batch_size:
+            self._wakeup.set()
+
+    def _gap_expired(self) -> bool:
+        """
+        SQLite commits ids in order; Postgres hands out ids before commit,
+        so a gap can be a transaction still in flight (or one that rolled back)
+        """
+        now = time.monotonic()
+        if self._gap_since is None:
+            self._gap_since = now
+        return now - self._gap_since >= GAP_WAIT_SECONDS
+
+
+trip_events = TripEventBroadcaster(settings.TRIP_EVENTS_POLL_SECONDS)
+
+
+@on_trip_change
+def _wake_dispatcher(trip_ids):
+    # Every write that adds trip events also changes its trips
+    trip_events.notify()
+
+
+async def trip_event_stream(trip_id: int, since: Optional[int] = None,
+                            keepalive: float = 15) -> AsyncIterator[Optional[dict]]:
+    """
+    Events for one trip: missed ones first (id > since), then live
+
+    Yields None after `keepalive` idle seconds, and a "reset" event
+    when the missed events can't be replayed (reload the trip instead)
+    """
+    subscription = await trip_events.subscribe(trip_id)
+    try:
+        sent = subscription.start_id
+        if since is not None and since < sent:
+            missed = await run_in_threadpool(replay_events, trip_id, since, sent)
+            if missed is None:
+                yield _reset(trip_id, sent)
+            else:
+                for event in missed:
+                    yield event
+
+        while True:
+            if subscription.overflowed:
+                subscription.overflowed = False
+                while not subscription.queue.empty():
+                    subscription.queue.get_nowait()
+
+                until = trip_events.last_id
+                missed = await run_in_threadpool(replay_events, trip_id, sent, until)
+                if missed is None:
+                    yield _reset(trip_id, until)
+                else:
+                    for event in missed:
+                        yield event
+                sent = until
+
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), timeout=keepalive)
+            except asyncio.TimeoutError:
+                yield None
+                continue
+
+            if event["id"] > sent:
+                sent = event["id"]
+                yield event
+    finally:
+        trip_events.unsubscribe(subscription)
+
+
+def _reset(trip_id: int, event_id: int) -> dict:
+    return {"type": "reset", "id": event_id, "trip_id": trip_id}
+
+
+def install_trip_events_on_startup() -> None:
+    """Create trip_events on databases created before it existed, then purge"""
+    try:
+        with write_engine.begin() as connection:
+            TripEvent.__table__.create(connection, checkfirst=True)
+
+        deleted = purge_trip_events()
+        if deleted:
+            print(f"✅ Purged {deleted} old trip events")
+    except Exception as e:
+        print(f"⚠️ Trip events table not installed: {str(e)}")
@@ -1,10 +1,19 @@
 # backend/app/services/trip_service.py
 
+from datetime import timedelta
+from typing import Optional, Tuple
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from ..cache import cache, trip_tag
+from ..models.user import User
 from ..models.trip import Trip
 from ..models.stop import Stop
 from ..models.activity import Activity
 from ..models.budget import BudgetRecord
+from ..schemas.activity import ActivityResponse
+from ..utils.serializers import RowSerializer
+
+calendar_activity_rows = RowSerializer(Activity, ActivityResponse)
 
 class TripService:
     """Handle trip-related business logic"""
@@ -61,17 +70,162 @@ class TripService:
     
     @staticmethod
     def is_trip_over_budget(db: Session, trip_id: int) -> bool:
-        """Check if trip spending exceeds budget"""
-        trip = db.query(Trip).filter(Trip.id == trip_id).first()
+        """
+        Check if trip spending exceeds budget
+        
+        Uses the running spent_total (budget records, parking and
+        activity costs), so nothing is summed here
+        """
+        trip = db.query(Trip.budget_limit, Trip.spent_total).filter(Trip.id == trip_id).first()
         
         if not trip or not trip.budget_limit:
             return False
         
-        # Get total spent
-        budget_records = db.query(BudgetRecord).filter(
-            BudgetRecord.trip_id == trip_id
+        return float(trip.spent_total or 0) > float(trip.budget_limit)
+    
+    # ============================================
+    # CALENDAR
+    # ============================================
+    
+    @staticmethod
+    def get_trip_calendar(db: Session, trip_id: int, user_id: Optional[int] = None) -> Optional[dict]:
+        """
+        Day-by-day itinerary from start_date to end_date
+        
+        - Stops (a handful) are read sorted by arrival
+        - Activities are streamed in (date, time) order from one query
+        - Both are merged in a single walk over the days
+        
+        Returns None if the trip doesn't exist (or isn't the user's)
+        """
+        trip_query = db.query(Trip.id, Trip.start_date, Trip.end_date).filter(
+            Trip.id == trip_id,
+            Trip.is_deleted == False
+        )
+        if user_id is not None:
+            trip_query = trip_query.filter(Trip.user_id == user_id)
+        
+        trip = trip_query.first()
+        if not trip:
+            return None
+        
+        stops = db.query(
+            Stop.id, Stop.city_name, Stop.country, Stop.sequence_order,
+            Stop.arrival_date, Stop.departure_date
+        ).filter(Stop.trip_id == trip_id).order_by(
+            Stop.arrival_date, Stop.sequence_order
         ).all()
         
-        total_spent = sum(float(r.amount) for r in budget_records)
+        fields = calendar_activity_rows.fields
+        activity_query = select(*calendar_activity_rows.columns).join(
+            Stop, Stop.id == Activity.stop_id
+        ).where(
+            Stop.trip_id == trip_id,
+            Activity.date_scheduled >= trip.start_date,
+            Activity.date_scheduled <= trip.end_date
+        ).order_by(
+            Activity.date_scheduled,
+            Activity.time_start.nulls_last(),
+            Activity.id
+        ).execution_options(yield_per=500)
+        
+        activities = (dict(zip(fields, row)) for row in db.execute(activity_query))
+        pending = next(activities, None)
+        
+        days = []
+        active = []        # Stops the traveller is at today
+        next_stop = 0
+        day = trip.start_date
+        
+        while day <= trip.end_date:
+            # Stops arriving today join, stops that have left drop out
+            while next_stop < len(stops) and stops[next_stop].arrival_date <= day:
+                active.append(stops[next_stop])
+                next_stop += 1
+            active = [stop for stop in active if stop.departure_date >= day]
+            
+            todays = []
+            while pending is not None and pending["date_scheduled"] == day:
+                todays.append(pending)
+                pending = next(activities, None)
+            
+            days.append({
+                "date": day,
+                "stops": [
+                    {
+                        "id": stop.id,
+                        "city_name": stop.city_name,
+                        "country": stop.country,
+                        "sequence_order": stop.sequence_order
+                    }
+                    for stop in active
+                ],
+                "activities": todays,
+                "total_cost": sum(a["cost"] or 0 for a in todays),
+                "total_duration_hours": sum(a["duration_hours"] or 0 for a in todays)
+            })
+            day += timedelta(days=1)
+        
+        return {
+            "trip_id": trip.id,
+            "start_date": trip.start_date,
+            "end_date": trip.end_date,
+            "days": days
+        }
+    
+    # ============================================
+    # VERSIONS (for ETags / conditional GETs)
+    # ============================================
+    
+    @staticmethod
+    def get_trip_version(db: Session, trip_id: int, user_id: Optional[int] = None) -> Optional[int]:
+        """
+        Current version of a trip (None if it doesn't exist)
+        
+        Cached until the trip changes, so ETag checks don't hit the database
+        """
+        def load():
+            row = db.query(Trip.user_id, Trip.version).filter(
+                Trip.id == trip_id,
+                Trip.is_deleted == False
+            ).first()
+            return list(row) if row else None
+        
+        row = cache.get_or_load(
+            f"trip-version:{trip_id}", load, tags=[trip_tag(trip_id)],
+            session=db
+        )
+        
+        if not row or (user_id is not None and row[0] != user_id):
+            return None
+        
+        return row[1]
+    
+    @staticmethod
+    def get_stop_trip_version(db: Session, stop_id: int) -> Optional[Tuple[int, int]]:
+        """(trip_id, version) of the trip a stop belongs to (cached)"""
+        def load():
+            row = db.query(Trip.id, Trip.version).join(
+                Stop, Stop.trip_id == Trip.id
+            ).filter(Stop.id == stop_id).first()
+            return list(row) if row else None
+        
+        row = cache.get_or_load(
+            f"stop-trip-version:{stop_id}", load,
+            tags=lambda row: [trip_tag(row[0])],
+            session=db
+        )
+        
+        return tuple(row) if row else None
+    
+    @staticmethod
+    def get_user_trips_version(db: Session, user_id: int) -> int:
+        """
+        The user's trips_version (0 if there's no such user)
+        
+        Bumped in the same transaction as any create, edit or delete
+        of one of their trips, so it changes whenever the list could
+        """
+        version = db.query(User.trips_version).filter(User.id == user_id).scalar()
         
-        return total_spent > float(trip.budget_limit)
\ No newline at end of file
+        return version or 0
@@ -0,0 +1,158 @@
+# backend/app/services/worker_sync_service.py
+
+import threading
+import time
+from typing import List, Optional
+from sqlalchemy import func, select
+from ..cache import cache, trip_tag
+from ..config import settings
+from ..database import SessionLocal, WriteSessionLocal
+from ..models.trip_event import TripEvent
+from ..models.budget_alert import BudgetAlertEvent
+from ..utils.budget_watch import budget_alerts, purge_budget_alerts
+from .schedule_service import stop_schedules
+from .share_service import share_snapshots
+
+# ============================================
+# CROSS-WORKER SYNC
+# ============================================
+# Each worker process keeps its own share snapshots, stop schedules,
+# response cache (CACHE_BACKEND=memory) and budget alert buffer, and
+# commits only invalidate them in the process that made them. Under
+# the pre-fork server (SERVER_WORKERS > 1) one thread per worker reads
+# what the others committed, every WORKER_SYNC_SECONDS:
+#
+#   trip_events   id > last → trip ids → drop their cached entries
+#   budget_alerts id > last → ring buffer + alert streams
+#
+# Both tables are written in the same transaction as the change, so a
+# commit is never missed; a cached entry can be stale for one interval.
+# This process's own commits come round again too - dropping an entry
+# twice costs a reload, nothing else.
+
+# Seconds to wait for a missing trip_events id (a transaction that took
+# its id but hasn't committed yet) before reading past it
+GAP_WAIT_SECONDS = 5
+
+# Seconds between budget_alerts purges
+PURGE_INTERVAL = 3600
+
+
+def invalidate_remote_trips(trip_ids) -> None:
+    """Forget what this process cached about trips another process changed"""
+    if settings.CACHE_BACKEND == "memory":
+        cache.invalidate_tags(trip_tag(trip_id) for trip_id in trip_ids)
+    share_snapshots.invalidate_trips(trip_ids)
+    stop_schedules.invalidate_trips(trip_ids)
+
+
+class WorkerSync:
+    """
+    Follows trip_events and budget_alerts on a daemon thread
+
+    - start() / stop(): from app startup/shutdown
+    - sync_once(): one pass (also usable from tests)
+    """
+
+    def __init__(self, poll_seconds: float, batch_size: int = 1000):
+        self.poll_seconds = poll_seconds
+        self.batch_size = batch_size
+        self.last_event_id: Optional[int] = None
+        self._gap_since: Optional[float] = None
+        self._purged_at = 0.0
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+
+        # From now on: earlier commits were made before this process cached anything
+        db = SessionLocal()
+        try:
+            self.last_event_id = db.query(func.coalesce(func.max(TripEvent.id), 0)).scalar()
+            newest_alert = db.query(func.coalesce(func.max(BudgetAlertEvent.id), 0)).scalar()
+            budget_alerts.last_id = max(budget_alerts.last_id, newest_alert)
+        finally:
+            db.close()
+        budget_alerts.followed = True
+
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="worker-sync", daemon=True)
+        self._thread.start()
+        print(f"✅ Following other workers' commits every {self.poll_seconds}s")
+
+    def stop(self, timeout: float = 5) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopping.wait(self.poll_seconds):
+            try:
+                self.sync_once()
+                if time.monotonic() - self._purged_at > PURGE_INTERVAL:
+                    self._purged_at = time.monotonic()
+                    self._purge()
+            except Exception as e:
+                print(f"❌ Worker sync failed: {str(e)}")
+
+    def sync_once(self) -> None:
+        db = SessionLocal()
+        try:
+            trip_ids = self._changed_trips(db)
+            budget_alerts.follow(db.connection())
+        finally:
+            db.close()
+
+        if trip_ids:
+            invalidate_remote_trips(trip_ids)
+
+    def _changed_trips(self, db) -> List[int]:
+        rows = db.execute(
+            select(TripEvent.id, TripEvent.trip_id)
+            .where(TripEvent.id > self.last_event_id)
+            .order_by(TripEvent.id)
+            .limit(self.batch_size)
+        ).all()
+
+        trip_ids = set()
+        for event_id, trip_id in rows:
+            if event_id != self.last_event_id + 1 and not self._gap_expired():
+                break  # Read again on the next pass
+            self._gap_since = None
+            self.last_event_id = event_id
+            trip_ids.add(trip_id)
+        return sorted(trip_ids)
+
+    def _gap_expired(self) -> bool:
+        """
+        SQLite commits ids in order; Postgres hands out ids before commit,
+        so a gap can be a transaction still in flight (or one that rolled back)
+        """
+        now = time.monotonic()
+        if self._gap_since is None:
+            self._gap_since = now
+        return now - self._gap_since >= GAP_WAIT_SECONDS
+
+    def _purge(self) -> None:
+        db = WriteSessionLocal()
+        try:
+            purge_budget_alerts(db.connection())
+            db.commit()
+        finally:
+            db.close()
+
+
+worker_sync = WorkerSync(settings.WORKER_SYNC_SECONDS)
+
+
+def start_worker_sync_on_startup() -> None:
+    """Start following the other workers (only with SERVER_WORKERS > 1)"""
+    if settings.SERVER_WORKERS < 2:
+        return
+    try:
+        worker_sync.start()
+    except Exception as e:
+        print(f"⚠️ Worker sync not started: {str(e)}")
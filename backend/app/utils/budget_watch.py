@@ -0,0 +1,417 @@
+# backend/app/utils/budget_watch.py
+
+import asyncio
+import threading
+from collections import deque
+from datetime import datetime
+from itertools import chain
+from typing import Callable, Dict, List, Optional
+from sqlalchemy import delete, event, func, insert, inspect, or_, select, text, update
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..database import write_engine
+from ..models.trip import Trip
+from ..models.stop import Stop
+from ..models.activity import Activity
+from ..models.budget import BudgetRecord
+from ..models.parking import ParkingBooking
+from ..models.budget_alert import BudgetAlertEvent
+from .trip_changes import stop_trip_map
+from .jobs import job_handler
+
+# ============================================
+# BUDGET THRESHOLD WATCHER
+# ============================================
+# trips.spent_total is a running total of what's charged to the trip:
+#
+#   budget records + parking bookings (not cancelled) + activity costs
+#
+# Every flush adds the difference it made (new amount - old amount):
+#
+#   UPDATE trips SET spent_total = spent_total + :delta ... RETURNING ...
+#
+# and compares before/after with BUDGET_ALERT_THRESHOLDS (% of
+# budget_limit). Each threshold crossed becomes a budget_alerts row in
+# the same transaction, published to budget_alerts after it commits.
+# Under several worker processes, each one follows the table for the
+# alerts committed by the others (services/worker_sync_service.py).
+#
+# One UPDATE per changed trip and a handful of comparisons:
+# nothing is ever summed again.
+
+_SESSION_KEY = "budget_alerts"
+
+# model → (parent column, amount charged given a value getter)
+_CHARGES = {
+    BudgetRecord: ("trip_id", lambda get: get("amount")),
+    ParkingBooking: (
+        "trip_id",
+        lambda get: get("total_cost") if get("booking_status") != "cancelled" else None
+    ),
+    Activity: ("stop_id", lambda get: get("cost")),
+}
+
+
+def _old_value(obj, attr: str):
+    """Value before this flush (attribute history)"""
+    history = inspect(obj).attrs[attr].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return None
+
+
+def _percent(spent: float, limit) -> Optional[float]:
+    if not limit or float(limit) <= 0:
+        return None
+    return spent / float(limit) * 100
+
+
+def _crossings(trip_id: int, user_id: int, old_spent: float, new_spent: float,
+               old_limit, new_limit) -> List[dict]:
+    """Alerts for every threshold between the old and new percentage"""
+    old_percent = _percent(old_spent, old_limit) or 0.0
+    new_percent = _percent(new_spent, new_limit)
+    if new_percent is None:
+        return []
+
+    at = datetime.utcnow().isoformat()
+    alerts = []
+    for threshold in settings.BUDGET_ALERT_THRESHOLDS:
+        if old_percent < threshold <= new_percent:
+            direction = "up"
+        elif new_percent < threshold <= old_percent:
+            direction = "down"
+        else:
+            continue
+
+        alerts.append({
+            "trip_id": trip_id,
+            "user_id": user_id,
+            "threshold": threshold,
+            "direction": direction,
+            "spent": round(new_spent, 2),
+            "budget_limit": float(new_limit),
+            "percent": round(new_percent, 1),
+            "created_at": at
+        })
+    return alerts
+
+
+def record_spend(session: Session, deltas: Dict[int, float]) -> None:
+    """
+    Add amounts to trips' running totals (trip_id → amount, may be negative)
+    and queue alerts for thresholds crossed
+
+    Use this for Core-level writes (insert()/update()/delete())
+    which don't go through the ORM flush
+    """
+    for trip_id, delta in deltas.items():
+        delta = round(float(delta), 2)
+        if not delta or trip_id is None:
+            continue
+
+        row = session.connection().execute(
+            update(Trip)
+            .where(Trip.id == trip_id)
+            .values(spent_total=Trip.spent_total + delta)
+            .returning(Trip.user_id, Trip.spent_total, Trip.budget_limit)
+            .execution_options(synchronize_session=False)
+        ).first()
+        if row is None:
+            continue
+
+        user_id, spent, limit = row
+        spent = float(spent)
+        _queue_alerts(session, _crossings(trip_id, user_id, spent - delta, spent, limit, limit))
+
+
+def _queue_alerts(session: Session, alerts: List[dict]) -> None:
+    """Write alerts to the budget_alerts table (which numbers them), published after commit"""
+    for alert in alerts:
+        values = {key: value for key, value in alert.items() if key != "created_at"}
+        alert["id"] = session.connection().execute(
+            insert(BudgetAlertEvent).values(**values).returning(BudgetAlertEvent.id)
+        ).scalar()
+        session.info.setdefault(_SESSION_KEY, []).append(alert)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_spend(session, flush_context):
+    deltas = {"trip_id": {}, "stop_id": {}}
+    limit_changes = []
+    moved_stops = []  # (stop_id, old trip_id, new trip_id)
+
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, Trip):
+            history = inspect(obj).attrs.budget_limit.history
+            if obj in session.dirty and history.has_changes():
+                limit_changes.append((obj.id, _old_value(obj, "budget_limit")))
+            continue
+
+        if isinstance(obj, Stop):
+            if obj in session.dirty and inspect(obj).attrs.trip_id.history.deleted:
+                moved_stops.append((obj.id, _old_value(obj, "trip_id"), obj.trip_id))
+            continue
+
+        charge = _CHARGES.get(type(obj))
+        if charge is None:
+            continue
+        parent, amount = charge
+
+        if obj not in session.new:
+            get = lambda attr: _old_value(obj, attr)
+            old_amount = amount(get)
+            if old_amount:
+                by_parent = deltas[parent]
+                by_parent[get(parent)] = by_parent.get(get(parent), 0.0) - float(old_amount)
+
+        if obj not in session.deleted:
+            get = lambda attr: getattr(obj, attr)
+            new_amount = amount(get)
+            if new_amount:
+                by_parent = deltas[parent]
+                by_parent[get(parent)] = by_parent.get(get(parent), 0.0) + float(new_amount)
+
+    trip_deltas = deltas["trip_id"]
+
+    # A stop moved to another trip takes its activities' costs along:
+    # the old trip loses what they cost before this flush, the new one
+    # gains what they cost now (which covers this flush's activity writes)
+    for stop_id, old_trip_id, new_trip_id in moved_stops:
+        after = float(session.connection().execute(
+            select(func.coalesce(func.sum(Activity.cost), 0)).where(Activity.stop_id == stop_id)
+        ).scalar())
+        before = after - deltas["stop_id"].pop(stop_id, 0.0)
+        trip_deltas[old_trip_id] = trip_deltas.get(old_trip_id, 0.0) - before
+        trip_deltas[new_trip_id] = trip_deltas.get(new_trip_id, 0.0) + after
+
+    if deltas["stop_id"]:
+        stop_trips = stop_trip_map(session, set(deltas["stop_id"]))
+        for stop_id, delta in deltas["stop_id"].items():
+            trip_id = stop_trips.get(stop_id)
+            trip_deltas[trip_id] = trip_deltas.get(trip_id, 0.0) + delta
+
+    record_spend(session, trip_deltas)
+
+    # A new budget_limit can cross thresholds without any spend
+    for trip_id, old_limit in limit_changes:
+        row = session.connection().execute(
+            select(Trip.user_id, Trip.spent_total, Trip.budget_limit).where(Trip.id == trip_id)
+        ).first()
+        if row:
+            user_id, spent, limit = row
+            _queue_alerts(session, _crossings(trip_id, user_id, float(spent), float(spent), old_limit, limit))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_alerts(session):
+    alerts = session.info.pop(_SESSION_KEY, None)
+    if alerts:
+        budget_alerts.publish(alerts)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_alerts(session):
+    session.info.pop(_SESSION_KEY, None)
+
+
+# ============================================
+# PUB/SUB
+# ============================================
+
+class BudgetAlertBroker:
+    """
+    Budget alerts, published after commit
+
+    - subscribe(callback): callback(alert) for every alert committed
+      by this process
+    - open_queue(): an asyncio.Queue fed with every alert (SSE streams);
+      safe to publish from any thread
+    - recent(since): alerts still in the ring buffer with id > since
+      (polling, and replay for reconnecting streams)
+    - follow(): alerts committed by other processes, from the
+      budget_alerts table; once something follows, every alert (this
+      process's too) reaches the queues that way, in id order
+    """
+
+    def __init__(self, history: int):
+        self._events = deque(maxlen=history)
+        self._callbacks: List[Callable[[dict], None]] = []
+        self._queues = {}   # queue → its event loop
+        self._lock = threading.Lock()
+        self.last_id = 0
+        self.followed = False
+
+    def subscribe(self, callback: Callable[[dict], None]):
+        """Register callback(alert); can be used as a decorator"""
+        self._callbacks.append(callback)
+        return callback
+
+    def publish(self, alerts: List[dict]) -> None:
+        for alert in alerts:
+            print(f"⚠️ Budget alert: trip {alert['trip_id']} {alert['direction']} "
+                  f"{alert['threshold']}% ({alert['percent']}%)")
+
+            for callback in self._callbacks:
+                try:
+                    callback(alert)
+                except Exception as e:
+                    print(f"❌ Budget alert subscriber failed: {str(e)}")
+
+        if not self.followed:
+            self.dispatch(alerts)
+
+    def follow(self, connection, limit: int = 500) -> int:
+        """Dispatch alerts committed since the last one seen; returns how many"""
+        table = BudgetAlertEvent.__table__
+        rows = connection.execute(
+            select(table).where(table.c.id > self.last_id).order_by(table.c.id).limit(limit)
+        ).mappings().all()
+
+        alerts = []
+        for row in rows:
+            alert = dict(row)
+            alert["created_at"] = row["created_at"].isoformat() if row["created_at"] else None
+            alerts.append(alert)
+
+        self.dispatch(alerts)
+        return len(rows)
+
+    def dispatch(self, alerts: List[dict]) -> None:
+        """Into the ring buffer and every open queue"""
+        with self._lock:
+            for alert in alerts:
+                self.last_id = max(self.last_id, alert["id"])
+                self._events.append(alert)
+            queues = list(self._queues.items())
+
+        for alert in alerts:
+            for queue, loop in queues:
+                try:
+                    loop.call_soon_threadsafe(self._offer, queue, alert)
+                except RuntimeError:
+                    # Loop already closed (client gone)
+                    self.close_queue(queue)
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, alert: dict) -> None:
+        try:
+            queue.put_nowait(alert)
+        except asyncio.QueueFull:
+            pass  # Slow reader; it can catch up from recent()
+
+    def recent(self, since: int = 0, user_id: Optional[int] = None,
+               trip_id: Optional[int] = None) -> List[dict]:
+        with self._lock:
+            events = list(self._events)
+        return [
+            alert for alert in events
+            if alert["id"] > since
+            and (user_id is None or alert["user_id"] == user_id)
+            and (trip_id is None or alert["trip_id"] == trip_id)
+        ]
+
+    def open_queue(self, max_size: int = 1000) -> asyncio.Queue:
+        """Queue for the calling event loop (call from async code)"""
+        queue = asyncio.Queue(maxsize=max_size)
+        with self._lock:
+            self._queues[queue] = asyncio.get_running_loop()
+        return queue
+
+    def close_queue(self, queue: asyncio.Queue) -> None:
+        with self._lock:
+            self._queues.pop(queue, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._events.clear()
+
+
+budget_alerts = BudgetAlertBroker(settings.BUDGET_ALERT_HISTORY)
+
+
+def install_budget_alerts_on_startup() -> None:
+    """Create budget_alerts on databases created before it existed; keep the latest BUDGET_ALERT_HISTORY"""
+    try:
+        with write_engine.begin() as connection:
+            BudgetAlertEvent.__table__.create(connection, checkfirst=True)
+            purge_budget_alerts(connection)
+    except Exception as e:
+        print(f"⚠️ Budget alerts table not installed: {str(e)}")
+
+
+def purge_budget_alerts(connection) -> None:
+    """Drop all but the latest BUDGET_ALERT_HISTORY alerts (what the ring buffers keep)"""
+    newest = connection.execute(select(func.max(BudgetAlertEvent.id))).scalar()
+    if newest is not None:
+        connection.execute(delete(BudgetAlertEvent).where(BudgetAlertEvent.id <= newest - settings.BUDGET_ALERT_HISTORY))
+
+
+# ============================================
+# RUNNING TOTALS FOR EXISTING DATABASES
+# ============================================
+
+# Trips per transaction in the recompute_spend_totals job
+RECOMPUTE_CHUNK = 500
+
+def recompute_spend_totals(connection, trip_ids: Optional[List[int]] = None) -> None:
+    """
+    Set trips' spent_total from their records, bookings and activities
+    (every trip unless trip_ids is given)
+
+    Needed once when the column is added to an existing database,
+    and to repair totals after writes that bypassed the hooks
+    """
+    records = select(func.coalesce(func.sum(BudgetRecord.amount), 0)).where(
+        BudgetRecord.trip_id == Trip.id
+    ).scalar_subquery()
+
+    parking = select(func.coalesce(func.sum(ParkingBooking.total_cost), 0)).where(
+        ParkingBooking.trip_id == Trip.id,
+        or_(ParkingBooking.booking_status.is_(None), ParkingBooking.booking_status != "cancelled")
+    ).scalar_subquery()
+
+    activities = select(func.coalesce(func.sum(Activity.cost), 0)).join(
+        Stop, Stop.id == Activity.stop_id
+    ).where(Stop.trip_id == Trip.id).scalar_subquery()
+
+    repair = update(Trip.__table__).values(
+        spent_total=records + parking + activities,
+        updated_at=Trip.__table__.c.updated_at  # Not a user edit
+    )
+    if trip_ids is not None:
+        repair = repair.where(Trip.__table__.c.id.in_(trip_ids))
+    connection.execute(repair)
+
+
+@job_handler("recompute_spend_totals")
+def _recompute_spend_totals_job(db: Session, payload: dict) -> None:
+    """
+    Payload: {"trip_ids": [...]} or {} for every trip
+
+    Committed RECOMPUTE_CHUNK trips at a time, so other writers
+    aren't held up for the whole table
+    """
+    trip_ids = payload.get("trip_ids")
+    if trip_ids is None:
+        trip_ids = db.execute(select(Trip.id).order_by(Trip.id)).scalars().all()
+        db.commit()
+
+    for start in range(0, len(trip_ids), RECOMPUTE_CHUNK):
+        recompute_spend_totals(db.connection(), trip_ids[start:start + RECOMPUTE_CHUNK])
+        db.commit()
+
+
+def install_spend_totals(connection) -> None:
+    """Add trips.spent_total to databases created before it existed"""
+    columns = {column["name"] for column in inspect(connection).get_columns("trips")}
+    if "spent_total" in columns:
+        return
+
+    connection.execute(text(
+        "ALTER TABLE trips ADD COLUMN spent_total NUMERIC(12, 2) NOT NULL DEFAULT 0"
+    ))
+    recompute_spend_totals(connection)
+    print("✅ Budget running totals added to trips")
@@ -52,6 +52,36 @@ COST_INDEX_CHEAP = 1.0  # Very budget-friendly
 COST_INDEX_MODERATE = 5.0  # Mid-range
 COST_INDEX_EXPENSIVE = 9.0  # Luxury
 
+# ============================================
+# DESTINATION NAME ALIASES (normalised form → canonical form)
+# ============================================
+# Whole country names
+COUNTRY_ALIASES = {
+    "usa": "united states",
+    "us": "united states",
+    "u s a": "united states",
+    "united states of america": "united states",
+    "america": "united states",
+    "uk": "united kingdom",
+    "u k": "united kingdom",
+    "great britain": "united kingdom",
+    "britain": "united kingdom",
+    "uae": "united arab emirates",
+    "holland": "netherlands",
+    "the netherlands": "netherlands",
+    "czech republic": "czechia",
+    "south korea": "korea",
+    "republic of korea": "korea",
+}
+
+# Single words in city names
+CITY_WORD_ALIASES = {
+    "st": "saint",
+    "ste": "sainte",
+    "mt": "mount",
+    "ft": "fort",
+}
+
 # ============================================
 # ERROR MESSAGES
 # ============================================
@@ -0,0 +1,65 @@
+# backend/app/utils/etag.py
+
+import hashlib
+from typing import Optional
+from fastapi import Response
+
+
+def strong_etag(body: bytes) -> str:
+    """
+    Strong ETag from the exact response bytes
+
+    Example:
+    strong_etag(b'{"id": 1}')
+    # '"3f1a9c..."'
+    """
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def weak_etag(*parts, fields=None) -> str:
+    """
+    Weak ETag built from version numbers / ids
+    (plus the sparse fieldset, if any)
+
+    Example:
+    weak_etag("stops", 1, 7)
+    # 'W/"stops-1-7"'
+    weak_etag("stops", 1, 7, fields=("id", "city_name"))
+    # 'W/"stops-1-7-city_name.id"'
+    """
+    if fields:
+        parts = parts + (".".join(sorted(fields)),)
+    return 'W/"' + "-".join(str(part) for part in parts) + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against our ETag
+
+    Handles "*", comma separated lists and W/ prefixes
+    (If-None-Match always uses weak comparison)
+    """
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    wanted = etag[2:] if etag.startswith("W/") else etag
+
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == wanted:
+            return True
+
+    return False
+
+
+def not_modified(etag: str, cache_control: str = "private, no-cache") -> Response:
+    """Empty 304 response for a matching conditional GET"""
+    return Response(
+        status_code=304,
+        headers={"ETag": etag, "Cache-Control": cache_control}
+    )
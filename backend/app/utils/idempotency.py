@@ -0,0 +1,361 @@
+# backend/app/utils/idempotency.py
+
+# Idempotency-Key support for POST requests
+#
+# A client that retries a POST with the same Idempotency-Key gets the
+# first response back instead of creating a second row:
+#
+# POST /api/trips/            Idempotency-Key: 6f1c...  → 200, trip 7 created
+# POST /api/trips/ (retry)    Idempotency-Key: 6f1c...  → 200, trip 7 replayed
+#                                                          (Idempotent-Replayed: true)
+
+import hashlib
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+import anyio
+from sqlalchemy import and_, delete, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from ..config import settings
+from ..database import SessionLocal, WriteSessionLocal, write_engine
+from ..models.idempotency_key import IdempotencyKey
+from .security import get_user_id_from_token
+
+MAX_KEY_LENGTH = 255
+
+# Seconds between checks while another request holds the key
+# (doubled after each check, up to the max)
+WAIT_POLL_SECONDS = 0.05
+WAIT_POLL_MAX_SECONDS = 1.0
+
+# Responses here carry credentials (JWTs), so they're never stored
+EXCLUDED_PATH_PREFIXES = ("/api/auth/",)
+
+# Seconds between purges of expired keys (per process)
+PURGE_INTERVAL = 600
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    """A finished response, kept for replay"""
+    fingerprint: str  # Method, path, query and body of the original request
+    status: int
+    headers: Tuple[Tuple[bytes, bytes], ...]
+    body: bytes
+
+
+def _key_filter(key: Tuple[str, str]):
+    principal, idempotency_key = key
+    return and_(IdempotencyKey.principal == principal, IdempotencyKey.key == idempotency_key)
+
+
+class IdempotencyStore:
+    """
+    Responses by (principal, Idempotency-Key), in the idempotency_keys table
+
+    - claim() inserts the key's row; the unique constraint means one
+      request runs per key across every worker process, and the others
+      wait for its response (or take over a claim older than pending_timeout)
+    - put() stores the response on that row, release() drops a claim
+      that ended without one
+    - Rows expire after ttl seconds
+    """
+
+    def __init__(self, ttl: int, pending_timeout: int):
+        self.ttl = ttl
+        self.pending_timeout = pending_timeout
+        self._last_purge = 0.0
+
+    def get(self, key: Tuple[str, str]) -> Optional[StoredResponse]:
+        db = SessionLocal()
+        try:
+            row = db.execute(
+                select(
+                    IdempotencyKey.fingerprint, IdempotencyKey.response_status,
+                    IdempotencyKey.response_headers, IdempotencyKey.response_body
+                ).where(
+                    _key_filter(key),
+                    IdempotencyKey.status == "done",
+                    IdempotencyKey.expires_at > datetime.utcnow()
+                )
+            ).first()
+        finally:
+            db.close()
+
+        if row is None:
+            return None
+
+        return StoredResponse(
+            fingerprint=row.fingerprint,
+            status=row.response_status,
+            headers=tuple((name.encode("latin-1"), value.encode("latin-1"))
+                          for name, value in row.response_headers),
+            body=row.response_body
+        )
+
+    def claim(self, key: Tuple[str, str]) -> bool:
+        """
+        Mark a request as in flight
+
+        Returns True if the caller should run it (and call release() when
+        done), False if another request holds the key or already answered it
+        """
+        now = datetime.utcnow()
+        principal, idempotency_key = key
+
+        db = WriteSessionLocal()
+        try:
+            # An expired response or an abandoned claim frees the key
+            db.execute(delete(IdempotencyKey).where(
+                _key_filter(key),
+                or_(
+                    IdempotencyKey.expires_at <= now,
+                    and_(
+                        IdempotencyKey.status == "pending",
+                        IdempotencyKey.created_at < now - timedelta(seconds=self.pending_timeout)
+                    )
+                )
+            ))
+            db.execute(insert(IdempotencyKey).values(
+                principal=principal,
+                key=idempotency_key,
+                status="pending",
+                created_at=now,
+                expires_at=now + timedelta(seconds=self.ttl)
+            ))
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            return False
+        finally:
+            db.close()
+
+        self._purge_expired()
+        return True
+
+    def put(self, key: Tuple[str, str], fingerprint: str, status: int, headers, body: bytes) -> None:
+        db = WriteSessionLocal()
+        try:
+            db.execute(update(IdempotencyKey).where(_key_filter(key)).values(
+                status="done",
+                fingerprint=fingerprint,
+                response_status=status,
+                response_headers=[[name.decode("latin-1"), value.decode("latin-1")] for name, value in headers],
+                response_body=body,
+                expires_at=datetime.utcnow() + timedelta(seconds=self.ttl)
+            ))
+            db.commit()
+        finally:
+            db.close()
+
+    def release(self, key: Tuple[str, str]) -> None:
+        """Give the key up if no response was stored (5xx, errors)"""
+        db = WriteSessionLocal()
+        try:
+            db.execute(delete(IdempotencyKey).where(_key_filter(key), IdempotencyKey.status == "pending"))
+            db.commit()
+        finally:
+            db.close()
+
+    def _purge_expired(self) -> None:
+        if time.monotonic() - self._last_purge < PURGE_INTERVAL:
+            return
+        self._last_purge = time.monotonic()
+
+        db = WriteSessionLocal()
+        try:
+            db.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at <= datetime.utcnow()))
+            db.commit()
+        except Exception as e:
+            print(f"⚠️ Expired idempotency keys not purged: {str(e)}")
+        finally:
+            db.close()
+
+
+idempotency_store = IdempotencyStore(
+    ttl=settings.IDEMPOTENCY_TTL,
+    pending_timeout=settings.IDEMPOTENCY_PENDING_TIMEOUT
+)
+
+
+def install_idempotency_on_startup() -> None:
+    """Create idempotency_keys on databases created before it existed"""
+    try:
+        with write_engine.begin() as connection:
+            IdempotencyKey.__table__.create(connection, checkfirst=True)
+    except Exception as e:
+        print(f"⚠️ Idempotency keys table not installed: {str(e)}")
+
+
+def _principal(authorization: Optional[str]) -> str:
+    """Who is sending the request - keys are only shared within one user"""
+    if authorization:
+        user_id = get_user_id_from_token(authorization.replace("Bearer ", ""))
+        if user_id is not None:
+            return f"user:{user_id}"
+    return "anonymous"
+
+
+def _fingerprint(scope, body: bytes) -> str:
+    digest = hashlib.sha256()
+    digest.update(scope["method"].encode())
+    digest.update(scope["path"].encode())
+    digest.update(b"?" + scope.get("query_string", b""))
+    digest.update(b"\n" + body)
+    return digest.hexdigest()
+
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+async def _disconnected_within(receive, seconds: float) -> bool:
+    """
+    Wait up to `seconds` for the client to go away
+
+    The body has been read already, so the only message left is the disconnect
+    """
+    with anyio.move_on_after(seconds):
+        message = await receive()
+        return message["type"] == "http.disconnect"
+    return False
+
+
+class IdempotencyMiddleware:
+    """
+    ASGI middleware for POST requests carrying an Idempotency-Key header
+
+    - First request runs normally; its response (status < 500) is stored
+    - Retries with the same key get the stored response back
+      without reaching the routes (one indexed lookup)
+    - A retry that arrives while the first request is still running
+      (in any worker process) waits for it, checking less and less often,
+      and gets the same response; after IDEMPOTENCY_WAIT seconds → 409
+    - Reusing a key for a different request body → 422
+    - Auth routes are left alone (their responses hold tokens)
+
+    Server errors are not stored, so the client can retry them.
+    """
+
+    def __init__(self, app, store: IdempotencyStore = idempotency_store,
+                 max_wait: float = settings.IDEMPOTENCY_WAIT):
+        self.app = app
+        self.store = store
+        self.max_wait = max_wait
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or scope["path"].startswith(EXCLUDED_PATH_PREFIXES)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        idempotency_key = headers.get("idempotency-key")
+        if not idempotency_key:
+            await self.app(scope, receive, send)
+            return
+
+        if len(idempotency_key) > MAX_KEY_LENGTH:
+            response = JSONResponse(
+                {"detail": f"Idempotency-Key must be at most {MAX_KEY_LENGTH} characters"},
+                status_code=400
+            )
+            await response(scope, receive, send)
+            return
+
+        body = await _read_body(receive)
+        key = (_principal(headers.get("authorization")), idempotency_key)
+        fingerprint = _fingerprint(scope, body)
+
+        # Replay a finished response, or wait for the one in flight
+        # (the database calls run on a worker thread)
+        deadline = time.monotonic() + self.max_wait
+        delay = WAIT_POLL_SECONDS
+        while True:
+            stored = await anyio.to_thread.run_sync(self.store.get, key)
+            if stored is not None:
+                await self._replay(stored, fingerprint, scope, receive, send)
+                return
+
+            if await anyio.to_thread.run_sync(self.store.claim, key):
+                break
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                response = JSONResponse(
+                    {"detail": "A request with this Idempotency-Key is still in progress"},
+                    status_code=409,
+                    headers={"Retry-After": "1"}
+                )
+                await response(scope, receive, send)
+                return
+
+            if await _disconnected_within(receive, min(delay, remaining)):
+                return  # Nobody left to answer
+            delay = min(delay * 2, WAIT_POLL_MAX_SECONDS)
+
+        try:
+            await self._run(key, fingerprint, body, scope, receive, send)
+        finally:
+            await anyio.to_thread.run_sync(self.store.release, key)
+
+    async def _run(self, key, fingerprint: str, body: bytes, scope, receive, send):
+        """Call the app with the buffered body and keep a copy of the response"""
+        body_sent = False
+
+        async def replay_receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        status = None
+        response_headers = []
+        chunks = []
+
+        async def capture_send(message):
+            nonlocal status, response_headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                response_headers = message.get("headers", [])
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        await self.app(scope, replay_receive, capture_send)
+
+        if status is not None and status < 500:
+            await anyio.to_thread.run_sync(
+                self.store.put, key, fingerprint, status, response_headers, b"".join(chunks)
+            )
+
+    async def _replay(self, stored: StoredResponse, fingerprint: str, scope, receive, send):
+        if stored.fingerprint != fingerprint:
+            response = JSONResponse(
+                {"detail": "Idempotency-Key was already used for a different request"},
+                status_code=422
+            )
+            await response(scope, receive, send)
+            return
+
+        await send({
+            "type": "http.response.start",
+            "status": stored.status,
+            "headers": list(stored.headers) + [(b"idempotent-replayed", b"true")]
+        })
+        await send({"type": "http.response.body", "body": stored.body})
@@ -0,0 +1,342 @@
+# backend/app/utils/jobs.py
+
+import os
+import random
+import socket
+import threading
+import time
+import traceback
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional
+from sqlalchemy import case, delete, event, insert, select, update
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..database import WriteSessionLocal, write_engine
+from ..models.job import Job
+
+# ============================================
+# BACKGROUND JOBS
+# ============================================
+# Request handlers only enqueue: enqueue_job() inserts a jobs row in the
+# request's own transaction, so the job exists if and only if the write
+# it belongs to committed. JOB_WORKERS threads per process then claim
+# due jobs one at a time:
+#
+#   Postgres: UPDATE jobs SET status = 'running' ...
+#             WHERE id = (SELECT id ... FOR UPDATE SKIP LOCKED LIMIT 1)
+#   SQLite:   the same UPDATE without the lock clause - a single
+#             statement, and SQLite runs one writer at a time
+#
+# so two runners (threads or processes) never get the same job.
+#
+# A failing job is retried after JOB_RETRY_BASE_SECONDS × 2^(attempt - 1)
+# (capped at JOB_RETRY_MAX_SECONDS, with jitter) until max_attempts,
+# then stays 'failed' for the admin view.
+#
+# The claim, and marking the job done or failed, are short transactions
+# of their own. The handler runs between them with no transaction open
+# around it: it takes the write lock when it first writes and should
+# commit after each chunk, so other writers get their turn. While it
+# runs, a heartbeat refreshes locked_at every JOB_HEARTBEAT_SECONDS; a
+# 'running' job whose runner went away (no heartbeat for
+# JOB_LOCK_TIMEOUT) is queued again.
+
+_SESSION_KEY = "jobs_enqueued"
+
+# Seconds between housekeeping passes (stale locks, old finished jobs)
+HOUSEKEEPING_INTERVAL = 60
+
+_handlers: Dict[str, Callable[[Session, dict], None]] = {}
+
+
+def job_handler(kind: str):
+    """
+    Register handler(db, payload) for a job kind
+
+    Used as a decorator. The runner commits after the handler returns
+    and rolls back if it raises; a long handler commits after each chunk
+    itself. Jobs can run more than once (retries, a runner dying
+    mid-job), so handlers must be safe to repeat.
+    """
+    def register(handler):
+        _handlers[kind] = handler
+        return handler
+    return register
+
+
+def job_kinds():
+    return sorted(_handlers)
+
+
+def enqueue_job(session: Session, kind: str, payload: Optional[dict] = None,
+                dedupe_key: Optional[str] = None, delay: float = 0,
+                max_attempts: Optional[int] = None) -> Optional[int]:
+    """
+    Queue a job in the current transaction; the caller commits
+
+    With a dedupe_key, nothing is added while a job with the same key
+    is still queued (it will see this write too). Returns the job id,
+    or None if deduplicated.
+    """
+    connection = session.connection()
+
+    if dedupe_key is not None:
+        waiting = connection.execute(
+            select(Job.id).where(Job.dedupe_key == dedupe_key, Job.status == "queued").limit(1)
+        ).first()
+        if waiting:
+            return None
+
+    now = datetime.utcnow()
+    job_id = connection.execute(
+        insert(Job).values(
+            kind=kind,
+            payload=payload or {},
+            dedupe_key=dedupe_key,
+            status="queued",
+            attempts=0,
+            max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+            run_at=now + timedelta(seconds=delay),
+            created_at=now
+        ).returning(Job.id)
+    ).scalar()
+
+    session.info[_SESSION_KEY] = True
+    return job_id
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_runner(session):
+    if session.info.pop(_SESSION_KEY, None):
+        job_runner.notify()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_enqueued(session):
+    session.info.pop(_SESSION_KEY, None)
+
+
+def claim_job(connection, runner_name: str):
+    """Mark the next due job as running by this runner and return it (or None)"""
+    now = datetime.utcnow()
+    due = (
+        select(Job.id)
+        .where(Job.status == "queued", Job.run_at <= now)
+        .order_by(Job.run_at, Job.id)
+        .limit(1)
+    )
+    if connection.dialect.name == "postgresql":
+        due = due.with_for_update(skip_locked=True)
+
+    return connection.execute(
+        update(Job)
+        .where(Job.id == due.scalar_subquery(), Job.status == "queued")
+        .values(status="running", locked_by=runner_name, locked_at=now, attempts=Job.attempts + 1)
+        .returning(Job.id, Job.kind, Job.payload, Job.attempts, Job.max_attempts)
+    ).first()
+
+
+def retry_delay(attempts: int) -> float:
+    """Seconds before the next attempt (exponential, capped, jittered)"""
+    delay = min(settings.JOB_RETRY_BASE_SECONDS * 2 ** (attempts - 1), settings.JOB_RETRY_MAX_SECONDS)
+    return delay * random.uniform(0.5, 1.0)
+
+
+class JobRunner:
+    """
+    Runs queued jobs on a few daemon threads in this process
+
+    - start() / stop(): from app startup/shutdown (JOB_WORKERS = 0 runs none)
+    - notify(): a job was enqueued, look now instead of at the next poll
+    - run_one(): claim and run a single job (also usable from scripts)
+    """
+
+    def __init__(self, workers: int, poll_seconds: float):
+        self.workers = workers
+        self.poll_seconds = poll_seconds
+        self.name = f"{socket.gethostname()}:{os.getpid()}"
+        self.stats = Counter()  # done / retried / failed in this process
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._threads = []
+        self._housekeeping_at = 0.0
+
+    def start(self) -> None:
+        if self._threads or self.workers <= 0:
+            return
+
+        # Forked worker processes need their own name
+        self.name = f"{socket.gethostname()}:{os.getpid()}"
+        self._stopping.clear()
+        for number in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-runner-{number}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        print(f"✅ Job runner started: {self.workers} workers")
+
+    def stop(self, timeout: float = 10) -> None:
+        """Finish running jobs (up to timeout) and stop"""
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def notify(self) -> None:
+        self._wakeup.set()
+
+    def _work(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                if time.monotonic() - self._housekeeping_at > HOUSEKEEPING_INTERVAL:
+                    self._housekeeping_at = time.monotonic()
+                    self.housekeeping()
+                ran = self.run_one()
+            except Exception as e:
+                print(f"❌ Job runner error: {str(e)}")
+                ran = False
+
+            if not ran:
+                self._wakeup.wait(self.poll_seconds)
+                self._wakeup.clear()
+
+    def run_one(self) -> bool:
+        """Run the next due job; False if there was none"""
+        # Per thread, so a job requeued and claimed again by another
+        # thread of this process isn't mistaken for ours
+        holder = f"{self.name}/{threading.current_thread().name}"
+        db = WriteSessionLocal()
+        try:
+            job = claim_job(db.connection(), holder)
+            db.commit()
+        finally:
+            db.close()
+
+        if job is None:
+            return False
+
+        error = None
+        db = WriteSessionLocal()
+        try:
+            with self._heartbeat(job.id, holder):
+                try:
+                    handler = _handlers.get(job.kind)
+                    if handler is None:
+                        raise LookupError(f"No handler for job kind '{job.kind}'")
+                    handler(db, job.payload or {})
+                    db.commit()
+                except Exception as e:
+                    # Before the heartbeat stops: it may be waiting for our write lock
+                    db.rollback()
+                    error = e
+        finally:
+            db.close()
+
+        if error is not None:
+            self._failed(job, holder, error)
+        else:
+            self._finished(job, holder, {"status": "done", "finished_at": datetime.utcnow(), "last_error": None})
+            self.stats["done"] += 1
+        return True
+
+    @contextmanager
+    def _heartbeat(self, job_id: int, holder: str):
+        """Keep the job's locked_at fresh while the handler runs"""
+        stopped = threading.Event()
+
+        def beat():
+            while not stopped.wait(settings.JOB_HEARTBEAT_SECONDS):
+                try:
+                    self._update_held(job_id, holder, {"locked_at": datetime.utcnow()})
+                except Exception as e:
+                    print(f"⚠️ Job {job_id} heartbeat failed: {str(e)}")
+
+        thread = threading.Thread(target=beat, name=f"job-heartbeat-{job_id}", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stopped.set()
+            thread.join()
+
+    def _update_held(self, job_id: int, holder: str, values: dict) -> bool:
+        """Update the job if holder still has it (False if housekeeping took it back)"""
+        db = WriteSessionLocal()
+        try:
+            updated = db.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.status == "running", Job.locked_by == holder)
+                .values(**values)
+            ).rowcount
+            db.commit()
+            return bool(updated)
+        finally:
+            db.close()
+
+    def _finished(self, job, holder: str, values: dict) -> None:
+        if not self._update_held(job.id, holder, {"locked_by": None, **values}):
+            print(f"⚠️ Job {job.id} ({job.kind}) was requeued while it ran; its result is not recorded")
+
+    def _failed(self, job, holder: str, error: Exception) -> None:
+        message = "".join(traceback.format_exception_only(type(error), error)).strip()
+
+        if job.attempts < job.max_attempts:
+            values = {
+                "status": "queued",
+                "run_at": datetime.utcnow() + timedelta(seconds=retry_delay(job.attempts))
+            }
+            self.stats["retried"] += 1
+            print(f"⚠️ Job {job.id} ({job.kind}) failed, attempt {job.attempts}/{job.max_attempts}: {message}")
+        else:
+            values = {"status": "failed", "finished_at": datetime.utcnow()}
+            self.stats["failed"] += 1
+            print(f"❌ Job {job.id} ({job.kind}) failed for good: {message}")
+
+        self._finished(job, holder, {"last_error": message, **values})
+
+    def housekeeping(self) -> None:
+        """Requeue jobs of runners that went away; drop old finished jobs"""
+        now = datetime.utcnow()
+        db = WriteSessionLocal()
+        try:
+            stale = now - timedelta(seconds=settings.JOB_LOCK_TIMEOUT)
+            requeued = db.execute(
+                update(Job)
+                .where(Job.status == "running", Job.locked_at < stale)
+                .values(
+                    status=case((Job.attempts >= Job.max_attempts, "failed"), else_="queued"),
+                    locked_by=None,
+                    last_error="Runner stopped before finishing"
+                )
+            ).rowcount
+
+            cutoff = now - timedelta(hours=settings.JOB_RETENTION_HOURS)
+            db.execute(delete(Job).where(Job.status == "done", Job.finished_at < cutoff))
+            db.commit()
+
+            if requeued:
+                print(f"⚠️ Requeued {requeued} jobs left running by a stopped runner")
+        finally:
+            db.close()
+
+
+job_runner = JobRunner(settings.JOB_WORKERS, settings.JOB_POLL_SECONDS)
+
+
+def install_jobs_on_startup() -> None:
+    """Create the jobs table on databases created before it existed"""
+    try:
+        with write_engine.begin() as connection:
+            Job.__table__.create(connection, checkfirst=True)
+    except Exception as e:
+        print(f"⚠️ Jobs table not installed: {str(e)}")
+
+
+def start_job_runner_on_startup() -> None:
+    """Start the worker threads (after the other startup hooks changed the schema)"""
+    try:
+        job_runner.start()
+    except Exception as e:
+        print(f"⚠️ Job runner not started: {str(e)}")
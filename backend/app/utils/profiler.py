@@ -0,0 +1,247 @@
+# backend/app/utils/profiler.py
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+# ============================================
+# ON-DEMAND STACK SAMPLER
+# ============================================
+# A background thread wakes `hz` times a second, reads every other
+# thread's current stack (sys._current_frames) and counts it. Nothing
+# is hooked into the interpreter or the request path: when no profile
+# is running there is no thread and no per-request work at all.
+#
+# Stacks are tagged with the route being served, found by matching
+# frames against the route endpoints' code objects - a sync endpoint
+# runs in a threadpool thread, an async one on the event loop thread,
+# and either way the endpoint function is on the stack. Work done
+# around the endpoint (response validation, serialization) shows up
+# under its thread's name instead.
+#
+# The sampler needs the GIL to look, so samples favour the points
+# where threads let go of it (I/O, waking the event loop) - good for
+# "where does the time go", not for exact per-line costs.
+
+# Deepest stack recorded (frames nearer the root are dropped)
+MAX_DEPTH = 128
+
+# Leaf frames of a thread that is blocked waiting, not working
+IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("thread.py", "_worker"),
+    ("socket.py", "accept"),
+    ("socket.py", "readinto"),
+}
+
+_APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+Frame = Tuple[str, str, int]  # (function, file, first line)
+
+
+def _short_path(path: str) -> str:
+    """app/routes/trips.py for the app's files, site-packages/... stripped for libraries"""
+    if path.startswith(_APP_ROOT):
+        return "app" + path[len(_APP_ROOT):]
+    marker = path.rfind("-packages" + os.sep)
+    if marker != -1:
+        return path[marker + len("-packages" + os.sep):]
+    return os.path.basename(path)
+
+
+class StackSampler:
+    """
+    Sample all threads' stacks for a while
+
+    sampler = StackSampler(hz=100, routes={code: "GET /api/trips"})
+    sampler.start(); ...; sampler.stop()
+    sampler.collapsed() / sampler.speedscope()
+    """
+
+    def __init__(self, hz: int = 100, routes: Optional[Dict[object, str]] = None, idle: bool = False):
+        self.interval = 1 / hz
+        self.routes = routes or {}
+        self.idle = idle
+        self.stacks: Counter = Counter()   # (tag, frames root→leaf) → samples
+        self.samples = 0
+        self.started_at: Optional[float] = None
+        self.stopped_at: Optional[float] = None
+        self.overhead = 0.0                # Seconds spent sampling
+        self._frames: Dict[object, Frame] = {}
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.stopped_at = time.time()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        next_at = time.perf_counter()
+        while not self._stopping.is_set():
+            started = time.perf_counter()
+            self._sample(own_id)
+            self.overhead += time.perf_counter() - started
+
+            # Fixed schedule, so slow samples don't stretch the interval
+            next_at += self.interval
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                self._stopping.wait(delay)
+            else:
+                next_at = time.perf_counter()
+
+    def _frame(self, code) -> Frame:
+        frame = self._frames.get(code)
+        if frame is None:
+            frame = (getattr(code, "co_qualname", code.co_name), _short_path(code.co_filename), code.co_firstlineno)
+            self._frames[code] = frame
+        return frame
+
+    def _sample(self, own_id: int) -> None:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        self.samples += 1
+
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+
+            codes = []
+            while frame is not None and len(codes) < MAX_DEPTH:
+                codes.append(frame.f_code)
+                frame = frame.f_back
+            if not codes:
+                continue
+
+            leaf = codes[0]
+            if not self.idle and (os.path.basename(leaf.co_filename), leaf.co_name) in IDLE_FRAMES:
+                continue
+
+            tag = None
+            for code in codes:
+                tag = self.routes.get(code)
+                if tag is not None:
+                    break
+            if tag is None:
+                tag = f"thread:{names.get(thread_id, thread_id)}"
+
+            self.stacks[(tag, tuple(self._frame(code) for code in reversed(codes)))] += 1
+
+    # ============================================
+    # OUTPUT
+    # ============================================
+
+    def summary(self) -> dict:
+        by_tag = Counter()
+        for (tag, _), count in self.stacks.items():
+            by_tag[tag] += count
+        duration = (self.stopped_at or time.time()) - (self.started_at or time.time())
+        return {
+            "pid": os.getpid(),
+            "seconds": round(duration, 3),
+            "samples": self.samples,
+            "interval_ms": round(self.interval * 1000, 3),
+            "overhead_ms": round(self.overhead * 1000, 1),
+            "by_route": dict(by_tag.most_common()),
+        }
+
+    def collapsed(self) -> str:
+        """
+        One line per distinct stack, route first (flamegraph.pl / speedscope input):
+        GET /api/trips;run;list_trips (app/routes/trips.py:136);fetch (...) 42
+        """
+        lines = []
+        for (tag, frames), count in self.stacks.most_common():
+            names = [f"{name} ({path}:{line})" for name, path, line in frames]
+            lines.append(f"{';'.join([tag] + names)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def speedscope(self) -> dict:
+        """speedscope file format: one sampled profile per route, frames shared"""
+        frame_index: Dict[Frame, int] = {}
+        frames: List[dict] = []
+        profiles: Dict[str, dict] = {}
+
+        for (tag, stack), count in self.stacks.most_common():
+            indexes = []
+            for frame in stack:
+                if frame not in frame_index:
+                    frame_index[frame] = len(frames)
+                    name, path, line = frame
+                    frames.append({"name": name, "file": path, "line": line})
+                indexes.append(frame_index[frame])
+
+            profile = profiles.setdefault(tag, {
+                "type": "sampled",
+                "name": tag,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": 0,
+                "samples": [],
+                "weights": [],
+            })
+            weight = round(count * self.interval, 6)
+            profile["samples"].append(indexes)
+            profile["weights"].append(weight)
+            profile["endValue"] = round(profile["endValue"] + weight, 6)
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": f"pid {os.getpid()}, {self.summary()['seconds']}s at {round(1 / self.interval)}Hz",
+            "exporter": "globetrotter",
+            "shared": {"frames": frames},
+            "profiles": sorted(profiles.values(), key=lambda profile: -profile["endValue"]),
+        }
+
+
+# One profile at a time per process
+_profile_lock = threading.Lock()
+
+
+def route_codes(routes) -> Dict[object, str]:
+    """Route endpoints' code objects → "GET /api/trips/{trip_id}" """
+    tags = {}
+    for route in routes:
+        endpoint = getattr(route, "endpoint", None)
+        code = getattr(endpoint, "__code__", None)
+        if code is None:
+            continue
+        methods = ",".join(sorted(getattr(route, "methods", None) or ["WS"]))
+        tags[code] = f"{methods} {route.path}"
+    return tags
+
+
+def try_start_profile(sampler: StackSampler) -> bool:
+    """Start `sampler` unless another profile is running in this process"""
+    if not _profile_lock.acquire(blocking=False):
+        return False
+    try:
+        sampler.start()
+    except Exception:
+        _profile_lock.release()
+        raise
+    return True
+
+
+def finish_profile(sampler: StackSampler) -> None:
+    try:
+        sampler.stop()
+    finally:
+        _profile_lock.release()
@@ -1,13 +1,24 @@
 # backend/app/utils/security.py
 
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
-from passlib.context import CryptContext
-from jose import JWTError, jwt
 from ..config import settings
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# passlib (and its bcrypt backend) and python-jose are imported on
+# first use, so starting a worker doesn't pay for them; load_security()
+# loads them ahead of traffic (warm-up, or a pre-fork parent)
+
+@lru_cache(maxsize=None)
+def get_pwd_context():
+    """Password hashing context (bcrypt)"""
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+def load_security():
+    """Import the bcrypt backend and jose now instead of on the first login"""
+    get_pwd_context().handler("bcrypt").get_backend()
+    from jose import jwt  # noqa: F401
 
 # ============================================
 # PASSWORD FUNCTIONS
@@ -22,7 +33,7 @@ def hash_password(password: str) -> str:
     hashed = hash_password(plain)
     # hashed = "$2b$12$..."
     """
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
@@ -32,7 +43,7 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     if verify_password("mypassword123", hashed):
         # Password is correct
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 # ============================================
 # JWT TOKEN FUNCTIONS
@@ -49,6 +60,8 @@ def create_access_token(
     token = create_access_token({"sub": "user_id_123"})
     # token = "eyJhbGciOiJIUzI1NiIs..."
     """
+    from jose import jwt
+    
     to_encode = data.copy()
     
     # Set expiration
@@ -79,6 +92,8 @@ def decode_access_token(token: str) -> Optional[dict]:
     if payload:
         user_id = payload.get("sub")
     """
+    from jose import JWTError, jwt
+    
     try:
         payload = jwt.decode(
             token,
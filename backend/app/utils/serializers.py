@@ -0,0 +1,142 @@
+# backend/app/utils/serializers.py
+
+from typing import List, Optional, Tuple
+from fastapi import HTTPException, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import Float, Numeric, select, type_coerce
+from sqlalchemy.orm import Session
+from ..config import settings
+
+# orjson is optional - the fast path is only used when it's installed
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse
+except ImportError:
+    orjson = None
+    ORJSONResponse = None
+
+# Headers set on the route's injected Response that must survive
+# when we return our own response object
+_PASSTHROUGH_HEADERS = ("etag", "cache-control")
+
+
+def fast_json_enabled() -> bool:
+    """FAST_JSON is on and orjson is available"""
+    return settings.FAST_JSON and orjson is not None
+
+
+def default_response_class():
+    """Response class for the FastAPI app (ORJSONResponse on the fast path)"""
+    if settings.FAST_JSON and orjson is None:
+        print("⚠️ FAST_JSON is set but orjson is not installed, using JSONResponse")
+
+    return ORJSONResponse if fast_json_enabled() else JSONResponse
+
+
+class RowSerializer:
+    """
+    Build response dicts for a schema from a model's rows
+
+    Fast path (FAST_JSON=true):
+    select() only the schema's columns and zip each row tuple into a
+    dict - no ORM objects, no Pydantic validation
+
+    Otherwise:
+    regular ORM query, validated through the schema
+
+    Sparse fieldsets (?fields=id,name) always use the column path,
+    selecting only the requested columns
+
+    Example:
+    stop_rows = RowSerializer(Stop, StopResponse)
+    stops = stop_rows.fetch(db, Stop.trip_id == 1, order_by=[Stop.sequence_order])
+    names = stop_rows.fetch(db, Stop.trip_id == 1, fields=("id", "city_name"))
+    """
+
+    def __init__(self, model, schema):
+        self.model = model
+        self.schema = schema
+        self.fields = list(schema.model_fields)
+        self.columns = [self._column(name) for name in self.fields]
+        self._columns_by_name = dict(zip(self.fields, self.columns))
+
+    def _column(self, name: str):
+        column = getattr(self.model, name)
+
+        # Numeric columns come back as Decimal, the schemas expose float
+        if isinstance(column.type, Numeric) and not isinstance(column.type, Float):
+            return type_coerce(column, Float).label(name)
+
+        return column
+
+    def parse_fields(self, fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+        """
+        Validate a ?fields= value against the response schema
+
+        "id, name,id" → ("id", "name")
+        None / ""     → None (all fields)
+
+        Raises 400 for unknown field names
+        """
+        if not fields:
+            return None
+
+        requested = []
+        for name in fields.split(","):
+            name = name.strip()
+            if name and name not in requested:
+                requested.append(name)
+
+        unknown = [name for name in requested if name not in self._columns_by_name]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown field(s): {', '.join(unknown)}. "
+                       f"Allowed: {', '.join(self.fields)}"
+            )
+
+        return tuple(requested) or None
+
+    @staticmethod
+    def cache_key(base: str, fields: Optional[Tuple[str, ...]]) -> str:
+        """Cache key for a list, separate per fieldset"""
+        if not fields:
+            return base
+        return f"{base}:fields={','.join(sorted(fields))}"
+
+    def fetch(self, db: Session, *criteria, order_by=(), fields: Optional[Tuple[str, ...]] = None) -> List[dict]:
+        """Run the list query and return plain dicts"""
+        if fields or fast_json_enabled():
+            names = fields or self.fields
+            columns = [self._columns_by_name[name] for name in names]
+            query = select(*columns).where(*criteria).order_by(*order_by)
+            return [dict(zip(names, row)) for row in db.execute(query)]
+
+        objects = db.query(self.model).filter(*criteria).order_by(*order_by).all()
+        return [self.schema.model_validate(obj).model_dump(mode="json") for obj in objects]
+
+
+def list_response(data: list, response: Optional[Response] = None, partial: bool = False):
+    """
+    Return list data from a route
+
+    On the fast path the dicts are already in response shape,
+    so they go straight to orjson (skipping response_model validation).
+    Partial rows (?fields=) can't pass response_model validation either,
+    so they are JSON-encoded directly.
+    Otherwise FastAPI validates them through the route's response_model.
+    """
+    if not fast_json_enabled() and not partial:
+        return data
+
+    headers = {}
+    if response is not None:
+        for name in _PASSTHROUGH_HEADERS:
+            if name in response.headers:
+                headers[name] = response.headers[name]
+
+    if fast_json_enabled():
+        return ORJSONResponse(data, headers=headers)
+
+    return JSONResponse(jsonable_encoder(data), headers=headers)
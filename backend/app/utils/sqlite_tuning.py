@@ -0,0 +1,163 @@
+# backend/app/utils/sqlite_tuning.py
+
+import threading
+import time
+from collections import Counter
+from typing import Optional
+from sqlalchemy import event
+from ..config import settings
+
+# ============================================
+# SQLITE PRODUCTION PROFILE
+# ============================================
+# Applied to every connection when DATABASE_URL is SQLite:
+#
+#   journal_mode=WAL     readers don't block the writer (or each other)
+#   synchronous=NORMAL   fsync at checkpoints, not every commit (safe with WAL)
+#   busy_timeout         wait for another process's write lock instead of failing
+#   mmap_size            reads served from the page cache without copies
+#   cache_size           per connection page cache
+#   foreign_keys=ON      ondelete=CASCADE / SET NULL actually happen
+#
+# Writes: SQLite has one writer at a time. A transaction that reads and
+# then writes can't wait for the lock - if another write committed since
+# its read, it fails with "database is locked" at once. So write sessions
+# (WriteSessionLocal, get_db for POST/PUT/PATCH/DELETE) start with
+# BEGIN IMMEDIATE, taking the write lock up front, and within a process
+# they queue for it first-come first-served (WriterQueue) rather than
+# polling SQLite's busy handler. Read sessions BEGIN as usual and never wait.
+
+WRITER_OPTION = "sqlite_writer"   # Execution option set on the write engine
+
+
+class WriterQueue:
+    """
+    FIFO lock for write transactions in this process
+
+    Tickets are served in order; a writer that times out gives its
+    ticket up so the ones behind it aren't stuck
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._next_ticket = 0
+        self._serving = 0
+        self._abandoned = set()
+        self.stats = Counter()   # acquired / timeouts
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def acquire(self, timeout: float) -> bool:
+        started = time.perf_counter()
+        with self._condition:
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            if not self._condition.wait_for(lambda: self._serving == ticket, timeout):
+                self._abandoned.add(ticket)
+                self.stats["timeouts"] += 1
+                return False
+
+            waited = time.perf_counter() - started
+            self.stats["acquired"] += 1
+            self.wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+            return True
+
+    def release(self) -> None:
+        with self._condition:
+            self._serving += 1
+            while self._serving in self._abandoned:
+                self._abandoned.remove(self._serving)
+                self._serving += 1
+            self._condition.notify_all()
+
+    def status(self) -> dict:
+        acquired = self.stats["acquired"]
+        return {
+            "enabled": settings.SQLITE_WRITER_QUEUE,
+            "waiting": max(self._next_ticket - self._serving - len(self._abandoned) - 1, 0),
+            "acquired": acquired,
+            "timeouts": self.stats["timeouts"],
+            "mean_wait_ms": round(self.wait_seconds / acquired * 1000, 2) if acquired else None,
+            "max_wait_ms": round(self.max_wait_seconds * 1000, 2),
+        }
+
+
+writer_queue = WriterQueue()
+
+
+def _pragmas() -> list:
+    return [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}",
+        f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}",
+        f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KB)}",
+        f"PRAGMA foreign_keys={'ON' if settings.SQLITE_FOREIGN_KEYS else 'OFF'}",
+    ]
+
+
+def _release_writer(info: dict) -> None:
+    if info.pop("writer_queued", False):
+        writer_queue.release()
+
+
+def install_sqlite_tuning(engine) -> None:
+    """Register the connect/begin/commit hooks on a SQLite engine"""
+
+    @event.listens_for(engine, "connect")
+    def apply_pragmas(dbapi_connection, connection_record):
+        # We emit BEGIN ourselves (below), so pysqlite must not
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in _pragmas():
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def begin(connection):
+        if not connection.get_execution_options().get(WRITER_OPTION):
+            connection.exec_driver_sql("BEGIN")
+            return
+
+        if settings.SQLITE_WRITER_QUEUE:
+            if not writer_queue.acquire(settings.SQLITE_WRITER_TIMEOUT):
+                raise TimeoutError(f"No turn to write after {settings.SQLITE_WRITER_TIMEOUT}s (writer queue)")
+            connection.info["writer_queued"] = True
+        try:
+            connection.exec_driver_sql("BEGIN IMMEDIATE")
+        except Exception:
+            _release_writer(connection.info)
+            raise
+
+    @event.listens_for(engine, "commit")
+    def after_commit(connection):
+        _release_writer(connection.info)
+
+    @event.listens_for(engine, "rollback")
+    def after_rollback(connection):
+        _release_writer(connection.info)
+
+    # Connection given back (or invalidated) without commit/rollback
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        _release_writer(connection_record.info)
+
+
+def database_status(engine) -> Optional[dict]:
+    """Effective pragmas and the writer queue (None if not SQLite)"""
+    if engine.dialect.name != "sqlite":
+        return None
+
+    with engine.connect() as connection:
+        pragmas = {
+            name: connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+            for name in ("journal_mode", "synchronous", "busy_timeout", "mmap_size", "cache_size", "foreign_keys")
+        }
+    return {
+        "tuning": settings.SQLITE_TUNING,
+        "pragmas": pragmas,
+        "writer_queue": writer_queue.status(),
+    }
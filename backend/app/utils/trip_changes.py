@@ -0,0 +1,173 @@
+# backend/app/utils/trip_changes.py
+
+from itertools import chain
+from sqlalchemy import event, inspect, select, text, update
+from sqlalchemy.orm import Session
+from ..models.user import User
+from ..models.trip import Trip
+from ..models.stop import Stop
+from ..models.activity import Activity
+from ..models.budget import BudgetRecord
+from ..models.parking import ParkingBooking
+from ..models.shared_trip import SharedTrip
+
+# ============================================
+# TRIP SUBTREE WRITE TRACKING
+# ============================================
+# Every flush records which trips had something written under them:
+#
+#   Trip → Stops → Activities
+#        ├→ Budget Records
+#        ├→ Parking Bookings
+#        └→ Shared Trips
+#
+# Each changed trip gets its version bumped in the same transaction,
+# and so does its owner's trips_version (the trip list ETag).
+# After the transaction commits, registered listeners are called once
+# with the set of changed trip ids (cache invalidation, etc.)
+
+_SESSION_KEY = "changed_trip_ids"
+
+# Objects that carry trip_id directly
+_TRIP_CHILDREN = (Stop, BudgetRecord, ParkingBooking, SharedTrip)
+
+_listeners = []
+
+
+def on_trip_change(callback):
+    """
+    Register callback(trip_ids) to run after a commit that wrote
+    anything in those trips' subtrees
+
+    Can be used as a decorator
+    """
+    _listeners.append(callback)
+    return callback
+
+
+def mark_trips_changed(session: Session, trip_ids, user_ids=()) -> None:
+    """
+    Record trip ids as changed in the current transaction
+    and bump their versions and their owners' trips_version
+
+    user_ids: owners whose trip rows are gone (deleted in this flush)
+    or who just lost a trip to another user
+
+    Use this for Core-level writes (insert()/update()/delete())
+    which don't go through the ORM flush
+    """
+    trip_ids = {trip_id for trip_id in trip_ids if trip_id is not None}
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    if not trip_ids and not user_ids:
+        return
+
+    connection = session.connection()
+    connection.execute(
+        update(Trip)
+        .where(Trip.id.in_(trip_ids))
+        .values(version=Trip.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+    owners = select(Trip.user_id).where(Trip.id.in_(trip_ids))
+    connection.execute(
+        update(User)
+        .where(User.id.in_(owners) | User.id.in_(user_ids))
+        .values(trips_version=User.trips_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+    session.info.setdefault(_SESSION_KEY, set()).update(trip_ids)
+
+
+def stop_trip_map(session: Session, stop_ids: set) -> dict:
+    """stop_id → trip_id, using loaded stops before querying"""
+    trips = {}
+
+    loaded = chain(session.identity_map.values(), session.new, session.deleted)
+    for obj in loaded:
+        if isinstance(obj, Stop) and obj.id in stop_ids:
+            trips[obj.id] = obj.trip_id
+
+    missing = stop_ids - trips.keys()
+    if missing:
+        trips.update(session.connection().execute(
+            select(Stop.id, Stop.trip_id).where(Stop.id.in_(missing))
+        ).all())
+
+    return trips
+
+
+def _resolve_stop_trip_ids(session: Session, stop_ids: set) -> set:
+    """Map stop ids to their trip ids"""
+    return set(stop_trip_map(session, stop_ids).values())
+
+
+def _owner_ids(obj, attribute: str) -> set:
+    """
+    The object's current parent id plus the one it had before this flush
+    (an activity moved to another stop, a stop moved to another trip)
+    """
+    history = inspect(obj).attrs[attribute].history
+    return {getattr(obj, attribute), *history.deleted}
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_trips(session, flush_context):
+    trip_ids = set()
+    stop_ids = set()
+    user_ids = set()
+
+    dirty = (obj for obj in session.dirty if session.is_modified(obj))
+
+    for obj in chain(session.new, dirty, session.deleted):
+        if isinstance(obj, Trip):
+            trip_ids.add(obj.id)
+            user_ids |= _owner_ids(obj, "user_id")
+        elif isinstance(obj, _TRIP_CHILDREN):
+            trip_ids |= _owner_ids(obj, "trip_id")
+        elif isinstance(obj, Activity):
+            stop_ids |= _owner_ids(obj, "stop_id")
+
+    trip_ids.discard(None)
+    stop_ids.discard(None)
+    if stop_ids:
+        trip_ids |= _resolve_stop_trip_ids(session, stop_ids)
+
+    if trip_ids:
+        mark_trips_changed(session, trip_ids, user_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_changed_trips(session):
+    trip_ids = session.info.pop(_SESSION_KEY, None)
+    if not trip_ids:
+        return
+
+    for callback in _listeners:
+        try:
+            callback(trip_ids)
+        except Exception as e:
+            print(f"❌ Trip change listener failed: {str(e)}")
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_trips(session):
+    session.info.pop(_SESSION_KEY, None)
+
+
+# ============================================
+# STARTUP
+# ============================================
+
+def install_trip_versions(connection) -> None:
+    """Add trips.version and users.trips_version to databases created before they existed"""
+    columns = {column["name"] for column in inspect(connection).get_columns("trips")}
+    if "version" not in columns:
+        connection.execute(text("ALTER TABLE trips ADD COLUMN version INTEGER NOT NULL DEFAULT 1"))
+        print("✅ Version column added to trips")
+
+    columns = {column["name"] for column in inspect(connection).get_columns("users")}
+    if "trips_version" not in columns:
+        connection.execute(text("ALTER TABLE users ADD COLUMN trips_version INTEGER NOT NULL DEFAULT 1"))
+        print("✅ Trips version column added to users")
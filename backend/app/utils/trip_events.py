@@ -0,0 +1,121 @@
+# backend/app/utils/trip_events.py
+
+from itertools import chain
+from typing import Iterable, List
+from sqlalchemy import event, insert, inspect
+from sqlalchemy.orm import Session
+from ..models.trip import Trip
+from ..models.stop import Stop
+from ..models.activity import Activity
+from ..models.budget import BudgetRecord
+from ..models.parking import ParkingBooking
+from ..models.trip_event import TripEvent
+from .trip_changes import _owner_ids, stop_trip_map
+
+# ============================================
+# TRIP EVENT OUTBOX
+# ============================================
+# Every flush that writes a trip, stop, activity, budget record or
+# parking booking also inserts one trip_events row per object:
+#
+#   (trip_id, entity, entity_id, action, fields)
+#
+# in the same transaction, so the feed can never show a write that
+# was rolled back, or miss one that committed. The live feed
+# (services/trip_event_service.py) reads the table in id order.
+#
+# A stop moved to another trip (or an activity moved to a stop of
+# another trip) is "updated" on its new trip and "deleted" on the old
+# one, with the same fields, so watchers of either trip see it.
+
+ENTITIES = {
+    Trip: "trip",
+    Stop: "stop",
+    Activity: "activity",
+    BudgetRecord: "budget_record",
+    ParkingBooking: "parking_booking",
+}
+
+# Bookkeeping columns, not worth an event on their own
+_IGNORED_FIELDS = {"updated_at", "version", "spent_total", "destination_id"}
+
+
+def trip_event(trip_id: int, entity: str, entity_id: int, action: str, fields=None) -> dict:
+    return {
+        "trip_id": trip_id,
+        "entity": entity,
+        "entity_id": entity_id,
+        "action": action,
+        "fields": fields,
+    }
+
+
+def record_trip_events(session: Session, events: Iterable[dict]) -> None:
+    """
+    Add rows (see trip_event()) to the outbox in the current transaction
+
+    Use this for Core-level writes (insert()/update()/delete())
+    which don't go through the ORM flush
+    """
+    rows = [row for row in events if row["trip_id"] is not None]
+    if rows:
+        session.connection().execute(insert(TripEvent), rows)
+
+
+def _changed_fields(obj) -> List[str]:
+    state = inspect(obj)
+    return [
+        attr.key for attr in state.mapper.column_attrs
+        if attr.key not in _IGNORED_FIELDS and state.attrs[attr.key].history.has_changes()
+    ]
+
+
+@event.listens_for(Session, "after_flush")
+def _write_trip_events(session, flush_context):
+    events = []
+    activities = []
+
+    changes = chain(
+        ((obj, "created") for obj in session.new),
+        ((obj, "updated") for obj in session.dirty),
+        ((obj, "deleted") for obj in session.deleted),
+    )
+
+    for obj, action in changes:
+        entity = ENTITIES.get(type(obj))
+        if entity is None:
+            continue
+
+        fields = None
+        if action == "updated":
+            fields = _changed_fields(obj)
+            if not fields:
+                continue
+            if entity == "trip" and "is_deleted" in fields and obj.is_deleted:
+                action = "deleted"
+
+        if isinstance(obj, Trip):
+            events.append(trip_event(obj.id, entity, obj.id, action, fields))
+        elif isinstance(obj, Activity):
+            activities.append((obj, action, fields))
+        else:
+            events.append(trip_event(obj.trip_id, entity, obj.id, action, fields))
+            if action == "updated" and "trip_id" in fields:
+                for old_trip_id in _owner_ids(obj, "trip_id") - {obj.trip_id}:
+                    events.append(trip_event(old_trip_id, entity, obj.id, "deleted", fields))
+
+    if activities:
+        stop_ids = set()
+        for obj, action, fields in activities:
+            stop_ids |= _owner_ids(obj, "stop_id") if action == "updated" else {obj.stop_id}
+        stop_trips = stop_trip_map(session, stop_ids)
+
+        for obj, action, fields in activities:
+            trip_id = stop_trips.get(obj.stop_id)
+            events.append(trip_event(trip_id, "activity", obj.id, action, fields))
+            if action == "updated" and "stop_id" in fields:
+                old_trips = {stop_trips.get(stop_id) for stop_id in _owner_ids(obj, "stop_id")}
+                for old_trip_id in old_trips - {trip_id}:
+                    events.append(trip_event(old_trip_id, "activity", obj.id, "deleted", fields))
+
+    record_trip_events(session, events)
@@ -0,0 +1,139 @@
+# backend/app/utils/warmup.py
+
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from sqlalchemy import text
+from ..config import settings
+from ..database import engine
+
+# ============================================
+# WORKER WARM-UP AND READINESS
+# ============================================
+# A worker starts serving as soon as its startup hooks are done; the
+# slow-to-load parts (bcrypt, jose, numpy, DB connections) are loaded
+# on a background thread right after. GET /api/ready answers 503 until
+# that's finished, so a load balancer only sends traffic to warm workers.
+#
+# preload() is the import-only part, safe to run in a parent process
+# before forking workers (nothing in it holds a connection or a thread).
+
+# Process start, as close as we get to it (this module loads with the app)
+PROCESS_STARTED = time.time()
+
+
+def preload() -> None:
+    """Import the heavy dependencies loaded lazily by the request path"""
+    from .security import load_security
+    load_security()
+    import numpy  # noqa: F401 (budget forecasts)
+
+
+def warm_database() -> None:
+    """Open WARMUP_DB_CONNECTIONS pool connections, so early requests don't connect"""
+    connections = []
+    try:
+        for _ in range(settings.WARMUP_DB_CONNECTIONS):
+            connection = engine.connect()
+            connections.append(connection)
+            connection.execute(text("SELECT 1"))
+    finally:
+        for connection in connections:
+            connection.close()  # Back to the pool, still open
+
+
+def warm_forecast_model() -> None:
+    """Build the budget forecast model (otherwise the first forecast request does)"""
+    from ..database import SessionLocal
+    from ..services.forecast_service import ForecastService
+
+    db = SessionLocal()
+    try:
+        ForecastService.get_model(db)
+    finally:
+        db.close()
+
+
+# Steps run in order; each is timed. The third item names the
+# setting that turns the step off (None: always runs)
+WARMUP_STEPS: List[Tuple[str, Callable[[], None], Optional[str]]] = [
+    ("preload", preload, None),
+    ("database", warm_database, None),
+    ("forecast_model", warm_forecast_model, "WARMUP_FORECAST_MODEL"),
+]
+
+
+class Readiness:
+    """Warm-up progress of this worker process"""
+
+    def __init__(self):
+        self.started_at: Optional[float] = None
+        self.ready_at: Optional[float] = None
+        self.steps: Dict[str, dict] = {}
+        self._ready = threading.Event()
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._ready.wait(timeout)
+
+    def run(self) -> None:
+        """Run every warm-up step (a failed step is reported, not fatal)"""
+        self.started_at = time.time()
+        for name, step, setting in WARMUP_STEPS:
+            if setting is not None and not getattr(settings, setting):
+                self.steps[name] = {"ok": True, "skipped": True}
+                continue
+
+            started = time.perf_counter()
+            try:
+                step()
+                self.steps[name] = {"ok": True}
+            except Exception as e:
+                self.steps[name] = {"ok": False, "error": str(e)}
+                print(f"⚠️ Warm-up step {name} failed: {str(e)}")
+            self.steps[name]["ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+        self.ready_at = time.time()
+        self._ready.set()
+        self._notify_launcher()
+        print(f"✅ Worker ready {self.ready_at - PROCESS_STARTED:.2f}s after start")
+
+    def skip(self) -> None:
+        """Ready without warming up"""
+        self.ready_at = time.time()
+        self._ready.set()
+        self._notify_launcher()
+
+    def _notify_launcher(self) -> None:
+        """Under the pre-fork server, let the master know this worker is up"""
+        from .worker_metrics import worker_metrics
+        if worker_metrics is not None and worker_metrics.index is not None:
+            worker_metrics.mark_ready()
+
+    def status(self) -> dict:
+        return {
+            "ready": self.ready,
+            "steps": self.steps,
+            "seconds_since_start": round(time.time() - PROCESS_STARTED, 3),
+            "ready_after_seconds": round(self.ready_at - PROCESS_STARTED, 3) if self.ready_at else None,
+        }
+
+
+readiness = Readiness()
+
+
+def start_warmup_on_startup() -> None:
+    """
+    Warm up on a background thread, or before startup finishes with
+    WARMUP_BLOCKING (the pre-fork launcher: a worker only starts
+    accepting connections once it's warm)
+    """
+    if not settings.WARMUP_ON_STARTUP:
+        readiness.skip()
+    elif settings.WARMUP_BLOCKING:
+        readiness.run()
+    else:
+        threading.Thread(target=readiness.run, name="warmup", daemon=True).start()
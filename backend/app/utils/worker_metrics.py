@@ -0,0 +1,161 @@
+# backend/app/utils/worker_metrics.py
+
+# Per-worker request counters, readable from every worker
+#
+# The pre-fork launcher (app.server) maps one anonymous shared memory
+# block before forking, with a slot per worker. Each worker only writes
+# its own slot (from the event loop thread, so without locks) and any
+# worker can read all of them - GET /api/admin/workers sums them up.
+#
+# The master writes the pid/restarts/retired fields of a slot only
+# while no worker process owns it (before forking its replacement).
+
+import mmap
+import os
+import struct
+import time
+from typing import Optional
+
+# pid, restarts, requests, errors, in_flight, retired_requests, busy_seconds, started_at, ready_at
+_SLOT = struct.Struct("qqqqqqddd")
+_PID, _RESTARTS, _REQUESTS, _ERRORS, _IN_FLIGHT, _RETIRED, _BUSY, _STARTED, _READY = range(9)
+
+
+def _rss_mb(pid: int) -> Optional[float]:
+    """Resident memory of a process (Linux only)"""
+    try:
+        with open(f"/proc/{pid}/statm") as statm:
+            pages = int(statm.read().split()[1])
+        return round(pages * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024, 1)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class WorkerMetrics:
+    """Counters for `workers` slots in shared memory"""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.master_pid = os.getpid()
+        self.index: Optional[int] = None  # This worker's slot
+        self._buffer = mmap.mmap(-1, _SLOT.size * workers)
+
+    def _read(self, index: int) -> list:
+        return list(_SLOT.unpack_from(self._buffer, index * _SLOT.size))
+
+    def _write(self, index: int, values: list) -> None:
+        _SLOT.pack_into(self._buffer, index * _SLOT.size, *values)
+
+    # Master side
+
+    def assign(self, index: int, pid: int) -> None:
+        """
+        A new worker process took slot `index`: its predecessor's requests
+        move to retired, errors and busy time carry over
+        """
+        values = self._read(index)
+        restarts = values[_RESTARTS] + 1 if values[_PID] else 0
+        retired = values[_RETIRED] + values[_REQUESTS]
+        self._write(index, [pid, restarts, 0, values[_ERRORS], 0, retired, values[_BUSY], time.time(), 0.0])
+
+    def is_ready(self, index: int) -> bool:
+        return self._read(index)[_READY] > 0
+
+    # Worker side
+
+    def attach(self, index: int) -> None:
+        self.index = index
+
+    def mark_ready(self) -> None:
+        """Startup and warm-up are done; about to accept connections"""
+        values = self._read(self.index)
+        values[_READY] = time.time()
+        self._write(self.index, values)
+
+    def request_started(self) -> None:
+        values = self._read(self.index)
+        values[_IN_FLIGHT] += 1
+        self._write(self.index, values)
+
+    def request_finished(self, seconds: float, error: bool) -> None:
+        values = self._read(self.index)
+        values[_IN_FLIGHT] -= 1
+        values[_REQUESTS] += 1
+        values[_ERRORS] += int(error)
+        values[_BUSY] += seconds
+        self._write(self.index, values)
+
+    # Any process
+
+    def snapshot(self) -> dict:
+        workers = []
+        for index in range(self.workers):
+            values = self._read(index)
+            served = values[_REQUESTS] + values[_RETIRED]
+            workers.append({
+                "index": index,
+                "pid": values[_PID],
+                "restarts": values[_RESTARTS],
+                "requests": values[_REQUESTS],
+                "requests_all_generations": served,
+                "errors": values[_ERRORS],
+                "in_flight": values[_IN_FLIGHT],
+                "mean_ms": round(values[_BUSY] / served * 1000, 2) if served else None,
+                "ready": values[_READY] > 0,
+                "uptime_seconds": round(time.time() - values[_STARTED], 1) if values[_STARTED] else None,
+                "rss_mb": _rss_mb(values[_PID]) if values[_PID] else None,
+            })
+
+        served = sum(worker["requests_all_generations"] for worker in workers)
+        busy = sum(self._read(index)[_BUSY] for index in range(self.workers))
+        return {
+            "master_pid": self.master_pid,
+            "this_worker": self.index,
+            "workers": workers,
+            "totals": {
+                "requests": served,
+                "errors": sum(worker["errors"] for worker in workers),
+                "in_flight": sum(worker["in_flight"] for worker in workers),
+                "restarts": sum(worker["restarts"] for worker in workers),
+                "mean_ms": round(busy / served * 1000, 2) if served else None,
+                "rss_mb": round(sum(worker["rss_mb"] or 0 for worker in workers), 1),
+            },
+        }
+
+
+# Set by the launcher; None when the app runs any other way
+worker_metrics: Optional[WorkerMetrics] = None
+
+
+def install_worker_metrics(workers: int) -> WorkerMetrics:
+    global worker_metrics
+    worker_metrics = WorkerMetrics(workers)
+    return worker_metrics
+
+
+class WorkerMetricsMiddleware:
+    """Count requests, errors (5xx) and busy time in this worker's slot"""
+
+    def __init__(self, app, metrics: WorkerMetrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.metrics.index is None:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self.metrics.request_started()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.metrics.request_finished(time.perf_counter() - started, status >= 500)
@@ -0,0 +1,5 @@
+# backend/benchmarks/__init__.py
+
+
+# Benchmark scripts - run from backend/ with:
+#   python -m benchmarks.<script_name>
@@ -0,0 +1,127 @@
+# backend/benchmarks/bench_archive.py
+
+"""
+Soft-delete archival benchmark
+
+- archive run over N deleted trips: trips/s, rows/s, gzip ratio
+- a writer updating a live trip the whole time: its worst latency is
+  the longest lock the run held (vs. deleting everything in one go)
+- restoring one trip from the archive
+
+Run: python -m benchmarks.bench_archive [trips]
+"""
+
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import delete, select
+from benchmarks.common import create_schema, seed_trip, SessionLocal
+from app.models import Trip, Stop, Activity, BudgetRecord
+from app.services.archive_service import ArchiveService
+
+STOPS = 10
+ACTIVITIES_PER_STOP = 50
+BUDGET_RECORDS = 100
+
+
+def seed_deleted(trips: int):
+    trip_ids = [seed_trip(stops=STOPS, activities_per_stop=ACTIVITIES_PER_STOP,
+                          budget_records=BUDGET_RECORDS) for _ in range(trips)]
+    db = SessionLocal()
+    try:
+        db.query(Trip).filter(Trip.id.in_(trip_ids)).update(
+            {"is_deleted": True, "deleted_at": datetime.utcnow() - timedelta(days=90)},
+            synchronize_session=False
+        )
+        db.commit()
+    finally:
+        db.close()
+    return trip_ids
+
+
+def with_writer(live_trip_id: int, work):
+    """Run work() while another thread keeps updating a live trip; worst write latency"""
+    latencies = []
+    done = threading.Event()
+
+    def write():
+        while not done.is_set():
+            db = SessionLocal()
+            try:
+                started = time.perf_counter()
+                db.query(Trip).filter(Trip.id == live_trip_id).update({"description": str(started)})
+                db.commit()
+                latencies.append(time.perf_counter() - started)
+            finally:
+                db.close()
+            time.sleep(0.005)
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    started = time.perf_counter()
+    result = work()
+    elapsed = time.perf_counter() - started
+    done.set()
+    writer.join()
+    return result, elapsed, max(latencies) * 1000, len(latencies)
+
+
+def delete_in_one_go(trip_ids):
+    db = SessionLocal()
+    try:
+        stops = select(Stop.id).where(Stop.trip_id.in_(trip_ids)).scalar_subquery()
+        db.execute(delete(Activity).where(Activity.stop_id.in_(stops)))
+        db.execute(delete(BudgetRecord).where(BudgetRecord.trip_id.in_(trip_ids)))
+        db.execute(delete(Stop).where(Stop.trip_id.in_(trip_ids)))
+        db.execute(delete(Trip).where(Trip.id.in_(trip_ids)))
+        db.commit()
+    finally:
+        db.close()
+
+
+def main():
+    trips = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    create_schema()
+    live_trip_id = seed_trip(stops=1, activities_per_stop=0, budget_records=0)
+    rows_per_trip = 1 + STOPS + STOPS * ACTIVITIES_PER_STOP + BUDGET_RECORDS
+
+    # Baseline: the whole subtree in one transaction
+    trip_ids = seed_deleted(trips)
+    _, elapsed, worst, writes = with_writer(live_trip_id, lambda: delete_in_one_go(trip_ids))
+    print(f"one transaction: {trips} trips in {elapsed:.2f}s, writer worst {worst:.0f}ms ({writes} writes)")
+
+    trip_ids = seed_deleted(trips)
+
+    def archive_all():
+        db = SessionLocal()
+        try:
+            progress = {"trips_archived": 0, "raw_bytes": 0, "stored_bytes": 0}
+            while True:
+                run = ArchiveService.run(db)
+                for key in progress:
+                    progress[key] += run.get(key, 0)
+                if not run["remaining"]:
+                    return progress
+        finally:
+            db.close()
+
+    progress, elapsed, worst, writes = with_writer(live_trip_id, archive_all)
+    rows = progress["trips_archived"] * rows_per_trip
+    print(f"archive runs:    {progress['trips_archived']} trips in {elapsed:.2f}s "
+          f"({progress['trips_archived'] / elapsed:.1f} trips/s, {rows / elapsed:.0f} rows/s), "
+          f"writer worst {worst:.0f}ms ({writes} writes)")
+    print(f"gzip NDJSON: {progress['raw_bytes'] / 1024:.0f}KB → {progress['stored_bytes'] / 1024:.0f}KB "
+          f"({progress['raw_bytes'] / max(progress['stored_bytes'], 1):.1f}x)")
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        ArchiveService.restore(db, trip_ids[0])
+        print(f"restore one trip ({rows_per_trip} rows): {(time.perf_counter() - started) * 1000:.0f}ms")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# backend/benchmarks/bench_batch.py
+
+"""
+Batch endpoint benchmark
+
+Time for N itinerary edits (creates, updates and deletes of activities)
+sent as N separate requests vs one POST /api/batch.
+
+Run: python -m benchmarks.bench_batch
+"""
+
+import time
+from .common import create_schema, seed_trip, client, SessionLocal
+from app.models import Stop
+
+SIZES = (10, 50, 200)
+
+
+def main():
+    create_schema()
+    trip_id = seed_trip(stops=1, activities_per_stop=0, budget_records=0)
+
+    db = SessionLocal()
+    stop_id = db.query(Stop.id).filter(Stop.trip_id == trip_id).first()[0]
+    db.close()
+
+    http = client()
+
+    def activity(i):
+        return {"stop_id": stop_id, "name": f"Edit {i}", "date_scheduled": "2024-06-01", "cost": 10}
+
+    print(f"{'ops':>6}{'N requests ms':>16}{'batch ms':>12}{'speedup':>10}")
+
+    for n in SIZES:
+        # N separate requests: n/2 creates, then update + delete pairs
+        started = time.perf_counter()
+        ids = [http.post("/api/activities/", json=activity(i)).json()["id"] for i in range(n // 2)]
+        for i, activity_id in enumerate(ids):
+            if i % 2:
+                http.delete(f"/api/activities/{activity_id}")
+            else:
+                http.put(f"/api/activities/{activity_id}", json=activity(i))
+        separate_ms = (time.perf_counter() - started) * 1000
+
+        # Same edits as one batch (temp ids link the creates to updates/deletes)
+        operations = [
+            {"op": "create", "resource": "activity", "temp_id": f"a{i}", "data": activity(i)}
+            for i in range(n // 2)
+        ]
+        for i in range(n // 2):
+            if i % 2:
+                operations.append({"op": "delete", "resource": "activity", "id": f"$a{i}"})
+            else:
+                operations.append({"op": "update", "resource": "activity", "id": f"$a{i}", "data": {"cost": 12}})
+
+        started = time.perf_counter()
+        response = http.post("/api/batch/", json={"operations": operations})
+        batch_ms = (time.perf_counter() - started) * 1000
+        assert response.status_code == 200, response.text
+
+        print(f"{n:>6}{separate_ms:>16.1f}{batch_ms:>12.1f}{separate_ms / batch_ms:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
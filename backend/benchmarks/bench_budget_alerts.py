@@ -0,0 +1,64 @@
+# backend/benchmarks/bench_budget_alerts.py
+
+"""
+Budget watcher benchmark
+
+For trips that already have N budget records:
+- POST /api/budget (the running total + threshold check ride along)
+- the old over-budget check: load and sum every record of the trip
+
+Run: python -m benchmarks.bench_budget_alerts
+"""
+
+from sqlalchemy import insert
+from benchmarks.common import create_schema, seed_trip, client, measure, SessionLocal
+from app.models import BudgetRecord
+from app.utils.budget_watch import budget_alerts, record_spend
+
+SIZES = (100, 10000, 100000)
+
+
+def add_records(trip_id: int, count: int):
+    db = SessionLocal()
+    try:
+        db.execute(insert(BudgetRecord), [
+            {"trip_id": trip_id, "category": "meals", "amount": 1} for _ in range(count)
+        ])
+        record_spend(db, {trip_id: count})
+        db.commit()
+    finally:
+        db.close()
+
+
+def sum_records(trip_id: int) -> bool:
+    """What TripService.is_trip_over_budget used to do"""
+    db = SessionLocal()
+    try:
+        records = db.query(BudgetRecord).filter(BudgetRecord.trip_id == trip_id).all()
+        return sum(float(r.amount) for r in records) > 0
+    finally:
+        db.close()
+
+
+def main():
+    create_schema()
+    http = client()
+    alerts = []
+    budget_alerts.subscribe(alerts.append)
+
+    print(f"{'records':>9}{'POST p50 ms':>13}{'POST p95 ms':>13}{'sum all ms':>12}")
+    for size in SIZES:
+        trip_id = seed_trip(stops=1, activities_per_stop=0, budget_records=0)
+        add_records(trip_id, size)
+
+        post = measure(lambda: http.post(
+            "/api/budget/", params={"trip_id": trip_id}, json={"category": "meals", "amount": 1}
+        ))
+        scan = measure(lambda: sum_records(trip_id), repeat=10)
+        print(f"{size:>9}{post['p50_ms']:>13}{post['p95_ms']:>13}{scan['p50_ms']:>12}")
+
+    print(f"{len(alerts)} alerts published")
+
+
+if __name__ == "__main__":
+    main()
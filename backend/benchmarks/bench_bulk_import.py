@@ -0,0 +1,56 @@
+# backend/benchmarks/bench_bulk_import.py
+
+"""
+Bulk import benchmark
+
+Time to add N activities to a trip with N POST /api/activities/
+requests vs one POST /api/activities/bulk.
+
+Run: python -m benchmarks.bench_bulk_import
+"""
+
+import time
+from .common import create_schema, seed_trip, client, SessionLocal
+from app.models import Stop
+
+SIZES = (100, 500, 2000)
+
+
+def main():
+    create_schema()
+    trip_id = seed_trip(stops=5, activities_per_stop=0, budget_records=0)
+
+    db = SessionLocal()
+    stop_ids = [row[0] for row in db.query(Stop.id).filter(Stop.trip_id == trip_id)]
+    db.close()
+
+    http = client()
+
+    def activity(i):
+        return {
+            "stop_id": stop_ids[i % len(stop_ids)],
+            "name": f"Imported {i}",
+            "category": "sightseeing",
+            "date_scheduled": "2024-06-01",
+            "cost": 10
+        }
+
+    print(f"{'rows':>6}{'N requests ms':>16}{'bulk ms':>12}{'speedup':>10}")
+
+    for n in SIZES:
+        started = time.perf_counter()
+        for i in range(n):
+            http.post("/api/activities/", json=activity(i))
+        separate_ms = (time.perf_counter() - started) * 1000
+
+        payload = {"trip_id": trip_id, "activities": [activity(i) for i in range(n)]}
+        started = time.perf_counter()
+        response = http.post("/api/activities/bulk", json=payload)
+        bulk_ms = (time.perf_counter() - started) * 1000
+        assert response.status_code == 200 and response.json()["created"] == n, response.text
+
+        print(f"{n:>6}{separate_ms:>16.1f}{bulk_ms:>12.1f}{separate_ms / bulk_ms:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
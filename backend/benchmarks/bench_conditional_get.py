@@ -0,0 +1,45 @@
+# backend/benchmarks/bench_conditional_get.py
+
+"""
+Conditional GET benchmark
+
+Compares full responses with If-None-Match revalidation (304)
+for the dashboard polling endpoints.
+
+Run: python -m benchmarks.bench_conditional_get
+"""
+
+from .common import create_schema, seed_trip, client, measure
+
+
+def main():
+    create_schema()
+    trip_id = seed_trip(stops=10, activities_per_stop=200)
+
+    http = client()
+    stop_id = http.get(f"/api/stops/?trip_id={trip_id}").json()[0]["id"]
+
+    endpoints = {
+        "trips": "/api/trips/",
+        "stops": f"/api/stops/?trip_id={trip_id}",
+        "activities": f"/api/activities/?stop_id={stop_id}",
+    }
+
+    print(f"{'endpoint':<12}{'mode':<8}{'bytes':>10}{'p50 ms':>10}{'p95 ms':>10}")
+
+    for name, url in endpoints.items():
+        full = http.get(url)
+        etag = full.headers["etag"]
+
+        full_stats = measure(lambda: http.get(url))
+        cond = http.get(url, headers={"If-None-Match": etag})
+        cond_stats = measure(lambda: http.get(url, headers={"If-None-Match": etag}))
+
+        assert cond.status_code == 304
+
+        print(f"{name:<12}{'200':<8}{len(full.content):>10}{full_stats['p50_ms']:>10}{full_stats['p95_ms']:>10}")
+        print(f"{name:<12}{'304':<8}{len(cond.content):>10}{cond_stats['p50_ms']:>10}{cond_stats['p95_ms']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# backend/benchmarks/bench_conflicts.py
+
+"""
+Schedule conflict benchmark
+
+Conflict report for one stop with N timed activities:
+pairwise scan (what the frontend did) vs StopSchedule sweep,
+and the per-insert overlap check against the sorted index.
+
+Run: python -m benchmarks.bench_conflicts
+"""
+
+import random
+import time
+from datetime import datetime, timedelta
+from app.services.schedule_service import StopSchedule
+
+SIZES = (500, 2000, 10000)
+
+
+def intervals(n: int):
+    rng = random.Random(n)
+    start = datetime(2024, 6, 1)
+    result = []
+    for i in range(n):
+        begin = start + timedelta(minutes=rng.randrange(0, 60 * 24 * 30, 15))
+        result.append((begin, begin + timedelta(minutes=rng.choice((30, 60, 90))), i, f"Activity {i}"))
+    return result
+
+
+def pairwise(items):
+    found = 0
+    for i, a in enumerate(items):
+        for b in items[i + 1:]:
+            if a[0] < b[1] and b[0] < a[1]:
+                found += 1
+    return found
+
+
+def main():
+    print(f"{'n':>7}{'pairwise ms':>14}{'sweep ms':>11}{'pairs':>8}{'check us':>10}")
+
+    for n in SIZES:
+        items = intervals(n)
+
+        started = time.perf_counter()
+        expected = pairwise(items)
+        pairwise_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        schedule = StopSchedule(1, 1, items)
+        found = len(schedule.conflicts())
+        sweep_ms = (time.perf_counter() - started) * 1000
+        assert found == expected, (found, expected)
+
+        probes = intervals(1000)
+        started = time.perf_counter()
+        for begin, end, _, _ in probes:
+            schedule.overlapping(begin, end)
+        check_us = (time.perf_counter() - started) * 1e6 / len(probes)
+
+        print(f"{n:>7}{pairwise_ms:>14.1f}{sweep_ms:>11.1f}{found:>8}{check_us:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
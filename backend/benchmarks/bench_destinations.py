@@ -0,0 +1,107 @@
+# backend/benchmarks/bench_destinations.py
+
+"""
+Destination autocomplete benchmark
+
+Seeds N free-text stops (random spellings of ~20k cities), then:
+- links them to canonical destinations (what startup does once)
+- GET /api/destinations/suggest for short and long prefixes
+- the same lookup as SQL (LIKE on the stops, grouped by spelling)
+
+Run: python -m benchmarks.bench_destinations [stops]
+"""
+
+import random
+import sys
+import time
+from datetime import date
+from sqlalchemy import func, insert
+from benchmarks.common import create_schema, seed_trip, client, measure, SessionLocal
+from app.models import Stop
+from app.services.destination_service import DestinationService, destination_index
+
+SYLLABLES = ("pa", "ris", "ro", "ma", "san", "to", "ber", "lin", "mu", "nich", "sa", "o", "li", "sbon", "ka", "to")
+PREFIXES = ("s", "pa", "san", "berl", "zzz")
+
+
+def city_names(count: int):
+    rng = random.Random(1)
+    names = set()
+    while len(names) < count:
+        names.add(" ".join(
+            "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 3))).capitalize()
+            for _ in range(rng.choice((1, 1, 1, 2)))
+        ))
+    return sorted(names)
+
+
+def spelling(rng, name: str) -> str:
+    """Same city, typed differently"""
+    return rng.choice((name, name.lower(), name.upper(), f" {name} ", name.replace(" ", "-")))
+
+
+def seed_stops(trip_id: int, count: int, cities):
+    rng = random.Random(2)
+    weights = [1 / (rank + 1) for rank in range(len(cities))]
+    db = SessionLocal()
+    try:
+        for offset in range(0, count, 10000):
+            db.execute(insert(Stop), [
+                {
+                    "trip_id": trip_id,
+                    "city_name": spelling(rng, city),
+                    "country": rng.choice(("France", "france", "FRANCE")),
+                    "arrival_date": date(2024, 6, 1),
+                    "departure_date": date(2024, 6, 2),
+                    "sequence_order": 1
+                }
+                for city in rng.choices(cities, weights, k=min(10000, count - offset))
+            ])
+        db.commit()
+    finally:
+        db.close()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    create_schema()
+    trip_id = seed_trip(stops=0, budget_records=0)
+    seed_stops(trip_id, count, city_names(20000))
+
+    db = SessionLocal()
+    try:
+        spellings = db.query(func.count(func.distinct(Stop.city_name))).scalar()
+
+        started = time.perf_counter()
+        linked = DestinationService.link_unassigned_stops(db)
+        db.commit()
+        link_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        destination_index.load(db)
+        load_ms = (time.perf_counter() - started) * 1000
+    finally:
+        db.close()
+
+    print(f"{count} stops, {spellings} spellings → {len(destination_index)} destinations")
+    print(f"link {linked} stops: {link_s:.1f}s, index load: {load_ms:.0f}ms")
+
+    http = client()
+    print(f"{'prefix':<8}{'api p50 ms':>12}{'api p95 ms':>12}{'sql p50 ms':>12}")
+    for prefix in PREFIXES:
+        api = measure(lambda: http.get("/api/destinations/suggest", params={"prefix": prefix}))
+
+        def sql():
+            db = SessionLocal()
+            try:
+                db.query(Stop.city_name, func.count(Stop.id)).filter(
+                    func.lower(Stop.city_name).like(f"{prefix}%")
+                ).group_by(Stop.city_name).order_by(func.count(Stop.id).desc()).limit(10).all()
+            finally:
+                db.close()
+
+        print(f"{prefix:<8}{api['p50_ms']:>12}{api['p95_ms']:>12}{measure(sql, repeat=20)['p50_ms']:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# backend/benchmarks/bench_export.py
+
+"""
+Streaming export benchmark
+
+Seeds one trip with N activities and N budget records, then runs each
+exporter to the end, reporting time to the first chunk, total time,
+bytes produced and peak Python memory (tracemalloc). Peak memory should
+stay flat as N grows.
+
+Run: python -m benchmarks.bench_export [N ...]
+"""
+
+import sys
+import time
+import tracemalloc
+from datetime import date, time as dtime
+from sqlalchemy import insert
+from .common import create_schema, seed_trip, SessionLocal
+from app.models import Trip, Stop, Activity, BudgetRecord
+from app.services.export_service import ExportService
+
+SIZES = (10000, 100000)
+
+
+def add_rows(trip_id: int, n: int):
+    db = SessionLocal()
+    stop_id = db.query(Stop.id).filter(Stop.trip_id == trip_id).first()[0]
+    for offset in range(0, n, 10000):
+        count = min(10000, n - offset)
+        db.execute(insert(Activity), [
+            {"stop_id": stop_id, "name": f"Activity {offset + i}", "cost": 12,
+             "duration_hours": 1, "date_scheduled": date(2024, 6, 1 + i % 28),
+             "time_start": dtime(9 + i % 10, 0), "description": "Some notes"}
+            for i in range(count)
+        ])
+        db.execute(insert(BudgetRecord), [
+            {"trip_id": trip_id, "category": "meals", "amount": 9.5, "notes": "Dinner"}
+            for _ in range(count)
+        ])
+    db.commit()
+    db.close()
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    create_schema()
+
+    print(f"{'rows':>8}{'format':>8}{'first ms':>10}{'total ms':>10}{'MB out':>8}{'peak MB':>9}")
+
+    for n in sizes:
+        trip_id = seed_trip(stops=1, activities_per_stop=0, budget_records=0)
+        add_rows(trip_id, n)
+
+        for name, exporter in (("ndjson", ExportService.ndjson),
+                               ("csv", ExportService.budget_csv),
+                               ("ics", ExportService.ics)):
+            started = time.perf_counter()
+            first_ms = None
+            size = 0
+
+            for chunk in exporter(Trip.id == trip_id):
+                if first_ms is None:
+                    first_ms = (time.perf_counter() - started) * 1000
+                size += len(chunk)
+
+            total_ms = (time.perf_counter() - started) * 1000
+
+            # Second pass for memory (tracemalloc slows everything down)
+            tracemalloc.start()
+            for chunk in exporter(Trip.id == trip_id):
+                pass
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            print(f"{n:>8}{name:>8}{first_ms:>10.1f}{total_ms:>10.0f}"
+                  f"{size / 1e6:>8.1f}{peak / 1e6:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# backend/benchmarks/bench_forecast.py
+
+"""
+Trip forecast benchmark
+
+Seeds N historical trips (one stop each, budget records in three
+categories), then times:
+- building the per-bucket spend model (once per FORECAST_MODEL_TTL)
+- GET /api/trips/{id}/forecast with the response cache off
+- the same averages computed by scanning history in Python per request
+
+Run: python -m benchmarks.bench_forecast [trips]
+"""
+
+import random
+import sys
+import time
+from datetime import date, timedelta
+from sqlalchemy import insert, select
+from benchmarks.common import create_schema, seed_trip, client, measure, SessionLocal
+from app.cache import cache
+from app.models import Trip, Stop, BudgetRecord
+from app.services.forecast_service import build_forecast_model
+
+CATEGORIES = (("stay", 30), ("meals", 15), ("transport", 10))
+
+
+def seed_history(count: int):
+    rng = random.Random(1)
+    db = SessionLocal()
+    try:
+        start = date(2023, 1, 1)
+        for offset in range(0, count, 5000):
+            size = min(5000, count - offset)
+            trips = [
+                {
+                    "user_id": 1,
+                    "name": f"History {offset + i}",
+                    "start_date": start,
+                    "end_date": start + timedelta(days=rng.randint(2, 13)),
+                    "version": 1
+                }
+                for i in range(size)
+            ]
+            trip_ids = db.execute(insert(Trip).returning(Trip.id, sort_by_parameter_order=True), trips).scalars().all()
+
+            stops, records = [], []
+            for trip_id, trip in zip(trip_ids, trips):
+                cost_index = rng.uniform(1, 10)
+                days = (trip["end_date"] - trip["start_date"]).days + 1
+                stops.append({
+                    "trip_id": trip_id, "city_name": "City", "country": "Country",
+                    "arrival_date": trip["start_date"], "departure_date": trip["end_date"],
+                    "sequence_order": 1, "cost_index": round(cost_index, 2)
+                })
+                for category, rate in CATEGORIES:
+                    records.append({
+                        "trip_id": trip_id, "category": category,
+                        "amount": round(rate * cost_index * days * rng.uniform(0.7, 1.3), 2)
+                    })
+
+            db.execute(insert(Stop), stops)
+            db.execute(insert(BudgetRecord), records)
+        db.commit()
+    finally:
+        db.close()
+
+
+def scan_history(db):
+    """Per-request alternative: read every record and average in Python"""
+    totals = {}
+    for trip_id, category, amount in db.execute(
+        select(BudgetRecord.trip_id, BudgetRecord.category, BudgetRecord.amount)
+    ):
+        totals[category] = totals.get(category, 0.0) + float(amount)
+    return totals
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    create_schema()
+    trip_id = seed_trip(stops=5, activities_per_stop=10, budget_records=0)
+    seed_history(count)
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        build_forecast_model(db)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        scan = measure(lambda: scan_history(db), repeat=5)
+    finally:
+        db.close()
+
+    http = client()
+    http.get(f"/api/trips/{trip_id}/forecast")
+
+    def uncached():
+        cache.clear()
+        http.get(f"/api/trips/{trip_id}/forecast")
+
+    forecast = measure(uncached, repeat=200)
+    cached = measure(lambda: http.get(f"/api/trips/{trip_id}/forecast"), repeat=200)
+
+    print(f"{count} history trips ({count * len(CATEGORIES)} budget records)")
+    print(f"model build:              {build_ms:.0f}ms (once per FORECAST_MODEL_TTL)")
+    print(f"forecast (no cache) p50:  {forecast['p50_ms']}ms  p95: {forecast['p95_ms']}ms")
+    print(f"forecast (cached) p50:    {cached['p50_ms']}ms")
+    print(f"history scan per request: {scan['p50_ms']}ms")
+
+
+if __name__ == "__main__":
+    main()
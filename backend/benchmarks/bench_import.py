@@ -0,0 +1,48 @@
+# backend/benchmarks/bench_import.py
+
+"""
+Streaming import benchmark
+
+Exports a trip with N activities and N budget records to NDJSON,
+then imports the dump back (one transaction, batched inserts).
+
+Run: python -m benchmarks.bench_import [N ...]
+"""
+
+import io
+import sys
+import time
+from .bench_export import add_rows
+from .common import create_schema, seed_trip, SessionLocal
+from app.models import Trip
+from app.services.export_service import ExportService
+from app.services.import_service import ImportService
+
+SIZES = (10000, 100000)
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    create_schema()
+
+    print(f"{'rows':>8}{'MB':>7}{'import ms':>11}{'rows/s':>10}")
+
+    for n in sizes:
+        trip_id = seed_trip(stops=1, activities_per_stop=0, budget_records=0)
+        add_rows(trip_id, n)
+        dump = b"".join(ExportService.ndjson(Trip.id == trip_id)).decode()
+
+        db = SessionLocal()
+        started = time.perf_counter()
+        # The synthetic rows repeat time slots, so they overlap at their stop
+        result = ImportService.run(db, 1, io.StringIO(dump), allow_conflicts=True)
+        elapsed = time.perf_counter() - started
+        db.close()
+
+        assert result.committed, result.errors
+        rows = sum(result.created.values())
+        print(f"{n:>8}{len(dump) / 1e6:>7.1f}{elapsed * 1000:>11.0f}{rows / elapsed:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
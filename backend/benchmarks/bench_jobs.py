@@ -0,0 +1,127 @@
+# backend/benchmarks/bench_jobs.py
+
+"""
+Background job benchmark
+
+- importing N stops: the request now only enqueues link_destinations;
+  the linking it used to do inline is timed separately
+- enqueue cost: a write with and without enqueue_job() in its transaction
+- runner throughput on SQLite with 1..8 runners claiming the same table,
+  checking that no job runs twice
+
+Run: python -m benchmarks.bench_jobs [stops]
+"""
+
+import io
+import json
+import sys
+import threading
+import time
+from benchmarks.common import create_schema, seed_trip, measure, SessionLocal
+from app.models import Trip
+from app.services.destination_service import DestinationService
+from app.services.import_service import ImportService
+from app.utils.jobs import JobRunner, enqueue_job, job_handler
+
+JOBS = 2000
+RUNNERS = (1, 2, 4, 8)
+
+_ran = []
+_ran_lock = threading.Lock()
+
+
+@job_handler("bench_noop")
+def _noop(db, payload):
+    with _ran_lock:
+        _ran.append(payload["n"])
+
+
+def import_dump(stops: int) -> str:
+    lines = [json.dumps({"type": "trip", "data": {
+        "id": 1, "name": "Imported", "start_date": "2024-06-01", "end_date": "2024-06-30"
+    }})]
+    lines += [
+        json.dumps({"type": "stop", "data": {
+            "id": i, "trip_id": 1, "city_name": f"City {i % 500}", "country": "Country",
+            "arrival_date": "2024-06-01", "departure_date": "2024-06-02", "sequence_order": i + 1
+        }})
+        for i in range(stops)
+    ]
+    return "\n".join(lines)
+
+
+def touch_trip(trip_id: int, enqueue: bool):
+    db = SessionLocal()
+    try:
+        trip = db.query(Trip).filter(Trip.id == trip_id).first()
+        trip.description = str(time.perf_counter())
+        if enqueue:
+            enqueue_job(db, "bench_noop", {"n": -1})
+        db.commit()
+    finally:
+        db.close()
+
+
+def drain(runners: int) -> float:
+    db = SessionLocal()
+    try:
+        for n in range(JOBS):
+            enqueue_job(db, "bench_noop", {"n": n})
+        db.commit()
+    finally:
+        db.close()
+
+    _ran.clear()
+    workers = [JobRunner(1, 0.05) for _ in range(runners)]
+
+    def work(runner):
+        while runner.run_one():
+            pass
+
+    threads = [threading.Thread(target=work, args=(runner,)) for runner in workers]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started
+
+
+def main():
+    stops = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    create_schema()
+    trip_id = seed_trip(stops=1, activities_per_stop=0, budget_records=0)
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        ImportService.run(db, 1, io.StringIO(import_dump(stops)))
+        import_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        DestinationService.link_unassigned_stops(db)
+        db.commit()
+        link_ms = (time.perf_counter() - started) * 1000
+    finally:
+        db.close()
+
+    print(f"import {stops} stops: {import_ms:.0f}ms in the request, "
+          f"+{link_ms:.0f}ms linking destinations (now a job)")
+
+    plain = measure(lambda: touch_trip(trip_id, enqueue=False), repeat=200)
+    queued = measure(lambda: touch_trip(trip_id, enqueue=True), repeat=200)
+    print(f"write p50: {plain['p50_ms']}ms, with enqueue_job: {queued['p50_ms']}ms")
+
+    # Clear the jobs queued above
+    runner = JobRunner(1, 0.05)
+    while runner.run_one():
+        pass
+
+    print(f"{'runners':>8}{'jobs/s':>9}{'ran':>7}{'unique':>8}")
+    for runners in RUNNERS:
+        elapsed = drain(runners)
+        print(f"{runners:>8}{JOBS / elapsed:>9.0f}{len(_ran):>7}{len(set(_ran)):>8}")
+
+
+if __name__ == "__main__":
+    main()
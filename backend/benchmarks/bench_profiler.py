@@ -0,0 +1,66 @@
+# backend/benchmarks/bench_profiler.py
+
+"""
+Sampling profiler overhead benchmark
+
+Request latency on a trip detail page with the sampler off, and
+running at 100Hz and 1000Hz. Rounds alternate between modes so a
+busy spell on the machine hits all of them alike.
+
+Off means no sampler thread exists - there is no hook on the request
+path - so "off" is the plain app.
+
+Run: python -m benchmarks.bench_profiler
+"""
+
+import contextlib
+import io
+import statistics
+from .common import app, client, create_schema, measure, seed_trip
+from app.utils.profiler import StackSampler, route_codes
+
+ROUNDS = 5
+REQUESTS = 100
+MODES = {"off": None, "100Hz": 100, "1000Hz": 1000}
+
+
+def main():
+    create_schema()
+    trip_id = seed_trip(stops=10, activities_per_stop=50)
+    http = client()
+    routes = route_codes(app.routes)
+
+    def request():
+        assert http.get(f"/api/trips/{trip_id}/calendar").status_code == 200
+
+    p50s = {mode: [] for mode in MODES}
+    overhead = {mode: [] for mode in MODES}
+    tags = None
+
+    with contextlib.redirect_stdout(io.StringIO()):  # Route logs
+        request()
+        for _ in range(ROUNDS):
+            for mode, hz in MODES.items():
+                sampler = StackSampler(hz=hz, routes=routes) if hz else None
+                if sampler:
+                    sampler.start()
+                stats = measure(request, repeat=REQUESTS)
+                if sampler:
+                    sampler.stop()
+                    summary = sampler.summary()
+                    overhead[mode].append(summary["overhead_ms"] / summary["seconds"] / 10)
+                    tags = summary["by_route"]
+                p50s[mode].append(stats["p50_ms"])
+
+    print(f"{'mode':<10}{'p50 ms':>10}{'change':>9}{'sampler CPU':>13}")
+    base = statistics.median(p50s["off"])
+    for mode in MODES:
+        p50 = statistics.median(p50s[mode])
+        cpu = f"{statistics.median(overhead[mode]):.2f}%" if overhead[mode] else "-"
+        print(f"{mode:<10}{p50:>10.3f}{p50 / base - 1:>+9.1%}{cpu:>13}")
+    top = ", ".join(f"{tag}: {count}" for tag, count in list(tags.items())[:5])
+    print(f"\ntop tags (last 1000Hz round): {top}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# backend/benchmarks/bench_search.py
+
+"""
+Full-text search benchmark
+
+Seeds N activities spread over USERS users (10 stops per trip),
+then times GET /api/search for common, rare and prefix queries.
+
+Run: python -m benchmarks.bench_search [N]
+"""
+
+import random
+import sys
+import time
+from datetime import date
+from sqlalchemy import insert
+from .common import create_schema, client, measure, SessionLocal
+from app.models import User, Trip, Stop, Activity
+from app.utils.security import create_access_token
+
+USERS = 1000
+WORDS = ("museum", "tour", "walk", "market", "castle", "beach", "dinner", "gallery",
+         "cathedral", "harbour", "garden", "tasting", "cruise", "hike", "festival")
+# Filler vocabulary with a long tail, like real descriptions
+FILLER = [f"{a}{b}{c}" for a in "bdfgklmnprstv" for b in "aeiou" for c in ("ra", "lo", "ni", "ste", "vo", "ka")]
+CITIES = ("Paris", "Rome", "Lisbon", "Prague", "Vienna", "Berlin", "Madrid", "Oslo")
+
+
+def seed(n: int):
+    rng = random.Random(42)
+    db = SessionLocal()
+    db.execute(insert(User), [
+        {"id": u, "email": f"search{u}@example.com", "hashed_password": "x"}
+        for u in range(1, USERS + 1)
+    ])
+    db.execute(insert(Trip), [
+        {"id": u, "user_id": u, "name": f"Trip {u} {rng.choice(CITIES)}",
+         "start_date": date(2024, 6, 1), "end_date": date(2024, 6, 30)}
+        for u in range(1, USERS + 1)
+    ])
+    db.execute(insert(Stop), [
+        {"id": s, "trip_id": (s - 1) // 10 + 1, "city_name": rng.choice(CITIES), "country": "Europe",
+         "arrival_date": date(2024, 6, 1), "departure_date": date(2024, 6, 3), "sequence_order": s % 10}
+        for s in range(1, USERS * 10 + 1)
+    ])
+    for offset in range(0, n, 50000):
+        db.execute(insert(Activity), [
+            {"stop_id": rng.randrange(1, USERS * 10 + 1),
+             "name": f"{rng.choice(WORDS).title()} {rng.choice(FILLER)} {i}",
+             "category": rng.choice(WORDS),
+             "description": " ".join(
+                 FILLER[min(int(rng.paretovariate(1.0)) - 1, len(FILLER) - 1)] for _ in range(12)
+             ),
+             "date_scheduled": date(2024, 6, 2)}
+            for i in range(offset, min(n, offset + 50000))
+        ])
+    db.commit()
+    db.close()
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    create_schema()
+
+    started = time.perf_counter()
+    seed(n)
+    print(f"seeded {n} activities (index kept by triggers) in {time.perf_counter() - started:.1f} s")
+
+    http = client()
+    headers = {"Authorization": "Bearer " + create_access_token({"sub": "7"})}
+
+    for q in ("museum", "castle dara", "gall", "paris", "nomatch"):
+        stats = measure(lambda: http.get("/api/search/", params={"q": q}, headers=headers), repeat=50)
+        hits = len(http.get("/api/search/", params={"q": q}, headers=headers).json()["results"])
+        print(f"{q:>14}  hits={hits:>3}  p50={stats['p50_ms']:.2f} ms  p95={stats['p95_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# backend/benchmarks/bench_serialization.py
+
+"""
+List serialisation benchmark (10k rows)
+
+Compares, for a 10k-activity list:
+- ORM objects → Pydantic response_model → stdlib JSON (default)
+- select(columns) row tuples → dicts → orjson (FAST_JSON=true)
+
+The response cache is disabled so every request does the full work.
+
+Run: python -m benchmarks.bench_serialization
+"""
+
+import os
+
+os.environ["CACHE_BACKEND"] = "none"
+
+from app.config import settings  # noqa: E402
+from app.models import Activity  # noqa: E402
+from app.routes.activities import activity_rows  # noqa: E402
+from .common import create_schema, seed_trip, client, measure, SessionLocal  # noqa: E402
+
+ROWS = 10_000
+
+
+def main():
+    create_schema()
+    seed_trip(stops=1, activities_per_stop=ROWS)
+
+    http = client()
+    db = SessionLocal()
+    stop_id = db.query(Activity.stop_id).first()[0]
+    url = f"/api/activities/?stop_id={stop_id}"
+    order = [Activity.date_scheduled, Activity.time_start]
+
+    print(f"{ROWS} activities")
+    print(f"{'mode':<10}{'fetch p50 ms':>14}{'HTTP p50 ms':>14}{'HTTP p95 ms':>14}")
+
+    for fast in (False, True):
+        settings.FAST_JSON = fast
+
+        fetch = measure(lambda: activity_rows.fetch(db, Activity.stop_id == stop_id, order_by=order), repeat=10)
+        request = measure(lambda: http.get(url), repeat=10)
+
+        assert len(http.get(url).json()) == ROWS
+
+        mode = "fast" if fast else "default"
+        print(f"{mode:<10}{fetch['p50_ms']:>14}{request['p50_ms']:>14}{request['p95_ms']:>14}")
+
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+# backend/benchmarks/bench_server.py
+
+"""
+Pre-fork server benchmark (python -m app.server)
+
+- throughput: client threads on GET /api/trips/{id} for a few seconds,
+  with 1 worker and with N, recycling every --max-requests
+- the workers' aggregated counters (GET /api/admin/workers): restarts,
+  errors, and how much memory the preloaded workers share (RSS vs PSS)
+- drain: SIGTERM the master while a 2s request is in flight; the
+  request still completes and the master exits
+
+Clients keep connections alive; a connection closed by a recycled
+worker is reopened and the request retried once (counted as a
+reconnect, as a proxy would).
+
+Run: python -m benchmarks.bench_server [workers] [max_requests]
+"""
+
+import http.client
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from .common import create_schema, seed_trip
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+ADMIN_TOKEN = "bench-admin-token"
+
+CLIENTS = 8
+SECONDS = 10
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, workers: int, max_requests: int) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app.server", "--port", str(port), "--workers", str(workers),
+         "--max-requests", str(max_requests), "--max-requests-jitter", str(max_requests // 10),
+         "--drain", "10", "--log-level", "warning"],
+        cwd=BACKEND_DIR, env={**os.environ, "ADMIN_TOKEN": ADMIN_TOKEN},
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            status, body = get(port, "/api/admin/workers")
+            if status == 200:
+                workers_up = json.loads(body)["workers"]
+                if all(worker["pid"] for worker in workers_up) and get(port, "/api/ready")[0] == 200:
+                    return server
+        except OSError:
+            pass
+        time.sleep(0.1)
+    server.kill()
+    raise RuntimeError(server.stdout.read())
+
+
+def get(port: int, path: str, headers=None, method="GET", timeout=30):
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=timeout)
+    try:
+        connection.request(method, path, headers=headers or {})
+        response = connection.getresponse()
+        return response.status, response.read()
+    finally:
+        connection.close()
+
+
+def hammer(port: int, path: str, seconds: float) -> dict:
+    """CLIENTS keep-alive threads; requests, errors, reconnects"""
+    counts = {"requests": 0, "errors": 0, "reconnects": 0}
+    lock = threading.Lock()
+    deadline = time.time() + seconds
+
+    def client():
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        done = errors = reconnects = 0
+        while time.time() < deadline:
+            for attempt in range(2):
+                try:
+                    connection.request("GET", path)
+                    response = connection.getresponse()
+                    response.read()
+                    done += 1
+                    errors += response.status != 200
+                    break
+                except (http.client.RemoteDisconnected, ConnectionError, http.client.CannotSendRequest):
+                    connection.close()
+                    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+                    if attempt:
+                        errors += 1
+                    else:
+                        reconnects += 1
+        connection.close()
+        with lock:
+            counts["requests"] += done
+            counts["errors"] += errors
+            counts["reconnects"] += reconnects
+
+    threads = [threading.Thread(target=client) for _ in range(CLIENTS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return counts
+
+
+def pss_mb(pid: int):
+    """Proportional set size: shared pages split between the processes using them"""
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as smaps:
+            for line in smaps:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+
+
+def run(workers: int, max_requests: int, trip_id: int):
+    port = _free_port()
+    server = start_server(port, workers, max_requests)
+    try:
+        counts = hammer(port, f"/api/trips/{trip_id}", SECONDS)
+        status, body = get(port, "/api/admin/workers")
+        snapshot = json.loads(body)
+        pss = [pss_mb(worker["pid"]) for worker in snapshot["workers"]]
+        totals = snapshot["totals"]
+        print(f"{workers:>8}{counts['requests'] / SECONDS:>10.0f}{counts['errors']:>8}{counts['reconnects']:>12}"
+              f"{totals['requests']:>10}{totals['restarts']:>10}{totals['rss_mb']:>10.0f}"
+              f"{sum(value or 0 for value in pss):>10.0f}")
+        return port, server
+    except Exception:
+        server.kill()
+        raise
+
+
+def drain(port: int, server: subprocess.Popen):
+    """A slow request in flight when the master gets SIGTERM"""
+    result = {}
+
+    def slow_request():
+        started = time.perf_counter()
+        result["status"], _ = get(port, "/api/admin/profile?seconds=2&format=collapsed",
+                                  headers={"X-Admin-Token": ADMIN_TOKEN}, method="POST")
+        result["seconds"] = time.perf_counter() - started
+
+    thread = threading.Thread(target=slow_request)
+    thread.start()
+    time.sleep(0.5)
+    stopped = time.perf_counter()
+    server.send_signal(signal.SIGTERM)
+    thread.join()
+    code = server.wait(timeout=30)
+    print(f"\ndrain: in-flight request → {result.get('status')} after {result.get('seconds', 0):.2f}s, "
+          f"master exited {code} {time.perf_counter() - stopped:.2f}s after SIGTERM")
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    max_requests = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    create_schema()
+    trip_id = seed_trip(stops=5, activities_per_stop=20)
+
+    print(f"{CLIENTS} clients, {SECONDS}s, recycle every ~{max_requests} requests, {os.cpu_count()} CPUs\n")
+    print(f"{'workers':>8}{'req/s':>10}{'errors':>8}{'reconnects':>12}{'served':>10}{'restarts':>10}"
+          f"{'RSS MB':>10}{'PSS MB':>10}")
+
+    port, server = run(1, max_requests, trip_id)
+    server.send_signal(signal.SIGTERM)
+    server.wait(timeout=30)
+
+    port, server = run(workers, max_requests, trip_id)
+    drain(port, server)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+# backend/benchmarks/bench_sqlite.py
+
+"""
+SQLite tuning benchmark: mixed read/write throughput
+
+Reader threads load trip budgets while writer threads run
+read-then-write transactions (look the trip up, add a budget record,
+bump the trip), for a few seconds, in three setups:
+
+- defaults:  SQLITE_TUNING=false (rollback journal, pysqlite's BEGIN)
+- wal:       pragmas + BEGIN IMMEDIATE for writers, no writer queue
+- wal+queue: the default profile (writers take turns in-process)
+
+Each setup runs in its own process on a fresh database. "locked" counts
+transactions that failed with "database is locked".
+
+Run: python -m benchmarks.bench_sqlite [readers] [writers] [seconds]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+MODES = {
+    "defaults": {"SQLITE_TUNING": "false"},
+    "wal": {"SQLITE_WRITER_QUEUE": "false"},
+    "wal+queue": {},
+}
+TRIPS = 20
+
+
+def _percentile(samples, fraction):
+    if not samples:
+        return 0.0
+    samples = sorted(samples)
+    return samples[min(int(len(samples) * fraction), len(samples) - 1)] * 1000
+
+
+def run_mode(readers: int, writers: int, seconds: float) -> dict:
+    """Runs inside the child process (DATABASE_URL / SQLITE_* already set)"""
+    from sqlalchemy import update
+    from sqlalchemy.exc import OperationalError
+    from .common import create_schema, seed_trip, SessionLocal
+    from app.database import WriteSessionLocal
+    from app.models import BudgetRecord, Trip
+    from app.services.budget_service import BudgetService
+
+    create_schema()
+    trip_ids = [seed_trip(stops=3, activities_per_stop=10, budget_records=20) for _ in range(TRIPS)]
+
+    results = {"read": [], "write": [], "locked": 0, "other_errors": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def read(number):
+        latencies = []
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            db = SessionLocal()
+            try:
+                BudgetService.calculate_trip_budget(db, trip_ids[(number + len(latencies)) % TRIPS])
+                latencies.append(time.perf_counter() - started)
+            except OperationalError:
+                with lock:
+                    results["locked"] += 1
+            finally:
+                db.close()
+        with lock:
+            results["read"] += latencies
+
+    def write(number):
+        latencies = []
+        while time.perf_counter() < deadline:
+            trip_id = trip_ids[(number * 7 + len(latencies)) % TRIPS]
+            started = time.perf_counter()
+            db = WriteSessionLocal()
+            try:
+                trip = db.query(Trip.id, Trip.version).filter(Trip.id == trip_id).first()
+                db.add(BudgetRecord(trip_id=trip.id, category="meals", amount=12, notes="Bench"))
+                db.execute(update(Trip).where(Trip.id == trip_id).values(description=f"edit {started}"))
+                db.commit()
+                latencies.append(time.perf_counter() - started)
+            except OperationalError as e:
+                db.rollback()
+                with lock:
+                    results["locked" if "locked" in str(e) else "other_errors"] += 1
+            finally:
+                db.close()
+        with lock:
+            results["write"] += latencies
+
+    threads = [threading.Thread(target=read, args=(number,)) for number in range(readers)]
+    threads += [threading.Thread(target=write, args=(number,)) for number in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return {
+        "reads_per_s": len(results["read"]) / seconds,
+        "writes_per_s": len(results["write"]) / seconds,
+        "read_p99_ms": _percentile(results["read"], 0.99),
+        "write_p50_ms": _percentile(results["write"], 0.50),
+        "write_p99_ms": _percentile(results["write"], 0.99),
+        "locked": results["locked"],
+        "other_errors": results["other_errors"],
+    }
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        readers, writers, seconds = int(sys.argv[2]), int(sys.argv[3]), float(sys.argv[4])
+        import contextlib
+        import io
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = run_mode(readers, writers, seconds)
+        print(json.dumps(result))
+        return
+
+    readers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    writers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 10
+
+    print(f"{readers} readers, {writers} writers, {seconds:.0f}s, {os.cpu_count()} CPUs\n")
+    print(f"{'mode':<12}{'reads/s':>9}{'writes/s':>10}{'read p99':>10}{'write p50':>11}{'write p99':>11}{'locked':>8}")
+    for mode, env in MODES.items():
+        db_dir = tempfile.mkdtemp(prefix="globetrotter-bench-")
+        child = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_sqlite", "--child", str(readers), str(writers), str(seconds)],
+            cwd=BACKEND_DIR, capture_output=True, text=True,
+            env={**os.environ, **env, "DATABASE_URL": f"sqlite:///{db_dir}/bench.db", "JOB_WORKERS": "0"}
+        )
+        if child.returncode:
+            print(f"{mode:<12}❌ {child.stderr.strip().splitlines()[-1]}")
+            continue
+        result = json.loads(child.stdout.strip().splitlines()[-1])
+        print(f"{mode:<12}{result['reads_per_s']:>9.0f}{result['writes_per_s']:>10.0f}{result['read_p99_ms']:>10.1f}"
+              f"{result['write_p50_ms']:>11.1f}{result['write_p99_ms']:>11.1f}{result['locked']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+# backend/benchmarks/bench_trip_events.py
+
+"""
+Live trip feed load test
+
+Starts one uvicorn worker on the benchmark database, then:
+- opens N idle SSE subscribers (GET /api/trips/{id}/events):
+  a hot trip with N/10 watchers, the rest 10 per trip
+- server memory per subscriber, and CPU while they sit idle
+- GET /api/trips/{id} latency with all of them connected
+- write → event latency for every watcher of the hot trip and a cold one
+
+Run: python -m benchmarks.bench_trip_events [subscribers]
+"""
+
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import httpx
+from benchmarks.common import create_schema, seed_trip
+
+IDLE_SECONDS = 30  # One full keep-alive period
+COLD_WATCHERS = 10
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def cpu_seconds(pid: int) -> float:
+    with open(f"/proc/{pid}/stat") as stat:
+        fields = stat.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+class Subscriber:
+    """A raw SSE connection; records when each event id arrives"""
+
+    def __init__(self, trip_id: int):
+        self.trip_id = trip_id
+        self.received = {}
+
+    async def connect(self, port: int):
+        self.reader, self.writer = await asyncio.open_connection("127.0.0.1", port)
+        self.writer.write(
+            f"GET /api/trips/{self.trip_id}/events HTTP/1.1\r\nHost: bench\r\n\r\n".encode()
+        )
+        await self.writer.drain()
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        if b" 200 " not in head.split(b"\r\n", 1)[0]:
+            raise RuntimeError(head.decode())
+
+    async def listen(self):
+        try:
+            while True:
+                chunk = await self.reader.readuntil(b"\n\n")
+                for line in chunk.split(b"\n"):
+                    if line.startswith(b"id: "):
+                        self.received[int(line[4:].split(b"\r")[0])] = time.perf_counter()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+
+async def connect_all(subscribers, port: int):
+    limit = asyncio.Semaphore(200)
+
+    async def connect(subscriber):
+        async with limit:
+            await subscriber.connect(port)
+
+    await asyncio.gather(*(connect(subscriber) for subscriber in subscribers))
+    return [asyncio.create_task(subscriber.listen()) for subscriber in subscribers]
+
+
+async def fan_out(http, watchers, trip_id: int):
+    """POST a budget record, wait for its event at every watcher"""
+    started = time.perf_counter()
+    await http.post("/api/budget/", params={"trip_id": trip_id}, json={"category": "meals", "amount": 1})
+    known = [set(watcher.received) for watcher in watchers]
+
+    deadline = started + 10
+    while time.perf_counter() < deadline:
+        if all(watcher.received.keys() - seen for watcher, seen in zip(watchers, known)):
+            break
+        await asyncio.sleep(0.005)
+
+    latencies = [
+        (max(watcher.received.values()) - started) * 1000
+        for watcher in watchers if watcher.received
+    ]
+    latencies.sort()
+    return {
+        "delivered": len(latencies),
+        "p50_ms": round(statistics.median(latencies), 1) if latencies else None,
+        "max_ms": round(latencies[-1], 1) if latencies else None,
+    }
+
+
+async def run(count: int, port: int, pid: int):
+    hot_count = count // 10
+    cold_trips = [seed_trip(stops=1, activities_per_stop=0, budget_records=0)
+                  for _ in range((count - hot_count) // COLD_WATCHERS)]
+    hot_trip = seed_trip(stops=1, activities_per_stop=0, budget_records=0)
+
+    subscribers = [Subscriber(hot_trip) for _ in range(hot_count)]
+    for trip_id in cold_trips:
+        subscribers += [Subscriber(trip_id) for _ in range(COLD_WATCHERS)]
+
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}") as http:
+        await http.get(f"/api/trips/{hot_trip}")
+        base_rss = rss_mb(pid)
+
+        started = time.perf_counter()
+        listeners = await connect_all(subscribers, port)
+        connect_s = time.perf_counter() - started
+        await asyncio.sleep(2)
+        rss = rss_mb(pid)
+
+        cpu_before = cpu_seconds(pid)
+        await asyncio.sleep(IDLE_SECONDS)
+        idle_cpu = (cpu_seconds(pid) - cpu_before) / IDLE_SECONDS * 100
+
+        timings = []
+        for _ in range(50):
+            request_started = time.perf_counter()
+            await http.get(f"/api/trips/{hot_trip}")
+            timings.append((time.perf_counter() - request_started) * 1000)
+
+        hot = await fan_out(http, [s for s in subscribers if s.trip_id == hot_trip], hot_trip)
+        cold = await fan_out(http, [s for s in subscribers if s.trip_id == cold_trips[0]], cold_trips[0])
+
+        for listener in listeners:
+            listener.cancel()
+        for subscriber in subscribers:
+            subscriber.writer.close()
+
+    timings.sort()
+    print(f"{count} idle subscribers on one worker (connected in {connect_s:.1f}s)")
+    print(f"server RSS: {base_rss:.0f}MB → {rss:.0f}MB "
+          f"({(rss - base_rss) * 1024 / count:.1f}KB per subscriber)")
+    print(f"idle CPU over {IDLE_SECONDS}s: {idle_cpu:.1f}%")
+    print(f"GET /api/trips/{{id}} while connected: p50 {statistics.median(timings):.1f}ms "
+          f"p95 {timings[int(len(timings) * 0.95)]:.1f}ms")
+    print(f"fan-out to {hot_count} watchers: {hot['delivered']} delivered, "
+          f"p50 {hot['p50_ms']}ms, last {hot['max_ms']}ms")
+    print(f"fan-out to {COLD_WATCHERS} watchers: {cold['delivered']} delivered, "
+          f"p50 {cold['p50_ms']}ms, last {cold['max_ms']}ms")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    create_schema()
+    port = free_port()
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+         "--log-level", "warning", "--backlog", "4096"],
+        stdout=subprocess.DEVNULL,
+        env=dict(os.environ)
+    )
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(f"http://127.0.0.1:{port}/docs")
+                break
+            except httpx.TransportError:
+                time.sleep(0.1)
+        asyncio.run(run(count, port, server.pid))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+# backend/benchmarks/coldstart.py
+
+"""
+Cold start report, with a gate
+
+1. Import profile: `python -X importtime -c "import app.main"`, the
+   slowest imports, and a check that the dependencies the request path
+   loads lazily (bcrypt, jose, numpy) are not imported with the app.
+2. Time to first request: start uvicorn on a fresh database and poll
+   until GET /api/health answers, then until GET /api/ready does (the
+   worker has warmed up).
+
+Each is run --runs times and the fastest kept. Exits 1 if a lazy
+dependency is imported at startup or the first request takes longer
+than --budget seconds.
+
+Run:
+  python -m benchmarks.coldstart
+  python -m benchmarks.coldstart --budget 3 --top 25
+"""
+
+import argparse
+import os
+import re
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Must not be imported by `import app.main` (loaded on first use / warm-up)
+LAZY_MODULES = ("numpy", "jose", "passlib", "bcrypt")
+
+DEFAULT_BUDGET = 5.0   # Seconds from process start to the first response
+POLL_SECONDS = 0.01
+START_TIMEOUT = 60
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def _env(db_dir: str) -> dict:
+    return {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{db_dir}/coldstart.db",
+        "PYTHONDONTWRITEBYTECODE": "",
+    }
+
+
+# ============================================
+# IMPORT PROFILE
+# ============================================
+
+def import_profile(db_dir: str) -> list:
+    """[(self_us, cumulative_us, depth, module)] for one `import app.main`"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR, env=_env(db_dir), capture_output=True, text=True, check=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((int(self_us), int(cumulative_us), len(indent) // 2, module))
+    return rows
+
+
+def report_imports(rows: list, top: int) -> list:
+    """Print the slowest imports; returns the lazy modules that were imported"""
+    total = next(cumulative for _, cumulative, _, module in rows if module == "app.main")
+    print(f"import app.main: {total / 1000:.0f}ms, {len(rows)} modules")
+
+    # Self time per top-level package
+    packages = {}
+    for self_us, _, _, module in rows:
+        package = module.split(".")[0]
+        packages[package] = packages.get(package, 0) + self_us
+
+    print(f"\n{'package':<28}{'self ms':>10}{'share':>8}")
+    for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        print(f"{package:<28}{self_us / 1000:>10.1f}{self_us / total:>8.0%}")
+
+    print(f"\n{'app module':<44}{'cumulative ms':>14}")
+    app_rows = [row for row in rows if row[3].startswith("app.")]
+    for _, cumulative_us, _, module in sorted(app_rows, key=lambda row: -row[1])[:top]:
+        print(f"{module:<44}{cumulative_us / 1000:>14.1f}")
+
+    return sorted({
+        module for _, _, _, module in rows
+        if module.split(".")[0] in LAZY_MODULES
+    })
+
+
+# ============================================
+# TIME TO FIRST REQUEST
+# ============================================
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _get(url: str) -> int:
+    try:
+        with urllib.request.urlopen(url, timeout=1) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except (urllib.error.URLError, ConnectionError, socket.timeout):
+        return 0
+
+
+def first_request(db_dir: str) -> dict:
+    """Seconds from spawning uvicorn to the first /api/health and /api/ready 200s"""
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=_env(db_dir), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        timings = {}
+        for name, path in (("first_response", "/api/health"), ("ready", "/api/ready")):
+            while _get(base + path) != 200:
+                if server.poll() is not None:
+                    raise RuntimeError(f"uvicorn exited with {server.returncode}")
+                if time.perf_counter() - started > START_TIMEOUT:
+                    raise RuntimeError(f"{path} not answering after {START_TIMEOUT}s")
+                time.sleep(POLL_SECONDS)
+            timings[name] = time.perf_counter() - started
+        return timings
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.coldstart")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15, help="Rows in each import table")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET, help="Max seconds to the first response")
+    args = parser.parse_args(argv)
+
+    db_dir = tempfile.mkdtemp(prefix="globetrotter-bench-")
+    try:
+        profiles = [import_profile(db_dir) for _ in range(args.runs)]
+        fastest = min(profiles, key=lambda rows: next(row[1] for row in rows if row[3] == "app.main"))
+        eager = report_imports(fastest, args.top)
+
+        runs = [first_request(db_dir) for _ in range(args.runs)]
+        first = min(run["first_response"] for run in runs)
+        ready = min(run["ready"] for run in runs)
+        print(f"\nuvicorn start → first response: {first:.2f}s, → ready: {ready:.2f}s "
+              f"(best of {args.runs}, budget {args.budget:.1f}s)")
+    finally:
+        shutil.rmtree(db_dir, ignore_errors=True)
+
+    failed = False
+    if eager:
+        print(f"\n❌ Imported at startup (should load lazily): {', '.join(eager[:10])}")
+        failed = True
+    if first > args.budget:
+        print(f"\n❌ First response after {first:.2f}s, over the {args.budget:.1f}s budget")
+        failed = True
+    if failed:
+        return 1
+
+    print("\n✅ Cold start within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+# backend/benchmarks/common.py
+
+import os
+import statistics
+import tempfile
+import time
+from datetime import date, time as dtime, timedelta
+
+# Benchmarks always run against a throwaway SQLite file,
+# so this has to be set before the app (and its engine) is imported
+_db_dir = tempfile.mkdtemp(prefix="globetrotter-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/bench.db")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from app.main import app  # noqa: E402
+from app.database import Base, engine, SessionLocal  # noqa: E402
+from app.models import User, Trip, Stop, Activity, BudgetRecord  # noqa: E402
+from app.models.shared_trip import SharedTrip  # noqa: E402,F401
+
+
+def create_schema():
+    """Create all tables in the benchmark database"""
+    Base.metadata.create_all(engine)
+
+
+def seed_trip(user_id: int = 1, stops: int = 5, activities_per_stop: int = 20,
+              budget_records: int = 50) -> int:
+    """
+    Insert one trip with stops, activities and budget records
+
+    Returns the new trip id
+    """
+    db = SessionLocal()
+    try:
+        if not db.query(User).filter(User.id == user_id).first():
+            db.add(User(id=user_id, email=f"bench{user_id}@example.com", hashed_password="x"))
+            db.flush()  # Before the trip (foreign keys are enforced)
+
+        start = date(2024, 6, 1)
+        trip = Trip(
+            user_id=user_id,
+            name="Benchmark trip",
+            description="Synthetic trip " * 20,
+            start_date=start,
+            end_date=start + timedelta(days=stops * 3),
+            budget_limit=5000
+        )
+        db.add(trip)
+        db.flush()
+
+        for i in range(stops):
+            stop = Stop(
+                trip_id=trip.id,
+                city_name=f"City {i}",
+                country="Country",
+                arrival_date=start + timedelta(days=i * 3),
+                departure_date=start + timedelta(days=i * 3 + 2),
+                sequence_order=i + 1,
+                cost_index=5,
+                description="Stop notes " * 20
+            )
+            db.add(stop)
+            db.flush()
+
+            db.add_all([
+                Activity(
+                    stop_id=stop.id,
+                    name=f"Activity {j}",
+                    category="sightseeing",
+                    description="Activity details " * 20,
+                    cost=20,
+                    duration_hours=1.5,
+                    date_scheduled=stop.arrival_date,
+                    time_start=dtime(8 + j % 12, 0),
+                    image_url=f"https://example.com/img/{j}.jpg"
+                )
+                for j in range(activities_per_stop)
+            ])
+
+        db.add_all([
+            BudgetRecord(trip_id=trip.id, category="meals", amount=25, notes="Lunch")
+            for _ in range(budget_records)
+        ])
+
+        db.commit()
+        return trip.id
+    finally:
+        db.close()
+
+
+def client() -> TestClient:
+    return TestClient(app)
+
+
+def measure(fn, repeat: int = 200) -> dict:
+    """Run fn() `repeat` times and return latency stats in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+
+    samples.sort()
+    return {
+        "mean_ms": round(statistics.mean(samples), 3),
+        "p50_ms": round(samples[len(samples) // 2], 3),
+        "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 3),
+    }
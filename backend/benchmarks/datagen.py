@@ -0,0 +1,399 @@
+# backend/benchmarks/datagen.py
+
+"""
+Seeded synthetic data generator
+
+Fills a database with users, trips, stops, activities, budget records,
+parking slots/bookings and share links. The same seed, scale and
+starting database always give the same rows.
+
+- counts vary per user/trip around the scale's averages
+- cities are drawn with a long tail (a few very popular ones), dates
+  and times are consistent within each trip, costs follow the city's
+  cost index
+- every user's password is the same (--password), so the load test
+  can log anyone in; the bcrypt hash is computed once
+- rows go in with Core executemany, ids assigned here, one
+  transaction per --chunk users
+
+Writes a manifest (scale, seed, row counts, sample share tokens) for
+benchmarks.loadtest.
+
+Run:
+  python -m benchmarks.datagen --scale small --database-url sqlite:///./loadtest.db
+  python -m benchmarks.datagen --scale large --seed 7      # ~100k users, ~50M activities
+  python -m benchmarks.datagen --scale small --users 5000  # override one number
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from dataclasses import asdict, dataclass, fields, replace
+from datetime import date, datetime, time as dtime, timedelta
+from decimal import Decimal
+
+# (city, country, cost index) - weighted by rank when drawn
+CITIES = [
+    ("Paris", "France", 8), ("London", "United Kingdom", 9), ("Rome", "Italy", 7),
+    ("Barcelona", "Spain", 6), ("New York", "United States", 9), ("Tokyo", "Japan", 8),
+    ("Amsterdam", "Netherlands", 8), ("Bangkok", "Thailand", 3), ("Dubai", "United Arab Emirates", 8),
+    ("Istanbul", "Turkey", 4), ("Prague", "Czech Republic", 5), ("Lisbon", "Portugal", 5),
+    ("Berlin", "Germany", 6), ("Vienna", "Austria", 7), ("Singapore", "Singapore", 8),
+    ("Bali", "Indonesia", 3), ("Sydney", "Australia", 8), ("Mumbai", "India", 3),
+    ("Goa", "India", 3), ("Jaipur", "India", 2), ("Delhi", "India", 3),
+    ("Kyoto", "Japan", 7), ("Seoul", "South Korea", 6), ("Hanoi", "Vietnam", 2),
+    ("Cairo", "Egypt", 3), ("Marrakesh", "Morocco", 3), ("Cape Town", "South Africa", 4),
+    ("Rio de Janeiro", "Brazil", 4), ("Buenos Aires", "Argentina", 4), ("Mexico City", "Mexico", 4),
+    ("San Francisco", "United States", 9), ("Vancouver", "Canada", 7), ("Reykjavik", "Iceland", 9),
+    ("Edinburgh", "United Kingdom", 7), ("Dubrovnik", "Croatia", 6), ("Santorini", "Greece", 7),
+    ("Zurich", "Switzerland", 9), ("Budapest", "Hungary", 4), ("Krakow", "Poland", 3),
+    ("Kathmandu", "Nepal", 2),
+]
+
+ACTIVITY_NAMES = {
+    "sightseeing": ["Old town walk", "City viewpoint", "Cathedral visit", "River cruise", "Palace tour"],
+    "food": ["Street food tour", "Market lunch", "Cooking class", "Tasting menu", "Coffee crawl"],
+    "adventure": ["Hiking trip", "Kayaking", "Zip line", "Bike tour", "Scuba dive"],
+    "shopping": ["Flea market", "Design district", "Souvenir run", "Mall afternoon"],
+    "culture": ["Museum visit", "Gallery hop", "Opera night", "Historic quarter", "Local festival"],
+    "nightlife": ["Rooftop bar", "Jazz club", "Night market", "Pub crawl"],
+    "sports": ["Football match", "Surf lesson", "Tennis session"],
+    "relaxation": ["Spa day", "Beach afternoon", "Hot springs", "Park picnic"],
+}
+
+FIRST_NAMES = ["Aarav", "Maya", "Liam", "Sofia", "Noah", "Ananya", "Lucas", "Emma", "Kenji", "Zara",
+               "Omar", "Chloe", "Ravi", "Elena", "Mateo", "Isla", "Yuki", "Leah", "Arjun", "Nina"]
+LAST_NAMES = ["Sharma", "Garcia", "Smith", "Rossi", "Tanaka", "Khan", "Muller", "Silva", "Patel",
+              "Dubois", "Kim", "Novak", "Hansen", "Costa", "Ivanova", "Mensah", "Reyes", "Singh"]
+
+TRIP_NAMES = ["{city} getaway", "Summer in {country}", "{city} with friends", "Backpacking {country}",
+              "{city} long weekend", "Honeymoon", "Family trip to {city}", "Work trip + {city}"]
+
+
+@dataclass(frozen=True)
+class Scale:
+    """Average counts; the actual ones vary per user/trip"""
+    users: int
+    trips_per_user: float
+    stops_per_trip: float
+    activities_per_stop: float
+    budget_records_per_trip: float
+    parking_slots_per_stop: float
+    bookings_per_trip: float
+    share_ratio: float         # Trips with a public share link
+    deleted_ratio: float       # Trips soft-deleted
+
+
+SCALES = {
+    "tiny": Scale(50, 2, 3, 4, 5, 1, 0.5, 0.3, 0.05),
+    "small": Scale(1_000, 3, 5, 6, 10, 1, 1, 0.2, 0.05),
+    "medium": Scale(20_000, 4, 8, 8, 20, 1, 1, 0.2, 0.05),
+    "large": Scale(100_000, 5, 10, 10, 20, 1, 1, 0.2, 0.05),   # ~50M activities
+}
+
+
+# Rows held in memory before they're inserted
+FLUSH_ROWS = 20_000
+
+
+def email_for(seed: int, user_number: int) -> str:
+    return f"load{seed}.user{user_number}@example.com"
+
+
+class Generator:
+    """Builds rows for `users` users and inserts them in chunks"""
+
+    TABLES = ("users", "trips", "stops", "activities", "budget_records",
+              "parking_slots", "parking_bookings", "shared_trips")
+
+    def __init__(self, engine, scale: Scale, seed: int, password_hash: str,
+                 chunk_users: int = 500, share_samples: int = 1000):
+        from app.models import User, Trip, Stop, Activity, BudgetRecord, ParkingSlot, ParkingBooking
+        from app.models.shared_trip import SharedTrip
+
+        self.engine = engine
+        self.scale = scale
+        self.seed = seed
+        self.password_hash = password_hash
+        self.chunk_users = chunk_users
+        self.share_samples = share_samples
+        self.rng = random.Random(seed)
+        self.models = dict(zip(self.TABLES, (User, Trip, Stop, Activity, BudgetRecord,
+                                             ParkingSlot, ParkingBooking, SharedTrip)))
+        self.counts = dict.fromkeys(self.TABLES, 0)
+        self.share_tokens = []
+        self.city_weights = [1 / rank for rank in range(1, len(CITIES) + 1)]
+        self.categories = list(ACTIVITY_NAMES)
+        self.now = datetime(2025, 1, 1)   # Fixed, so timestamps repeat too
+        # Deleted "today", so the archive job leaves them alone for its retention window
+        self.deleted_at = datetime.combine(date.today(), dtime())
+
+    def _around(self, average: float) -> int:
+        """A count near `average` (0 to 2x, same mean)"""
+        if average <= 0:
+            return 0
+        whole = int(average)
+        count = whole + (self.rng.random() < average - whole)
+        spread = max(1, count // 2)
+        return max(0, count + self.rng.randint(-spread, spread))
+
+    def _next_ids(self, connection):
+        from sqlalchemy import func, select
+
+        return {
+            name: connection.execute(select(func.coalesce(func.max(model.id), 0))).scalar() + 1
+            for name, model in self.models.items()
+        }
+
+    def run(self, progress=print) -> dict:
+        from sqlalchemy import select
+
+        User = self.models["users"]
+        with self.engine.connect() as connection:
+            if connection.execute(select(User.id).where(User.email == email_for(self.seed, 1))).first():
+                raise SystemExit(f"❌ Users for seed {self.seed} are already in this database")
+            ids = self._next_ids(connection)
+
+        self.first_user_id = ids["users"]
+        started = time.perf_counter()
+        for first in range(1, self.scale.users + 1, self.chunk_users):
+            last = min(first + self.chunk_users, self.scale.users + 1)
+            with self.engine.begin() as connection:
+                rows = {name: [] for name in self.TABLES}
+                for user_number in range(first, last):
+                    self._user(user_number, ids, rows)
+                    if sum(map(len, rows.values())) >= FLUSH_ROWS:
+                        self._flush(connection, rows)
+                self._flush(connection, rows)
+
+            elapsed = time.perf_counter() - started
+            total = sum(self.counts.values())
+            progress(f"✅ {last - 1}/{self.scale.users} users, {total} rows "
+                     f"({total / elapsed:.0f} rows/s)")
+
+        return self.counts
+
+    def _flush(self, connection, rows: dict) -> None:
+        """Insert what's pending, parents first"""
+        from sqlalchemy import insert
+
+        for name in self.TABLES:
+            if rows[name]:
+                connection.execute(insert(self.models[name].__table__), rows[name])
+                self.counts[name] += len(rows[name])
+                rows[name].clear()
+
+    def _user(self, user_number: int, ids: dict, rows: dict) -> None:
+        rng = self.rng
+        user_id = ids["users"]
+        ids["users"] += 1
+        rows["users"].append({
+            "id": user_id,
+            "email": email_for(self.seed, user_number),
+            "hashed_password": self.password_hash,
+            "first_name": rng.choice(FIRST_NAMES),
+            "last_name": rng.choice(LAST_NAMES),
+            "language_preference": rng.choices(("en", "es", "fr", "hi", "de"), (60, 10, 10, 15, 5))[0],
+            "created_at": self.now - timedelta(days=rng.randint(0, 1500)),
+            "updated_at": self.now,
+            "is_deleted": False,
+        })
+
+        for _ in range(self._around(self.scale.trips_per_user)):
+            self._trip(user_id, ids, rows)
+
+    def _trip(self, user_id: int, ids: dict, rows: dict) -> None:
+        rng, scale = self.rng, self.scale
+        trip_id = ids["trips"]
+        ids["trips"] += 1
+
+        cities = rng.choices(CITIES, self.city_weights, k=max(1, self._around(scale.stops_per_trip)))
+        start = date(2024, 1, 1) + timedelta(days=rng.randint(0, 1000))
+        day = start
+        planned = Decimal(0)
+        stop_ids, slot_ids = [], []
+
+        for order, (city, country, cost_index) in enumerate(cities, start=1):
+            stop_id = ids["stops"]
+            ids["stops"] += 1
+            stop_ids.append(stop_id)
+            nights = rng.randint(1, 4)
+            rows["stops"].append({
+                "id": stop_id,
+                "trip_id": trip_id,
+                "city_name": city,
+                "country": country,
+                "arrival_date": day,
+                "departure_date": day + timedelta(days=nights),
+                "sequence_order": order,
+                "cost_index": Decimal(cost_index),
+                "description": f"{nights} nights in {city}",
+                "created_at": self.now,
+            })
+
+            for _ in range(self._around(scale.activities_per_stop)):
+                category = rng.choice(self.categories)
+                cost = Decimal(round(rng.uniform(0, 12) * cost_index, 2)).quantize(Decimal("0.01"))
+                planned += cost
+                rows["activities"].append({
+                    "id": ids["activities"],
+                    "stop_id": stop_id,
+                    "name": f"{rng.choice(ACTIVITY_NAMES[category])} in {city}",
+                    "category": category,
+                    "description": None if rng.random() < 0.5 else f"Booked for {rng.randint(1, 6)} people",
+                    "cost": cost,
+                    "duration_hours": Decimal(rng.choice((0.5, 1, 1.5, 2, 3, 4))),
+                    "date_scheduled": day + timedelta(days=rng.randint(0, nights)),
+                    "time_start": dtime(rng.randint(7, 21), rng.choice((0, 15, 30, 45))),
+                    "image_url": None,
+                    "created_at": self.now,
+                })
+                ids["activities"] += 1
+
+            for number in range(self._around(scale.parking_slots_per_stop)):
+                slot_ids.append((ids["parking_slots"], day, cost_index))
+                rows["parking_slots"].append({
+                    "id": ids["parking_slots"],
+                    "stop_id": stop_id,
+                    "slot_number": f"{chr(65 + number % 26)}{rng.randint(1, 99)}",
+                    "location": f"{city} centre",
+                    "availability_status": rng.choices(("available", "booked", "maintenance"), (70, 25, 5))[0],
+                    "cost_per_hour": Decimal(cost_index) / 2,
+                    "cost_per_day": Decimal(cost_index * 4),
+                    "max_hours": 24,
+                    "created_at": self.now,
+                })
+                ids["parking_slots"] += 1
+
+            day += timedelta(days=nights)
+
+        for _ in range(self._around(scale.budget_records_per_trip)):
+            rows["budget_records"].append({
+                "id": ids["budget_records"],
+                "trip_id": trip_id,
+                "category": rng.choices(
+                    ("transport", "stay", "activities", "meals", "parking", "shopping", "other"),
+                    (15, 20, 15, 30, 5, 10, 5)
+                )[0],
+                "amount": Decimal(round(rng.lognormvariate(3.5, 0.9), 2)).quantize(Decimal("0.01")),
+                "date": datetime.combine(start + timedelta(days=rng.randint(0, (day - start).days)), dtime(12)),
+                "notes": None,
+                "created_at": self.now,
+            })
+            ids["budget_records"] += 1
+
+        for _ in range(self._around(scale.bookings_per_trip) if slot_ids else 0):
+            slot_id, slot_day, cost_index = rng.choice(slot_ids)
+            days = rng.randint(1, 3)
+            rows["parking_bookings"].append({
+                "id": ids["parking_bookings"],
+                "trip_id": trip_id,
+                "parking_slot_id": slot_id,
+                "start_date": slot_day,
+                "end_date": slot_day + timedelta(days=days),
+                "total_cost": Decimal(cost_index * 4 * days),
+                "booking_status": rng.choices(("confirmed", "pending", "cancelled"), (80, 10, 10))[0],
+                "created_at": self.now,
+            })
+            ids["parking_bookings"] += 1
+
+        deleted = rng.random() < scale.deleted_ratio
+        rows["trips"].append({
+            "id": trip_id,
+            "user_id": user_id,
+            "name": rng.choice(TRIP_NAMES).format(city=cities[0][0], country=cities[0][1]),
+            "start_date": start,
+            "end_date": day,
+            "description": None if rng.random() < 0.3 else f"{len(cities)} cities, {(day - start).days} days",
+            "budget_limit": (planned * Decimal(rng.uniform(1.5, 4))).quantize(Decimal("1")) or Decimal(500),
+            "is_public": False,
+            "created_at": self.now - timedelta(days=rng.randint(0, 365)),
+            "updated_at": self.deleted_at if deleted else self.now,
+            "is_deleted": deleted,
+            "deleted_at": self.deleted_at if deleted else None,
+        })
+
+        if not deleted and rng.random() < scale.share_ratio:
+            token = f"load{self.seed}-{trip_id:x}-{rng.getrandbits(64):016x}"
+            rows["shared_trips"].append({
+                "id": ids["shared_trips"],
+                "trip_id": trip_id,
+                "public_share_token": token,
+                "shared_by_user_id": user_id,
+                "can_copy": True,
+                "created_at": self.now,
+            })
+            ids["shared_trips"] += 1
+            if len(self.share_tokens) < self.share_samples:
+                self.share_tokens.append(token)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.datagen")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database-url", help="Default: DATABASE_URL / the app's default")
+    parser.add_argument("--password", default="loadtest-password", help="Every user's password")
+    parser.add_argument("--chunk", type=int, default=500, help="Users per transaction")
+    parser.add_argument("--manifest", default="loadtest-manifest.json")
+    for field in fields(Scale):
+        parser.add_argument(f"--{field.name.replace('_', '-')}", type=int if field.name == "users" else float,
+                            help=f"Override the scale's {field.name}")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+
+    # The app reads DATABASE_URL when it's imported
+    from app.config import settings
+    from app.database import Base, engine
+    from app.utils.budget_watch import recompute_spend_totals
+    from app.utils.security import hash_password
+
+    overrides = {
+        field.name: getattr(args, field.name)
+        for field in fields(Scale) if getattr(args, field.name) is not None
+    }
+    scale = replace(SCALES[args.scale], **overrides)
+
+    print(f"📦 Generating {args.scale} data (seed {args.seed}) into {settings.DATABASE_URL}")
+    print(f"   {asdict(scale)}")
+
+    Base.metadata.create_all(engine)
+    started = time.perf_counter()
+    generator = Generator(engine, scale, args.seed, hash_password(args.password), chunk_users=args.chunk)
+    counts = generator.run()
+
+    # Running totals are kept by ORM hooks, which Core inserts skip
+    with engine.begin() as connection:
+        recompute_spend_totals(connection)
+    elapsed = time.perf_counter() - started
+
+    manifest = {
+        "seed": args.seed,
+        "scale": args.scale,
+        "params": asdict(scale),
+        "database_url": settings.DATABASE_URL,
+        "password": args.password,
+        "email_pattern": email_for(args.seed, 0).replace("user0", "user{n}"),
+        "first_user_id": generator.first_user_id,
+        "counts": counts,
+        "share_tokens": generator.share_tokens,
+        "seconds": round(elapsed, 1),
+    }
+    with open(args.manifest, "w") as output:
+        json.dump(manifest, output, indent=2)
+
+    print(f"✅ {sum(counts.values())} rows in {elapsed:.1f}s: {counts}")
+    print(f"✅ Manifest written to {args.manifest}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,409 @@
+# backend/benchmarks/loadtest.py
+
+"""
+Load test: weighted user scenarios against the real app
+
+Drives the FastAPI app in this process (httpx ASGI transport, startup
+hooks run as usual) or a running server (--base-url), with
+--concurrency virtual users looping over scenarios picked by weight:
+
+- dashboard:       trip list, one trip, its stops and budget summary
+                   (sends back ETags like a browser does)
+- itinerary_edit:  add an activity, change it, log an expense, undo both
+- login_storm:     log in as a random user (bcrypt on every request)
+- share_view:      public view of a shared trip, popular ones more often
+
+Reports throughput and latency percentiles per scenario and endpoint,
+and writes them as JSON for comparing runs.
+
+Data comes from benchmarks.datagen (its manifest has the users'
+password and share tokens):
+
+  python -m benchmarks.datagen --scale small --database-url sqlite:///./loadtest.db
+  python -m benchmarks.loadtest --database-url sqlite:///./loadtest.db --duration 60
+  python -m benchmarks.loadtest --base-url http://localhost:8000 --mix dashboard=80,share_view=20
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+import httpx
+
+DEFAULT_MIX = "dashboard=50,itinerary_edit=20,share_view=25,login_storm=5"
+
+# Logins at once while setting up
+SETUP_LOGINS = 4
+
+SCENARIOS = {}
+
+
+def scenario(name: str):
+    def register(run):
+        SCENARIOS[name] = run
+        return run
+    return register
+
+
+def percentiles(samples: List[float]) -> dict:
+    """Latency summary in milliseconds (samples in seconds)"""
+    if not samples:
+        return {"count": 0}
+
+    ordered = sorted(samples)
+
+    def at(fraction: float) -> float:
+        position = (len(ordered) - 1) * fraction
+        low = int(position)
+        high = min(low + 1, len(ordered) - 1)
+        return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+    return {
+        "count": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 2),
+        **{f"p{int(fraction * 100)}_ms": round(at(fraction) * 1000, 2) for fraction in (0.5, 0.9, 0.95, 0.99)},
+        "max_ms": round(ordered[-1] * 1000, 2),
+    }
+
+
+class Recorder:
+    """Latency samples and outcomes, per scenario and per endpoint"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.started = time.perf_counter()
+        self.requests: Dict[str, List[float]] = defaultdict(list)
+        self.scenarios: Dict[str, List[float]] = defaultdict(list)
+        self.statuses = Counter()
+        self.errors = Counter()
+
+    def request(self, endpoint: str, elapsed: float, status: Optional[int]) -> None:
+        self.requests[endpoint].append(elapsed)
+        self.statuses[str(status or "error")] += 1
+        if status is None or status >= 400:
+            self.errors[endpoint] += 1
+
+    def results(self) -> dict:
+        elapsed = time.perf_counter() - self.started
+        everything = [sample for samples in self.requests.values() for sample in samples]
+        return {
+            "seconds": round(elapsed, 2),
+            "requests": len(everything),
+            "errors": sum(self.errors.values()),
+            "requests_per_second": round(len(everything) / elapsed, 1),
+            "latency": percentiles(everything),
+            "statuses": dict(self.statuses),
+            "scenarios": {
+                name: {"per_second": round(len(samples) / elapsed, 1), **percentiles(samples)}
+                for name, samples in sorted(self.scenarios.items())
+            },
+            "endpoints": {
+                name: {"errors": self.errors[name], **percentiles(samples)}
+                for name, samples in sorted(self.requests.items())
+            },
+        }
+
+
+class VirtualUser:
+    """A logged-in user with their trips, and the ETags their browser kept"""
+
+    def __init__(self, email: str, token: str):
+        self.email = email
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.trip_ids: List[int] = []
+        self.etags: Dict[str, str] = {}
+
+
+class LoadTest:
+    def __init__(self, client: httpx.AsyncClient, manifest: dict, seed: int):
+        self.client = client
+        self.manifest = manifest
+        self.rng = random.Random(seed)
+        self.recorder = Recorder()
+        self.users: List[VirtualUser] = []
+        self.share_weights = [1 / rank for rank in range(1, len(manifest["share_tokens"]) + 1)]
+        self.share_etags: Dict[str, str] = {}
+
+    def email(self, user_number: int) -> str:
+        return self.manifest["email_pattern"].format(n=user_number)
+
+    async def call(self, endpoint: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.recorder.request(endpoint, time.perf_counter() - started, None)
+            return None
+        self.recorder.request(endpoint, time.perf_counter() - started, response.status_code)
+        return response
+
+    async def get(self, endpoint: str, user: VirtualUser, url: str) -> Optional[httpx.Response]:
+        """GET with the ETag from the last response for this URL"""
+        headers = dict(user.headers)
+        if url in user.etags:
+            headers["If-None-Match"] = user.etags[url]
+        response = await self.call(endpoint, "GET", url, headers=headers)
+        if response is not None and "etag" in response.headers:
+            user.etags[url] = response.headers["etag"]
+        return response
+
+    async def login(self, user_number: int) -> Optional[VirtualUser]:
+        email = self.email(user_number)
+        response = await self.call("POST /api/auth/login", "POST", "/api/auth/login", json={
+            "email": email, "password": self.manifest["password"]
+        })
+        if response is None or response.status_code != 200:
+            return None
+        return VirtualUser(email, response.json()["token"])
+
+    async def setup(self, count: int) -> None:
+        """Log in `count` users (untimed) and load their trip ids"""
+        numbers = self.rng.sample(range(1, self.manifest["params"]["users"] + 1),
+                                  min(count, self.manifest["params"]["users"]))
+        # A few at a time: logins hold a database connection through bcrypt
+        gate = asyncio.Semaphore(SETUP_LOGINS)
+
+        async def login(number):
+            async with gate:
+                return await self.login(number)
+
+        users = await asyncio.gather(*(login(number) for number in numbers))
+        for user in filter(None, users):
+            response = await self.client.get("/api/trips/", params={"fields": "id"}, headers=user.headers)
+            user.trip_ids = [trip["id"] for trip in response.json()]
+            if user.trip_ids:
+                self.users.append(user)
+
+        if not self.users:
+            raise SystemExit("❌ No users could log in - is the manifest for this database?")
+
+    async def worker(self, mix: Dict[str, float], deadline: float, think: float) -> None:
+        names, weights = list(mix), list(mix.values())
+        while time.perf_counter() < deadline:
+            name = self.rng.choices(names, weights)[0]
+            started = time.perf_counter()
+            await SCENARIOS[name](self, self.rng.choice(self.users))
+            self.recorder.scenarios[name].append(time.perf_counter() - started)
+            if think:
+                await asyncio.sleep(self.rng.expovariate(1 / think))
+
+    async def run(self, mix: Dict[str, float], concurrency: int, duration: float,
+                  warmup: float, think: float) -> dict:
+        if warmup:
+            deadline = time.perf_counter() + warmup
+            await asyncio.gather(*(self.worker(mix, deadline, think) for _ in range(concurrency)))
+
+        self.recorder.reset()
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*(self.worker(mix, deadline, think) for _ in range(concurrency)))
+        return self.recorder.results()
+
+
+# ============================================
+# SCENARIOS
+# ============================================
+
+@scenario("dashboard")
+async def dashboard(test: LoadTest, user: VirtualUser) -> None:
+    await test.get("GET /api/trips", user, "/api/trips/")
+    trip_id = test.rng.choice(user.trip_ids)
+    await test.get("GET /api/trips/{id}", user, f"/api/trips/{trip_id}")
+    await test.get("GET /api/stops", user, f"/api/stops/?trip_id={trip_id}")
+    await test.get("GET /api/budget/summary/{id}", user, f"/api/budget/summary/{trip_id}")
+
+
+@scenario("itinerary_edit")
+async def itinerary_edit(test: LoadTest, user: VirtualUser) -> None:
+    trip_id = test.rng.choice(user.trip_ids)
+    response = await test.get("GET /api/stops", user, f"/api/stops/?trip_id={trip_id}")
+    if response is None or response.status_code != 200 or not response.json():
+        return
+    stop = test.rng.choice(response.json())
+
+    activity = {
+        "stop_id": stop["id"],
+        "name": "Load test activity",
+        "category": "sightseeing",
+        "cost": round(test.rng.uniform(5, 80), 2),
+        "duration_hours": 1.5,
+        "date_scheduled": stop["arrival_date"],
+        "time_start": f"{test.rng.randint(8, 20):02d}:00",
+    }
+    response = await test.call("POST /api/activities", "POST", "/api/activities/?allow_conflicts=true",
+                               json=activity, headers=user.headers)
+    if response is None or response.status_code != 200:
+        return
+    activity_id = response.json()["id"]
+
+    activity["cost"] += 10
+    await test.call("PUT /api/activities/{id}", "PUT", f"/api/activities/{activity_id}?allow_conflicts=true",
+                    json=activity, headers=user.headers)
+    response = await test.call("POST /api/budget", "POST", f"/api/budget/?trip_id={trip_id}",
+                               json={"category": "meals", "amount": 18.5}, headers=user.headers)
+
+    # Undo, so repeated runs see the same data
+    await test.call("DELETE /api/activities/{id}", "DELETE", f"/api/activities/{activity_id}",
+                    headers=user.headers)
+    if response is not None and response.status_code == 200:
+        await test.call("DELETE /api/budget/{id}", "DELETE", f"/api/budget/{response.json()['id']}",
+                        headers=user.headers)
+
+
+@scenario("login_storm")
+async def login_storm(test: LoadTest, user: VirtualUser) -> None:
+    await test.login(test.rng.randint(1, test.manifest["params"]["users"]))
+
+
+@scenario("share_view")
+async def share_view(test: LoadTest, user: VirtualUser) -> None:
+    tokens = test.manifest["share_tokens"]
+    if not tokens:
+        return
+    token = test.rng.choices(tokens, test.share_weights)[0]
+
+    # Half the views are repeat visitors with the page cached
+    headers = {}
+    if token in test.share_etags and test.rng.random() < 0.5:
+        headers["If-None-Match"] = test.share_etags[token]
+    response = await test.call("GET /api/sharing/public/{token}", "GET", f"/api/sharing/public/{token}",
+                               headers=headers)
+    if response is not None and "etag" in response.headers:
+        test.share_etags[token] = response.headers["etag"]
+
+
+# ============================================
+# RUNNING
+# ============================================
+
+def parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"unknown scenario '{name}' (choose from {', '.join(SCENARIOS)})")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+@contextlib.asynccontextmanager
+async def app_client(args):
+    """An httpx client for --base-url, or for the app in this process"""
+    limits = httpx.Limits(max_connections=args.concurrency * 2, max_keepalive_connections=args.concurrency * 2)
+    if args.base_url:
+        async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60) as client:
+            yield client
+        return
+
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    from app.main import app
+
+    # The app logs every request to stdout
+    quiet = open(os.devnull, "w") if not args.verbose else None
+    with contextlib.redirect_stdout(quiet) if quiet else contextlib.nullcontext():
+        await app.router.startup()
+        try:
+            transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+            async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=60) as client:
+                yield client
+        finally:
+            await app.router.shutdown()
+    if quiet:
+        quiet.close()
+
+
+def print_results(results: dict) -> None:
+    print(f"\n{results['requests']} requests in {results['seconds']}s: "
+          f"{results['requests_per_second']} req/s, {results['errors']} errors")
+
+    columns = ("count", "p50_ms", "p90_ms", "p95_ms", "p99_ms", "max_ms")
+    header = f"{'':<34}" + "".join(f"{column:>10}" for column in columns)
+    for title in ("scenarios", "endpoints"):
+        print(f"\n{header.replace(' ' * len(title), title, 1)}")
+        for name, stats in results[title].items():
+            print(f"{name:<34}" + "".join(f"{stats.get(column, '-'):>10}" for column in columns))
+
+
+async def main_async(args) -> dict:
+    with open(args.manifest) as manifest_file:
+        manifest = json.load(manifest_file)
+    mix = parse_mix(args.mix)
+
+    async with app_client(args) as client:
+        test = LoadTest(client, manifest, args.seed)
+        await test.setup(args.users or args.concurrency * 4)
+        print(f"🚀 {args.concurrency} virtual users, {len(test.users)} accounts, "
+              f"{args.duration}s (+{args.warmup}s warm-up), mix {mix}")
+        results = await test.run(mix, args.concurrency, args.duration, args.warmup, args.think_ms / 1000)
+
+    return {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "target": args.base_url or "in-process",
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "seed": args.seed,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "think_ms": args.think_ms,
+            "mix": mix,
+            "data": {key: manifest[key] for key in ("seed", "scale", "params", "counts")},
+        },
+        **results,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.loadtest")
+    parser.add_argument("--manifest", default="loadtest-manifest.json", help="Written by benchmarks.datagen")
+    parser.add_argument("--base-url", help="A running server; default: the app in this process")
+    parser.add_argument("--database-url", help="In-process only; default: the manifest's database")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="scenario=weight,...")
+    parser.add_argument("--concurrency", type=int, default=20, help="Virtual users")
+    parser.add_argument("--users", type=int, help="Accounts logged in up front (default 4 per virtual user)")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds measured")
+    parser.add_argument("--warmup", type=float, default=5, help="Seconds run before measuring")
+    parser.add_argument("--think-ms", type=float, default=0, help="Mean pause between scenarios")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", default=f"loadtest-{date.today().isoformat()}.json")
+    parser.add_argument("--verbose", action="store_true", help="Keep the app's request logs")
+    args = parser.parse_args(argv)
+
+    if not args.base_url and not args.database_url:
+        with open(args.manifest) as manifest_file:
+            args.database_url = json.load(manifest_file)["database_url"]
+
+    results = asyncio.run(main_async(args))
+    print_results(results)
+
+    with open(args.output, "w") as output:
+        json.dump(results, output, indent=2)
+    print(f"\n✅ Results written to {args.output}")
+    return 1 if results["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
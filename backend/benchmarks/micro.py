@@ -0,0 +1,309 @@
+# backend/benchmarks/micro.py
+
+"""
+Micro-benchmarks for the hot helpers, with a regression gate
+
+Each case is timed in repeated samples (inner loops sized so a sample
+takes ~SAMPLE_SECONDS), each one right after a short pure Python
+calibration loop. The gate compares the case's fastest sample relative
+to the calibration loop's fastest - both ran under the same load, so a
+busy (or faster) machine moves both - against the stored baseline, and
+the run fails if any case is slower than baseline x (1 + tolerance).
+A case over the limit is timed again up to RETRIES times before it
+counts as a regression; --save keeps the best of RETRIES + 1 attempts.
+
+Tolerances are wide on purpose: the gate is for the 1.5x-10x slowdowns
+(an extra query per row, validation on a hot path), not for 5%.
+
+Run:
+  python -m benchmarks.micro                  # compare, exit 1 on a regression
+  python -m benchmarks.micro --save           # store new baselines
+  python -m benchmarks.micro --only security  # cases whose name contains "security"
+  python -m benchmarks.micro --raw            # compare raw times (same machine, quiet)
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+os.environ["CACHE_BACKEND"] = "none"
+
+from app.models import Trip  # noqa: E402
+from app.schemas.activity import ActivityCreate  # noqa: E402
+from app.schemas.trip import TripCreate, TripResponse  # noqa: E402
+from app.services.budget_service import BudgetService  # noqa: E402
+from app.services.trip_service import TripService  # noqa: E402
+from app.utils.security import create_access_token, decode_access_token, hash_password, verify_password  # noqa: E402
+from .common import create_schema, seed_trip, SessionLocal  # noqa: E402
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "micro.json"
+
+# Target length of one sample, and samples per case
+SAMPLE_SECONDS = 0.05
+SAMPLES = 15
+
+# Calibration loops run before each sample (~1ms each)
+CALIBRATION_LOOPS = 5
+
+DEFAULT_TOLERANCE = 0.50
+
+# Extra attempts for a case that looks like a regression, a few
+# seconds apart (busy spells on a shared machine come and go)
+RETRIES = 3
+RETRY_PAUSE = 3
+
+CASES = {}
+
+
+def case(name: str, tolerance: float = DEFAULT_TOLERANCE):
+    """Register setup() → fn; fn() is what gets timed"""
+    def register(setup):
+        CASES[name] = (setup, tolerance)
+        return setup
+    return register
+
+
+def calibration_loop():
+    total = 0
+    for number in range(10_000):
+        total += number * number % 7
+    return total
+
+
+def _run(fn, loops: int) -> float:
+    started = time.perf_counter()
+    for _ in range(loops):
+        fn()
+    return (time.perf_counter() - started) / loops
+
+
+def time_case(fn) -> dict:
+    """Fastest/median time per call, and the calibration loop's fastest alongside"""
+    fn()  # Warm-up (imports, caches, first connection)
+
+    loops = 1
+    while True:
+        elapsed = _run(fn, loops) * loops
+        if elapsed >= SAMPLE_SECONDS or loops >= 1_000_000:
+            break
+        loops *= 2 if elapsed == 0 else max(2, min(10, int(SAMPLE_SECONDS / elapsed) + 1))
+
+    # Slow cases (bcrypt) get fewer samples
+    samples, calibration = [], []
+    for _ in range(SAMPLES if elapsed < 0.2 else 5):
+        calibration.append(_run(calibration_loop, CALIBRATION_LOOPS))
+        samples.append(_run(fn, loops))
+
+    return {
+        "min_us": round(min(samples) * 1e6, 3),
+        "median_us": round(statistics.median(samples) * 1e6, 3),
+        "calibration_us": round(min(calibration) * 1e6, 3),
+        "relative": round(min(samples) / min(calibration), 5),
+        "loops": loops,
+        "samples": len(samples),
+    }
+
+
+# ============================================
+# CASES
+# ============================================
+
+@case("security.hash_password", tolerance=0.25)
+def hash_case():
+    return lambda: hash_password("correct horse battery staple")
+
+
+@case("security.verify_password", tolerance=0.25)
+def verify_case():
+    hashed = hash_password("correct horse battery staple")
+    return lambda: verify_password("correct horse battery staple", hashed)
+
+
+@case("security.create_access_token")
+def create_token_case():
+    return lambda: create_access_token({"sub": "42"})
+
+
+@case("security.decode_access_token")
+def decode_token_case():
+    token = create_access_token({"sub": "42"})
+    return lambda: decode_access_token(token)
+
+
+@case("schemas.TripCreate")
+def trip_create_case():
+    body = {
+        "name": "Europe Summer 2024",
+        "description": "Summer vacation across Europe",
+        "start_date": "2024-06-01",
+        "end_date": "2024-06-15",
+        "budget_limit": 5000.0
+    }
+    return lambda: TripCreate.model_validate(body)
+
+
+@case("schemas.ActivityCreate")
+def activity_create_case():
+    body = {
+        "stop_id": 1,
+        "name": "Visit Eiffel Tower",
+        "category": "sightseeing",
+        "description": "Iconic landmark",
+        "cost": 20.0,
+        "duration_hours": 2.0,
+        "date_scheduled": "2024-06-01",
+        "time_start": "10:00"
+    }
+    return lambda: ActivityCreate.model_validate(body)
+
+
+@case("serialize.TripResponse_list_200")
+def trip_list_case():
+    """The default (non FAST_JSON) list path: ORM objects → response dicts → JSON"""
+    start = date(2024, 6, 1)
+    trips = [
+        Trip(
+            id=number, user_id=1, name=f"Trip {number}", description="Synthetic trip " * 5,
+            start_date=start, end_date=start + timedelta(days=10), budget_limit=5000,
+            is_public=False, created_at=start
+        )
+        for number in range(200)
+    ]
+
+    def serialize():
+        data = [TripResponse.model_validate(trip).model_dump(mode="json") for trip in trips]
+        return json.dumps(data)
+    return serialize
+
+
+def _seeded_trip() -> int:
+    if not hasattr(_seeded_trip, "trip_id"):
+        create_schema()
+        _seeded_trip.trip_id = seed_trip(stops=5, activities_per_stop=20, budget_records=50)
+    return _seeded_trip.trip_id
+
+
+@case("services.BudgetService.calculate_trip_budget")
+def budget_case():
+    trip_id = _seeded_trip()
+
+    def calculate():
+        db = SessionLocal()
+        try:
+            return BudgetService.calculate_trip_budget(db, trip_id)
+        finally:
+            db.close()
+    return calculate
+
+
+@case("services.TripService.get_trip_summary")
+def summary_case():
+    trip_id = _seeded_trip()
+
+    def summarize():
+        db = SessionLocal()
+        try:
+            return TripService.get_trip_summary(db, trip_id)
+        finally:
+            db.close()
+    return summarize
+
+
+# ============================================
+# RUNNING
+# ============================================
+
+def machine() -> dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.micro")
+    parser.add_argument("--save", action="store_true", help="Store these results as the baseline")
+    parser.add_argument("--only", help="Run cases whose name contains this")
+    parser.add_argument("--tolerance", type=float, help="Override every case's tolerance (0.5 = 50%% slower)")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument("--raw", action="store_true", help="Compare raw times instead of relative ones")
+    parser.add_argument("--output", help="Also write this run's results as JSON")
+    args = parser.parse_args(argv)
+
+    baseline_path = Path(args.baseline)
+    baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() else None
+    if baseline is None and not args.save:
+        print(f"⚠️ No baseline at {baseline_path}, run with --save first")
+
+    metric = "min_us" if args.raw else "relative"
+    if baseline and args.raw and baseline.get("machine") != machine() and not args.save:
+        print(f"⚠️ Baseline is from another machine ({baseline['machine']})")
+
+    results = {}
+    failed = []
+    print(f"\n{'case':<48}{'best us':>12}{'baseline':>12}{'change':>9}")
+    for name, (setup, tolerance) in CASES.items():
+        if args.only and args.only not in name:
+            continue
+
+        with contextlib.redirect_stdout(io.StringIO()):  # Seeding logs
+            fn = setup()
+
+        before = (baseline or {}).get("results", {}).get(name)
+        allowed = args.tolerance if args.tolerance is not None else tolerance
+        for attempt in range(RETRIES + 1):
+            if attempt:
+                time.sleep(RETRY_PAUSE)
+            result = time_case(fn)
+            if name in results and results[name][metric] < result[metric]:
+                result = results[name]
+            results[name] = result
+            if args.save:
+                continue  # Baselines keep the best of every attempt
+            if not before:
+                break
+            change = result[metric] / before[metric] - 1
+            if change <= allowed:
+                break
+
+        line = f"{name:<48}{result['min_us']:>12}"
+        if before and not args.save:
+            line += f"{before['min_us']:>12}{change:>+9.0%}"
+            if change > allowed:
+                failed.append(name)
+                line += f"  ❌ over +{allowed:.0%}"
+        print(line)
+
+    run = {"machine": machine(), "results": results}
+    if args.output:
+        Path(args.output).write_text(json.dumps(run, indent=2))
+
+    if args.save:
+        if baseline and args.only:
+            # Keep the cases that weren't run
+            results = {**baseline["results"], **results}
+            run = {**run, "results": results}
+        baseline_path.parent.mkdir(exist_ok=True)
+        baseline_path.write_text(json.dumps(run, indent=2) + "\n")
+        print(f"\n✅ Baseline saved to {baseline_path}")
+        return 0
+
+    if failed:
+        print(f"\n❌ {len(failed)} regression(s): {', '.join(failed)}")
+        return 1
+    print("\n✅ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+# backend/tests/conftest.py
+
+# App tests run against a throwaway SQLite file, so DATABASE_URL has to be
+# set before the app (and its engine) is imported. Jobs don't run on their
+# own threads here: tests run them with job_runner.run_one().
+
+import itertools
+import os
+import tempfile
+
+_db_dir = tempfile.mkdtemp(prefix="globetrotter-test-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/test.db"
+os.environ["JOB_WORKERS"] = "0"
+os.environ["WARMUP_ON_STARTUP"] = "false"
+os.environ["ADMIN_TOKEN"] = "test-admin-token"
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+ADMIN_HEADERS = {"X-Admin-Token": "test-admin-token"}
+
+_emails = itertools.count(1)
+
+
+@pytest.fixture(scope="session")
+def app():
+    from app.database import Base, engine
+    from app.main import app as application
+    import app.models  # noqa: F401  (every table registered)
+
+    Base.metadata.create_all(engine)
+    return application
+
+
+@pytest.fixture(scope="session")
+def client(app):
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def db(app):
+    from app.database import SessionLocal
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def signup(client) -> dict:
+    """A new user; returns the Authorization header (and the user id)"""
+    number = next(_emails)
+    response = client.post("/api/auth/signup", json={
+        "email": f"user{number}@example.com",
+        "password": "secret123",
+        "first_name": "Test",
+        "last_name": f"User{number}"
+    })
+    assert response.status_code == 200, response.text
+    body = response.json()
+    return {"Authorization": f"Bearer {body['token']}", "user_id": str(body["user"]["id"])}
+
+
+@pytest.fixture
+def auth(client) -> dict:
+    headers = signup(client)
+    headers.pop("user_id")
+    return headers
+
+
+def create_trip(client, auth, **fields) -> dict:
+    body = {"name": "Trip", "start_date": "2026-01-01", "end_date": "2026-01-10", **fields}
+    response = client.post("/api/trips/", json=body, headers=auth)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def create_stop(client, auth, trip_id: int, **fields) -> dict:
+    body = {
+        "city_name": "Paris", "country": "France",
+        "arrival_date": "2026-01-01", "departure_date": "2026-01-04",
+        "sequence_order": 1, **fields
+    }
+    response = client.post(f"/api/stops/?trip_id={trip_id}", json=body, headers=auth)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def create_activity(client, auth, stop_id: int, **fields) -> dict:
+    body = {
+        "stop_id": stop_id, "name": "Louvre", "date_scheduled": "2026-01-02",
+        "time_start": "10:00", "duration_hours": 2, **fields
+    }
+    response = client.post("/api/activities/", json=body, headers=auth)
+    assert response.status_code == 200, response.text
+    return response.json()
@@ -0,0 +1,94 @@
+# backend/tests/test_archive.py
+
+# Archiving soft-deleted trips, and restoring them (user-044)
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from app.database import WriteSessionLocal
+from app.models import Stop, Trip
+from app.models.archived_trip import ArchivedTrip
+from app.services import archive_service
+from app.services.archive_service import ArchiveService
+from .conftest import ADMIN_HEADERS, create_activity, create_stop, create_trip
+
+
+def deleted_long_ago(client, auth) -> int:
+    """A trip with a stop and an activity, deleted past the retention window"""
+    trip = create_trip(client, auth)
+    create_activity(client, auth, create_stop(client, auth, trip["id"])["id"])
+    client.delete(f"/api/trips/{trip['id']}", headers=auth)
+
+    write(update(Trip).where(Trip.id == trip["id"]).values(deleted_at=datetime.utcnow() - timedelta(days=365)))
+    return trip["id"]
+
+
+def write(statement) -> None:
+    db = WriteSessionLocal()
+    try:
+        db.execute(statement)
+        db.commit()
+    finally:
+        db.close()
+
+
+def run_archive() -> dict:
+    db = WriteSessionLocal()
+    try:
+        return ArchiveService.run(db)
+    finally:
+        db.close()
+
+
+def stop_count(db, trip_id: int) -> int:
+    db.rollback()
+    return db.query(Stop).filter(Stop.trip_id == trip_id).count()
+
+
+def test_archive_routes_need_the_admin_token(client):
+    assert client.post("/api/admin/archive/run").status_code == 401
+    assert client.post("/api/admin/archive/trips/1/restore").status_code == 401
+    assert client.post("/api/admin/archive/run", headers=ADMIN_HEADERS).status_code == 200
+
+
+def test_archived_trip_is_restored_with_its_rows(client, auth, db):
+    trip_id = deleted_long_ago(client, auth)
+
+    run_archive()
+    assert db.get(Trip, trip_id) is None
+
+    response = client.post(f"/api/trips/{trip_id}/restore", headers=auth)
+    assert response.status_code == 200, response.text
+    assert stop_count(db, response.json()["trip_id"]) == 1
+
+
+def test_trip_restored_during_the_snapshot_is_left_alone(client, auth, db, monkeypatch):
+    trip_id = deleted_long_ago(client, auth)
+    snapshot = archive_service._snapshot
+
+    def restored_meanwhile(session, snapshot_trip_id):
+        result = snapshot(session, snapshot_trip_id)
+        write(update(Trip).where(Trip.id == trip_id).values(is_deleted=False, deleted_at=None))
+        return result
+
+    monkeypatch.setattr(archive_service, "_snapshot", restored_meanwhile)
+    run_archive()
+
+    assert stop_count(db, trip_id) == 1
+    assert db.query(ArchivedTrip).filter(ArchivedTrip.trip_id == trip_id).count() == 0
+
+
+def test_purge_stops_if_the_trip_is_no_longer_deleted(client, auth, db):
+    trip_id = deleted_long_ago(client, auth)
+    session = WriteSessionLocal()
+    try:
+        archive = ArchiveService.archive_trip(session, trip_id)
+        write(update(Trip).where(Trip.id == trip_id).values(is_deleted=False))
+
+        assert archive_service._purge(session, archive) is None
+    finally:
+        session.close()
+
+    assert stop_count(db, trip_id) == 1
+    assert db.query(ArchivedTrip).filter(ArchivedTrip.trip_id == trip_id).count() == 0
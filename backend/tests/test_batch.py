@@ -0,0 +1,114 @@
+# backend/tests/test_batch.py
+
+# POST /api/batch with temp ids (user-031)
+
+from app.models import Activity, Stop
+from .conftest import create_activity, create_stop, create_trip
+
+STOP = {
+    "city_name": "Rome", "country": "Italy",
+    "arrival_date": "2026-01-05", "departure_date": "2026-01-08",
+    "sequence_order": 2
+}
+ACTIVITY = {"name": "Colosseum", "date_scheduled": "2026-01-06"}
+
+
+def batch(client, operations, **params):
+    return client.post("/api/batch/", json={"operations": operations}, params=params)
+
+
+def test_temp_ids_link_a_new_stop_and_its_activity(client, auth, db):
+    trip = create_trip(client, auth)
+
+    response = batch(client, [
+        {"op": "create", "resource": "stop", "temp_id": "rome", "data": {"trip_id": trip["id"], **STOP}},
+        {"op": "create", "resource": "activity", "temp_id": "colosseum", "data": {"stop_id": "$rome", **ACTIVITY}},
+        {"op": "update", "resource": "activity", "id": "$colosseum", "data": {"cost": 25.0}},
+    ])
+
+    assert response.status_code == 200, response.text
+    results = response.json()["results"]
+    stop_id = results[0]["id"]
+    assert results[1]["data"]["stop_id"] == stop_id
+    assert db.get(Activity, results[1]["id"]).cost == 25.0
+
+
+def test_failed_operation_rolls_back_the_batch(client, auth, db):
+    trip = create_trip(client, auth)
+
+    response = batch(client, [
+        {"op": "create", "resource": "stop", "data": {"trip_id": trip["id"], **STOP}},
+        {"op": "delete", "resource": "activity", "id": 999999},
+    ])
+
+    assert response.status_code == 404
+    statuses = [result["status"] for result in response.json()["results"]]
+    assert statuses == [424, 404]
+    assert db.query(Stop).filter(Stop.trip_id == trip["id"]).count() == 0
+
+
+def test_deleting_a_new_stop_with_a_new_activity_is_409(client, auth, db):
+    trip = create_trip(client, auth)
+
+    response = batch(client, [
+        {"op": "create", "resource": "stop", "temp_id": "s2", "data": {"trip_id": trip["id"], **STOP}},
+        {"op": "create", "resource": "activity", "data": {"stop_id": "$s2", **ACTIVITY}},
+        {"op": "delete", "resource": "stop", "id": "$s2"},
+    ])
+
+    assert response.status_code == 409
+    failed = response.json()["results"][2]
+    assert "operation 1" in failed["error"]
+    assert db.query(Stop).filter(Stop.trip_id == trip["id"]).count() == 0
+
+
+def test_deleting_a_stop_after_adding_an_activity_to_it_is_409(client, auth):
+    trip = create_trip(client, auth)
+    stop = create_stop(client, auth, trip["id"])
+
+    response = batch(client, [
+        {"op": "create", "resource": "activity", "data": {"stop_id": stop["id"], **ACTIVITY, "date_scheduled": "2026-01-02"}},
+        {"op": "delete", "resource": "stop", "id": stop["id"]},
+    ])
+
+    assert response.status_code == 409
+    assert "operation 0" in response.json()["results"][1]["error"]
+
+
+def test_new_stop_can_be_deleted_once_its_activity_is(client, auth, db):
+    trip = create_trip(client, auth)
+
+    response = batch(client, [
+        {"op": "create", "resource": "stop", "temp_id": "s2", "data": {"trip_id": trip["id"], **STOP}},
+        {"op": "create", "resource": "activity", "temp_id": "a", "data": {"stop_id": "$s2", **ACTIVITY}},
+        {"op": "delete", "resource": "activity", "id": "$a"},
+        {"op": "delete", "resource": "stop", "id": "$s2"},
+    ])
+
+    assert response.status_code == 200, response.text
+    assert db.query(Stop).filter(Stop.trip_id == trip["id"]).count() == 0
+
+
+def test_existing_stop_delete_takes_its_existing_activities(client, auth, db):
+    trip = create_trip(client, auth)
+    stop = create_stop(client, auth, trip["id"])
+    activity = create_activity(client, auth, stop["id"])
+
+    response = batch(client, [{"op": "delete", "resource": "stop", "id": stop["id"]}])
+
+    assert response.status_code == 200, response.text
+    assert db.get(Activity, activity["id"]) is None
+
+
+def test_overlapping_activity_is_409_unless_allowed(client, auth):
+    trip = create_trip(client, auth)
+    stop = create_stop(client, auth, trip["id"])
+    create_activity(client, auth, stop["id"])
+    overlapping = {
+        "stop_id": stop["id"], "name": "Overlap", "date_scheduled": "2026-01-02",
+        "time_start": "11:00", "duration_hours": 1
+    }
+
+    assert batch(client, [{"op": "create", "resource": "activity", "data": overlapping}]).status_code == 409
+    allowed = batch(client, [{"op": "create", "resource": "activity", "data": overlapping}], allow_conflicts="true")
+    assert allowed.status_code == 200
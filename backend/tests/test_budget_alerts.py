@@ -0,0 +1,92 @@
+# backend/tests/test_budget_alerts.py
+
+# Running trip spend and budget threshold alerts (user-041)
+
+from app.models import Activity, Stop, Trip
+from .conftest import create_activity, create_stop, create_trip
+
+
+def add_expense(client, trip_id: int, amount: float) -> dict:
+    response = client.post(f"/api/budget/?trip_id={trip_id}", json={"category": "meals", "amount": amount})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def alerts(client, auth, trip_id: int) -> list:
+    response = client.get("/api/budget/alerts", params={"trip_id": trip_id}, headers=auth)
+    return [(alert["threshold"], alert["direction"]) for alert in response.json()["alerts"]]
+
+
+def spent(db, trip_id: int) -> float:
+    db.expire_all()
+    return float(db.get(Trip, trip_id).spent_total)
+
+
+def test_each_threshold_crossed_is_one_alert(client, auth):
+    trip = create_trip(client, auth, budget_limit=1000)
+
+    add_expense(client, trip["id"], 400)
+    assert alerts(client, auth, trip["id"]) == []
+
+    add_expense(client, trip["id"], 450)  # 85%: past 50 and 80 at once
+    assert alerts(client, auth, trip["id"]) == [(50, "up"), (80, "up")]
+
+
+def test_deleting_spend_crosses_back_down(client, auth):
+    trip = create_trip(client, auth, budget_limit=100)
+    record = add_expense(client, trip["id"], 60)
+
+    client.delete(f"/api/budget/{record['id']}")
+
+    assert alerts(client, auth, trip["id"]) == [(50, "up"), (50, "down")]
+
+
+def test_activity_costs_count_towards_the_trip(client, auth, db):
+    trip = create_trip(client, auth)
+    stop = create_stop(client, auth, trip["id"])
+    activity = create_activity(client, auth, stop["id"], cost=120)
+    assert spent(db, trip["id"]) == 120.0
+
+    db.get(Activity, activity["id"]).cost = 20
+    db.commit()
+    assert spent(db, trip["id"]) == 20.0
+
+
+def test_moved_stop_takes_its_activity_costs_along(client, auth, db):
+    source = create_trip(client, auth)
+    target = create_trip(client, auth)
+    stop = create_stop(client, auth, source["id"])
+    create_activity(client, auth, stop["id"], cost=300)
+
+    db.get(Stop, stop["id"]).trip_id = target["id"]
+    db.commit()
+
+    assert spent(db, source["id"]) == 0.0
+    assert spent(db, target["id"]) == 300.0
+
+
+def test_moved_stop_with_activity_writes_in_the_same_flush(client, auth, db):
+    source = create_trip(client, auth)
+    target = create_trip(client, auth)
+    stop = create_stop(client, auth, source["id"])
+    kept = create_activity(client, auth, stop["id"], cost=100)
+    gone = create_activity(client, auth, stop["id"], cost=50, time_start="14:00")
+
+    db.get(Stop, stop["id"]).trip_id = target["id"]
+    db.get(Activity, kept["id"]).cost = 150
+    db.delete(db.get(Activity, gone["id"]))
+    db.commit()
+
+    assert spent(db, source["id"]) == 0.0
+    assert spent(db, target["id"]) == 150.0
+
+
+def test_alerts_are_per_user(client, auth):
+    from .conftest import signup
+
+    trip = create_trip(client, auth, budget_limit=10)
+    add_expense(client, trip["id"], 10)
+    other = signup(client)
+    other.pop("user_id")
+
+    assert alerts(client, other, trip["id"]) == []
@@ -0,0 +1,83 @@
+# backend/tests/test_bulk_activities.py
+
+# POST /api/activities/bulk (user-032)
+
+from app.models import Activity, Trip
+from .conftest import create_activity, create_stop, create_trip
+
+
+def bulk(client, auth, payload, **params):
+    return client.post("/api/activities/bulk", json=payload, params=params, headers=auth)
+
+
+def test_valid_rows_are_created_in_order(client, auth, db):
+    trip = create_trip(client, auth)
+    stop = create_stop(client, auth, trip["id"])
+
+    response = bulk(client, auth, {"stop_id": stop["id"], "activities": [
+        {"name": f"Museum {n}", "date_scheduled": "2026-01-02", "cost": 10.0}
+        for n in range(50)
+    ]})
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["created"] == 50 and body["errors"] == []
+    assert [db.get(Activity, id).name for id in body["ids"][:3]] == ["Museum 0", "Museum 1", "Museum 2"]
+
+
+def test_bad_rows_are_reported_by_index_and_skipped(client, auth):
+    trip = create_trip(client, auth)
+    stop = create_stop(client, auth, trip["id"])
+
+    response = bulk(client, auth, {"stop_id": stop["id"], "activities": [
+        {"name": "Fine", "date_scheduled": "2026-01-02"},
+        {"date_scheduled": "2026-01-02"},
+        {"stop_id": 999999, "name": "Nowhere", "date_scheduled": "2026-01-02"},
+    ]})
+
+    body = response.json()
+    assert body["created"] == 1
+    assert [error["index"] for error in body["errors"]] == [1, 2]
+    assert "Stop 999999 not found" in body["errors"][1]["error"]
+
+
+def test_trip_id_limits_the_stops(client, auth):
+    trip = create_trip(client, auth)
+    other = create_stop(client, auth, create_trip(client, auth)["id"])
+
+    body = bulk(client, auth, {"trip_id": trip["id"], "activities": [
+        {"stop_id": other["id"], "name": "Elsewhere", "date_scheduled": "2026-01-02"}
+    ]}).json()
+
+    assert body["created"] == 0
+    assert f"in trip {trip['id']}" in body["errors"][0]["error"]
+
+
+def test_overlaps_are_skipped_unless_allowed(client, auth):
+    trip = create_trip(client, auth)
+    stop = create_stop(client, auth, trip["id"])
+    create_activity(client, auth, stop["id"])
+    payload = {"stop_id": stop["id"], "activities": [
+        {"name": "Overlap", "date_scheduled": "2026-01-02", "time_start": "11:00", "duration_hours": 1},
+        {"name": "Later", "date_scheduled": "2026-01-02", "time_start": "15:00", "duration_hours": 1},
+        {"name": "Overlaps later", "date_scheduled": "2026-01-02", "time_start": "15:30", "duration_hours": 1},
+    ]}
+
+    body = bulk(client, auth, payload).json()
+    assert body["created"] == 1
+    assert [error["index"] for error in body["errors"]] == [0, 2]
+
+    assert bulk(client, auth, payload, allow_conflicts="true").json()["created"] == 3
+
+
+def test_import_bumps_the_trip_version(client, auth, db):
+    trip = create_trip(client, auth)
+    stop = create_stop(client, auth, trip["id"])
+    before = db.get(Trip, trip["id"]).version
+    db.rollback()
+
+    bulk(client, auth, {"stop_id": stop["id"], "activities": [
+        {"name": "Louvre", "date_scheduled": "2026-01-02"}
+    ]})
+
+    assert db.get(Trip, trip["id"]).version > before
@@ -0,0 +1,62 @@
+# backend/tests/test_cache.py
+
+# Read-through cache vs. the reader's snapshot (user-028)
+
+from sqlalchemy import select
+from app.cache import MISSING, cache, trip_tag
+from app.database import SessionLocal
+from app.models import Stop
+from .conftest import create_stop, create_trip
+
+
+def stop_names(session, trip_id: int) -> list:
+    return list(session.scalars(select(Stop.city_name).where(Stop.trip_id == trip_id)))
+
+
+def test_value_read_before_a_commit_is_not_stored(client, auth):
+    trip = create_trip(client, auth)
+    create_stop(client, auth, trip["id"], city_name="A")
+    key = f"test-stops:{trip['id']}"
+
+    reader = SessionLocal()
+    try:
+        # The reader's snapshot begins here...
+        stop_names(reader, trip["id"])
+        # ...then another request commits a write to the trip
+        create_stop(client, auth, trip["id"], city_name="NEW")
+
+        cache.get_or_load(
+            key, lambda: stop_names(reader, trip["id"]),
+            tags=[trip_tag(trip["id"])], session=reader
+        )
+        assert cache.get(key) is MISSING
+    finally:
+        reader.close()
+
+    fresh = SessionLocal()
+    try:
+        value = cache.get_or_load(
+            key, lambda: stop_names(fresh, trip["id"]),
+            tags=[trip_tag(trip["id"])], session=fresh
+        )
+    finally:
+        fresh.close()
+    assert sorted(value) == ["A", "NEW"]
+    assert sorted(cache.get(key)) == ["A", "NEW"]
+
+
+def test_session_without_a_transaction_uses_the_current_generation(client, auth):
+    trip = create_trip(client, auth)
+    key = f"test-stops:{trip['id']}"
+
+    session = SessionLocal()
+    try:
+        create_stop(client, auth, trip["id"], city_name="B")
+        cache.get_or_load(
+            key, lambda: stop_names(session, trip["id"]),
+            tags=[trip_tag(trip["id"])], session=session
+        )
+    finally:
+        session.close()
+
+    assert cache.get(key) == ["B"]
@@ -0,0 +1,65 @@
+# backend/tests/test_calendar.py
+
+# GET /api/trips/{trip_id}/calendar (user-035)
+
+from .conftest import create_activity, create_stop, create_trip, signup
+
+
+def calendar(client, auth, trip_id: int):
+    response = client.get(f"/api/trips/{trip_id}/calendar", headers=auth)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_every_day_of_the_trip_with_its_stops(client, auth):
+    trip = create_trip(client, auth, start_date="2026-01-01", end_date="2026-01-06")
+    create_stop(client, auth, trip["id"], city_name="Paris",
+                arrival_date="2026-01-01", departure_date="2026-01-03", sequence_order=1)
+    create_stop(client, auth, trip["id"], city_name="Rome",
+                arrival_date="2026-01-03", departure_date="2026-01-05", sequence_order=2)
+
+    days = calendar(client, auth, trip["id"])["days"]
+
+    assert [day["date"] for day in days] == [f"2026-01-0{n}" for n in range(1, 7)]
+    assert [[stop["city_name"] for stop in day["stops"]] for day in days] == [
+        ["Paris"], ["Paris"], ["Paris", "Rome"], ["Rome"], ["Rome"], []
+    ]
+
+
+def test_activities_in_time_order_with_daily_totals(client, auth):
+    trip = create_trip(client, auth)
+    stop = create_stop(client, auth, trip["id"])
+    create_activity(client, auth, stop["id"], name="Late", time_start="15:00", cost=20, duration_hours=1)
+    create_activity(client, auth, stop["id"], name="Early", time_start="09:00", cost=15, duration_hours=2)
+    create_activity(client, auth, stop["id"], name="Untimed", time_start=None, duration_hours=None)
+    create_activity(client, auth, stop["id"], name="After the trip", date_scheduled="2026-02-01")
+
+    days = calendar(client, auth, trip["id"])["days"]
+    day = next(day for day in days if day["date"] == "2026-01-02")
+
+    assert [activity["name"] for activity in day["activities"]] == ["Early", "Late", "Untimed"]
+    assert day["total_cost"] == 35.0
+    assert day["total_duration_hours"] == 3.0
+    assert all(activity["name"] != "After the trip" for d in days for activity in d["activities"])
+
+
+def test_calendar_is_revalidated_after_a_write(client, auth):
+    trip = create_trip(client, auth)
+    stop = create_stop(client, auth, trip["id"])
+    first = client.get(f"/api/trips/{trip['id']}/calendar", headers=auth)
+
+    create_activity(client, auth, stop["id"], name="New")
+
+    after = client.get(f"/api/trips/{trip['id']}/calendar",
+                       headers={**auth, "If-None-Match": first.headers["etag"]})
+    assert after.status_code == 200
+    names = [a["name"] for day in after.json()["days"] for a in day["activities"]]
+    assert names == ["New"]
+
+
+def test_other_users_trip_is_404(client, auth):
+    trip = create_trip(client, auth)
+    other = signup(client)
+    other.pop("user_id")
+
+    assert client.get(f"/api/trips/{trip['id']}/calendar", headers=other).status_code == 404
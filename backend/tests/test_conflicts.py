@@ -0,0 +1,123 @@
+# backend/tests/test_conflicts.py
+
+# Overlapping activities at a stop and the cached StopSchedules (user-034)
+
+from app.models import Activity, BudgetRecord, Stop
+from app.services.schedule_service import stop_schedules
+from .conftest import create_activity, create_stop, create_trip
+
+AT_11 = {"time_start": "11:00", "duration_hours": 1}
+
+
+def test_overlapping_activity_is_409_unless_allowed(client, auth):
+    trip = create_trip(client, auth)
+    stop = create_stop(client, auth, trip["id"])
+    create_activity(client, auth, stop["id"], name="Louvre")  # 10:00 - 12:00
+
+    body = {"stop_id": stop["id"], "name": "Orsay", "date_scheduled": "2026-01-02", **AT_11}
+    response = client.post("/api/activities/", json=body, headers=auth)
+    assert response.status_code == 409
+    assert response.json()["detail"]["conflicts"][0]["activity_name"] == "Louvre"
+
+    allowed = client.post("/api/activities/?allow_conflicts=true", json=body, headers=auth)
+    assert allowed.status_code == 200
+
+    pairs = client.get(f"/api/stops/{stop['id']}/conflicts").json()
+    assert [(pair["activity_name"], pair["other_activity_name"]) for pair in pairs] == [("Louvre", "Orsay")]
+    assert len(client.get(f"/api/trips/{trip['id']}/conflicts", headers=auth).json()) == 1
+
+
+def test_activity_does_not_conflict_with_itself(client, auth):
+    trip = create_trip(client, auth)
+    stop = create_stop(client, auth, trip["id"])
+    activity = create_activity(client, auth, stop["id"])
+
+    body = {"stop_id": stop["id"], "name": "Louvre", "date_scheduled": "2026-01-02", **AT_11}
+    assert client.put(f"/api/activities/{activity['id']}", json=body, headers=auth).status_code == 200
+
+
+def test_writes_update_the_cached_schedule_in_place(client, auth, db):
+    trip = create_trip(client, auth)
+    stop = create_stop(client, auth, trip["id"])
+    first = create_activity(client, auth, stop["id"], name="First")
+    client.get(f"/api/stops/{stop['id']}/conflicts")
+    assert stop_schedules.get(stop["id"]) is not None
+
+    second = create_activity(client, auth, stop["id"], name="Second", time_start="14:00")
+    schedule = stop_schedules.get(stop["id"])
+    assert schedule is not None
+    assert [interval[3] for interval in schedule.intervals] == ["First", "Second"]
+
+    client.delete(f"/api/activities/{first['id']}")
+    assert [interval[2] for interval in stop_schedules.get(stop["id"]).intervals] == [second["id"]]
+
+
+def test_activity_moved_between_stops_leaves_the_old_schedule(client, auth, db):
+    trip = create_trip(client, auth)
+    source = create_stop(client, auth, trip["id"])
+    target = create_stop(client, auth, trip["id"], sequence_order=2)
+    activity = create_activity(client, auth, source["id"])
+    for stop in (source, target):
+        client.get(f"/api/stops/{stop['id']}/conflicts")
+
+    db.get(Activity, activity["id"]).stop_id = target["id"]
+    db.commit()
+
+    assert stop_schedules.get(source["id"]).intervals == []
+    assert [interval[2] for interval in stop_schedules.get(target["id"]).intervals] == [activity["id"]]
+
+
+def test_unrelated_trip_writes_keep_the_schedule(client, auth, db):
+    trip = create_trip(client, auth)
+    stop = create_stop(client, auth, trip["id"])
+    create_activity(client, auth, stop["id"])
+    client.get(f"/api/stops/{stop['id']}/conflicts")
+    cached = stop_schedules.get(stop["id"])
+
+    db.add(BudgetRecord(trip_id=trip["id"], category="food", amount=10))
+    db.commit()
+
+    assert stop_schedules.get(stop["id"]) is cached
+
+
+def test_deleted_stop_drops_its_schedule(client, auth, db):
+    trip = create_trip(client, auth)
+    stop = create_stop(client, auth, trip["id"])
+    client.get(f"/api/stops/{stop['id']}/conflicts")
+
+    db.delete(db.get(Stop, stop["id"]))
+    db.commit()
+
+    assert stop_schedules.get(stop["id"]) is None
+
+
+def test_load_from_before_a_write_to_its_trip_is_not_stored(client, auth, db):
+    from datetime import date, time
+    from app.database import SessionLocal
+    from app.services.schedule_service import ScheduleService
+
+    trip = create_trip(client, auth)
+    stop = create_stop(client, auth, trip["id"])
+    other = create_stop(client, auth, create_trip(client, auth)["id"])
+
+    reader = SessionLocal()
+    try:
+        reader.get(Stop, stop["id"])  # The reader's transaction begins
+        create_activity(client, auth, other["id"])  # Another trip: doesn't matter
+        ScheduleService.get_stop_schedule(reader, stop["id"])
+        assert stop_schedules.get(stop["id"]) is not None
+    finally:
+        reader.close()
+
+    stop_schedules.invalidate_trips([trip["id"]])
+    reader = SessionLocal()
+    try:
+        reader.get(Stop, stop["id"])
+        # Same trip, committed after the reader began
+        db.add(Activity(stop_id=stop["id"], name="Late", date_scheduled=date(2026, 1, 2),
+                        time_start=time(16), duration_hours=1))
+        db.commit()
+        ScheduleService.get_stop_schedule(reader, stop["id"])
+        assert stop_schedules.get(stop["id"]) is None
+    finally:
+        reader.close()
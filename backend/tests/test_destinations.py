@@ -0,0 +1,48 @@
+# backend/tests/test_destinations.py
+
+# Destination dictionary, autocomplete and popular destinations (user-039)
+
+from app.models import Destination, Stop
+from app.services.destination_service import destination_key
+from .conftest import ADMIN_HEADERS, create_stop, create_trip
+
+
+def test_spellings_share_one_key():
+    assert destination_key("  São Paulo ", "Brazil") == destination_key("SAO-PAULO", "brazil")
+    assert destination_key("St. Petersburg", "Russia") == destination_key("Saint Petersburg", "russia")
+    assert destination_key("New York", "USA") == destination_key("new york", "United States")
+    assert destination_key("!!", "France") is None
+
+
+def test_stops_are_linked_to_one_destination(client, auth, db):
+    trip = create_trip(client, auth)
+    first = create_stop(client, auth, trip["id"], city_name="Kraków", country="Poland")
+    second = create_stop(client, auth, trip["id"], city_name="krakow ", country="poland", sequence_order=2)
+
+    linked = {db.get(Stop, stop["id"]).destination_id for stop in (first, second)}
+    assert len(linked) == 1 and None not in linked
+
+
+def test_suggest_ignores_case_and_accents(client, auth):
+    trip = create_trip(client, auth)
+    for order in range(3):
+        create_stop(client, auth, trip["id"], city_name="Reykjavík", country="Iceland", sequence_order=order)
+    create_stop(client, auth, trip["id"], city_name="Reykholt", country="Iceland", sequence_order=4)
+
+    suggestions = client.get("/api/destinations/suggest", params={"prefix": "REYK"}).json()
+
+    assert [s["city_name"] for s in suggestions][:2] == ["Reykjavík", "Reykholt"]
+    assert suggestions[0]["stop_count"] >= 3
+
+
+def test_popular_destinations_group_spellings_and_stay_read_only(client, auth, db):
+    trip = create_trip(client, auth)
+    for order, spelling in enumerate(("Tbilisi", "TBILISI", " tbilisi")):
+        create_stop(client, auth, trip["id"], city_name=spelling, country="Georgia", sequence_order=order)
+    destinations_before = db.query(Destination).count()
+
+    popular = client.get("/api/admin/popular-destinations", headers=ADMIN_HEADERS).json()
+
+    tbilisi = [row for row in popular if row["city"] == "Tbilisi"]
+    assert len(tbilisi) == 1 and tbilisi[0]["count"] == 3
+    assert db.query(Destination).count() == destinations_before
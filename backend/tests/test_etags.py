@@ -0,0 +1,60 @@
+# backend/tests/test_etags.py
+
+# Weak ETags / If-None-Match on trip, stop and activity reads (user-027)
+
+from app.models import Trip
+from .conftest import create_activity, create_stop, create_trip
+
+
+def revalidate(client, path, etag, auth):
+    return client.get(path, headers={**auth, "If-None-Match": etag})
+
+
+def test_trip_read_is_304_until_the_trip_changes(client, auth):
+    trip = create_trip(client, auth)
+    path = f"/api/trips/{trip['id']}"
+
+    first = client.get(path, headers=auth)
+    assert first.status_code == 200
+    assert revalidate(client, path, first.headers["etag"], auth).status_code == 304
+
+    create_stop(client, auth, trip["id"])
+    assert revalidate(client, path, first.headers["etag"], auth).status_code == 200
+
+
+def test_stop_list_changes_with_an_activity_write(client, auth):
+    trip = create_trip(client, auth)
+    stop = create_stop(client, auth, trip["id"])
+    path = f"/api/stops?trip_id={trip['id']}"
+
+    first = client.get(path, headers=auth)
+    assert revalidate(client, path, first.headers["etag"], auth).status_code == 304
+
+    create_activity(client, auth, stop["id"])
+    assert revalidate(client, path, first.headers["etag"], auth).status_code == 200
+
+
+def test_trip_list_changes_when_one_trip_goes_and_another_comes(client, auth, db):
+    gone = create_trip(client, auth, name="Gone")
+    first = client.get("/api/trips/", headers=auth)
+    assert revalidate(client, "/api/trips/", first.headers["etag"], auth).status_code == 304
+
+    # Same count and same sum of versions as before
+    db.delete(db.get(Trip, gone["id"]))
+    db.commit()
+    create_trip(client, auth, name="New")
+
+    after = revalidate(client, "/api/trips/", first.headers["etag"], auth)
+    assert after.status_code == 200
+    assert [trip["name"] for trip in after.json()] == ["New"]
+
+
+def test_list_etag_is_per_user(client, auth):
+    from .conftest import signup
+
+    other = signup(client)
+    other.pop("user_id")
+    mine = client.get("/api/trips/", headers=auth)
+    create_trip(client, other)
+
+    assert revalidate(client, "/api/trips/", mine.headers["etag"], auth).status_code == 304
@@ -0,0 +1,57 @@
+# backend/tests/test_export.py
+
+# Streaming trip exports: NDJSON, CSV ledger, iCalendar (user-036)
+
+import json
+from app.models import Trip
+from app.services.export_service import ExportService
+from .conftest import ADMIN_HEADERS, create_activity, create_stop, create_trip
+
+
+def records(text: str) -> list:
+    return [json.loads(line) for line in text.splitlines()]
+
+
+def test_trip_export_streams_parents_before_children(client, auth):
+    trip = create_trip(client, auth)
+    stop = create_stop(client, auth, trip["id"])
+    create_activity(client, auth, stop["id"])
+
+    response = client.get(f"/api/trips/{trip['id']}/export", headers=auth)
+
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == f'attachment; filename="trip-{trip["id"]}.ndjson"'
+    assert [record["type"] for record in records(response.text)] == ["trip", "stop", "activity"]
+
+
+def test_csv_and_ics_formats(client, auth):
+    trip = create_trip(client, auth)
+    stop = create_stop(client, auth, trip["id"])
+    create_activity(client, auth, stop["id"], name="Louvre")
+
+    ledger = client.get(f"/api/trips/{trip['id']}/export?format=csv", headers=auth)
+    assert ledger.text.splitlines()[0] == "trip_id,record_id,date,category,amount,notes,running_total"
+
+    calendar = client.get(f"/api/trips/{trip['id']}/export?format=ics", headers=auth).text
+    assert calendar.startswith("BEGIN:VCALENDAR\r\n")
+    assert calendar.count("BEGIN:VEVENT") == 2
+    assert "SUMMARY:Louvre" in calendar
+
+
+def test_admin_export_needs_the_admin_token(client):
+    assert client.get("/api/admin/export").status_code == 401
+    assert client.get("/api/admin/export", headers={"X-Admin-Token": "wrong"}).status_code == 401
+    assert client.get("/api/admin/export", headers=ADMIN_HEADERS).status_code == 200
+
+
+def test_export_reads_every_table_from_one_snapshot(client, auth):
+    trip = create_trip(client, auth)
+    create_stop(client, auth, trip["id"], city_name="Before")
+
+    chunks = ExportService.ndjson(Trip.id == trip["id"])
+    first = next(chunks)  # Trips sent, the export's transaction is open
+    create_stop(client, auth, trip["id"], city_name="During")
+    rest = b"".join(chunks)
+
+    stops = [record["data"]["city_name"] for record in records((first + rest).decode()) if record["type"] == "stop"]
+    assert stops == ["Before"]
@@ -0,0 +1,63 @@
+# backend/tests/test_forecast.py
+
+# GET /api/trips/{trip_id}/forecast (user-040)
+
+from app.models import Trip
+from app.services.forecast_service import forecast_models
+from .conftest import create_activity, create_stop, create_trip
+
+
+def add_expense(client, trip_id: int, category: str, amount: float):
+    response = client.post(f"/api/budget/?trip_id={trip_id}",
+                           json={"category": category, "amount": amount})
+    assert response.status_code == 200, response.text
+
+
+def forecast(client, auth, trip_id: int) -> dict:
+    forecast_models.clear()  # Rebuild from the history written by the test
+    response = client.get(f"/api/trips/{trip_id}/forecast", headers=auth)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_forecast_scales_with_trip_length(client, auth):
+    history = create_trip(client, auth, start_date="2025-01-01", end_date="2025-01-10")
+    add_expense(client, history["id"], "meals", 500)
+
+    short = create_trip(client, auth, start_date="2026-01-01", end_date="2026-01-02")
+    long = create_trip(client, auth, start_date="2026-01-01", end_date="2026-01-20")
+
+    assert forecast(client, auth, short["id"])["days"] == 2
+    assert forecast(client, auth, long["id"])["projected_total"] > forecast(client, auth, short["id"])["projected_total"]
+
+
+def test_known_spend_is_a_floor(client, auth):
+    trip = create_trip(client, auth, budget_limit=900)
+    stop = create_stop(client, auth, trip["id"])
+    create_activity(client, auth, stop["id"], cost=400)
+    add_expense(client, trip["id"], "stay", 950)
+
+    result = forecast(client, auth, trip["id"])
+
+    assert result["spent_to_date"] == 950.0
+    assert result["scheduled_activities"] == 400.0
+    assert result["categories"]["stay"] >= 950.0
+    assert result["categories"]["activities"] >= 400.0
+    assert result["low_total"] >= 1350.0
+    assert result["over_budget"] is True
+
+
+def test_deleted_trips_are_left_out_of_the_history(client, auth, db):
+    forecast_models.clear()
+    before = forecast(client, auth, create_trip(client, auth)["id"])["history_trips"]
+
+    gone = create_trip(client, auth)
+    add_expense(client, gone["id"], "meals", 100000)
+    db.get(Trip, gone["id"]).is_deleted = True
+    db.commit()
+
+    assert forecast(client, auth, create_trip(client, auth)["id"])["history_trips"] == before
+
+
+def test_unknown_trip_is_404(client, auth):
+    assert client.get("/api/trips/999999/forecast", headers=auth).status_code == 404
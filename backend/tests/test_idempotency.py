@@ -0,0 +1,123 @@
+# backend/tests/test_idempotency.py
+
+# Idempotency-Key replay for POST requests (user-033)
+
+import uuid
+import anyio
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.models import IdempotencyKey
+from app.utils.idempotency import IdempotencyMiddleware, idempotency_store
+from .conftest import signup
+
+TRIP = {"name": "Retried", "start_date": "2026-01-01", "end_date": "2026-01-10"}
+
+
+def new_key() -> str:
+    return uuid.uuid4().hex
+
+
+def test_retry_replays_the_first_response(client, auth):
+    headers = {**auth, "Idempotency-Key": new_key()}
+
+    first = client.post("/api/trips/", json=TRIP, headers=headers)
+    retry = client.post("/api/trips/", json=TRIP, headers=headers)
+
+    assert first.status_code == retry.status_code == 200
+    assert retry.json()["id"] == first.json()["id"]
+    assert retry.headers["idempotent-replayed"] == "true"
+    names = [trip["name"] for trip in client.get("/api/trips/", headers=auth).json()]
+    assert names.count("Retried") == 1
+
+
+def test_key_reused_for_another_body_is_422(client, auth):
+    headers = {**auth, "Idempotency-Key": new_key()}
+    client.post("/api/trips/", json=TRIP, headers=headers)
+
+    response = client.post("/api/trips/", json={**TRIP, "name": "Other"}, headers=headers)
+    assert response.status_code == 422
+
+
+def test_keys_are_per_user(client, auth):
+    key = new_key()
+    other = signup(client)
+    other.pop("user_id")
+
+    mine = client.post("/api/trips/", json=TRIP, headers={**auth, "Idempotency-Key": key})
+    theirs = client.post("/api/trips/", json=TRIP, headers={**other, "Idempotency-Key": key})
+
+    assert theirs.json()["id"] != mine.json()["id"]
+    assert "idempotent-replayed" not in theirs.headers
+
+
+def test_auth_responses_are_not_stored(client, db):
+    key = new_key()
+    user = {"email": f"{key}@example.com", "password": "secret123", "first_name": "A", "last_name": "B"}
+    client.post("/api/auth/signup", json=user)
+
+    login = {"email": user["email"], "password": user["password"]}
+    client.post("/api/auth/login", json=login, headers={"Idempotency-Key": key})
+    again = client.post("/api/auth/login", json=login, headers={"Idempotency-Key": key})
+
+    assert "idempotent-replayed" not in again.headers
+    assert db.query(IdempotencyKey).filter(IdempotencyKey.key == key).count() == 0
+
+
+def counting_app(max_wait: float):
+    app = FastAPI()
+    app.state.calls = 0
+
+    @app.post("/things")
+    def create_thing():
+        app.state.calls += 1
+        return {"n": app.state.calls}
+
+    app.add_middleware(IdempotencyMiddleware, max_wait=max_wait)
+    return app
+
+
+def test_retry_while_the_first_request_is_in_flight_is_409(app):
+    small = counting_app(max_wait=0.2)
+    key = new_key()
+    assert idempotency_store.claim(("anonymous", key))  # First request still running
+    try:
+        response = TestClient(small).post("/things", headers={"Idempotency-Key": key})
+    finally:
+        idempotency_store.release(("anonymous", key))
+
+    assert response.status_code == 409
+    assert response.headers["retry-after"] == "1"
+    assert small.state.calls == 0
+
+
+def test_waiting_retry_stops_when_the_client_disconnects(app):
+    small = counting_app(max_wait=30)
+    key = new_key()
+    assert idempotency_store.claim(("anonymous", key))
+    messages = iter([
+        {"type": "http.request", "body": b"", "more_body": False},
+        {"type": "http.disconnect"},
+    ])
+    sent = []
+
+    async def receive():
+        return next(messages)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http", "method": "POST", "path": "/things", "query_string": b"",
+        "headers": [(b"idempotency-key", key.encode())]
+    }
+    async def call():
+        with anyio.fail_after(5):
+            await IdempotencyMiddleware(small, max_wait=30)(scope, receive, send)
+
+    try:
+        anyio.run(call)
+    finally:
+        idempotency_store.release(("anonymous", key))
+
+    assert sent == []
+    assert small.state.calls == 0
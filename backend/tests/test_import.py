@@ -0,0 +1,79 @@
+# backend/tests/test_import.py
+
+# POST /api/trips/import from an NDJSON export (user-037)
+
+import json
+from .conftest import create_activity, create_stop, create_trip, signup
+
+
+def upload(client, auth, text: str, filename: str = "trips.ndjson", **params):
+    return client.post(
+        "/api/trips/import", params=params, headers=auth,
+        files={"file": (filename, text.encode(), "application/octet-stream")}
+    )
+
+
+def line(record_type: str, **data) -> str:
+    return json.dumps({"type": record_type, "data": data}) + "\n"
+
+
+TRIP = line("trip", id=1, name="Imported", start_date="2026-03-01", end_date="2026-03-05")
+STOP = line("stop", id=10, trip_id=1, city_name="Lisbon", country="Portugal",
+            arrival_date="2026-03-01", departure_date="2026-03-05", sequence_order=1)
+
+
+def activity(id: int, time_start: str = "10:00", **fields) -> str:
+    return line("activity", id=id, stop_id=10, name=f"Activity {id}", date_scheduled="2026-03-02",
+                time_start=time_start, duration_hours=1, **fields)
+
+
+def test_export_round_trips_into_another_account(client, auth):
+    trip = create_trip(client, auth, name="Original")
+    stop = create_stop(client, auth, trip["id"])
+    create_activity(client, auth, stop["id"])
+    dump = client.get(f"/api/trips/{trip['id']}/export", headers=auth).text
+
+    other = signup(client)
+    other.pop("user_id")
+    result = upload(client, other, dump).json()
+
+    assert result["committed"] is True
+    assert result["created"] == {"trip": 1, "stop": 1, "activity": 1, "budget_record": 0}
+    imported = client.get("/api/trips/", headers=other).json()
+    assert [trip["name"] for trip in imported] == ["Original"]
+    assert imported[0]["id"] != trip["id"]
+
+
+def test_ids_are_remapped_to_the_new_rows(client, auth):
+    result = upload(client, auth, TRIP + STOP + activity(100)).json()
+    assert result["committed"] is True
+
+    trip = next(t for t in client.get("/api/trips/", headers=auth).json() if t["name"] == "Imported")
+    stops = client.get(f"/api/stops?trip_id={trip['id']}", headers=auth).json()
+    assert [stop["city_name"] for stop in stops] == ["Lisbon"]
+
+
+def test_invalid_record_rolls_back_everything(client, auth):
+    bad = line("activity", id=101, stop_id=10, date_scheduled="2026-03-02")  # No name
+    result = upload(client, auth, TRIP + STOP + bad).json()
+
+    assert result["committed"] is False
+    assert result["errors"][0]["line"] == 3
+    assert client.get("/api/trips/", headers=auth).json() == []
+
+
+def test_partial_keeps_the_valid_records(client, auth):
+    bad = line("activity", id=101, stop_id=99, name="Orphan", date_scheduled="2026-03-02")
+    result = upload(client, auth, TRIP + STOP + bad, partial="true").json()
+
+    assert result["committed"] is True
+    assert result["created"]["stop"] == 1
+    assert result["error_count"] == 1
+
+
+def test_overlapping_activities_are_invalid_unless_allowed(client, auth):
+    dump = TRIP + STOP + activity(100) + activity(101, time_start="10:30")
+
+    assert upload(client, auth, dump).json()["committed"] is False
+    assert upload(client, auth, dump, allow_conflicts="true").json()["created"]["activity"] == 2
+
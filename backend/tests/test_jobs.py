@@ -0,0 +1,115 @@
+# backend/tests/test_jobs.py
+
+# Background jobs: admin routes, runner transactions and heartbeat (user-043)
+
+import time
+
+import pytest
+
+from app.config import settings
+from app.database import WriteSessionLocal
+from app.models.job import Job
+from app.utils import jobs
+from app.utils.jobs import enqueue_job, job_runner
+from .conftest import ADMIN_HEADERS
+
+
+@pytest.fixture
+def handler(monkeypatch):
+    """Register a handler for the "test_job" kind for one test"""
+    def register(function):
+        monkeypatch.setitem(jobs._handlers, "test_job", function)
+    return register
+
+
+def queue_job(kind: str = "test_job", **fields) -> int:
+    db = WriteSessionLocal()
+    try:
+        job_id = enqueue_job(db, kind, **fields)
+        db.commit()
+        return job_id
+    finally:
+        db.close()
+
+
+def run_until_taken(db, job_id: int) -> Job:
+    """run_one() until this job has been claimed (others may be due first)"""
+    for _ in range(20):
+        job_runner.run_one()
+        db.rollback()  # New snapshot
+        job = db.get(Job, job_id)
+        if job.attempts:
+            return job
+    raise AssertionError(f"Job {job_id} never ran")
+
+
+def test_queueing_and_retrying_need_the_admin_token(client, db, handler):
+    handler(lambda session, payload: None)
+    body = {"kind": "test_job", "payload": {}}
+
+    assert client.post("/api/admin/jobs", json=body).status_code == 401
+    assert client.post("/api/admin/jobs/1/retry").status_code == 401
+
+    response = client.post("/api/admin/jobs", json=body, headers=ADMIN_HEADERS)
+    assert response.status_code == 200, response.text
+    assert response.json()["status"] == "queued"
+    assert run_until_taken(db, response.json()["id"]).status == "done"
+
+
+def test_handler_writes_and_done_status(client, db, handler):
+    seen = []
+    handler(lambda session, payload: seen.append(payload))
+    job_id = queue_job(payload={"n": 1})
+
+    job = run_until_taken(db, job_id)
+
+    assert seen == [{"n": 1}]
+    assert (job.status, job.locked_by) == ("done", None)
+
+
+def test_failing_job_is_retried_later(client, db, handler):
+    def fail(session, payload):
+        raise ValueError("boom")
+    handler(fail)
+    job_id = queue_job(max_attempts=2)
+
+    job = run_until_taken(db, job_id)
+
+    assert job.status == "queued"
+    assert "boom" in job.last_error
+
+
+def test_heartbeat_keeps_a_long_job_locked(client, db, handler, monkeypatch):
+    monkeypatch.setattr(settings, "JOB_HEARTBEAT_SECONDS", 0.05)
+    lock_times = []
+
+    def slow(session, payload):
+        claimed = session.get(Job, job_id).locked_at
+        session.rollback()
+        time.sleep(0.3)
+        lock_times.append((claimed, session.get(Job, job_id).locked_at))
+        session.rollback()
+
+    handler(slow)
+    job_id = queue_job()
+
+    assert run_until_taken(db, job_id).status == "done"
+    claimed, refreshed = lock_times[0]
+    assert refreshed > claimed
+
+
+def test_job_requeued_while_running_is_not_marked_done(client, db, handler):
+    def taken_back(session, payload):
+        # What housekeeping does when the lock looks stale
+        other = WriteSessionLocal()
+        try:
+            job = other.get(Job, job_id)
+            job.status, job.locked_by = "queued", None
+            other.commit()
+        finally:
+            other.close()
+
+    handler(taken_back)
+    job_id = queue_job()
+
+    assert run_until_taken(db, job_id).status == "queued"
@@ -0,0 +1,67 @@
+# backend/tests/test_profiler.py
+
+# On-demand stack sampler (user-047)
+
+import threading
+import time
+
+from app.utils.profiler import StackSampler, finish_profile, try_start_profile
+from .conftest import ADMIN_HEADERS
+
+
+def spin(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_profile_needs_the_admin_token(client):
+    assert client.post("/api/admin/profile", params={"seconds": 0.1}).status_code == 401
+
+
+def test_profile_length_is_capped(client):
+    response = client.post("/api/admin/profile", params={"seconds": 3600}, headers=ADMIN_HEADERS)
+    assert response.status_code == 400
+
+
+def test_profile_endpoint_returns_collapsed_stacks(client):
+    response = client.post(
+        "/api/admin/profile",
+        params={"seconds": 0.2, "hz": 200, "format": "collapsed", "idle": True},
+        headers=ADMIN_HEADERS
+    )
+
+    assert response.status_code == 200, response.text
+    assert int(response.headers["X-Profile-Samples"]) > 0
+    assert response.text.strip()
+
+
+def test_stacks_are_tagged_with_the_route_on_them():
+    stop = threading.Event()
+    worker = threading.Thread(target=spin, args=(stop,))
+    sampler = StackSampler(hz=500, routes={spin.__code__: "GET /spin"})
+
+    worker.start()
+    sampler.start()
+    time.sleep(0.2)
+    sampler.stop()
+    stop.set()
+    worker.join()
+
+    assert sampler.summary()["by_route"].get("GET /spin", 0) > 0
+    assert any(line.startswith("GET /spin;") for line in sampler.collapsed().splitlines())
+
+    profiles = sampler.speedscope()["profiles"]
+    assert "GET /spin" in {profile["name"] for profile in profiles}
+
+
+def test_one_profile_at_a_time():
+    first, second = StackSampler(hz=50), StackSampler(hz=50)
+
+    assert try_start_profile(first)
+    try:
+        assert not try_start_profile(second)
+    finally:
+        finish_profile(first)
+
+    assert try_start_profile(second)
+    finish_profile(second)
@@ -0,0 +1,142 @@
+# backend/tests/test_redis_cache.py
+
+# RedisCache against fakeredis (a Redis-compatible in-process server).
+# Two RedisCache objects on one FakeServer stand in for two worker processes.
+
+import threading
+import fakeredis
+import pytest
+from app.cache import MISSING, RedisCache, trip_tag
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+def make_cache(server, **kwargs) -> RedisCache:
+    return RedisCache(client=fakeredis.FakeRedis(server=server), default_ttl=60, **kwargs)
+
+
+def test_set_get_roundtrip(server):
+    cache = make_cache(server)
+    cache.set("trips:1", [{"id": 1, "start_date": "2026-01-01"}])
+
+    assert cache.get("trips:1") == [{"id": 1, "start_date": "2026-01-01"}]
+    assert cache.get("trips:2") is MISSING
+
+
+def test_ttl_is_set(server):
+    cache = make_cache(server)
+    cache.set("trips:1", [1], ttl=30)
+
+    assert 0 < cache._client.ttl(cache.prefix + "trips:1") <= 30
+
+
+def test_invalidation_reaches_other_processes(server):
+    one, other = make_cache(server), make_cache(server)
+    one.set("stops:1", [1], tags=[trip_tag(1)])
+    one.set("stops:2", [2], tags=[trip_tag(2)])
+
+    other.invalidate_tags([trip_tag(1)])
+
+    assert one.get("stops:1") is MISSING
+    assert one.get("stops:2") == [2]
+
+
+def test_get_or_load_caches_and_counts(server):
+    cache = make_cache(server)
+    calls = []
+
+    def load():
+        calls.append(1)
+        return {"id": 1}
+
+    assert cache.get_or_load("trip:1", load, tags=[trip_tag(1)]) == {"id": 1}
+    assert cache.get_or_load("trip:1", load, tags=[trip_tag(1)]) == {"id": 1}
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_load_overlapping_invalidation_in_other_process_is_not_stored(server):
+    loader_cache, writer_cache = make_cache(server), make_cache(server)
+
+    def load():
+        # A write in another worker commits while this load runs
+        writer_cache.invalidate_tags([trip_tag(1)])
+        return {"version": "stale"}
+
+    assert loader_cache.get_or_load("trip:1", load, tags=[trip_tag(1)]) == {"version": "stale"}
+    assert loader_cache.get("trip:1") is MISSING
+
+
+def test_concurrent_loads_across_processes_run_loader_once(server):
+    caches = [make_cache(server, lock_timeout=5) for _ in range(4)]
+    calls = []
+    started = threading.Event()
+
+    def load():
+        calls.append(1)
+        started.wait(1)  # Hold the lock until everyone has asked
+        return [1, 2, 3]
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda c=c: results.append(c.get_or_load("stops:9", load)))
+        for c in caches
+    ]
+    for thread in threads:
+        thread.start()
+    started.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == [[1, 2, 3]] * 4
+    assert len(calls) == 1
+
+
+def test_clear_only_removes_prefixed_keys(server):
+    cache = make_cache(server)
+    cache.set("trips:1", [1], tags=[trip_tag(1)])
+    cache._client.set("unrelated", "keep")
+
+    cache.clear()
+
+    assert cache.get("trips:1") is MISSING
+    assert cache._client.get("unrelated") == b"keep"
+
+
+def test_unreachable_redis_falls_through(server):
+    cache = make_cache(server)
+    cache.set("trips:1", [1])
+    server.connected = False
+
+    assert cache.get("trips:1") is MISSING
+    cache.set("trips:2", [2])
+    cache.delete("trips:1")
+    cache.invalidate_tags([trip_tag(1)])
+    cache.clear()
+    assert cache.get_or_load("trips:3", lambda: [3]) == [3]
+
+
+def test_store_is_dropped_when_the_generation_moves_before_exec(server):
+    cache, other = make_cache(server), make_cache(server)
+    generation = cache._current_generation()
+    real_pipeline = cache._client.pipeline
+
+    def pipeline():
+        pipe = real_pipeline()
+        real_multi = pipe.multi
+
+        def multi():
+            # Another worker invalidates between the check and EXEC
+            other.invalidate_tags([trip_tag(1)])
+            real_multi()
+
+        pipe.multi = multi
+        return pipe
+
+    cache._client.pipeline = pipeline
+    cache._set_if_generation("trip:1", {"version": "stale"}, None, [trip_tag(1)], generation)
+
+    assert cache.get("trip:1") is MISSING
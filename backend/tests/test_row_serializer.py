@@ -0,0 +1,44 @@
+# backend/tests/test_row_serializer.py
+
+# Column-path list serialization for orjson responses (user-029)
+
+from fastapi.encoders import jsonable_encoder
+
+from app.config import settings
+from app.models import Activity, Stop
+from app.routes.activities import activity_rows
+from app.routes.stops import stop_rows
+from .conftest import create_activity, create_stop, create_trip
+
+
+def both_paths(monkeypatch, serializer, db, *criteria) -> tuple:
+    monkeypatch.setattr(settings, "FAST_JSON", False)
+    validated = serializer.fetch(db, *criteria)
+    monkeypatch.setattr(settings, "FAST_JSON", True)
+    rows = serializer.fetch(db, *criteria)
+    return validated, jsonable_encoder(rows)
+
+
+def test_fast_path_rows_match_validated_output(client, auth, db, monkeypatch):
+    trip = create_trip(client, auth)
+    stop = create_stop(client, auth, trip["id"])
+    create_activity(client, auth, stop["id"], cost=12.5)
+
+    validated, rows = both_paths(monkeypatch, stop_rows, db, Stop.trip_id == trip["id"])
+    assert rows == validated
+
+    validated, rows = both_paths(monkeypatch, activity_rows, db, Activity.stop_id == stop["id"])
+    assert rows == validated
+    assert rows[0]["cost"] == 12.5
+
+
+def test_fast_json_list_response_keeps_etag(client, auth, monkeypatch):
+    trip = create_trip(client, auth)
+    create_stop(client, auth, trip["id"])
+    monkeypatch.setattr(settings, "FAST_JSON", True)
+
+    response = client.get("/api/stops/", params={"trip_id": trip["id"]}, headers=auth)
+
+    assert response.status_code == 200
+    assert response.headers["ETag"]
+    assert response.json()[0]["city_name"] == "Paris"
@@ -0,0 +1,66 @@
+# backend/tests/test_search.py
+
+# GET /api/search over trips, stops and activities (user-038)
+
+from app.models import Stop, Trip
+from .conftest import create_activity, create_stop, create_trip, signup
+
+
+def search(client, auth, q: str) -> list:
+    response = client.get("/api/search/", params={"q": q}, headers=auth)
+    assert response.status_code == 200, response.text
+    return [(hit["type"], hit["id"], hit["trip_id"]) for hit in response.json()["results"]]
+
+
+def other_user(client) -> dict:
+    headers = signup(client)
+    headers.pop("user_id")
+    return headers
+
+
+def test_prefix_search_finds_every_kind(client, auth):
+    trip = create_trip(client, auth, name="Zanzibar escape")
+    stop = create_stop(client, auth, trip["id"], city_name="Zanzibar City")
+    activity = create_activity(client, auth, stop["id"], name="Zanzibar spice tour")
+
+    hits = search(client, auth, "zanzi")
+
+    assert sorted(hits) == sorted([
+        ("trip", trip["id"], trip["id"]),
+        ("stop", stop["id"], trip["id"]),
+        ("activity", activity["id"], trip["id"]),
+    ])
+
+
+def test_results_are_the_users_own(client, auth):
+    create_trip(client, auth, name="Quokka island")
+
+    assert search(client, other_user(client), "quokka") == []
+
+
+def test_moved_stop_takes_its_activities_to_the_new_trip(client, auth, db):
+    source = create_trip(client, auth)
+    stop = create_stop(client, auth, source["id"], city_name="Harbour")
+    activity = create_activity(client, auth, stop["id"], name="Wombat walk")
+
+    owner = other_user(client)
+    target = create_trip(client, owner)
+    db.get(Stop, stop["id"]).trip_id = target["id"]
+    db.commit()
+
+    assert search(client, owner, "wombat") == [("activity", activity["id"], target["id"])]
+    assert search(client, auth, "wombat") == []
+
+
+def test_trip_given_to_another_user_moves_its_rows(client, auth, db):
+    trip = create_trip(client, auth)
+    stop = create_stop(client, auth, trip["id"], city_name="Numbat Bay")
+    create_activity(client, auth, stop["id"], name="Numbat watching")
+
+    owner = signup(client)
+    owner_id = int(owner.pop("user_id"))
+    db.get(Trip, trip["id"]).user_id = owner_id
+    db.commit()
+
+    assert len(search(client, owner, "numbat")) == 2
+    assert search(client, auth, "numbat") == []
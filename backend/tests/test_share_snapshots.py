@@ -0,0 +1,64 @@
+# backend/tests/test_share_snapshots.py
+
+# Public shared trips served from ShareSnapshotCache (user-026)
+
+from app.services.share_service import share_snapshots
+from .conftest import create_activity, create_stop, create_trip
+
+
+def share(client, trip_id: int) -> str:
+    response = client.post(f"/api/sharing/{trip_id}")
+    assert response.status_code == 200
+    return response.json()["share_token"]
+
+
+def test_snapshot_is_served_with_etag(client, auth):
+    trip = create_trip(client, auth, name="Shared")
+    create_stop(client, auth, trip["id"])
+    token = share(client, trip["id"])
+
+    first = client.get(f"/api/sharing/public/{token}")
+    assert first.status_code == 200
+    assert first.json()["name"] == "Shared"
+    assert share_snapshots.get(token) is not None
+
+    again = client.get(f"/api/sharing/public/{token}", headers={"If-None-Match": first.headers["etag"]})
+    assert again.status_code == 304
+    assert again.headers["etag"] == first.headers["etag"]
+
+
+def test_write_in_the_trip_drops_the_snapshot(client, auth):
+    trip = create_trip(client, auth)
+    stop = create_stop(client, auth, trip["id"])
+    token = share(client, trip["id"])
+    before = client.get(f"/api/sharing/public/{token}")
+
+    create_activity(client, auth, stop["id"], name="Orsay")
+    assert share_snapshots.get(token) is None
+
+    after = client.get(f"/api/sharing/public/{token}", headers={"If-None-Match": before.headers["etag"]})
+    assert after.status_code == 200
+    assert after.headers["etag"] != before.headers["etag"]
+    assert [a["name"] for a in after.json()["stops"][0]["activities"]] == ["Orsay"]
+
+
+def test_activity_moved_out_of_the_trip_drops_its_snapshot(client, auth, db):
+    from app.models import Activity
+
+    source = create_trip(client, auth)
+    source_stop = create_stop(client, auth, source["id"])
+    activity = create_activity(client, auth, source_stop["id"])
+    token = share(client, source["id"])
+    client.get(f"/api/sharing/public/{token}")
+
+    target = create_trip(client, auth)
+    target_stop = create_stop(client, auth, target["id"])
+    db.get(Activity, activity["id"]).stop_id = target_stop["id"]
+    db.commit()
+
+    assert share_snapshots.get(token) is None
+    assert client.get(f"/api/sharing/public/{token}").json()["stops"][0]["activities"] == []
+
+
+def test_unknown_token_is_404(client):
+    assert client.get("/api/sharing/public/nope").status_code == 404
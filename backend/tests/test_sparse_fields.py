@@ -0,0 +1,42 @@
+# backend/tests/test_sparse_fields.py
+
+# ?fields= sparse fieldsets on list endpoints (user-030)
+
+from .conftest import create_activity, create_stop, create_trip
+
+
+def test_only_the_requested_columns_come_back(client, auth):
+    trip = create_trip(client, auth)
+    stop = create_stop(client, auth, trip["id"])
+    create_activity(client, auth, stop["id"])
+
+    response = client.get("/api/stops/", params={"trip_id": trip["id"], "fields": "id, city_name,id"}, headers=auth)
+    assert response.status_code == 200, response.text
+    assert response.json() == [{"id": stop["id"], "city_name": "Paris"}]
+
+    response = client.get("/api/activities/", params={"stop_id": stop["id"], "fields": "name"}, headers=auth)
+    assert response.json() == [{"name": "Louvre"}]
+
+
+def test_unknown_fields_are_rejected(client, auth):
+    trip = create_trip(client, auth)
+
+    response = client.get("/api/stops/", params={"trip_id": trip["id"], "fields": "id,password"}, headers=auth)
+
+    assert response.status_code == 400
+    assert "password" in response.json()["detail"]
+
+
+def test_each_fieldset_has_its_own_etag(client, auth):
+    trip = create_trip(client, auth)
+    create_stop(client, auth, trip["id"])
+
+    full = client.get("/api/stops/", params={"trip_id": trip["id"]}, headers=auth)
+    names = client.get("/api/stops/", params={"trip_id": trip["id"], "fields": "city_name"}, headers=auth)
+    assert full.headers["ETag"] != names.headers["ETag"]
+
+    again = client.get(
+        "/api/stops/", params={"trip_id": trip["id"], "fields": "city_name"},
+        headers={**auth, "If-None-Match": names.headers["ETag"]}
+    )
+    assert again.status_code == 304
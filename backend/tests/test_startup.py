@@ -0,0 +1,47 @@
+# backend/tests/test_startup.py
+
+# Lazy heavy imports and warm-up steps (user-048)
+
+import os
+import subprocess
+import sys
+import tempfile
+
+from app.config import settings
+from app.utils import warmup
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ("numpy", "jose", "passlib", "bcrypt")
+
+
+def test_importing_the_app_leaves_heavy_modules_unloaded():
+    script = (
+        "import sys, app.main\n"
+        f"print('loaded:' + ','.join(name for name in {HEAVY_MODULES!r} if name in sys.modules))\n"
+    )
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{tempfile.mkdtemp()}/import.db"}
+
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=BACKEND_DIR, env=env,
+        capture_output=True, text=True, timeout=60
+    )
+
+    assert result.returncode == 0, result.stderr
+    loaded = [line for line in result.stdout.splitlines() if line.startswith("loaded:")]
+    assert loaded == ["loaded:"]
+
+
+def test_forecast_model_warm_up_can_be_turned_off(monkeypatch):
+    built = []
+    monkeypatch.setattr(warmup, "WARMUP_STEPS", [
+        ("forecast_model", lambda: built.append(True), "WARMUP_FORECAST_MODEL"),
+    ])
+    monkeypatch.setattr(settings, "WARMUP_FORECAST_MODEL", False)
+    readiness = warmup.Readiness()
+
+    readiness.run()
+
+    assert built == []
+    assert readiness.ready
+    assert readiness.status()["steps"]["forecast_model"]["skipped"]
@@ -0,0 +1,71 @@
+# backend/tests/test_trip_events.py
+
+# Trip change feed: outbox rows and who may watch (user-042)
+
+from app.models import Activity, Stop, TripEvent
+from app.services.trip_event_service import can_watch_trip
+from .conftest import create_activity, create_stop, create_trip
+
+
+def events_for(db, trip_id: int, entity: str, entity_id: int) -> list:
+    rows = db.query(TripEvent.action, TripEvent.fields).filter(
+        TripEvent.trip_id == trip_id,
+        TripEvent.entity == entity,
+        TripEvent.entity_id == entity_id
+    ).order_by(TripEvent.id)
+    return [(action, fields) for action, fields in rows]
+
+
+def test_writes_land_in_the_outbox(client, auth, db):
+    trip = create_trip(client, auth)
+    stop = create_stop(client, auth, trip["id"])
+
+    assert events_for(db, trip["id"], "stop", stop["id"]) == [("created", None)]
+
+
+def test_moved_stop_leaves_its_old_trip(client, auth, db):
+    source = create_trip(client, auth)
+    target = create_trip(client, auth)
+    stop = create_stop(client, auth, source["id"])
+
+    db.get(Stop, stop["id"]).trip_id = target["id"]
+    db.commit()
+
+    assert events_for(db, source["id"], "stop", stop["id"])[-1] == ("deleted", ["trip_id"])
+    assert events_for(db, target["id"], "stop", stop["id"]) == [("updated", ["trip_id"])]
+
+
+def test_activity_moved_to_another_trip_leaves_the_old_one(client, auth, db):
+    source = create_trip(client, auth)
+    target = create_trip(client, auth)
+    activity = create_activity(client, auth, create_stop(client, auth, source["id"])["id"])
+    new_stop = create_stop(client, auth, target["id"])
+
+    db.get(Activity, activity["id"]).stop_id = new_stop["id"]
+    db.commit()
+
+    assert events_for(db, source["id"], "activity", activity["id"])[-1] == ("deleted", ["stop_id"])
+    assert events_for(db, target["id"], "activity", activity["id"]) == [("updated", ["stop_id"])]
+
+
+def test_activity_moved_within_a_trip_is_just_updated(client, auth, db):
+    trip = create_trip(client, auth)
+    activity = create_activity(client, auth, create_stop(client, auth, trip["id"])["id"])
+    other_stop = create_stop(client, auth, trip["id"])
+
+    db.get(Activity, activity["id"]).stop_id = other_stop["id"]
+    db.commit()
+
+    assert events_for(db, trip["id"], "activity", activity["id"]) == [
+        ("created", None), ("updated", ["stop_id"])
+    ]
+
+
+def test_share_token_stops_working_once_the_trip_is_deleted(client, auth):
+    trip = create_trip(client, auth)
+    token = client.post(f"/api/sharing/{trip['id']}", headers=auth).json()["share_token"]
+    assert can_watch_trip(trip["id"], user_id=0, share_token=token)
+
+    client.delete(f"/api/trips/{trip['id']}", headers=auth)
+
+    assert not can_watch_trip(trip["id"], user_id=0, share_token=token)
@@ -0,0 +1,76 @@
+# backend/tests/test_worker_sync.py
+
+# Several worker processes following each other's commits (user-049)
+
+from sqlalchemy import func, insert, select, update
+
+from app.config import settings
+from app.database import SessionLocal, write_engine
+from app.models import BudgetAlertEvent, Stop, TripEvent
+from app.server import share_process_state
+from app.services.worker_sync_service import WorkerSync
+from app.utils.budget_watch import budget_alerts
+from .conftest import create_stop, create_trip
+
+
+def newest_event_id() -> int:
+    db = SessionLocal()
+    try:
+        return db.query(func.coalesce(func.max(TripEvent.id), 0)).scalar()
+    finally:
+        db.close()
+
+
+def test_alerts_are_numbered_by_the_table(client, auth, db):
+    trip = create_trip(client, auth, budget_limit=100)
+    client.post(f"/api/budget/?trip_id={trip['id']}", json={"category": "meals", "amount": 60})
+
+    alerts = client.get("/api/budget/alerts", params={"trip_id": trip["id"]}, headers=auth).json()["alerts"]
+    stored = db.execute(select(BudgetAlertEvent.id).where(BudgetAlertEvent.trip_id == trip["id"])).scalars().all()
+
+    assert [alert["id"] for alert in alerts] == stored
+
+
+def test_alerts_committed_by_another_worker_are_picked_up(client, auth):
+    trip = create_trip(client, auth, budget_limit=100)
+    with write_engine.begin() as connection:
+        connection.execute(insert(BudgetAlertEvent).values(
+            trip_id=trip["id"], user_id=None, threshold=80, direction="up",
+            spent=85.0, budget_limit=100.0, percent=85.0
+        ))
+        budget_alerts.follow(connection)
+
+    assert [(alert["threshold"], alert["direction"]) for alert in budget_alerts.recent(trip_id=trip["id"])] == [(80, "up")]
+
+
+def test_caches_drop_trips_written_by_another_worker(client, auth):
+    trip = create_trip(client, auth)
+    stop = create_stop(client, auth, trip["id"])
+    names = lambda: [s["city_name"] for s in client.get("/api/stops/", params={"trip_id": trip["id"]}, headers=auth).json()]
+    assert names() == ["Paris"]
+
+    sync = WorkerSync(poll_seconds=60)
+    sync.last_event_id = newest_event_id()
+
+    # Another process: no session hooks run here
+    with write_engine.begin() as connection:
+        connection.execute(update(Stop).where(Stop.id == stop["id"]).values(city_name="Lyon"))
+        connection.execute(insert(TripEvent).values(
+            trip_id=trip["id"], entity="stop", entity_id=stop["id"], action="updated", fields=["city_name"]
+        ))
+    assert names() == ["Paris"]
+
+    sync.sync_once()
+
+    assert names() == ["Lyon"]
+
+
+def test_several_workers_keep_the_caches_on(monkeypatch):
+    for name in ("SERVER_WORKERS", "CACHE_BACKEND", "SHARE_SNAPSHOT_MAX_ENTRIES", "SCHEDULE_INDEX_MAX_ENTRIES"):
+        monkeypatch.setattr(settings, name, getattr(settings, name))
+    before = (settings.CACHE_BACKEND, settings.SHARE_SNAPSHOT_MAX_ENTRIES, settings.SCHEDULE_INDEX_MAX_ENTRIES)
+
+    share_process_state(4)
+
+    assert settings.SERVER_WORKERS == 4
+    assert (settings.CACHE_BACKEND, settings.SHARE_SNAPSHOT_MAX_ENTRIES, settings.SCHEDULE_INDEX_MAX_ENTRIES) == before